@@ -15,6 +15,12 @@ from __future__ import print_function
 import math
 import sys
 
+try:
+    import numpy
+except ImportError:
+    # The summaries are then calculated column by column in pure Python
+    numpy = None
+
 from Bio import Alphabet
 from Bio.Alphabet import IUPAC
 from Bio.Seq import Seq
@@ -27,6 +33,18 @@ Protein20Random = 0.05
 Nucleotide4Random = 0.25
 
 
+def _log(values):
+    """Return the natural logarithm of each value of a NumPy array (PRIVATE).
+
+    This uses math.log, so that the results are exactly those of the column
+    by column code (numpy.log can differ in the last digit). There are
+    usually only a few distinct values, so this is still fast.
+    """
+    unique, inverse = numpy.unique(values, return_inverse=True)
+    logs = numpy.array([math.log(value) for value in unique.tolist()])
+    return logs[inverse.ravel()]
+
+
 class SummaryInfo(object):
     """Calculate summary info about the alignment.
 
@@ -43,6 +61,68 @@ class SummaryInfo(object):
         self.alignment = alignment
         self.ic_vector = []
 
+    def _get_array(self):
+        """Return the alignment as an AlignmentArray, or None (PRIVATE).
+
+        The summaries are calculated from the letter counts of the columns
+        of this array when NumPy is available and the sequences all have
+        the same length. Otherwise, and whenever the array could not give
+        identical results (e.g. for letters which will raise an exception),
+        they are calculated column by column in pure Python.
+        """
+        if numpy is None or not hasattr(self.alignment, "as_array"):
+            return None
+        try:
+            return self.alignment.as_array()
+        except ValueError:
+            # e.g. sequences of different lengths
+            return None
+
+    def _array_consensus(self, array, letters, threshold, ambiguous,
+                         require_multiple):
+        """Consensus of the given letters in each array column (PRIVATE)."""
+        length = array.get_alignment_length()
+        if not letters:
+            return ambiguous * length
+        counts = array.column_counts(letters)[1]
+        num_atoms = counts.sum(axis=0)
+        max_size = counts.max(axis=0)
+        # only use the most common letter if there is no tie
+        use = ((counts == max_size).sum(axis=0) == 1) & (max_size > 0)
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            use &= max_size / num_atoms.astype(float) >= threshold
+        if require_multiple:
+            use &= num_atoms != 1
+        return "".join(letters[best] if ok else ambiguous for best, ok
+                       in zip(counts.argmax(axis=0).tolist(), use.tolist()))
+
+    def _column_weights(self, array, letters):
+        """Sum the record weights of each letter per column (PRIVATE).
+
+        Returns a float array with one row per letter, and the total weight
+        of each column (of the records with any of the letters). Weights
+        are taken from the 'weight' annotation of the records (default 1),
+        and are added up in the order of the records, as in the column by
+        column code, so the sums are identical.
+        """
+        weights = [record.annotations.get('weight', 1.0)
+                   for record in array.records]
+        if all(weight == 1 for weight in weights):
+            sums = array.column_counts(letters)[1].astype(float)
+            return sums, sums.sum(axis=0)
+        table = numpy.zeros(256, dtype=numpy.intp) + len(letters)
+        for i, letter in enumerate(letters):
+            if ord(letter) < 256:
+                table[ord(letter)] = i
+        columns = numpy.arange(array.get_alignment_length())
+        sums = numpy.zeros((len(letters) + 1, len(columns)))
+        totals = numpy.zeros(len(columns))
+        for row, weight in zip(array.data, weights):
+            index = table[row]
+            sums[index, columns] += weight
+            totals[index < len(letters)] += weight
+        return sums[:-1], totals
+
     def dumb_consensus(self, threshold=.7, ambiguous="X",
                        consensus_alpha=None, require_multiple=0):
         """Output a fast consensus sequence of the alignment.
@@ -74,41 +154,47 @@ class SummaryInfo(object):
         # find the length of the consensus we are creating
         con_len = self.alignment.get_alignment_length()
 
-        # go through each seq item
-        for n in range(con_len):
-            # keep track of the counts of the different atoms we get
-            atom_dict = {}
-            num_atoms = 0
-
-            for record in self.alignment:
-                # make sure we haven't run past the end of any sequences
-                # if they are of different lengths
-                if n < len(record.seq):
-                    if record.seq[n] != '-' and record.seq[n] != '.':
-                        if record.seq[n] not in atom_dict:
-                            atom_dict[record.seq[n]] = 1
-                        else:
-                            atom_dict[record.seq[n]] += 1
-
-                        num_atoms = num_atoms + 1
-
-            max_atoms = []
-            max_size = 0
-
-            for atom in atom_dict:
-                if atom_dict[atom] > max_size:
-                    max_atoms = [atom]
-                    max_size = atom_dict[atom]
-                elif atom_dict[atom] == max_size:
-                    max_atoms.append(atom)
-
-            if require_multiple and num_atoms == 1:
-                consensus += ambiguous
-            elif (len(max_atoms) == 1) and ((float(max_size) /
-                                             float(num_atoms)) >= threshold):
-                consensus += max_atoms[0]
-            else:
-                consensus += ambiguous
+        array = self._get_array()
+        if array is not None:
+            letters = array.letters().replace('-', '').replace('.', '')
+            consensus = self._array_consensus(array, letters, threshold,
+                                              ambiguous, require_multiple)
+        else:
+            # go through each seq item
+            for n in range(con_len):
+                # keep track of the counts of the different atoms we get
+                atom_dict = {}
+                num_atoms = 0
+
+                for record in self.alignment:
+                    # make sure we haven't run past the end of any sequences
+                    # if they are of different lengths
+                    if n < len(record.seq):
+                        if record.seq[n] != '-' and record.seq[n] != '.':
+                            if record.seq[n] not in atom_dict:
+                                atom_dict[record.seq[n]] = 1
+                            else:
+                                atom_dict[record.seq[n]] += 1
+
+                            num_atoms = num_atoms + 1
+
+                max_atoms = []
+                max_size = 0
+
+                for atom in atom_dict:
+                    if atom_dict[atom] > max_size:
+                        max_atoms = [atom]
+                        max_size = atom_dict[atom]
+                    elif atom_dict[atom] == max_size:
+                        max_atoms.append(atom)
+
+                if require_multiple and num_atoms == 1:
+                    consensus += ambiguous
+                elif (len(max_atoms) == 1) and \
+                        ((float(max_size) / float(num_atoms)) >= threshold):
+                    consensus += max_atoms[0]
+                else:
+                    consensus += ambiguous
 
         # we need to guess a consensus alphabet if one isn't specified
         if consensus_alpha is None:
@@ -132,40 +218,46 @@ class SummaryInfo(object):
         # find the length of the consensus we are creating
         con_len = self.alignment.get_alignment_length()
 
-        # go through each seq item
-        for n in range(con_len):
-            # keep track of the counts of the different atoms we get
-            atom_dict = {}
-            num_atoms = 0
-
-            for record in self.alignment:
-                # make sure we haven't run past the end of any sequences
-                # if they are of different lengths
-                if n < len(record.seq):
-                    if record.seq[n] not in atom_dict:
-                        atom_dict[record.seq[n]] = 1
-                    else:
-                        atom_dict[record.seq[n]] += 1
+        array = self._get_array()
+        if array is not None:
+            consensus = self._array_consensus(array, array.letters(),
+                                              threshold, ambiguous,
+                                              require_multiple)
+        else:
+            # go through each seq item
+            for n in range(con_len):
+                # keep track of the counts of the different atoms we get
+                atom_dict = {}
+                num_atoms = 0
+
+                for record in self.alignment:
+                    # make sure we haven't run past the end of any sequences
+                    # if they are of different lengths
+                    if n < len(record.seq):
+                        if record.seq[n] not in atom_dict:
+                            atom_dict[record.seq[n]] = 1
+                        else:
+                            atom_dict[record.seq[n]] += 1
 
-                    num_atoms += 1
+                        num_atoms += 1
 
-            max_atoms = []
-            max_size = 0
+                max_atoms = []
+                max_size = 0
 
-            for atom in atom_dict:
-                if atom_dict[atom] > max_size:
-                    max_atoms = [atom]
-                    max_size = atom_dict[atom]
-                elif atom_dict[atom] == max_size:
-                    max_atoms.append(atom)
+                for atom in atom_dict:
+                    if atom_dict[atom] > max_size:
+                        max_atoms = [atom]
+                        max_size = atom_dict[atom]
+                    elif atom_dict[atom] == max_size:
+                        max_atoms.append(atom)
 
-            if require_multiple and num_atoms == 1:
-                consensus += ambiguous
-            elif (len(max_atoms) == 1) and ((float(max_size) /
-                                             float(num_atoms)) >= threshold):
-                consensus += max_atoms[0]
-            else:
-                consensus += ambiguous
+                if require_multiple and num_atoms == 1:
+                    consensus += ambiguous
+                elif (len(max_atoms) == 1) and \
+                        ((float(max_size) / float(num_atoms)) >= threshold):
+                    consensus += max_atoms[0]
+                else:
+                    consensus += ambiguous
 
         # we need to guess a consensus alphabet if one isn't specified
         if consensus_alpha is None:
@@ -255,6 +347,11 @@ class SummaryInfo(object):
         # get a starting dictionary based on the alphabet of the alignment
         rep_dict, skip_items = self._get_base_replacements(skip_chars)
 
+        array = self._get_array()
+        if array is not None and \
+                self._array_replacements(array, rep_dict, skip_items):
+            return rep_dict
+
         # iterate through each record
         for rec_num1 in range(len(self.alignment)):
             # iterate through each record from one beyond the current record
@@ -271,6 +368,49 @@ class SummaryInfo(object):
 
         return rep_dict
 
+    def _array_replacements(self, array, rep_dict, skip_items):
+        """Add the replacements of all pairs of rows of the array (PRIVATE).
+
+        Rather than comparing every pair of rows, this keeps the counts of
+        the letters in each column of the rows seen so far, so that the
+        replacements of a row with all the rows above it are counted in
+        one go, from the letters of that row.
+
+        Returns False, leaving the dictionary alone, for weighted records
+        (where the sums of the products of the weights could differ in the
+        last digits from those of the pairwise code) and if there are any
+        unexpected letters (for the pairwise code to raise an exception).
+        """
+        if any(record.annotations.get('weight', 1.0) != 1
+               for record in array.records):
+            return False
+        letters = sorted(set(first for first, second in rep_dict))
+        if not set(array.letters()).issubset(set(letters).union(skip_items)):
+            return False
+        size = len(letters) + 1
+        # skipped letters get the last index, which isn't counted
+        table = numpy.zeros(256, dtype=numpy.intp) + len(letters)
+        for i, letter in enumerate(letters):
+            if ord(letter) < 256:
+                table[ord(letter)] = i
+        columns = numpy.arange(array.get_alignment_length())
+        seen = numpy.zeros((len(letters), len(columns)))
+        offsets = numpy.arange(0, len(letters) * size, size)[:, None]
+        pairs = numpy.zeros(len(letters) * size)
+        for row in array.data:
+            index = table[row]
+            # the letters above (as rows) against this row's letters
+            pairs += numpy.bincount((offsets + index).ravel(), seen.ravel(),
+                                    len(letters) * size)
+            counted = index < len(letters)
+            seen[index[counted], columns[counted]] += 1
+        pairs = pairs.reshape(len(letters), size).tolist()
+        for i, first in enumerate(letters):
+            for j, second in enumerate(letters):
+                if pairs[i][j]:
+                    rep_dict[(first, second)] += pairs[i][j]
+        return True
+
     def _pair_replacement(self, seq1, seq2, weight1, weight2,
                           start_dict, ignore_chars):
         """Compare two sequences and generate info on the replacements seen.
@@ -409,6 +549,18 @@ class SummaryInfo(object):
             left_seq = self.dumb_consensus()
 
         pssm_info = []
+        array = self._get_array()
+        if array is not None and set(array.letters()).issubset(
+                set(all_letters).union(chars_to_ignore)):
+            letters = list(self._get_base_letters(all_letters))
+            sums = self._column_weights(array, letters)[0]
+            for residue_num, column in enumerate(sums.T.tolist()):
+                # letters not seen are left as integer zeros, as below
+                pssm_info.append((left_seq[residue_num],
+                                  dict((letter, value or 0) for letter, value
+                                       in zip(letters, column))))
+            return PSSM(pssm_info)
+
         # now start looping through all of the sequences and getting info
         for residue_num in range(len(left_seq)):
             score_dict = self._get_base_letters(all_letters)
@@ -517,20 +669,33 @@ class SummaryInfo(object):
             all_letters = all_letters.replace(char, '')
 
         info_content = {}
-        for residue_num in range(start, end):
-            freq_dict = self._get_letter_freqs(residue_num,
-                                               self.alignment,
-                                               all_letters,
-                                               chars_to_ignore,
-                                               pseudo_count,
-                                               e_freq_table,
-                                               random_expected)
-            # print freq_dict,
-            column_score = self._get_column_info_content(freq_dict,
-                                                         e_freq_table,
-                                                         log_base,
-                                                         random_expected)
-            info_content[residue_num] = column_score
+        column_scores = None
+        array = self._get_array()
+        if array is not None:
+            column_scores = self._array_info_content(array[:, start:end],
+                                                     all_letters,
+                                                     chars_to_ignore,
+                                                     pseudo_count,
+                                                     e_freq_table,
+                                                     log_base,
+                                                     random_expected)
+        if column_scores is not None:
+            info_content = dict(zip(range(start, end), column_scores))
+        else:
+            for residue_num in range(start, end):
+                freq_dict = self._get_letter_freqs(residue_num,
+                                                   self.alignment,
+                                                   all_letters,
+                                                   chars_to_ignore,
+                                                   pseudo_count,
+                                                   e_freq_table,
+                                                   random_expected)
+                # print freq_dict,
+                column_score = self._get_column_info_content(freq_dict,
+                                                             e_freq_table,
+                                                             log_base,
+                                                             random_expected)
+                info_content[residue_num] = column_score
         # sum up the score
         total_info = sum(info_content.values())
         # fill in the ic_vector member: holds IC for each column
@@ -540,6 +705,62 @@ class SummaryInfo(object):
             self.ic_vector.append(info_content[i + start])
         return total_info
 
+    def _array_info_content(self, array, all_letters, chars_to_ignore,
+                            pseudo_count, e_freq_table, log_base,
+                            random_expected):
+        """Calculate the information content of each array column (PRIVATE).
+
+        This gives the same results as the _get_letter_freqs and
+        _get_column_info_content methods for each column, but for all the
+        columns at once. Returns None (for the column by column code to
+        raise the exception) if these would raise an exception, e.g. for
+        letters not in the alphabet.
+        """
+        letters = list(self._get_base_letters(all_letters))
+        gap_char = self._get_gap_char()
+        if pseudo_count < 0 or not set(array.letters()).issubset(
+                set(letters).union(chars_to_ignore)):
+            return None
+        if e_freq_table:
+            for letter in letters:
+                if letter not in e_freq_table:
+                    # the gap only needs a frequency for pseudo counts
+                    if letter != gap_char or pseudo_count:
+                        return None
+                elif letter != gap_char and not e_freq_table[letter]:
+                    return None
+
+        sums, totals = self._column_weights(array, letters)
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            if pseudo_count and (random_expected or e_freq_table):
+                if e_freq_table:
+                    ajust_freq = numpy.array([e_freq_table[letter]
+                                              for letter in letters])[:, None]
+                else:
+                    ajust_freq = random_expected
+                freqs = (sums + ajust_freq * pseudo_count) / \
+                    (totals + pseudo_count)
+            else:
+                freqs = sums / totals
+        # columns of only ignored characters
+        freqs[:, totals == 0] = 0
+
+        column_scores = numpy.zeros(array.get_alignment_length())
+        for letter, obs_freq in zip(letters, freqs):
+            # gap characters do not add any information
+            if letter == gap_char:
+                continue
+            if e_freq_table:
+                inner_log = obs_freq / e_freq_table[letter]
+            else:
+                inner_log = obs_freq / random_expected
+            used = inner_log > 0
+            letter_info = numpy.zeros(len(column_scores))
+            letter_info[used] = (obs_freq[used] * _log(inner_log[used]) /
+                                 math.log(log_base))
+            column_scores += letter_info
+        return column_scores.tolist()
+
     def _get_letter_freqs(self, residue_num, all_records, letters, to_ignore,
                           pseudo_count=0, e_freq_table=None, random_expected=None):
         """Determine the frequency of specific letters in the alignment.
@@ -102,6 +102,9 @@ class MultipleSeqAlignment(object):
     reference sequence with special status.
     """
 
+    # Sequences and AlignmentArray from the last call to as_array
+    _array_cache = None
+
     def __init__(self, records, alphabet=None,
                  annotations=None):
         """Initialize a new MultipleSeqAlignment object.
@@ -764,12 +767,54 @@ class MultipleSeqAlignment(object):
             return self._records[row_index][col_index]
         elif isinstance(col_index, int):
             # e.g. col_or_part_col = align[1:5, 6], gives a string
+            array = self._cached_array()
+            if array is not None:
+                return array[row_index, col_index]
             return "".join(rec[col_index] for rec in self._records[row_index])
         else:
             # e.g. sub_align = align[1:4, 5:7], gives another alignment
             return MultipleSeqAlignment((rec[col_index] for rec in self._records[row_index]),
                                         self._alphabet)
 
+    def as_array(self):
+        """Return the letters of the alignment as an AlignmentArray.
+
+        This requires NumPy. The AlignmentArray holds the letters as a 2D
+        array of bytes, with fast column access, gap fractions and letter
+        counts per column, and subsetting by boolean masks, see the
+        Bio.Align._array module for details. For example, to remove the
+        columns with any gaps:
+
+            array = align.as_array()
+            trimmed = array[:, array.gap_fraction() == 0].to_alignment()
+
+        The array is cached, and only built again if the rows of the
+        alignment have been changed (e.g. records added, removed or given
+        a new sequence). While it is cached, single columns of the
+        alignment (e.g. align[:, 4]) are also taken from the array.
+        """
+        array = self._cached_array()
+        if array is None:
+            from Bio.Align._array import AlignmentArray
+            array = AlignmentArray.from_alignment(self)
+            seqs = [rec.seq for rec in self._records]
+            # A MutableSeq could be edited in place, so don't cache these
+            if all(isinstance(seq, Seq) for seq in seqs):
+                self._array_cache = (seqs, array)
+        return array
+
+    def _cached_array(self):
+        """Return the cached AlignmentArray if still valid, or None (PRIVATE)."""
+        if self._array_cache is None:
+            return None
+        seqs, array = self._array_cache
+        if len(seqs) != len(self._records) or \
+                any(rec is not old or rec.seq is not seq for rec, old, seq
+                    in zip(self._records, array.records, seqs)):
+            self._array_cache = None
+            return None
+        return array
+
     def sort(self, key=None, reverse=False):
         """Sort the rows (SeqRecord objects) of the alignment in place.
 
@@ -0,0 +1,212 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Array view of a multiple sequence alignment (requires NumPy).
+
+A MultipleSeqAlignment stores its rows as a list of SeqRecord objects, so
+working down the columns means building a new string for every column.
+For column-wise work on large alignments use the as_array method instead,
+which gives an AlignmentArray holding the letters as a two dimensional
+NumPy array of bytes (one row per sequence, one column per alignment
+column). This is built once and cached by the alignment:
+
+>>> from Bio import AlignIO
+>>> align = AlignIO.read("Clustalw/opuntia.aln", "clustal")
+>>> array = align.as_array()
+>>> print(array.data.shape)
+(7, 156)
+>>> array[:, 58]
+'----TTT'
+
+Counting the gaps or letters of every column is vectorized:
+
+>>> gaps = array.gap_fraction()
+>>> print("%0.2f %0.2f" % (gaps[0], gaps[58]))
+0.00 0.57
+>>> letters, counts = array.column_counts()
+>>> letters
+'-ACGT'
+>>> print(counts[:, 58])
+[4 0 0 0 3]
+
+Indexing with slices, lists of numbers or boolean masks (as for NumPy
+arrays) gives another AlignmentArray, here without the gappy columns:
+
+>>> trimmed = array[:, array.gap_fraction() < 0.25]
+>>> print(trimmed.data.shape)
+(7, 146)
+
+Finally, to go back to SeqRecord objects:
+
+>>> print(trimmed.to_alignment()[:, 50:80])
+SingleLetterAlphabet() alignment with 7 rows and 30 columns
+TATATAATATATTTCAAATTTCCTTATATA gi|6273285|gb|AF191659.1|AF191
+TATATAATATATTTCAAATTTCCTTATATA gi|6273284|gb|AF191658.1|AF191
+TATATAATATATTTCAAATTTCCTTATATA gi|6273287|gb|AF191661.1|AF191
+TATATAATATATTTATAATTTCCTTATATA gi|6273286|gb|AF191660.1|AF191
+TATATAATATATTTCAAATTCCCTTATATA gi|6273290|gb|AF191664.1|AF191
+TATATAATATATTTCAAATTCCCTTATATA gi|6273289|gb|AF191663.1|AF191
+TATATAATATATTTCAAATTCCCTTATATA gi|6273291|gb|AF191665.1|AF191
+"""
+
+from __future__ import print_function
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use MultipleSeqAlignment.as_array.")
+
+from Bio._py3k import _bytes_to_string
+
+from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
+
+
+# number of rows compared at a time when counting letters, this limits
+# the size of the temporary boolean arrays
+_CHUNK_ROWS = 1000
+
+
+def _text(values):
+    """Turn an array (or a single value) of letter codes into a string (PRIVATE)."""
+    if numpy.ndim(values) == 0:
+        return chr(values)
+    return _bytes_to_string(numpy.ascontiguousarray(values).tobytes())
+
+
+class AlignmentArray(object):
+    """The letters of an alignment as a 2D NumPy array of bytes.
+
+    Attributes:
+     - data - NumPy array of uint8 with one row per sequence and one column
+       per alignment column, holding the ASCII codes of the letters.
+     - records - List of the SeqRecord objects of the rows, used for their
+       identifiers and alphabets when converting back to an alignment.
+     - alphabet - The alphabet of the alignment.
+
+    You would normally get this from the as_array method of an alignment
+    rather than creating it yourself. The data array of an alignment's
+    cached AlignmentArray is read only; take a copy before changing it.
+    """
+
+    def __init__(self, data, records, alphabet):
+        """Initialize the class."""
+        if len(data) != len(records):
+            raise ValueError("Got %i rows of data but %i records"
+                             % (len(data), len(records)))
+        self.data = data
+        self.records = records
+        self.alphabet = alphabet
+
+    @classmethod
+    def from_alignment(cls, alignment):
+        """Build the array of letters of a MultipleSeqAlignment."""
+        records = list(alignment)
+        data = numpy.empty((len(records), alignment.get_alignment_length()),
+                           dtype=numpy.uint8)
+        for row, record in zip(data, records):
+            try:
+                text = str(record.seq).encode("ascii")
+            except UnicodeError:
+                raise ValueError("Only alignments of ASCII letters are "
+                                 "supported")
+            row[:] = numpy.frombuffer(text, dtype=numpy.uint8)
+        data.flags.writeable = False
+        return cls(data, records, alignment._alphabet)
+
+    def __len__(self):
+        """Return the number of rows (sequences)."""
+        return len(self.records)
+
+    def get_alignment_length(self):
+        """Return the number of columns."""
+        return self.data.shape[1]
+
+    def __repr__(self):
+        """Return a string with the size of the array."""
+        return "<%s with %i rows and %i columns>" \
+            % (self.__class__.__name__, len(self), self.get_alignment_length())
+
+    def __getitem__(self, index):
+        """Access part of the alignment.
+
+        The index works as for MultipleSeqAlignment objects, but also takes
+        lists of numbers or boolean masks (e.g. NumPy arrays) for the rows
+        and columns. A single character, row or column is returned as a
+        string, anything else as another AlignmentArray.
+        """
+        if not isinstance(index, tuple):
+            index = (index, slice(None))
+        elif len(index) != 2:
+            raise TypeError("Invalid index type.")
+        row_index, col_index = index
+        rows = numpy.arange(len(self.records))[row_index]
+        if rows.ndim == 0 or numpy.ndim(col_index) == 0 and \
+                not isinstance(col_index, slice):
+            return _text(self.data[row_index, col_index])
+        return self.__class__(self.data[row_index][:, col_index],
+                              [self.records[i] for i in rows],
+                              self.alphabet)
+
+    def _count(self, letter):
+        """Count a letter in each column, returns an integer array (PRIVATE)."""
+        code = ord(letter)
+        counts = numpy.zeros(self.data.shape[1], dtype=numpy.intp)
+        for start in range(0, len(self.data), _CHUNK_ROWS):
+            counts += numpy.count_nonzero(
+                self.data[start:start + _CHUNK_ROWS] == code, axis=0)
+        return counts
+
+    def gap_fraction(self, gap_char="-"):
+        """Return the fraction of gaps in each column as a float array."""
+        if not len(self.records):
+            return numpy.zeros(self.data.shape[1])
+        return self._count(gap_char) / float(len(self.records))
+
+    def letters(self):
+        """Return a sorted string of all the letters used in the alignment."""
+        used = numpy.zeros(256, dtype=bool)
+        for start in range(0, len(self.data), _CHUNK_ROWS):
+            used[self.data[start:start + _CHUNK_ROWS]] = True
+        return _text(numpy.flatnonzero(used).astype(numpy.uint8))
+
+    def column_counts(self, letters=None):
+        """Count the letters of each column.
+
+        Arguments:
+         - letters - String of the letters to count, by default all the
+           letters used in the alignment (sorted).
+
+        Returns the letters and a 2D integer array of the counts, with one
+        row per letter and one column per alignment column. Letters are
+        counted as they are, so upper and lower case are different.
+        """
+        if letters is None:
+            letters = self.letters()
+        counts = numpy.zeros((len(letters), self.data.shape[1]),
+                             dtype=numpy.intp)
+        for i, letter in enumerate(letters):
+            counts[i] = self._count(letter)
+        return letters, counts
+
+    def to_alignment(self):
+        """Return the array as a MultipleSeqAlignment of new SeqRecords.
+
+        The identifiers, names, descriptions and database cross references
+        of the records are kept, but not any other annotation.
+        """
+        from Bio.Align import MultipleSeqAlignment
+        records = [SeqRecord(Seq(_text(row), record.seq.alphabet),
+                             id=record.id, name=record.name,
+                             description=record.description,
+                             dbxrefs=record.dbxrefs[:])
+                   for record, row in zip(self.records, self.data)]
+        return MultipleSeqAlignment(records, self.alphabet)
+
+
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+    run_doctest()
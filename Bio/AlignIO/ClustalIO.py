@@ -125,8 +125,13 @@ class ClustalIterator(AlignmentIterator):
         # If the alignment contains entries with the same sequence
         # identifier (not a good idea - but seems possible), then this
         # dictionary based parser will merge their sequences.  Fix this?
+        # The sequences and consensus are split over many blocks, so we
+        # collect the pieces in lists and join them at the end (adding to
+        # a string each time is slow for big alignments)
         ids = []
         seqs = []
+        lengths = []
+        residues = []  # count of letters other than gaps
         consensus = ""
         seq_cols = None  # Used to extract the consensus
 
@@ -142,7 +147,9 @@ class ClustalIterator(AlignmentIterator):
                     raise ValueError("Could not parse line:\n%s" % line)
 
                 ids.append(fields[0])
-                seqs.append(fields[1])
+                seqs.append([fields[1]])
+                lengths.append(len(fields[1]))
+                residues.append(len(fields[1]) - fields[1].count("-"))
 
                 # Record the sequence position to get the consensus
                 if seq_cols is None:
@@ -160,7 +167,7 @@ class ClustalIterator(AlignmentIterator):
                     except ValueError:
                         raise ValueError("Could not parse line, "
                                          "bad sequence number:\n%s" % line)
-                    if len(fields[1].replace("-", "")) != letters:
+                    if residues[-1] != letters:
                         raise ValueError("Could not parse line, "
                                          "invalid sequence number:\n%s" % line)
             elif line[0] == " ":
@@ -186,10 +193,12 @@ class ClustalIterator(AlignmentIterator):
         assert seq_cols is not None
 
         # Confirm all same length
-        for s in seqs:
-            assert len(s) == len(seqs[0])
+        for length in lengths:
+            assert length == lengths[0]
         if consensus:
-            assert len(consensus) == len(seqs[0])
+            assert len(consensus) == lengths[0]
+            consensus = [consensus]
+            consensus_length = lengths[0]
 
         # Loop over any remaining blocks...
         done = False
@@ -234,8 +243,10 @@ class ClustalIterator(AlignmentIterator):
                     del start, end
 
                 # Append the sequence
-                seqs[i] += fields[1]
-                assert len(seqs[i]) == len(seqs[0])
+                seqs[i].append(fields[1])
+                lengths[i] += len(fields[1])
+                residues[i] += len(fields[1]) - fields[1].count("-")
+                assert lengths[i] == lengths[0]
 
                 if len(fields) == 3:
                     # This MAY be an old style file with a letter count...
@@ -245,7 +256,7 @@ class ClustalIterator(AlignmentIterator):
                         raise ValueError("Could not parse line, "
                                          "bad sequence number:\n%s" %
                                          line)
-                    if len(seqs[i].replace("-", "")) != letters:
+                    if residues[i] != letters:
                         raise ValueError("Could not parse line, "
                                          "invalid sequence number:\n%s" % line)
 
@@ -255,16 +266,19 @@ class ClustalIterator(AlignmentIterator):
             if consensus:
                 assert line[0] == " "
                 assert seq_cols is not None
-                consensus += line[seq_cols]
-                assert len(consensus) == len(seqs[0])
+                consensus.append(line[seq_cols])
+                consensus_length += len(consensus[-1])
+                assert consensus_length == lengths[0]
                 assert not line[:seq_cols.start].strip()
                 assert not line[seq_cols.stop:].strip()
                 # Read in the next line
                 line = handle.readline()
 
         assert len(ids) == len(seqs)
-        if len(seqs) == 0 or len(seqs[0]) == 0:
+        if len(seqs) == 0 or lengths[0] == 0:
             raise StopIteration
+        seqs = ["".join(pieces) for pieces in seqs]
+        consensus = "".join(consensus)
 
         if self.records_per_alignment is not None and \
                 self.records_per_alignment != len(ids):
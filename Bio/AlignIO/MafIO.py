@@ -32,6 +32,7 @@ For an inclusive end coordinate, we need to use ``end = start + size - 1``.
 A 1-column wide alignment would have ``start == end``.
 """
 import os
+from collections import OrderedDict
 from itertools import islice
 
 try:
@@ -42,6 +43,7 @@ except ImportError:
     # Still want to offer simple parsing/output
     _sqlite = None
 
+from Bio import bgzf
 from Bio.Alphabet import single_letter_alphabet
 from Bio.Seq import Seq
 from Bio.SeqRecord import SeqRecord
@@ -236,8 +238,15 @@ class MafIndex(object):
 
     The index is a sqlite3 database that is built upon creation of the object
     if necessary, and queried when methods *search* or *get_spliced* are
-    used."""
-    def __init__(self, sqlite_file, maf_file, target_seqname):
+    used.
+
+    The MAF file may be BGZF compressed (see Bio.bgzf), in which case the
+    index records the BGZF virtual offsets of the alignment blocks. The most
+    recently used alignment blocks (up to *max_cache* of them) are kept,
+    rather than re-read and parsed from the file when searching regions
+    close together. Each search returns new copies of them, which may be
+    modified."""
+    def __init__(self, sqlite_file, maf_file, target_seqname, max_cache=100):
         """Indexes or loads the index of a MAF file"""
         self._target_seqname = target_seqname
         # example: Tests/MAF/ucsc_mm9_chr10.mafindex
@@ -247,7 +256,16 @@ class MafIndex(object):
         # example: Tests/MAF/ucsc_mm9_chr10.maf
         self._maf_file = maf_file
 
-        self._maf_fp = open(self._maf_file, "r")
+        with open(self._maf_file, "rb") as handle:
+            self._is_bgzf = handle.read(4) == bgzf._bgzf_magic
+        if self._is_bgzf:
+            self._maf_fp = bgzf.BgzfReader(self._maf_file, "r")
+        else:
+            self._maf_fp = open(self._maf_file, "r")
+
+        # parsed alignment blocks by offset, least recently used first
+        self._max_cache = max_cache
+        self._cache = OrderedDict()
 
         # if sqlite_file exists, use the existing db, otherwise index the file
         if os.path.isfile(sqlite_file):
@@ -375,12 +393,17 @@ class MafIndex(object):
         (bin, start, end, offset) tuples where start and end are
         0-based inclusive coordinates.
         """
+        # for BGZF files, offsets can only be found before reading the line
+        line_offset = self._maf_fp.tell() if self._is_bgzf else None
         line = self._maf_fp.readline()
 
         while line:
             if line.startswith("a"):
                 # note the offset
-                offset = self._maf_fp.tell() - len(line)
+                if self._is_bgzf:
+                    offset = line_offset
+                else:
+                    offset = self._maf_fp.tell() - len(line)
 
                 # search the following lines for a match to target_seqname
                 while True:
@@ -406,6 +429,8 @@ class MafIndex(object):
 
                             break
 
+            if self._is_bgzf:
+                line_offset = self._maf_fp.tell()
             line = self._maf_fp.readline()
 
     # TODO: check coordinate correctness for the two bin-related static methods
@@ -452,9 +477,55 @@ class MafIndex(object):
         return 0
 
     def _get_record(self, offset):
-        """Retrieves a single MAF record located at the offset provided."""
-        self._maf_fp.seek(offset)
-        return next(self._mafiter)
+        """Retrieves a single MAF record located at the offset provided.
+
+        Recently used records are taken from the cache, if enabled, and
+        a copy returned so that the caller may modify it.
+        """
+        cache = self._cache
+        try:
+            record = cache.pop(offset)
+        except KeyError:
+            self._maf_fp.seek(offset)
+            record = next(self._mafiter)
+            if self._max_cache < 1:
+                return record
+            if len(cache) >= self._max_cache:
+                # discard the least recently used record
+                cache.popitem(last=False)
+        cache[offset] = record
+        return self._copy_record(record)
+
+    @staticmethod
+    def _copy_record(record):
+        """Returns a copy of a cached MAF record (PRIVATE).
+
+        The SeqRecord objects and annotation dictionaries are new, while
+        the (read only) Seq objects are shared with the cached record.
+        """
+        alignment = MultipleSeqAlignment(
+            [SeqRecord(seq_record.seq, id=seq_record.id,
+                       name=seq_record.name,
+                       description=seq_record.description,
+                       annotations=dict(seq_record.annotations))
+             for seq_record in record], record._alphabet)
+        alignment._annotations = dict(record._annotations)
+        return alignment
+
+    @staticmethod
+    def _merge_regions(starts, ends):
+        """Sorts regions by start, merging any that overlap or touch (PRIVATE).
+
+        Returns a list of (start, end) tuples.
+        """
+        merged = []
+        for start, end in sorted(zip(starts, ends)):
+            if merged and start <= merged[-1][1]:
+                if end > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+        return merged
 
     def search(self, starts, ends):
         """Searches index database for MAF records overlapping ranges provided.
@@ -466,6 +537,11 @@ class MafIndex(object):
         *ends* should be the list of the corresponding segment ends
         (in the half-open UCSC convention:
         http://genome.ucsc.edu/blog/the-ucsc-genome-browser-coordinate-counting-systems/).
+
+        Many segments (e.g. all the exons of a set of genes) can be searched
+        in one call. They are sorted and any overlapping segments merged, so
+        that the database is queried once per merged region, and each record
+        is only returned once.
         """
         # verify the provided exon coordinates
         if len(starts) != len(ends):
@@ -474,19 +550,20 @@ class MafIndex(object):
         for exonstart, exonend in zip(starts, ends):
             if exonstart >= exonend:
                 raise ValueError("Exon coordinates invalid (%s >= %s)" % (exonstart, exonend))
+            try:
+                self._region2bin(exonstart, exonend)
+            except TypeError:
+                raise TypeError("Exon coordinates must be integers "
+                                "(start=%d, end=%d)" % (exonstart, exonend))
         con = self._con
 
         # Keep track of what blocks have already been yielded
         # in order to avoid duplicating them
         # (see https://github.com/biopython/biopython/issues/1083)
         yielded_rec_coords = set([])
-        # search for every exon
-        for exonstart, exonend in zip(starts, ends):
-            try:
-                possible_bins = ", ".join(map(str, self._region2bin(exonstart, exonend)))
-            except TypeError:
-                raise TypeError("Exon coordinates must be integers "
-                                "(start=%d, end=%d)" % (exonstart, exonend))
+        # search for every region
+        for exonstart, exonend in self._merge_regions(starts, ends):
+            possible_bins = ", ".join(map(str, self._region2bin(exonstart, exonend)))
 
             # https://www.sqlite.org/lang_expr.html
             # -----
@@ -603,6 +680,7 @@ class MafIndex(object):
                                          self._target_seqname)
                     # length including gaps (i.e. alignment length)
                     rec_length = len(seqrec)
+                    target_seq = str(seqrec.seq)
                     rec_start = seqrec.annotations["start"]
                     rec_end = seqrec.annotations["start"] + seqrec.annotations["size"]
 
@@ -620,21 +698,21 @@ class MafIndex(object):
             # the true, chromosome/contig/etc position in the target seqname
             real_pos = rec_start
 
+            # the sequences as strings, which are much faster to index
+            split_seqs = [(split_by_position[seqrec.id], str(seqrec.seq))
+                          for seqrec in multiseq]
+
             # loop over the alignment to fill split_by_position
             for gapped_pos in range(0, rec_length):
-                for seqrec in multiseq:
-                    # keep track of this position's value for the target seqname
-                    if seqrec.id == self._target_seqname:
-                        track_val = seqrec.seq[gapped_pos]
-
+                for seq_split, seq in split_seqs:
                     # Here, a real_pos that corresponds to just after a series of "-"
                     # in the reference will "accumulate" the letters found in other sequences
                     # in front of the "-"s
-                    split_by_position[seqrec.id][real_pos] += seqrec.seq[gapped_pos]
+                    seq_split[real_pos] += seq[gapped_pos]
 
                 # increment the real_pos counter only when non-gaps are found in
                 # the target_seqname, and we haven't reached the end of the record
-                if track_val != "-" and real_pos < rec_end - 1:
+                if target_seq[gapped_pos] != "-" and real_pos < rec_end - 1:
                     real_pos += 1
 
         # make sure the number of bp entries equals the sum of the record lengths
@@ -706,7 +784,7 @@ class MafIndex(object):
         return MultipleSeqAlignment(result_multiseq)
 
     def __repr__(self):
-        return "MafIO.MafIndex(%r, target_seqname=%r)" % (self._maf_fp.name,
+        return "MafIO.MafIndex(%r, target_seqname=%r)" % (self._maf_file,
                                                           self._target_seqname)
 
     def __len__(self):
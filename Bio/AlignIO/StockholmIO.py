@@ -135,6 +135,7 @@ from __future__ import print_function
 
 from collections import OrderedDict
 
+from Bio.Alphabet import single_letter_alphabet
 from Bio.Seq import Seq
 from Bio.SeqRecord import SeqRecord
 from Bio.Align import MultipleSeqAlignment
@@ -282,6 +283,12 @@ class StockholmIterator(AlignmentIterator):
     conventions for sequence specific meta-data (lines starting #=GS
     and #=GR) and populates the SeqRecord fields accordingly.
 
+    The per-file meta-data (lines starting #=GF) is recorded in the
+    alignment's annotations dictionary, using the keys "identifier",
+    "accession" and "description" for the ID, AC and DE lines, and
+    "GF:" plus the feature name otherwise (with lines of the same feature
+    joined by new lines).
+
     Any annotation which does not follow the PFAM conventions is currently
     ignored.
 
@@ -301,6 +308,20 @@ class StockholmIterator(AlignmentIterator):
 
     For consistency with BioPerl and EMBOSS we call this the "stockholm"
     format.
+
+    For very large families, such as those of Pfam-A.full, the per-column
+    annotation of each sequence (lines starting #=GR) can take more memory
+    than the sequences themselves. If you do not need it, create the
+    iterator with letter_annotations=False to skip these lines::
+
+        from Bio.AlignIO.StockholmIO import StockholmIterator
+        with open("Pfam-A.full") as handle:
+            for alignment in StockholmIterator(handle,
+                                               letter_annotations=False):
+                print(alignment.annotations["accession"], len(alignment))
+
+    To load single families from such a file, see the Bio.AlignIO.index
+    and index_db functions.
     """
 
     # These dictionaries should be kept in sync with those
@@ -316,9 +337,27 @@ class StockholmIterator(AlignmentIterator):
     pfam_gs_mapping = {"OS": "organism",
                        "OC": "organism_classification",
                        "LO": "look"}
+    pfam_gf_mapping = {"ID": "identifier",
+                       "AC": "accession",
+                       "DE": "description"}
 
     _header = None  # for caching lines between __next__ calls
 
+    def __init__(self, handle, seq_count=None,
+                 alphabet=single_letter_alphabet, letter_annotations=True):
+        """Create a StockholmIterator object.
+
+        Arguments:
+         - handle   - input file
+         - seq_count - optional, expected number of records per alignment
+         - alphabet - optional, e.g. Bio.Alphabet.generic_protein
+         - letter_annotations - optional, use False to ignore the #=GR
+           lines (so the records have no letter_annotations).
+
+        """
+        AlignmentIterator.__init__(self, handle, seq_count, alphabet)
+        self.letter_annotations = letter_annotations
+
     def __next__(self):
         handle = self.handle
 
@@ -341,6 +380,9 @@ class StockholmIterator(AlignmentIterator):
         # We do not check for this - perhaps we should, and verify that
         # if present it agrees with our parsing.
 
+        # The sequences and #=GR lines of interlaced files are split over
+        # many lines, so we collect the pieces in lists and join them at
+        # the end (adding to a string each time is slow for big alignments)
         seqs = {}
         ids = OrderedDict()  # Really only need an OrderedSet, but python lacks this
         gs = {}
@@ -373,10 +415,11 @@ class StockholmIterator(AlignmentIterator):
                         "Could not split line into identifier "
                         "and sequence:\n" + line)
                 seq_id, seq = parts
-                if seq_id not in ids:
+                try:
+                    seqs[seq_id].append(seq)
+                except KeyError:
                     ids[seq_id] = True
-                seqs.setdefault(seq_id, '')
-                seqs[seq_id] += seq.replace(".", "-")
+                    seqs[seq_id] = [seq]
             elif len(line) >= 5:
                 # Comment line or meta-data
                 if line[:5] == "#=GF ":
@@ -408,14 +451,16 @@ class StockholmIterator(AlignmentIterator):
                 elif line[:5] == "#=GR ":
                     # Generic per-Sequence AND per-Column markup
                     # Format: "#=GR <seqname> <feature> <exactly 1 char per column>"
+                    if not self.letter_annotations:
+                        continue
                     seq_id, feature, text = line[5:].strip().split(None, 2)
                     # if seq_id not in ids:
                     #    ids.append(seq_id)
                     if seq_id not in gr:
                         gr[seq_id] = {}
                     if feature not in gr[seq_id]:
-                        gr[seq_id][feature] = ""
-                    gr[seq_id][feature] += text.strip()  # append to any previous entry
+                        gr[seq_id][feature] = []
+                    gr[seq_id][feature].append(text.strip())  # add to any previous entry
                     # TODO - Should we check the length matches the alignment length?
                     #       For iterlaced sequences the GR data can be split over
                     #       multiple lines
@@ -425,6 +470,12 @@ class StockholmIterator(AlignmentIterator):
         # assert len(gs)   <= len(ids)
         # assert len(gr)   <= len(ids)
 
+        for seq_id, pieces in seqs.items():
+            seqs[seq_id] = "".join(pieces).replace(".", "-")
+        for features in gr.values():
+            for feature, pieces in features.items():
+                features[feature] = "".join(pieces)
+
         self.ids = ids.keys()
         self.sequences = seqs
         self.seq_annotation = gs
@@ -459,6 +510,12 @@ class StockholmIterator(AlignmentIterator):
                 self._populate_meta_data(seq_id, record)
                 records.append(record)
             alignment = MultipleSeqAlignment(records, self.alphabet)
+            for feature, texts in gf.items():
+                if feature in self.pfam_gf_mapping:
+                    alignment.annotations[self.pfam_gf_mapping[feature]] = \
+                        "\n".join(texts)
+                else:
+                    alignment.annotations["GF:" + feature] = "\n".join(texts)
 
             # TODO - Introduce an annotated alignment class?
             # For now, store the annotation a new private property:
@@ -55,6 +55,25 @@ different multiple sequence alignments as possible.  One common example
 is the output of the tool seqboot in the PHLYIP suite.  Sometimes there
 can be a file header and footer, as seen in the EMBOSS alignment output.
 
+Input - Dictionaries
+--------------------
+For large files of many alignments, such as the Pfam-A.full Stockholm file,
+the function Bio.AlignIO.index(...) gives a read only dictionary like object
+mapping the accessions of the alignments to their file offsets, so that
+single alignments can be loaded (parsed) on demand:
+
+>>> from Bio import AlignIO
+>>> families = AlignIO.index("Stockholm/families.sth", "stockholm")
+>>> print(sorted(families))
+['PF00571.24', 'PF01783.17', 'no_accession']
+>>> print(families["PF01783.17"].annotations["description"])
+Ribosomal L32p protein family
+>>> families.close()
+
+The function Bio.AlignIO.index_db(...) is similar, but keeps the keys and
+offsets in an SQLite database file, which can be reloaded later without
+scanning the alignment file again.
+
 Output
 ------
 Use the function Bio.AlignIO.write(...), which takes a complete set of
@@ -442,6 +461,131 @@ def read(handle, format, seq_count=None, alphabet=None):
     return first
 
 
+def index(filename, format, alphabet=None, key_function=None, **kwargs):
+    """Indexes an alignment file and returns a dictionary like object.
+
+    Arguments:
+     - filename - string giving name of file to be indexed, which may be
+       compressed using BGZF (e.g. with the bgzip tool, but not gzip).
+     - format   - lower case string describing the file format, currently
+       only "stockholm" is supported.
+     - alphabet - optional Alphabet object, useful when the sequence type
+       cannot be automatically inferred from the file itself.
+     - key_function - Optional callback function which when given an
+       alignment accession should return a unique key for the dictionary.
+     - kwargs   - Format specific keyword arguments for the parser, e.g.
+       letter_annotations=False to ignore the #=GR lines of Stockholm files.
+
+    This indexing function will return a dictionary like object, giving the
+    MultipleSeqAlignment objects as values. For Stockholm files the keys are
+    taken from the "#=GF AC" lines (e.g. the Pfam accession with version,
+    such as PF00571.24), or if missing the "#=GF ID" lines. As with the
+    Bio.SeqIO.index function, a key_function can be used to change these,
+    for example to drop the Pfam version numbers:
+
+    >>> from Bio import AlignIO
+    >>> families = AlignIO.index("Stockholm/families.sth", "stockholm",
+    ...                          key_function=lambda acc: acc.split(".")[0])
+    >>> len(families)
+    3
+    >>> alignment = families["PF00571"]
+    >>> print(alignment.annotations["identifier"])
+    CBS
+    >>> print(alignment.get_alignment_length())
+    43
+    >>> families.close()
+
+    Only the keys and offsets are held in memory, and each alignment is
+    parsed when accessed. The raw text of an alignment can also be had with
+    the get_raw method.
+
+    See also: Bio.AlignIO.index_db()
+    """
+    # Try and give helpful error messages:
+    if not isinstance(filename, basestring):
+        raise TypeError("Need a filename (not a handle)")
+    if not isinstance(format, basestring):
+        raise TypeError("Need a string for the file format (lower case)")
+    if format != format.lower():
+        raise ValueError("Format string '%s' should be lower case" % format)
+
+    from ._index import _FormatToRandomAccess  # Lazy import
+    from Bio.File import _IndexedSeqFileDict
+    try:
+        proxy_class = _FormatToRandomAccess[format]
+    except KeyError:
+        raise ValueError("Unsupported format %r" % format)
+    repr = "AlignIO.index(%r, %r, alphabet=%r, key_function=%r)" \
+        % (filename, format, alphabet, key_function)
+    return _IndexedSeqFileDict(proxy_class(filename, format, alphabet,
+                                           **kwargs),
+                               key_function, repr, "MultipleSeqAlignment")
+
+
+def index_db(index_filename, filenames=None, format=None, alphabet=None,
+             key_function=None, **kwargs):
+    """Index several alignment files and return a dictionary like object.
+
+    The index is stored in an SQLite database rather than in memory (as in
+    the Bio.AlignIO.index(...) function).
+
+    Arguments:
+     - index_filename - Where to store the SQLite index
+     - filenames - list of strings specifying file(s) to be indexed, or when
+       indexing a single file this can be given as a string.
+       (optional if reloading an existing index, but must match)
+     - format   - lower case string describing the file format
+       (optional if reloading an existing index, but must match)
+     - alphabet - optional Alphabet object, useful when the sequence type
+       cannot be automatically inferred from the file itself.
+     - key_function - Optional callback function which when given an
+       alignment accession should return a unique key for the dictionary.
+     - kwargs   - Format specific keyword arguments for the parser.
+
+    This is intended for files too big to scan each time, such as Pfam-A.full
+    (compressed with bgzip if you like). Indexing it takes a while, but once
+    the index file exists it is simply reloaded::
+
+        from Bio import AlignIO
+        families = AlignIO.index_db("Pfam-A.full.idx", "Pfam-A.full.bgz",
+                                    "stockholm", letter_annotations=False)
+        alignment = families["PF00571.24"]
+
+    See also: Bio.AlignIO.index()
+    """
+    # Try and give helpful error messages:
+    if not isinstance(index_filename, basestring):
+        raise TypeError("Need a string for the index filename")
+    if isinstance(filenames, basestring):
+        # Make the API a little more friendly, and more similar
+        # to Bio.AlignIO.index(...) for indexing just one file.
+        filenames = [filenames]
+    if filenames is not None and not isinstance(filenames, list):
+        raise TypeError(
+            "Need a list of filenames (as strings), or one filename")
+    if format is not None and not isinstance(format, basestring):
+        raise TypeError("Need a string for the file format (lower case)")
+    if format and format != format.lower():
+        raise ValueError("Format string '%s' should be lower case" % format)
+
+    from ._index import _FormatToRandomAccess  # Lazy import
+    from Bio.File import _SQLiteManySeqFilesDict
+    repr = "AlignIO.index_db(%r, filenames=%r, format=%r, alphabet=%r, key_function=%r)" \
+        % (index_filename, filenames, format, alphabet, key_function)
+
+    def proxy_factory(format, filename=None):
+        """Given a filename returns proxy object, else boolean if format OK."""
+        if filename:
+            return _FormatToRandomAccess[format](filename, format, alphabet,
+                                                 **kwargs)
+        else:
+            return format in _FormatToRandomAccess
+
+    return _SQLiteManySeqFilesDict(index_filename, filenames,
+                                   proxy_factory, format,
+                                   key_function, repr)
+
+
 def convert(in_file, in_format, out_file, out_format, alphabet=None):
     """Convert between two alignment files, returns number of alignments.
 
@@ -0,0 +1,105 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+"""Dictionary like indexing of alignment files (PRIVATE).
+
+You are not expected to access this module, or any of its code, directly.
+This is all handled internally by the Bio.AlignIO.index(...) and index_db(...)
+functions which are the public interface for this functionality.
+
+As in Bio.SeqIO, we scan over the file looking for the start of each
+alignment, and record its key (here the Pfam accession of a Stockholm
+alignment, from the "#=GF AC" line) against the file offset. Each alignment
+is only parsed when it is accessed.
+"""
+
+from __future__ import print_function
+
+from Bio._py3k import StringIO
+from Bio._py3k import _bytes_to_string
+
+from Bio.File import _IndexedSeqFileProxy, _open_for_random_access
+
+from .StockholmIO import StockholmIterator
+
+
+class StockholmRandomAccess(_IndexedSeqFileProxy):
+    """Random access to the alignments of a Stockholm file (e.g. from Pfam).
+
+    The alignments are keyed on the first "#=GF AC" line (e.g. PF00571.24),
+    or if there is none the first "#=GF ID" line.
+    """
+
+    _marker = b"# STOCKHOLM 1.0"
+
+    def __init__(self, filename, format, alphabet, **kwargs):
+        self._handle = _open_for_random_access(filename)
+        if alphabet is not None:
+            kwargs["alphabet"] = alphabet
+        self._kwargs = kwargs
+
+    def __iter__(self):
+        """Returns (accession, offset, length) tuples."""
+        marker = self._marker
+        handle = self._handle
+        handle.seek(0)
+        # Skip any header before first alignment
+        while True:
+            start_offset = handle.tell()
+            line = handle.readline()
+            if line.startswith(marker) or not line:
+                break
+        while line:
+            accession = identifier = None
+            length = len(line)
+            while True:
+                end_offset = handle.tell()
+                line = handle.readline()
+                if line.startswith(marker) or not line:
+                    break
+                # Track this explicitly as can't do file offset difference on BGZF
+                length += len(line)
+                if line[:5] == b"#=GF " and accession is None:
+                    parts = line[5:].split(None, 1)
+                    if len(parts) != 2:
+                        continue
+                    if parts[0] == b"AC":
+                        accession = parts[1].strip()
+                    elif parts[0] == b"ID" and identifier is None:
+                        identifier = parts[1].strip()
+            key = accession or identifier
+            if not key:
+                raise ValueError("No #=GF AC or ID line in the alignment "
+                                 "starting at offset %i" % start_offset)
+            yield _bytes_to_string(key), start_offset, length
+            start_offset = end_offset
+
+    def get(self, offset):
+        """Returns the alignment starting at this offset."""
+        handle = StringIO(_bytes_to_string(self.get_raw(offset)))
+        return next(StockholmIterator(handle, **self._kwargs))
+
+    def get_raw(self, offset):
+        """Return the raw alignment from the file as a bytes string."""
+        marker = self._marker
+        handle = self._handle
+        handle.seek(offset)
+        lines = [handle.readline()]
+        while True:
+            line = handle.readline()
+            if line.startswith(marker) or not line:
+                # End of file, or start of next alignment
+                break
+            lines.append(line)
+        return b"".join(lines)
+
+    def get_id(self, alignment):
+        """Returns the accession (or identifier) of a parsed alignment."""
+        key = alignment.annotations.get("accession") or \
+            alignment.annotations.get("identifier")
+        # the parser joins repeated lines, the index uses the first one
+        return key.split("\n", 1)[0]
+
+
+_FormatToRandomAccess = {"stockholm": StockholmRandomAccess,
+                         }
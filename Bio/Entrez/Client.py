@@ -0,0 +1,487 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Entrez client with persistent connections, for downloading many records.
+
+The functions in Bio.Entrez open a new connection to the NCBI for each
+request, and wait a third of a second between requests. That is fine for
+the odd query, but when downloading hundreds of thousands of records most
+of the time is spent opening connections and waiting for the replies.
+
+The EntrezClient class offers the same E-utilities as methods, but keeps
+a pool of open (HTTP/1.1 keep-alive) connections, spaces out the requests
+using a token bucket shared by all the threads using the client (three
+requests per second, or ten with an NCBI API key), and retries requests
+which fail with a server or network error after a growing delay.
+
+Large downloads are done in batches over the Entrez history (WebEnv),
+using several connections at once so that the replies can overlap while
+still keeping to the request rate::
+
+    from Bio import Entrez
+    from Bio.Entrez.Client import EntrezClient
+    client = EntrezClient(email="A.N.Other@example.com")
+    handle = client.esearch(db="nucleotide", term="Cypripedioideae[Orgn]",
+                            usehistory="y")
+    record = Entrez.read(handle)
+    with open("orchids.gbk", "w") as output:
+        for handle in client.efetch_batches(db="nucleotide",
+                                            webenv=record["WebEnv"],
+                                            query_key=record["QueryKey"],
+                                            count=int(record["Count"]),
+                                            rettype="gb", retmode="text"):
+            output.write(handle.read())
+    client.close()
+
+Given a list of identifiers instead, these are first posted to the history
+with EPost (in chunks of up to 10000 identifiers).
+
+The client is thread safe. Use a single client for all the requests from
+your program, as each client keeps to the request rate on its own. With
+asyncio, call the (blocking) methods via loop.run_in_executor.
+"""
+
+from __future__ import print_function
+
+import socket
+import threading
+import time
+from collections import deque
+from io import BytesIO
+
+try:
+    from http.client import HTTPConnection, HTTPSConnection, HTTPException
+except ImportError:
+    # Python 2
+    from httplib import HTTPConnection, HTTPSConnection, HTTPException
+
+from Bio._py3k import basestring
+from Bio._py3k import urlparse as _urlparse
+from Bio._py3k import urlencode as _urlencode
+from Bio._py3k import HTTPError as _HTTPError
+from Bio._py3k import _binary_to_string_handle, _as_bytes
+
+from Bio import Entrez
+from Bio import WebCache
+
+
+try:
+    _clock = time.monotonic
+except AttributeError:
+    # Python 2
+    _clock = time.time
+
+# HTTP status codes worth trying again after a while
+_RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+class TokenBucket(object):
+    """Thread safe rate limiter.
+
+    Each call of the acquire method takes a token, waiting until one is
+    available. Tokens are added at the given rate (per second), up to the
+    capacity of the bucket. With the default capacity of one, successive
+    calls are spaced out by at least 1/rate seconds:
+
+    >>> bucket = TokenBucket(3)
+    >>> bucket.rate
+    3.0
+
+    The callers are served in the order they call acquire.
+    """
+
+    def __init__(self, rate, capacity=1, clock=_clock, sleep=time.sleep):
+        """Initialize the class.
+
+        Arguments:
+         - rate - Number of tokens added per second.
+         - capacity - Maximum number of tokens held (i.e. the largest burst
+           of calls without waiting), default one.
+         - clock - Function giving the time in seconds.
+         - sleep - Function to wait for a number of seconds.
+
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be positive, not %r" % rate)
+        if capacity < 1:
+            raise ValueError("Capacity must be at least one, not %r"
+                             % capacity)
+        self.rate = float(rate)
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token, waiting until one is available."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity,
+                               self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            # Reserve the token, the balance goes negative if we must wait
+            # (so later callers wait for their turn after this one)
+            self._tokens -= 1
+            wait = -self._tokens / self.rate
+        if wait > 0:
+            self._sleep(wait)
+
+
+class _ConnectionPool(object):
+    """Pool of open HTTP connections to a single server (PRIVATE)."""
+
+    def __init__(self, url, size, timeout):
+        parts = _urlparse(url)
+        if parts.scheme == "https":
+            self._connection_class = HTTPSConnection
+        elif parts.scheme == "http":
+            self._connection_class = HTTPConnection
+        else:
+            raise ValueError("Unsupported URL scheme %r" % parts.scheme)
+        self._host = parts.hostname
+        self._port = parts.port
+        self._size = size
+        self._timeout = timeout
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Return an open connection, and True if it was used before."""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self._connection_class(self._host, self._port,
+                                      timeout=self._timeout), False
+
+    def put(self, connection):
+        """Return a connection to the pool once the response was read."""
+        with self._lock:
+            if len(self._idle) < self._size:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+    def close(self):
+        """Close all the idle connections."""
+        with self._lock:
+            while self._idle:
+                self._idle.pop().close()
+
+
+class EntrezClient(object):
+    """Entrez client keeping persistent connections, see module docstring.
+
+    The methods efetch, epost, esearch, elink, einfo, esummary, egquery
+    and espell take the same arguments as the Bio.Entrez functions of the
+    same name, and like them return a handle to the results (which have
+    already been read from the connection). These can be parsed with
+    Bio.Entrez.read and Bio.Entrez.parse as usual.
+    """
+
+    def __init__(self, email=None, tool=None, api_key=None, rate=None,
+                 max_connections=3, retries=3, backoff=1.0, timeout=120,
+                 base_url="https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"):
+        """Initialize the class.
+
+        Arguments:
+         - email - Your email address, by default Bio.Entrez.email
+           (which the NCBI requires).
+         - tool - Name of your tool, by default Bio.Entrez.tool.
+         - api_key - Your NCBI API key, by default Bio.Entrez.api_key.
+         - rate - Maximum number of requests per second, by default three,
+           or ten if you have an API key (the NCBI limits).
+         - max_connections - Number of open connections to keep, which is
+           also the number of requests sent at once by efetch_batches and
+           esummary_batches.
+         - retries - Number of times to retry a request after a server
+           error (HTTP status 429, 500, 502, 503 or 504) or network error.
+         - backoff - Seconds to wait before the first retry, doubled for
+           each further retry.
+         - timeout - Network timeout in seconds.
+         - base_url - URL of the E-utilities (e.g. of a local test server).
+
+        """
+        self.email = email
+        self.tool = tool
+        self.api_key = api_key
+        if rate is None:
+            rate = 10 if (api_key or Entrez.api_key) else 3
+        self.max_connections = max_connections
+        self.retries = retries
+        self.backoff = backoff
+        if not base_url.endswith("/"):
+            base_url += "/"
+        self.base_url = base_url
+        self._path = _urlparse(base_url).path
+        self._bucket = TokenBucket(rate)
+        self._pool = _ConnectionPool(base_url, max_connections, timeout)
+
+    def __repr__(self):
+        """Return a string representation of the client."""
+        return "%s(base_url=%r, rate=%r)" % (self.__class__.__name__,
+                                             self.base_url, self._bucket.rate)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the open connections."""
+        self._pool.close()
+
+    def _params(self, params):
+        """Add the tool, email and API key to the parameters (PRIVATE)."""
+        params = dict((key, value) for key, value in params.items()
+                      if value is not None)
+        for key, value in [("tool", self.tool or Entrez.tool),
+                           ("email", self.email or Entrez.email),
+                           ("api_key", self.api_key or Entrez.api_key)]:
+            if key not in params and value is not None:
+                params[key] = value
+        if "email" not in params:
+            # this gives the usual warning
+            params = Entrez._construct_params(params)
+        return params
+
+    def _request(self, cgi, params, post=None):
+        """Send a request, returns the body of the response (PRIVATE).
+
+        Raises an HTTPError exception for unsuccessful responses, once any
+        retries have been used up. Responses are taken from (and stored in)
+        the Bio.WebCache response cache, if one is set.
+        """
+        options = _urlencode(self._params(params), doseq=True)
+        # By default, post is None. Set to a boolean to over-ride length choice:
+        if post is None:
+            post = len(options) > 1000
+        url = self.base_url + cgi
+        if post:
+            path = self._path + cgi
+            body = _as_bytes(options)
+        else:
+            path = self._path + cgi + "?" + options
+            url += "?" + options
+            body = None
+        cache = WebCache.get_cache()
+        if not Entrez._use_cache(cgi, params):
+            cache = None
+        if cache is not None:
+            data = cache.get(url, body)
+            if data is not None:
+                return url, data
+        attempt = 0
+        while True:
+            self._bucket.acquire()
+            connection, reused = self._pool.get()
+            try:
+                if post:
+                    connection.request("POST", path, body,
+                                       {"Content-Type":
+                                        "application/x-www-form-urlencoded"})
+                else:
+                    connection.request("GET", path)
+                response = connection.getresponse()
+                data = response.read()
+            except (socket.error, HTTPException) as err:
+                connection.close()
+                if reused:
+                    # The server probably closed the idle connection,
+                    # try again at once with a new one
+                    continue
+                error = err
+            else:
+                if response.will_close:
+                    connection.close()
+                else:
+                    self._pool.put(connection)
+                if response.status == 200:
+                    if cache is not None:
+                        cache.put(url, data, body)
+                    return url, data
+                error = _HTTPError(url, response.status, response.reason,
+                                   response.msg, BytesIO(data))
+                if response.status not in _RETRY_STATUS:
+                    raise error
+            if attempt >= self.retries:
+                raise error
+            time.sleep(self.backoff * 2 ** attempt)
+            attempt += 1
+
+    def _open(self, cgi, params, post=None):
+        """Send a request, returns a handle to the results (PRIVATE)."""
+        url, data = self._request(cgi, params, post)
+        handle = BytesIO(data)
+        handle.url = url
+        return _binary_to_string_handle(handle)
+
+    def epost(self, db, **keywds):
+        """Post a list of identifiers for future use, see Bio.Entrez.epost."""
+        variables = {"db": db}
+        variables.update(keywds)
+        return self._open("epost.fcgi", variables, post=True)
+
+    def efetch(self, db, **keywds):
+        """Fetch Entrez results, see Bio.Entrez.efetch.
+
+        This will automatically use an HTTP POST rather than HTTP GET if
+        there are over 200 identifiers as recommended by the NCBI.
+        """
+        variables = {"db": db}
+        variables.update(keywds)
+        post = False
+        ids = variables.get("id")
+        if isinstance(ids, (list, tuple)):
+            variables["id"] = ids = ",".join(str(i) for i in ids)
+        if isinstance(ids, basestring) and ids.count(",") >= 200:
+            post = True
+        return self._open("efetch.fcgi", variables, post=post)
+
+    def esearch(self, db, term, **keywds):
+        """Run an Entrez search, see Bio.Entrez.esearch."""
+        variables = {"db": db, "term": term}
+        variables.update(keywds)
+        return self._open("esearch.fcgi", variables)
+
+    def elink(self, **keywds):
+        """Check for linked external articles, see Bio.Entrez.elink."""
+        variables = {}
+        variables.update(keywds)
+        return self._open("elink.fcgi", variables)
+
+    def einfo(self, **keywds):
+        """Return a summary of the Entrez databases, see Bio.Entrez.einfo."""
+        variables = {}
+        variables.update(keywds)
+        return self._open("einfo.fcgi", variables)
+
+    def esummary(self, **keywds):
+        """Retrieve document summaries, see Bio.Entrez.esummary."""
+        variables = {}
+        variables.update(keywds)
+        return self._open("esummary.fcgi", variables)
+
+    def egquery(self, **keywds):
+        """Provide Entrez database counts, see Bio.Entrez.egquery."""
+        variables = {}
+        variables.update(keywds)
+        return self._open("egquery.fcgi", variables)
+
+    def espell(self, **keywds):
+        """Retrieve spelling suggestions, see Bio.Entrez.espell."""
+        variables = {}
+        variables.update(keywds)
+        return self._open("espell.fcgi", variables)
+
+    def efetch_batches(self, db, id=None, webenv=None, query_key=None,
+                       count=None, batch_size=500, post_size=10000,
+                       **keywds):
+        """Fetch many records in batches over the Entrez history.
+
+        Arguments:
+         - db - Entrez database.
+         - id - List of identifiers (or a comma separated string), which
+           are first posted to the history using EPost.
+         - webenv, query_key, count - Alternatively, the WebEnv and
+           QueryKey of an earlier search (e.g. esearch with usehistory="y")
+           and the number of records found.
+         - batch_size - Number of records fetched by each request.
+         - post_size - Number of identifiers posted by each EPost request.
+         - keywds - Further parameters for each EFetch request, such as
+           rettype and retmode.
+
+        Returns an iterator giving a handle to the results of each batch,
+        in order. Up to max_connections batches are fetched at once.
+
+        If a Bio.WebCache response cache is set, batches of identifiers are
+        fetched directly (by POST for long lists) rather than over the
+        history, so that running this again is answered from the cache.
+        """
+        return self._batches("efetch.fcgi", db, id, webenv, query_key, count,
+                             batch_size, post_size, keywds)
+
+    def esummary_batches(self, db, id=None, webenv=None, query_key=None,
+                         count=None, batch_size=500, post_size=10000,
+                         **keywds):
+        """Retrieve many document summaries in batches over the history.
+
+        This takes the same arguments as the efetch_batches method, and
+        returns an iterator giving a handle to the results of each batch.
+        """
+        return self._batches("esummary.fcgi", db, id, webenv, query_key,
+                             count, batch_size, post_size, keywds)
+
+    def _post_ids(self, db, ids, webenv, post_size):
+        """Post identifiers to the history (PRIVATE).
+
+        Returns the WebEnv and a list of (query key, count) tuples.
+        """
+        queries = []
+        for start in range(0, len(ids), post_size):
+            chunk = ids[start:start + post_size]
+            handle = self.epost(db, id=",".join(chunk), WebEnv=webenv)
+            record = Entrez.read(handle)
+            handle.close()
+            # reuse the same WebEnv for all the chunks
+            webenv = record["WebEnv"]
+            queries.append((record["QueryKey"], len(chunk)))
+        return webenv, queries
+
+    def _batches(self, cgi, db, ids, webenv, query_key, count,
+                 batch_size, post_size, keywds):
+        """Request the records of the history in batches (PRIVATE)."""
+        if batch_size < 1 or post_size < 1:
+            raise ValueError("Batch sizes must be positive")
+        tasks = deque()
+        if ids is not None:
+            if isinstance(ids, basestring):
+                ids = ids.split(",")
+            else:
+                ids = [str(i) for i in ids]
+            if WebCache.get_cache() is not None:
+                # Requests using the (short lived) history are not cached
+                for start in range(0, len(ids), batch_size):
+                    chunk = ids[start:start + batch_size]
+                    variables = {"db": db, "id": ",".join(chunk)}
+                    variables.update(keywds)
+                    tasks.append((variables, len(chunk) > 200))
+                queries = []
+            else:
+                webenv, queries = self._post_ids(db, ids, webenv, post_size)
+        elif webenv is None or query_key is None or count is None:
+            raise ValueError("Need a list of identifiers, or the WebEnv, "
+                             "query key and count of an earlier search")
+        else:
+            queries = [(query_key, count)]
+        for key, total in queries:
+            for start in range(0, total, batch_size):
+                variables = {"db": db, "WebEnv": webenv, "query_key": key,
+                             "retstart": start,
+                             "retmax": min(batch_size, total - start)}
+                variables.update(keywds)
+                tasks.append((variables, None))
+        if self.max_connections < 2:
+            while tasks:
+                yield self._open(cgi, *tasks.popleft())
+            return
+        from multiprocessing.pool import ThreadPool
+        pool = ThreadPool(self.max_connections)
+        try:
+            pending = deque()
+            while tasks or pending:
+                while tasks and len(pending) < 2 * self.max_connections:
+                    pending.append(pool.apply_async(self._open,
+                                                    (cgi,) + tasks.popleft()))
+                yield pending.popleft().get()
+        finally:
+            pool.terminate()
+            pool.join()
+
+
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+    run_doctest()
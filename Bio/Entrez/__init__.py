@@ -36,6 +36,9 @@ Variables:
 
     - email        Set the Entrez email parameter (default is not set).
     - tool         Set the Entrez tool parameter (default is ``biopython``).
+    - api_key      Personal API key from NCBI (default is not set). Without a
+      key at most 3 queries per second are allowed, with a valid
+      key up to 10 queries per second.
 
 Functions:
 
@@ -91,6 +94,10 @@ Functions:
 
     - _open        Internally used function.
 
+For downloading many records, see also the EntrezClient class in the
+Bio.Entrez.Client module, which keeps persistent connections to the NCBI
+and fetches records in batches over the Entrez history.
+
 """
 from __future__ import print_function
 
@@ -98,7 +105,7 @@ import time
 import warnings
 
 # Importing these functions with leading underscore as not intended for reuse
-from Bio._py3k import urlopen as _urlopen
+from Bio.WebCache import urlopen as _urlopen
 from Bio._py3k import urlencode as _urlencode
 from Bio._py3k import HTTPError as _HTTPError
 
@@ -107,6 +114,7 @@ from Bio._py3k import _binary_to_string_handle, _as_bytes
 
 email = None
 tool = "biopython"
+api_key = None
 
 
 # XXX retmode?
@@ -499,37 +507,58 @@ def _open(cgi, params=None, post=None, ecitmatch=False):
     be over 1000 characters long.
 
     This function also enforces the "up to three queries per second rule"
-    to avoid abusing the NCBI servers.
+    to avoid abusing the NCBI servers (or ten per second with an API key),
+    except for requests answered from the Bio.WebCache response cache.
     """
-    # NCBI requirement: At most three queries per second.
-    # Equivalently, at least a third of second between queries
-    delay = 0.333333334
-    current = time.time()
-    wait = _open.previous + delay - current
-    if wait > 0:
-        time.sleep(wait)
-        _open.previous = current + wait
-    else:
-        _open.previous = current
-
     params = _construct_params(params)
     options = _encode_options(ecitmatch, params)
 
     # By default, post is None. Set to a boolean to over-ride length choice:
     if post is None and len(options) > 1000:
         post = True
+    use_cache = _use_cache(cgi, params)
     cgi = _construct_cgi(cgi, post, options)
 
     try:
         if post:
-            handle = _urlopen(cgi, data=_as_bytes(options))
+            handle = _urlopen(cgi, data=_as_bytes(options), throttle=_wait,
+                              use_cache=use_cache)
         else:
-            handle = _urlopen(cgi)
+            handle = _urlopen(cgi, throttle=_wait, use_cache=use_cache)
     except _HTTPError as exception:
         raise exception
 
     return _binary_to_string_handle(handle)
-_open.previous = 0
+
+
+def _use_cache(cgi, params):
+    """Check if the response to a request may be cached (PRIVATE).
+
+    EPost and searches with usehistory create a new WebEnv on the NCBI
+    server, and requests using a WebEnv refer to one which will expire, so
+    these are always sent to the NCBI rather than using Bio.WebCache.
+    """
+    if cgi.endswith("epost.fcgi"):
+        return False
+    for key in params:
+        if key.lower() in ("webenv", "usehistory"):
+            return False
+    return True
+
+
+def _wait():
+    """Wait as needed before sending a query to the NCBI (PRIVATE)."""
+    # NCBI requirement: At most three queries per second if no API key is provided.
+    # Equivalently, at least a third of second between queries
+    delay = 0.1 if api_key else 0.333333334
+    current = time.time()
+    wait = _wait.previous + delay - current
+    if wait > 0:
+        time.sleep(wait)
+        _wait.previous = current + wait
+    else:
+        _wait.previous = current
+_wait.previous = 0
 
 
 def _construct_params(params):
@@ -544,6 +573,9 @@ def _construct_params(params):
     # specified explicitly in the parameters or by changing the default)
     if "tool" not in params:
         params["tool"] = tool
+    # Use the API key if we have one
+    if "api_key" not in params and api_key is not None:
+        params["api_key"] = api_key
     # Tell Entrez who we are
     if "email" not in params:
         if email is not None:
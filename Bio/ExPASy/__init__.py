@@ -18,7 +18,7 @@ Functions:
 """
 
 # Importing these functions with leading underscore as not intended for reuse
-from Bio._py3k import urlopen as _urlopen
+from Bio.WebCache import urlopen as _urlopen
 from Bio._py3k import urlencode as _urlencode
 
 
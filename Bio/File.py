@@ -94,8 +94,8 @@ def as_handle(handleish, mode='r', **kwargs):
 def _open_for_random_access(filename):
     """Open a file in binary mode, spot if it is BGZF format etc (PRIVATE).
 
-    This functionality is used by the Bio.SeqIO and Bio.SearchIO index
-    and index_db functions.
+    This functionality is used by the Bio.SeqIO, Bio.SearchIO and
+    Bio.AlignIO index and index_db functions.
     """
     handle = open(filename, "rb")
     from . import bgzf
@@ -199,8 +199,8 @@ class UndoHandle(object):
         self._handle.close()
 
 
-# The rest of this file defines code used in Bio.SeqIO and Bio.SearchIO
-# for indexing
+# The rest of this file defines code used in Bio.SeqIO, Bio.SearchIO
+# and Bio.AlignIO for indexing
 
 class _IndexedSeqFileProxy(object):
     """Base class for file format specific random access (PRIVATE).
@@ -209,7 +209,8 @@ class _IndexedSeqFileProxy(object):
     objects, and in Bio.SearchIO for indexing QueryResult objects.
 
     Subclasses for each file format should define '__iter__', 'get'
-    and optionally 'get_raw' methods.
+    and optionally 'get_raw' methods. Subclasses for objects without
+    an id attribute (e.g. alignments) should also define 'get_id'.
     """
 
     def __iter__(self):
@@ -236,12 +237,20 @@ class _IndexedSeqFileProxy(object):
         # Should be done by each sub-class (if possible)
         raise NotImplementedError("Not available for this file format.")
 
+    def get_id(self, record):
+        """Returns the identifier of a parsed object, as given by __iter__.
+
+        This is used to check the object matches the requested key.
+        """
+        return record.id
+
 
 class _IndexedSeqFileDict(_dict_base):
     """Read only dictionary interface to a sequential record file.
 
-    This code is used in both Bio.SeqIO for indexing as SeqRecord
-    objects, and in Bio.SearchIO for indexing QueryResult objects.
+    This code is used in Bio.SeqIO for indexing as SeqRecord objects,
+    in Bio.SearchIO for indexing QueryResult objects, and in Bio.AlignIO
+    for indexing MultipleSeqAlignment objects.
 
     Keeps the keys and associated file offsets in memory, reads the file
     to access entries as objects parsing them on demand. This approach
@@ -359,9 +368,9 @@ class _IndexedSeqFileDict(_dict_base):
         # Pass the offset to the proxy
         record = self._proxy.get(self._offsets[key])
         if self._key_function:
-            key2 = self._key_function(record.id)
+            key2 = self._key_function(self._proxy.get_id(record))
         else:
-            key2 = record.id
+            key2 = self._proxy.get_id(record)
         if key != key2:
             raise ValueError("Key did not match (%s vs %s)" % (key, key2))
         return record
@@ -689,7 +698,8 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         file_number, offset = row
         proxies = self._proxies
         if file_number in proxies:
-            record = proxies[file_number].get(offset)
+            proxy = proxies[file_number]
+            record = proxy.get(offset)
         else:
             if len(proxies) >= self._max_open:
                 # Close an old handle...
@@ -699,9 +709,9 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
             record = proxy.get(offset)
             proxies[file_number] = proxy
         if self._key_function:
-            key2 = self._key_function(record.id)
+            key2 = self._key_function(proxy.get_id(record))
         else:
-            key2 = record.id
+            key2 = proxy.get_id(record)
         if key != key2:
             raise ValueError("Key did not match (%s vs %s)" % (key, key2))
         return record
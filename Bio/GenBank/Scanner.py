@@ -135,7 +135,7 @@ class InsdcScanner(object):
         self.line = line
         return header_lines
 
-    def parse_features(self, skip=False):
+    def parse_features(self, skip=False, feature_types=None, lazy=False):
         """Return list of tuples for the features (if present)
 
         Each feature is returned as a tuple (key, location, qualifiers)
@@ -143,6 +143,11 @@ class InsdcScanner(object):
         "complement(join(490883..490885,1..879))") while qualifiers
         is a list of two string tuples (feature qualifier keys and values).
 
+        If feature_types is given (e.g. a set of feature keys like "CDS"
+        and "gene"), any other features are skipped without parsing them.
+        If lazy is true, each feature is instead returned as a tuple of its
+        key and lines, to be given to the parse_feature method later.
+
         Assumes you have already read to the start of the features table.
         """
         if self.line.rstrip() not in self.FEATURE_START_MARKERS:
@@ -200,13 +205,21 @@ class InsdcScanner(object):
                     feature_key = line[2:self.FEATURE_QUALIFIER_INDENT].strip()
                     feature_lines = [line[self.FEATURE_QUALIFIER_INDENT:]]
                 line = self.handle.readline()
+                if feature_types is not None and feature_key not in feature_types:
+                    # Skip this feature, as above
+                    while line[:self.FEATURE_QUALIFIER_INDENT] == self.FEATURE_QUALIFIER_SPACER:
+                        line = self.handle.readline()
+                    continue
                 while line[:self.FEATURE_QUALIFIER_INDENT] == self.FEATURE_QUALIFIER_SPACER \
                         or (line != '' and line.rstrip() == ""):  # cope with blank lines in the midst of a feature
                     # Use strip to remove any harmless trailing white space AND and leading
                     # white space (e.g. out of spec files with too much indentation)
                     feature_lines.append(line[self.FEATURE_QUALIFIER_INDENT:].strip())
                     line = self.handle.readline()
-                features.append(self.parse_feature(feature_key, feature_lines))
+                if lazy:
+                    features.append((feature_key, feature_lines))
+                else:
+                    features.append(self.parse_feature(feature_key, feature_lines))
         self.line = line
         return features
 
@@ -398,7 +411,8 @@ class InsdcScanner(object):
         """
         pass
 
-    def feed(self, handle, consumer, do_features=True):
+    def feed(self, handle, consumer, do_features=True, feature_types=None,
+             lazy_features=False):
         """Feed a set of data into the consumer.
 
         This method is intended for use with the "old" code in Bio.GenBank
@@ -409,6 +423,11 @@ class InsdcScanner(object):
             - consumer - The consumer that should be informed of events.
             - do_features - Boolean, should the features be parsed?
                           Skipping the features can be much faster.
+            - feature_types - Optional collection of feature keys (e.g.
+                          "CDS" and "gene"), other features are skipped.
+            - lazy_features - Boolean, should the features only be parsed
+                          when first used? The consumer's lazy_feature_table
+                          method is given the scanner and the raw features.
 
         Return values:
 
@@ -432,10 +451,15 @@ class InsdcScanner(object):
         self._feed_header_lines(consumer, self.parse_header())
 
         # Features (common to both EMBL and GenBank):
-        if do_features:
-            self._feed_feature_table(consumer, self.parse_features(skip=False))
-        else:
+        if not do_features:
             self.parse_features(skip=True)  # ignore the data
+        elif lazy_features:
+            consumer.start_feature_table()
+            raw_features = self.parse_features(feature_types=feature_types,
+                                               lazy=True)
+        else:
+            self._feed_feature_table(consumer, self.parse_features(
+                feature_types=feature_types))
 
         # Footer and sequence
         misc_lines, sequence_string = self.parse_footer()
@@ -444,40 +468,55 @@ class InsdcScanner(object):
         consumer.sequence(sequence_string)
         # Calls to consumer.base_number() do nothing anyway
         consumer.record_end("//")
+        if do_features and lazy_features:
+            consumer.lazy_feature_table(self, raw_features)
 
         assert self.line == "//"
 
         # And we are done
         return True
 
-    def parse(self, handle, do_features=True):
+    def parse(self, handle, do_features=True, feature_types=None,
+              lazy_features=False):
         """Returns a SeqRecord (with SeqFeatures if do_features=True)
 
-        See also the method parse_records() for use on multi-record files.
+        The feature_types and lazy_features arguments are as for the
+        parse_records() method, which you should use on multi-record files.
         """
         from Bio.GenBank import _FeatureConsumer
         from Bio.GenBank.utils import FeatureValueCleaner
 
         consumer = _FeatureConsumer(use_fuzziness=1,
-                                    feature_cleaner=FeatureValueCleaner())
+                                    feature_cleaner=FeatureValueCleaner(),
+                                    lazy_features=lazy_features)
 
-        if self.feed(handle, consumer, do_features):
+        if self.feed(handle, consumer, do_features, feature_types,
+                     lazy_features):
             return consumer.data
         else:
             return None
 
-    def parse_records(self, handle, do_features=True):
+    def parse_records(self, handle, do_features=True, feature_types=None,
+                      lazy_features=False):
         """Returns a SeqRecord object iterator
 
         Each record (from the ID/LOCUS line to the // line) becomes a SeqRecord
 
-        The SeqRecord objects include SeqFeatures if do_features=True
+        The SeqRecord objects include SeqFeatures if do_features=True,
+        optionally only those with the given feature_types (e.g. "CDS" and
+        "gene"), which is faster as the other features are not parsed.
+
+        If lazy_features=True, the feature table lines are kept and only
+        parsed when the record's features are first used, so are never
+        parsed if only the sequence and annotations are needed. Note
+        any problems with the features are then only found at that point.
 
         This method is intended for use in Bio.SeqIO
         """
         # This is a generator function
         while True:
-            record = self.parse(handle, do_features)
+            record = self.parse(handle, do_features, feature_types,
+                                lazy_features)
             if record is None:
                 break
             if record.id is None:
@@ -505,7 +544,7 @@ class InsdcScanner(object):
         while self.find_start():
             # Got an EMBL or GenBank record...
             self.parse_header()  # ignore header lines!
-            feature_tuples = self.parse_features()
+            feature_tuples = self.parse_features(feature_types=("CDS",))
             # self.parse_footer() # ignore footer lines!
             while True:
                 line = self.handle.readline()
@@ -921,6 +960,10 @@ class EmblScanner(InsdcScanner):
             raise ValueError("Problem in misc lines before sequence")
 
 
+# Used to fix IMGT locations like 123> (which should be >123)
+_bad_imgt_position_re = re.compile(r'([0-9]+)>')
+
+
 class _ImgtScanner(EmblScanner):
     """For extracting chunks of information in IMGT (EMBL like) files (PRIVATE).
 
@@ -989,7 +1032,7 @@ class _ImgtScanner(EmblScanner):
         consumer.data_file_division(fields[4])
         self._feed_seq_length(consumer, fields[5])
 
-    def parse_features(self, skip=False):
+    def parse_features(self, skip=False, feature_types=None, lazy=False):
         """Return list of tuples for the features (if present)
 
         Each feature is returned as a tuple (key, location, qualifiers)
@@ -997,6 +1040,9 @@ class _ImgtScanner(EmblScanner):
         "complement(join(490883..490885,1..879))") while qualifiers
         is a list of two string tuples (feature qualifier keys and values).
 
+        The feature_types and lazy arguments are as for the EMBL and
+        GenBank scanners.
+
         Assumes you have already read to the start of the features table.
         """
         if self.line.rstrip() not in self.FEATURE_START_MARKERS:
@@ -1007,8 +1053,6 @@ class _ImgtScanner(EmblScanner):
         while self.line.rstrip() in self.FEATURE_START_MARKERS:
             self.line = self.handle.readline()
 
-        bad_position_re = re.compile(r'([0-9]+)>')
-
         features = []
         line = self.line
         while True:
@@ -1048,6 +1092,11 @@ class _ImgtScanner(EmblScanner):
                     location_start = line[25:].strip()
                 feature_lines = [location_start]
                 line = self.handle.readline()
+                if feature_types is not None and feature_key not in feature_types:
+                    # Skip this feature, as above
+                    while line[:self.FEATURE_QUALIFIER_INDENT] == self.FEATURE_QUALIFIER_SPACER:
+                        line = self.handle.readline()
+                    continue
                 while line[:self.FEATURE_QUALIFIER_INDENT] == self.FEATURE_QUALIFIER_SPACER \
                         or line.rstrip() == "":  # cope with blank lines in the midst of a feature
                     # Use strip to remove any harmless trailing white space AND and leading
@@ -1055,21 +1104,28 @@ class _ImgtScanner(EmblScanner):
                     assert line[:2] == "FT"
                     feature_lines.append(line[self.FEATURE_QUALIFIER_INDENT:].strip())
                     line = self.handle.readline()
-                feature_key, location, qualifiers = \
-                    self.parse_feature(feature_key, feature_lines)
-                # Try to handle known problems with IMGT locations here:
-                if ">" in location:
-                    # Nasty hack for common IMGT bug, should be >123 not 123>
-                    # in a location string. At least here the meaning is clear,
-                    # and since it is so common I don't want to issue a warning
-                    # warnings.warn("Feature location %s is invalid, "
-                    #              "moving greater than sign before position"
-                    #              % location, BiopythonParserWarning)
-                    location = bad_position_re.sub(r'>\1', location)
-                features.append((feature_key, location, qualifiers))
+                if lazy:
+                    features.append((feature_key, feature_lines))
+                else:
+                    features.append(self.parse_feature(feature_key, feature_lines))
         self.line = line
         return features
 
+    def parse_feature(self, feature_key, lines):
+        """Parse a feature (see InsdcScanner), fixing common IMGT location problems."""
+        feature_key, location, qualifiers = \
+            EmblScanner.parse_feature(self, feature_key, lines)
+        # Try to handle known problems with IMGT locations here:
+        if ">" in location:
+            # Nasty hack for common IMGT bug, should be >123 not 123>
+            # in a location string. At least here the meaning is clear,
+            # and since it is so common I don't want to issue a warning
+            # warnings.warn("Feature location %s is invalid, "
+            #              "moving greater than sign before position"
+            #              % location, BiopythonParserWarning)
+            location = _bad_imgt_position_re.sub(r'>\1', location)
+        return feature_key, location, qualifiers
+
 
 class GenBankScanner(InsdcScanner):
     """For extracting chunks of information in GenBank files"""
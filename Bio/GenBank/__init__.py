@@ -48,6 +48,7 @@ import sys  # for checking if Python 2
 
 # other Biopython stuff
 from Bio import SeqFeature
+from Bio.SeqRecord import SeqRecord
 
 # other Bio.GenBank stuff
 from .utils import FeatureValueCleaner
@@ -627,6 +628,40 @@ class _BaseGenBankConsumer(object):
         return new_start, new_end
 
 
+class _LazyFeatureRecord(SeqRecord):
+    """SeqRecord which parses its feature table when first used (PRIVATE).
+
+    Like the BioSQL DBSeqRecord, the features are a property which loads
+    them on demand (here from the raw feature table lines kept by the
+    _FeatureConsumer's lazy_feature_table method).
+    """
+
+    def __get_features(self):
+        if not hasattr(self, "_features"):
+            self._features = _parse_lazy_features(*self._feature_table)
+            del self._feature_table
+        return self._features
+
+    def __set_features(self, features):
+        self._features = features
+        self.__dict__.pop("_feature_table", None)
+
+    features = property(__get_features, __set_features,
+                        doc="Features (list of SeqFeature objects)")
+
+
+def _parse_lazy_features(scanner, use_fuzziness, feature_cleaner,
+                         seq_type, expected_size, raw_features):
+    """Parse a feature table kept for a _LazyFeatureRecord (PRIVATE)."""
+    consumer = _FeatureConsumer(use_fuzziness, feature_cleaner)
+    consumer._seq_type = seq_type
+    consumer._expected_size = expected_size
+    scanner._feed_feature_table(consumer,
+                                [scanner.parse_feature(key, lines)
+                                 for key, lines in raw_features])
+    return consumer.data.features
+
+
 class _FeatureConsumer(_BaseGenBankConsumer):
     """Create a SeqRecord object with Features to return (PRIVATE).
 
@@ -636,11 +671,16 @@ class _FeatureConsumer(_BaseGenBankConsumer):
        feature locations.
      - feature_cleaner - a class that will be used to provide specialized
        cleaning-up of feature values.
+     - lazy_features - if true, the SeqRecord only parses its features
+       when they are first used (see the lazy_feature_table method).
     """
-    def __init__(self, use_fuzziness, feature_cleaner=None):
-        from Bio.SeqRecord import SeqRecord
+    def __init__(self, use_fuzziness, feature_cleaner=None,
+                 lazy_features=False):
         _BaseGenBankConsumer.__init__(self)
-        self.data = SeqRecord(None, id=None)
+        if lazy_features:
+            self.data = _LazyFeatureRecord(None, id=None)
+        else:
+            self.data = SeqRecord(None, id=None)
         self.data.id = None
         self.data.description = ""
 
@@ -1008,6 +1048,22 @@ class _FeatureConsumer(_BaseGenBankConsumer):
         self._cur_feature.type = content
         self.data.features.append(self._cur_feature)
 
+    def lazy_feature_table(self, scanner, raw_features):
+        """Keep the feature table to parse when the features are first used.
+
+        Takes the scanner and its list of raw features (tuples of the
+        feature key and lines). These are only kept if the SeqRecord was
+        created with lazy_features=True, otherwise they are parsed now.
+        """
+        table = (scanner.__class__(scanner.debug), self._use_fuzziness,
+                 self._feature_cleaner, self._seq_type, self._expected_size,
+                 raw_features)
+        if isinstance(self.data, _LazyFeatureRecord):
+            del self.data._features
+            self.data._feature_table = table
+        else:
+            self.data.features.extend(_parse_lazy_features(*table))
+
     def location(self, content):
         """Parse out location information from the location string.
 
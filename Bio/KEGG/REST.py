@@ -27,7 +27,7 @@ Kanehisa, M. and Goto, S.; KEGG: Kyoto Encyclopedia of Genes and Genomes.
 Nucleic Acids Res. 28, 29-34 (2000).
 """
 
-from Bio._py3k import urlopen as _urlopen
+from Bio.WebCache import urlopen as _urlopen
 from Bio._py3k import _binary_to_string_handle
 
 
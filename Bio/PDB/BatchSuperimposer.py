@@ -0,0 +1,463 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Superimpose many coordinate sets at once using vectorized QCP.
+
+The QCPSuperimposer and Superimposer classes handle one pair of coordinate
+sets per call. This module implements the same Quaternion Characteristic
+Polynomial (QCP) algorithm on stacks of coordinate arrays with NumPy, so
+that thousands of models can be compared in one call:
+
+ - BatchQCPSuperimposer superimposes a stack of models (an MxNx3 array)
+   onto one reference (an Nx3 array), all-vs-one.
+ - rmsd_matrix calculates the all-vs-all RMSD of a stack of models as a
+   condensed distance matrix, optionally written to a memory mapped file
+   and calculated in chunks with a pool of worker processes.
+
+Reference:
+
+Douglas L Theobald (2005), "Rapid calculation of RMSDs using a
+quaternion-based characteristic polynomial.", Acta Crystallogr
+A 61(4):478-480
+"""
+
+from __future__ import print_function
+
+import numpy
+
+
+def _center(coords):
+    """Return centered coordinates and centroids of an MxNx3 stack (PRIVATE)."""
+    centroids = coords.mean(axis=-2)
+    centered = coords - centroids[..., numpy.newaxis, :]
+    return centered, centroids
+
+
+def _inner_products(coords1, coords2):
+    """Return all 3x3 inner product matrices of two stacks (PRIVATE).
+
+    For an AxNx3 and a BxNx3 stack, returns an AxBx3x3 array holding
+    dot(coords1[a].T, coords2[b]) for every pair, using one matrix
+    product.
+    """
+    a, n = coords1.shape[:2]
+    b = coords2.shape[0]
+    left = coords1.transpose(0, 2, 1).reshape(a * 3, n)
+    right = coords2.transpose(1, 0, 2).reshape(n, b * 3)
+    return numpy.dot(left, right).reshape(a, 3, b, 3).transpose(0, 2, 1, 3)
+
+
+def _qcp(A, E0, n, rotation=True):
+    """Vectorized QCP RMSD and rotation calculation (PRIVATE).
+
+    This follows FastCalcRMSDAndRotation in qcprotmodule.c, applied to
+    arrays of inner product matrices.
+
+    Arguments:
+     - A - array of 3x3 inner product matrices, shape (..., 3, 3)
+     - E0 - array of (G1 + G2) / 2 values, shape (...)
+     - n - number of points in each coordinate set
+     - rotation - if True, also calculate the rotation matrices
+
+    Returns the array of RMSD values, and the array of (right multiplying)
+    rotation matrices or None.
+    """
+    evecprec = 1e-6
+    evalprec = 1e-11
+
+    Sxx = A[..., 0, 0]
+    Sxy = A[..., 0, 1]
+    Sxz = A[..., 0, 2]
+    Syx = A[..., 1, 0]
+    Syy = A[..., 1, 1]
+    Syz = A[..., 1, 2]
+    Szx = A[..., 2, 0]
+    Szy = A[..., 2, 1]
+    Szz = A[..., 2, 2]
+
+    Sxx2 = Sxx * Sxx
+    Syy2 = Syy * Syy
+    Szz2 = Szz * Szz
+    Sxy2 = Sxy * Sxy
+    Syz2 = Syz * Syz
+    Sxz2 = Sxz * Sxz
+    Syx2 = Syx * Syx
+    Szy2 = Szy * Szy
+    Szx2 = Szx * Szx
+
+    SyzSzymSyySzz2 = 2.0 * (Syz * Szy - Syy * Szz)
+    Sxx2Syy2Szz2Syz2Szy2 = Syy2 + Szz2 - Sxx2 + Syz2 + Szy2
+
+    C2 = -2.0 * (Sxx2 + Syy2 + Szz2 + Sxy2 + Syx2 + Sxz2 + Szx2 + Syz2 + Szy2)
+    C1 = 8.0 * (Sxx * Syz * Szy + Syy * Szx * Sxz + Szz * Sxy * Syx -
+                Sxx * Syy * Szz - Syz * Szx * Sxy - Szy * Syx * Sxz)
+
+    SxzpSzx = Sxz + Szx
+    SyzpSzy = Syz + Szy
+    SxypSyx = Sxy + Syx
+    SyzmSzy = Syz - Szy
+    SxzmSzx = Sxz - Szx
+    SxymSyx = Sxy - Syx
+    SxxpSyy = Sxx + Syy
+    SxxmSyy = Sxx - Syy
+    Sxy2Sxz2Syx2Szx2 = Sxy2 + Sxz2 - Syx2 - Szx2
+
+    C0 = (Sxy2Sxz2Syx2Szx2 * Sxy2Sxz2Syx2Szx2 +
+          (Sxx2Syy2Szz2Syz2Szy2 + SyzSzymSyySzz2) *
+          (Sxx2Syy2Szz2Syz2Szy2 - SyzSzymSyySzz2) +
+          (-SxzpSzx * SyzmSzy + SxymSyx * (SxxmSyy - Szz)) *
+          (-SxzmSzx * SyzpSzy + SxymSyx * (SxxmSyy + Szz)) +
+          (-SxzpSzx * SyzpSzy - SxypSyx * (SxxpSyy - Szz)) *
+          (-SxzmSzx * SyzmSzy - SxypSyx * (SxxpSyy + Szz)) +
+          (SxypSyx * SyzpSzy + SxzpSzx * (SxxmSyy + Szz)) *
+          (-SxymSyx * SyzmSzy + SxzpSzx * (SxxpSyy + Szz)) +
+          (SxypSyx * SyzmSzy + SxzmSzx * (SxxmSyy - Szz)) *
+          (-SxymSyx * SyzpSzy + SxzmSzx * (SxxpSyy - Szz)))
+
+    # Newton-Raphson for the largest eigenvalue, only updating the
+    # values that have not converged yet.
+    mxEigenV = numpy.array(E0, "d")
+    active = numpy.ones(mxEigenV.shape, bool)
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        for i in range(50):
+            oldg = mxEigenV
+            x2 = mxEigenV * mxEigenV
+            b = (x2 + C2) * mxEigenV
+            a = b + C1
+            delta = (a * mxEigenV + C0) / (2.0 * x2 * mxEigenV + b + a)
+            mxEigenV = numpy.where(active, mxEigenV - delta, mxEigenV)
+            active &= ~(numpy.abs(mxEigenV - oldg) <
+                        numpy.abs(evalprec * mxEigenV))
+            if not active.any():
+                break
+
+    # the abs is to guard against extremely small, but *negative*
+    # numbers due to floating point error
+    rmsd = numpy.sqrt(numpy.abs(2.0 * (E0 - mxEigenV) / n))
+    if not rotation:
+        return rmsd, None
+
+    a11 = SxxpSyy + Szz - mxEigenV
+    a12 = SyzmSzy
+    a13 = -SxzmSzx
+    a14 = SxymSyx
+    a21 = SyzmSzy
+    a22 = SxxmSyy - Szz - mxEigenV
+    a23 = SxypSyx
+    a24 = SxzpSzx
+    a31 = a13
+    a32 = a23
+    a33 = Syy - Sxx - Szz - mxEigenV
+    a34 = SyzpSzy
+    a41 = a14
+    a42 = a24
+    a43 = a34
+    a44 = Szz - SxxpSyy - mxEigenV
+    a3344_4334 = a33 * a44 - a43 * a34
+    a3244_4234 = a32 * a44 - a42 * a34
+    a3243_4233 = a32 * a43 - a42 * a33
+    a3143_4133 = a31 * a43 - a41 * a33
+    a3144_4134 = a31 * a44 - a41 * a34
+    a3142_4132 = a31 * a42 - a41 * a32
+    a1324_1423 = a13 * a24 - a14 * a23
+    a1224_1422 = a12 * a24 - a14 * a22
+    a1223_1322 = a12 * a23 - a13 * a22
+    a1124_1421 = a11 * a24 - a14 * a21
+    a1123_1321 = a11 * a23 - a13 * a21
+    a1122_1221 = a11 * a22 - a12 * a21
+
+    # Candidate eigenvectors from the adjoint matrix, in the order the
+    # C code tries them; the first one with a usable norm is taken.
+    candidates = [
+        (a22 * a3344_4334 - a23 * a3244_4234 + a24 * a3243_4233,
+         -a21 * a3344_4334 + a23 * a3144_4134 - a24 * a3143_4133,
+         a21 * a3244_4234 - a22 * a3144_4134 + a24 * a3142_4132,
+         -a21 * a3243_4233 + a22 * a3143_4133 - a23 * a3142_4132),
+        (a12 * a3344_4334 - a13 * a3244_4234 + a14 * a3243_4233,
+         -a11 * a3344_4334 + a13 * a3144_4134 - a14 * a3143_4133,
+         a11 * a3244_4234 - a12 * a3144_4134 + a14 * a3142_4132,
+         -a11 * a3243_4233 + a12 * a3143_4133 - a13 * a3142_4132),
+        (a42 * a1324_1423 - a43 * a1224_1422 + a44 * a1223_1322,
+         -a41 * a1324_1423 + a43 * a1124_1421 - a44 * a1123_1321,
+         a41 * a1224_1422 - a42 * a1124_1421 + a44 * a1122_1221,
+         -a41 * a1223_1322 + a42 * a1123_1321 - a43 * a1122_1221),
+        (a32 * a1324_1423 - a33 * a1224_1422 + a34 * a1223_1322,
+         -a31 * a1324_1423 + a33 * a1124_1421 - a34 * a1123_1321,
+         a31 * a1224_1422 - a32 * a1124_1421 + a34 * a1122_1221,
+         -a31 * a1223_1322 + a32 * a1123_1321 - a33 * a1122_1221),
+    ]
+    q = numpy.zeros(mxEigenV.shape + (4,), "d")
+    done = numpy.zeros(mxEigenV.shape, bool)
+    for candidate in candidates:
+        candidate = numpy.stack(candidate, axis=-1)
+        qsqr = (candidate * candidate).sum(axis=-1)
+        use = ~done & (qsqr >= evecprec)
+        q[use] = candidate[use] / numpy.sqrt(qsqr[use])[..., numpy.newaxis]
+        done |= use
+    # No usable eigenvector, the C code returns the identity matrix
+    q[~done] = (1.0, 0.0, 0.0, 0.0)
+
+    q1 = q[..., 0]
+    q2 = q[..., 1]
+    q3 = q[..., 2]
+    q4 = q[..., 3]
+    a2 = q1 * q1
+    x2 = q2 * q2
+    y2 = q3 * q3
+    z2 = q4 * q4
+    xy = q2 * q3
+    az = q1 * q4
+    zx = q4 * q2
+    ay = q1 * q3
+    yz = q3 * q4
+    ax = q1 * q2
+
+    # The matrix in the C code (which left multiplies the coordinates as
+    # column vectors) is, with A = dot(coords.T, reference), the right
+    # multiplying rotation matrix for row vectors, dot(coords, rot).
+    rot = numpy.empty(mxEigenV.shape + (3, 3), "d")
+    rot[..., 0, 0] = a2 + x2 - y2 - z2
+    rot[..., 0, 1] = 2 * (xy + az)
+    rot[..., 0, 2] = 2 * (zx - ay)
+    rot[..., 1, 0] = 2 * (xy - az)
+    rot[..., 1, 1] = a2 - x2 + y2 - z2
+    rot[..., 1, 2] = 2 * (yz + ax)
+    rot[..., 2, 0] = 2 * (zx + ay)
+    rot[..., 2, 1] = 2 * (yz - ax)
+    rot[..., 2, 2] = a2 - x2 - y2 + z2
+    return rmsd, rot
+
+
+def _check_stack(coords):
+    """Return coords as an MxNx3 float array, or raise ValueError (PRIVATE)."""
+    coords = numpy.asarray(coords, "d")
+    if coords.ndim != 3 or coords.shape[2] != 3:
+        raise ValueError("Expected an array of shape (models, atoms, 3), "
+                         "not %r" % (coords.shape,))
+    return coords
+
+
+class BatchQCPSuperimposer(object):
+    """Superimpose a stack of coordinate sets on one reference using QCP.
+
+    This is the all-vs-one counterpart of QCPSuperimposer, e.g.
+
+    >>> import numpy
+    >>> from Bio.PDB.BatchSuperimposer import BatchQCPSuperimposer
+    >>> x = numpy.array([[51.65, -1.90, 50.07],
+    ...                  [50.40, -1.23, 50.65],
+    ...                  [50.68, -0.04, 51.54],
+    ...                  [50.22, -0.02, 52.85]])
+    >>> sup = BatchQCPSuperimposer()
+    >>> sup.set(x, numpy.array([x, x + 1.0, x[::-1]]))
+    >>> sup.run()
+    >>> print(["%0.2f" % rms for rms in sup.get_rms()])
+    ['0.00', '0.00', '0.09']
+
+    The results are arrays with one entry per model in the stack.
+    """
+
+    def __init__(self):
+        self._clear()
+
+    # Private methods
+
+    def _clear(self):
+        self.reference_coords = None
+        self.coords = None
+        self.transformed_coords = None
+        self.rot = None
+        self.tran = None
+        self.rms = None
+        self.init_rms = None
+
+    # Public methods
+
+    def set(self, reference_coords, coords):
+        """Set the coordinates to be superimposed.
+
+        Each coordinate set in coords will be put on top of
+        reference_coords.
+
+        - reference_coords: an Nx3 array
+        - coords: an MxNx3 array (M coordinate sets)
+        """
+        self._clear()
+        reference_coords = numpy.asarray(reference_coords, "d")
+        coords = _check_stack(coords)
+        if reference_coords.shape != coords.shape[1:]:
+            raise ValueError("Coordinate number/dimension mismatch.")
+        self.reference_coords = reference_coords
+        self.coords = coords
+        self.n = coords.shape[1]
+
+    def run(self, rotation=True, chunk_size=4096):
+        """Superimpose the coordinate sets.
+
+        Arguments:
+         - rotation - if False, only the RMSD values are calculated,
+           which is faster.
+         - chunk_size - number of coordinate sets handled at once,
+           this limits the size of the temporary arrays.
+        """
+        if self.coords is None or self.reference_coords is None:
+            raise ValueError("No coordinates set.")
+        m = len(self.coords)
+        reference, av2 = _center(self.reference_coords)
+        G2 = (reference * reference).sum()
+        self.rms = numpy.empty(m, "d")
+        if rotation:
+            self.rot = numpy.empty((m, 3, 3), "d")
+            self.tran = numpy.empty((m, 3), "d")
+        for start in range(0, m, chunk_size):
+            end = min(start + chunk_size, m)
+            coords, av1 = _center(self.coords[start:end])
+            G1 = (coords * coords).sum(axis=(1, 2))
+            A = _inner_products(coords, reference[numpy.newaxis])[:, 0]
+            rms, rot = _qcp(A, (G1 + G2) / 2, self.n, rotation)
+            self.rms[start:end] = rms
+            if rotation:
+                self.rot[start:end] = rot
+                self.tran[start:end] = av2 - numpy.einsum("mi,mij->mj",
+                                                          av1, rot)
+
+    def get_transformed(self):
+        """Get the transformed coordinate sets (an MxNx3 array)."""
+        if self.coords is None or self.reference_coords is None:
+            raise ValueError("No coordinates set.")
+        if self.rot is None:
+            raise ValueError("No rotations calculated yet.")
+        if self.transformed_coords is None:
+            self.transformed_coords = numpy.einsum(
+                "mki,mij->mkj", self.coords, self.rot) + \
+                self.tran[:, numpy.newaxis, :]
+        return self.transformed_coords
+
+    def get_rotran(self):
+        """Right multiplying rotation matrices and translations (arrays)."""
+        if self.rot is None:
+            raise ValueError("No rotations calculated yet.")
+        return self.rot, self.tran
+
+    def get_init_rms(self):
+        """Root mean square deviations of untransformed coordinates."""
+        if self.coords is None:
+            raise ValueError("No coordinates set yet.")
+        if self.init_rms is None:
+            diff = self.coords - self.reference_coords
+            self.init_rms = numpy.sqrt((diff * diff).sum(axis=(1, 2)) /
+                                       self.n)
+        return self.init_rms
+
+    def get_rms(self):
+        """Root mean square deviations of superimposed coordinates."""
+        if self.rms is None:
+            raise ValueError("Nothing superimposed yet.")
+        return self.rms
+
+
+def _condensed_start(n, i):
+    """Index of pair (i, i + 1) in a condensed distance matrix (PRIVATE)."""
+    return i * n - (i * (i + 1)) // 2
+
+
+# Used to share the coordinates with the worker processes
+_worker_data = {}
+
+
+def _init_worker(centered, G):
+    _worker_data["centered"] = centered
+    _worker_data["G"] = G
+
+
+def _rmsd_rows(centered, G, start, end, chunk_size):
+    """Calculate the condensed RMSD matrix entries for rows start:end (PRIVATE).
+
+    Returns the flat array of RMSD values for the pairs (i, j) with
+    start <= i < end and j > i, in condensed matrix order.
+    """
+    m, n = centered.shape[:2]
+    block = numpy.empty((end - start, m - start), "d")
+    rows = centered[start:end]
+    for col in range(start, m, chunk_size):
+        col_end = min(col + chunk_size, m)
+        cols = centered[col:col_end]
+        A = _inner_products(rows, cols)
+        E0 = (G[start:end, numpy.newaxis] + G[numpy.newaxis, col:col_end]) / 2
+        block[:, col - start:col_end - start] = _qcp(A, E0, n, False)[0]
+    return numpy.concatenate([block[i, i + 1:] for i in range(end - start)])
+
+
+def _rmsd_rows_worker(args):
+    start, end, chunk_size = args
+    return start, _rmsd_rows(_worker_data["centered"], _worker_data["G"],
+                             start, end, chunk_size)
+
+
+def rmsd_matrix(coords, chunk_size=256, processes=1, filename=None):
+    """Calculate the all-vs-all RMSD of a stack of coordinate sets.
+
+    Each pair of coordinate sets is optimally superimposed with QCP.
+
+    Arguments:
+     - coords - an MxNx3 array (M coordinate sets of N points each)
+     - chunk_size - number of coordinate sets compared in one block,
+       this bounds the size of the temporary arrays.
+     - processes - number of worker processes; blocks of rows are
+       handed out to a multiprocessing pool if this is more than one.
+     - filename - if given, the result is written to a numpy.memmap
+       backed by this file instead of being held in memory.
+
+    Returns a condensed distance matrix, i.e. a flat array of length
+    M*(M-1)/2 holding the RMSD of pairs (0, 1), (0, 2), ..., (1, 2), ...
+    as used by scipy.spatial.distance.squareform and
+    scipy.cluster.hierarchy.
+
+    >>> import numpy
+    >>> from Bio.PDB.BatchSuperimposer import rmsd_matrix
+    >>> x = numpy.array([[51.65, -1.90, 50.07],
+    ...                  [50.40, -1.23, 50.65],
+    ...                  [50.68, -0.04, 51.54],
+    ...                  [50.22, -0.02, 52.85]])
+    >>> print(["%0.2f" % rms for rms in rmsd_matrix([x, x + 1.0, x[::-1]])])
+    ['0.00', '0.09', '0.09']
+    """
+    coords = _check_stack(coords)
+    m = len(coords)
+    size = m * (m - 1) // 2
+    if filename is None:
+        result = numpy.empty(size, "d")
+    else:
+        # numpy.memmap can't map an empty file, slicing gives a plain array
+        memmap = numpy.memmap(filename, dtype="d", mode="w+",
+                              shape=(max(size, 1),))
+        result = memmap[:size]
+    centered = _center(coords)[0]
+    G = (centered * centered).sum(axis=(1, 2))
+    tasks = [(start, min(start + chunk_size, m), chunk_size)
+             for start in range(0, m, chunk_size)]
+    if processes > 1 and len(tasks) > 1:
+        import multiprocessing
+        pool = multiprocessing.Pool(processes, _init_worker, (centered, G))
+        try:
+            for start, values in pool.imap_unordered(_rmsd_rows_worker,
+                                                     tasks):
+                offset = _condensed_start(m, start)
+                result[offset:offset + len(values)] = values
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        for start, end, chunk_size in tasks:
+            values = _rmsd_rows(centered, G, start, end, chunk_size)
+            offset = _condensed_start(m, start)
+            result[offset:offset + len(values)] = values
+    if filename is not None:
+        memmap.flush()
+    return result
+
+
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+    run_doctest()
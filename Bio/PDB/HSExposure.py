@@ -10,12 +10,125 @@ from __future__ import print_function
 import warnings
 from math import pi
 
+import numpy
+
 from Bio.PDB.AbstractPropertyMap import AbstractPropertyMap
 from Bio.PDB.PDBParser import PDBParser
 from Bio.PDB.Polypeptide import CaPPBuilder, is_aa
 from Bio.PDB.Vector import rotaxis
 
 
+def _get_ca_arrays(ppl):
+    """Collect the CA atoms of a list of polypeptides as arrays (PRIVATE).
+
+    Returns a list of residues, an Nx3 array with their CA coordinates,
+    and two integer arrays giving the index of the polypeptide each
+    residue belongs to and the position of the residue in it.
+    """
+    residues = []
+    coord_list = []
+    pp_list = []
+    pos_list = []
+    for pp_index, pp in enumerate(ppl):
+        for pos in range(0, len(pp)):
+            residue = pp[pos]
+            if not is_aa(residue) or not residue.has_id('CA'):
+                continue
+            residues.append(residue)
+            coord_list.append(residue['CA'].get_coord())
+            pp_list.append(pp_index)
+            pos_list.append(pos)
+    coords = numpy.array(coord_list, "d").reshape((-1, 3))
+    return (residues, coords, numpy.array(pp_list, int),
+            numpy.array(pos_list, int))
+
+
+def _pairs_within(query, coords, radius):
+    """Find all pairs of points closer than radius (PRIVATE).
+
+    Returns two index arrays (i, j) such that the distance between
+    query[i] and coords[j] is smaller than radius. The points are
+    hashed into a uniform grid with cells of size radius, so only
+    points in the 27 surrounding cells of a query point are compared.
+    """
+    empty = numpy.zeros(0, int)
+    if len(query) == 0 or len(coords) == 0 or not radius > 0:
+        return empty, empty
+    origin = numpy.minimum(query.min(axis=0), coords.min(axis=0))
+    # Cells are shifted by one so the neighbor cells are never negative
+    q_cells = numpy.floor((query - origin) / radius).astype(int) + 1
+    c_cells = numpy.floor((coords - origin) / radius).astype(int) + 1
+    dims = numpy.maximum(q_cells.max(axis=0), c_cells.max(axis=0)) + 2
+
+    def cell_key(cells):
+        return (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+
+    order = numpy.argsort(cell_key(c_cells), kind="mergesort")
+    sorted_keys = cell_key(c_cells)[order]
+    q_keys = cell_key(q_cells)
+    q_index = numpy.arange(len(query))
+    i_list = []
+    j_list = []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            for dz in (-1, 0, 1):
+                keys = q_keys + (dx * dims[1] + dy) * dims[2] + dz
+                start = numpy.searchsorted(sorted_keys, keys, "left")
+                counts = numpy.searchsorted(sorted_keys, keys, "right") - start
+                total = counts.sum()
+                if not total:
+                    continue
+                i = numpy.repeat(q_index, counts)
+                # Index into each of the runs [start, start + count)
+                first = numpy.cumsum(counts) - counts
+                j = order[numpy.arange(total) +
+                          numpy.repeat(start - first, counts)]
+                diff = coords[j] - query[i]
+                dist = numpy.sqrt((diff * diff).sum(axis=1))
+                close = dist < radius
+                i_list.append(i[close])
+                j_list.append(j[close])
+    if not i_list:
+        return empty, empty
+    i = numpy.concatenate(i_list)
+    j = numpy.concatenate(j_list)
+    # Sort by query and then by point, as a pairwise loop would
+    order = numpy.lexsort((j, i))
+    return i[order], j[order]
+
+
+def _count_half_spheres(ppl, centers, radius, offset):
+    """Count the CA atoms in the upper and lower half spheres (PRIVATE).
+
+    The centers argument is a list of (residue, polypeptide index,
+    position, pseudo CB vector, angle) tuples. Returns two lists with
+    the HSE-up and HSE-down values for each center.
+    """
+    if not centers:
+        return [], []
+    residues, coords, pp_index, pos_index = _get_ca_arrays(ppl)
+    c_coords = numpy.array([c[0]['CA'].get_coord() for c in centers], "d")
+    c_pp = numpy.array([c[1] for c in centers], int)
+    c_pos = numpy.array([c[2] for c in centers], int)
+    c_pcb = numpy.array([c[3].get_array() for c in centers], "d")
+    center, other = _pairs_within(c_coords, coords, radius)
+    # Neighboring residues in the chain are ignored
+    keep = (c_pp[center] != pp_index[other]) | \
+        (numpy.abs(c_pos[center] - pos_index[other]) > offset)
+    center = center[keep]
+    other = other[keep]
+    d = coords[other] - c_coords[center]
+    pcb = c_pcb[center]
+    # Same test as Vector.angle(d, pcb) < pi/2
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        cos = (d * pcb).sum(axis=1) / (numpy.sqrt((d * d).sum(axis=1)) *
+                                       numpy.sqrt((pcb * pcb).sum(axis=1)))
+        up = numpy.arccos(numpy.clip(cos, -1, 1)) < (pi / 2)
+    hse_u = numpy.bincount(center[up], minlength=len(centers))
+    hse_d = numpy.bincount(center[~up], minlength=len(centers))
+    return [int(u) for u in hse_u], [int(d) for d in hse_d]
+
+
 class _AbstractHSExposure(AbstractPropertyMap):
     """
     Abstract class to calculate Half-Sphere Exposure (HSE).
@@ -55,7 +168,10 @@ class _AbstractHSExposure(AbstractPropertyMap):
         hse_map = {}
         hse_list = []
         hse_keys = []
-        for pp1 in ppl:
+        # The (pseudo) CB vectors are calculated per residue, the
+        # neighbor counts are then done in one go on coordinate arrays.
+        centers = []
+        for pp_index, pp1 in enumerate(ppl):
             for i in range(0, len(pp1)):
                 if i == 0:
                     r1 = None
@@ -72,35 +188,22 @@ class _AbstractHSExposure(AbstractPropertyMap):
                     # Missing atoms, or i==0, or i==len(pp1)-1
                     continue
                 pcb, angle = result
-                hse_u = 0
-                hse_d = 0
-                ca2 = r2['CA'].get_vector()
-                for pp2 in ppl:
-                    for j in range(0, len(pp2)):
-                        if pp1 is pp2 and abs(i - j) <= offset:
-                            # neighboring residues in the chain are ignored
-                            continue
-                        ro = pp2[j]
-                        if not is_aa(ro) or not ro.has_id('CA'):
-                            continue
-                        cao = ro['CA'].get_vector()
-                        d = (cao - ca2)
-                        if d.norm() < radius:
-                            if d.angle(pcb) < (pi / 2):
-                                hse_u += 1
-                            else:
-                                hse_d += 1
-                res_id = r2.get_id()
-                chain_id = r2.get_parent().get_id()
-                # Fill the 3 data structures
-                hse_map[(chain_id, res_id)] = (hse_u, hse_d, angle)
-                hse_list.append((r2, (hse_u, hse_d, angle)))
-                hse_keys.append((chain_id, res_id))
-                # Add to xtra
-                r2.xtra[hse_up_key] = hse_u
-                r2.xtra[hse_down_key] = hse_d
-                if angle_key:
-                    r2.xtra[angle_key] = angle
+                centers.append((r2, pp_index, i, pcb, angle))
+        hse_u_list, hse_d_list = _count_half_spheres(ppl, centers,
+                                                     radius, offset)
+        for (r2, pp_index, i, pcb, angle), hse_u, hse_d in zip(
+                centers, hse_u_list, hse_d_list):
+            res_id = r2.get_id()
+            chain_id = r2.get_parent().get_id()
+            # Fill the 3 data structures
+            hse_map[(chain_id, res_id)] = (hse_u, hse_d, angle)
+            hse_list.append((r2, (hse_u, hse_d, angle)))
+            hse_keys.append((chain_id, res_id))
+            # Add to xtra
+            r2.xtra[hse_up_key] = hse_u
+            r2.xtra[hse_down_key] = hse_d
+            if angle_key:
+                r2.xtra[angle_key] = angle
         AbstractPropertyMap.__init__(self, hse_map, hse_keys, hse_list)
 
     def _get_cb(self, r1, r2, r3):
@@ -282,35 +385,48 @@ class ExposureCN(AbstractPropertyMap):
         fs_map = {}
         fs_list = []
         fs_keys = []
-        for pp1 in ppl:
-            for i in range(0, len(pp1)):
-                fs = 0
-                r1 = pp1[i]
-                if not is_aa(r1) or not r1.has_id('CA'):
-                    continue
-                ca1 = r1['CA']
-                for pp2 in ppl:
-                    for j in range(0, len(pp2)):
-                        if pp1 is pp2 and abs(i - j) <= offset:
-                            continue
-                        r2 = pp2[j]
-                        if not is_aa(r2) or not r2.has_id('CA'):
-                            continue
-                        ca2 = r2['CA']
-                        d = (ca2 - ca1)
-                        if d < radius:
-                            fs += 1
-                res_id = r1.get_id()
-                chain_id = r1.get_parent().get_id()
-                # Fill the 3 data structures
-                fs_map[(chain_id, res_id)] = fs
-                fs_list.append((r1, fs))
-                fs_keys.append((chain_id, res_id))
-                # Add to xtra
-                r1.xtra['EXP_CN'] = fs
+        residues, coords, pp_index, pos_index = _get_ca_arrays(ppl)
+        center, other = _pairs_within(coords, coords, radius)
+        # Neighboring residues in the same chain are ignored
+        keep = (pp_index[center] != pp_index[other]) | \
+            (numpy.abs(pos_index[center] - pos_index[other]) > offset)
+        counts = numpy.bincount(center[keep], minlength=len(residues))
+        for r1, fs in zip(residues, counts):
+            fs = int(fs)
+            res_id = r1.get_id()
+            chain_id = r1.get_parent().get_id()
+            # Fill the 3 data structures
+            fs_map[(chain_id, res_id)] = fs
+            fs_list.append((r1, fs))
+            fs_keys.append((chain_id, res_id))
+            # Add to xtra
+            r1.xtra['EXP_CN'] = fs
         AbstractPropertyMap.__init__(self, fs_map, fs_keys, fs_list)
 
 
+def calc_all_models(structure, exposure=HSExposureCB, radius=12, offset=0):
+    """Calculate HSE or CN for every model in a structure.
+
+    Returns a list of (model, exposure) tuples in model order, where each
+    exposure object is an instance of the given class (HSExposureCA,
+    HSExposureCB or ExposureCN) for that model. This is convenient for
+    NMR ensembles and other multi-model files.
+
+    @param structure: the structure that contains the models
+    @type structure: L{Structure}
+
+    @param exposure: the exposure class to use
+    @type exposure: class
+
+    @param radius: radius of the sphere (centred at the CA atom)
+    @type radius: float
+
+    @param offset: number of flanking residues that are ignored in the calculation of the number of neighbors
+    @type offset: int
+    """
+    return [(model, exposure(model, radius, offset)) for model in structure]
+
+
 if __name__ == "__main__":
 
     import sys
@@ -7,73 +7,210 @@
 
 from __future__ import print_function
 
+import re
+
+import numpy
+
 from Bio.File import as_handle
 from Bio._py3k import input as _input
 
-import shlex
+
+# A semicolon delimited text field, which starts and ends with a semicolon
+# at the beginning of a line.
+_TEXT_FIELD_RE = re.compile(r"^;([^\n]*(?:\n(?!;)[^\n]*)*)\n;", re.MULTILINE)
+
+# One token per match: a quoted string (which ends at a matching quote
+# followed by white space), a comment, or any other non-blank string.
+_TOKEN_RE = re.compile(r"""'.*?'(?=\s|$)|".*?"(?=\s|$)|\#.*|\S+""",
+                       re.MULTILINE)
+
+# Tags, loops and text fields starting at the beginning of a line
+_LINE_START_RE = re.compile(r"^(loop_|_[^\s.]*|;)", re.MULTILINE)
+
+# Values used for unknown (?) and inapplicable (.) data
+_MISSING_VALUES = ("?", ".")
+
+
+def _split_tokens(text):
+    """Split mmCIF text without text fields into tokens (PRIVATE)."""
+    if "'" not in text and '"' not in text and "#" not in text:
+        return text.split()
+    # Remove comments, and the quotes around quoted strings. A token can
+    # only start and end with the same quote if it was quoted.
+    return [token[1:-1]
+            if token[0] in "'\"" and token[-1] == token[0] and len(token) > 1
+            else token
+            for token in _TOKEN_RE.findall(text) if token[0] != "#"]
+
+
+def _tokenize_text(text):
+    """Split mmCIF text into a list of tokens (PRIVATE).
+
+    The text is handled in large chunks by regular expressions, or simply
+    split on white space where there are no quotes or comments. Text
+    fields are returned as a single token, with the lines stripped and
+    joined.
+    """
+    if ";" not in text:
+        return _split_tokens(text)
+    tokens = []
+    start = 0
+    for match in _TEXT_FIELD_RE.finditer(text):
+        tokens.extend(_split_tokens(text[start:match.start()]))
+        tokens.append("".join(line.strip()
+                              for line in match.group(1).split("\n")))
+        start = match.end()
+    tokens.extend(_split_tokens(text[start:]))
+    return tokens
+
+
+def _find_categories(text):
+    """Find the parts of mmCIF text belonging to each category (PRIVATE).
+
+    Returns a list of (category, start, end) tuples, where category is for
+    example "_atom_site" and text[start:end] holds the tags and values of
+    that category (including the loop_ keyword if any). The text before
+    the first tag has category None. Only the line starts are examined, so
+    this is much faster than tokenizing the whole text.
+    """
+    blocks = []
+    category = None
+    start = 0
+    loop_start = None
+    in_text_field = False
+    for match in _LINE_START_RE.finditer(text):
+        token = match.group(1)
+        if token == ";":
+            in_text_field = not in_text_field
+            continue
+        elif in_text_field:
+            continue
+        elif token == "loop_":
+            loop_start = match.start()
+            continue
+        if token != category:
+            # New category, which may start at a loop_ keyword
+            if loop_start is not None:
+                end = loop_start
+            else:
+                end = match.start()
+            blocks.append((category, start, end))
+            category = token
+            start = end
+        loop_start = None
+    blocks.append((category, start, len(text)))
+    return blocks
 
 
 class MMCIF2Dict(dict):
     """Parse a mmCIF file and return a dictionary."""
 
-    def __init__(self, filename):
+    def __init__(self, filename, categories=None):
         """Parse a mmCIF file and return a dictionary.
 
         Arguments:
          - file - name of the PDB file OR an open filehandle
+         - categories - optional list of categories (e.g. "_atom_site")
+           to parse. The parts of the file belonging to other categories
+           are skipped without being tokenized, which is much faster
+           when only a few categories are needed.
         """
         with as_handle(filename) as handle:
-            loop_flag = False
-            key = None
-            tokens = self._tokenize(handle)
-            token = next(tokens)
-            self[token[0:5]] = token[5:]
-            i = 0
-            n = 0
-            for token in tokens:
-                if token == "loop_":
-                    loop_flag = True
-                    keys = []
-                    i = 0
-                    n = 0
-                    continue
-                elif loop_flag:
-                    if token.startswith("_"):
-                        if i > 0:
-                            loop_flag = False
-                        else:
-                            self[token] = []
-                            keys.append(token)
-                            n += 1
-                            continue
-                    else:
-                        self[keys[i % n]].append(token)
-                        i += 1
-                        continue
-                if key is None:
-                    key = token
-                else:
-                    self[key] = token
-                    key = None
+            text = handle.read()
+        if categories is None:
+            self._parse(_tokenize_text(text), True)
+        else:
+            wanted = set("_" + c.lstrip("_") for c in categories)
+            blocks = _find_categories(text)
+            # The data_ header is at the start of the first block
+            self._parse(_tokenize_text(text[:blocks[0][2]])[:1], True)
+            for category, start, end in blocks:
+                if category in wanted:
+                    self._parse(_tokenize_text(text[start:end]), False)
 
     # Private methods
 
-    def _tokenize(self, handle):
-        for line in handle:
-            if line.startswith("#"):
-                continue
-            elif line.startswith(";"):
-                token = line[1:].strip()
-                for line in handle:
-                    line = line.strip()
-                    if line == ';':
-                        break
-                    token += line
-                yield token
+    def _parse(self, tokens, header):
+        """Store the tags and values from a list of tokens (PRIVATE)."""
+        if header and tokens:
+            token = tokens[0]
+            self[token[0:5]] = token[5:]
+            start = 1
+        else:
+            start = 0
+        n = len(tokens)
+        # First character of each token, used to find tags quickly
+        firsts = [token[:1] for token in tokens]
+        key = None
+        i = start
+        while i < n:
+            token = tokens[i]
+            i += 1
+            if token == "loop_":
+                keys = []
+                while i < n and firsts[i] == "_":
+                    keys.append(tokens[i])
+                    i += 1
+                # The values run until the next tag or loop
+                end = n
+                try:
+                    end = firsts.index("_", i)
+                except ValueError:
+                    pass
+                try:
+                    end = tokens.index("loop_", i, end)
+                except ValueError:
+                    pass
+                if keys:
+                    values = tokens[i:end]
+                    for j, loop_key in enumerate(keys):
+                        self[loop_key] = values[j::len(keys)]
+                i = end
+            elif key is None:
+                key = token
             else:
-                tokens = shlex.split(line)
-                for token in tokens:
-                    yield token
+                self[key] = token
+                key = None
+
+    def _tokenize(self, handle):
+        """Yield the tokens from an mmCIF file handle (PRIVATE)."""
+        for token in _tokenize_text(handle.read()):
+            yield token
+
+    # Public methods
+
+    def get_array(self, key, dtype=float, missing=None):
+        """Return the values of a (looped) key as a NumPy array.
+
+        Arguments:
+         - key - the mmCIF key, e.g. "_atom_site.Cartn_x"
+         - dtype - NumPy data type of the array (default float)
+         - missing - value used for the unknown (?) and inapplicable (.)
+           values. The default is NaN for floating point arrays; for other
+           numeric types a ValueError is raised if such values are present.
+
+        For example, to get the atom coordinates from a large file without
+        parsing all the other categories:
+
+        >>> mmcif_dict = MMCIF2Dict("PDB/1A8O.cif", categories=["_atom_site"])
+        >>> x = mmcif_dict.get_array("_atom_site.Cartn_x")
+        >>> print("%i %0.3f" % (len(x), x[0]))
+        644 19.594
+        >>> serial = mmcif_dict.get_array("_atom_site.id", int)
+        >>> print(serial[:3])
+        [1 2 3]
+        """
+        values = self[key]
+        if not isinstance(values, list):
+            values = [values]
+        dtype = numpy.dtype(dtype)
+        if dtype.kind in "iuf":
+            if missing is None and dtype.kind == "f":
+                missing = numpy.nan
+            if missing is not None:
+                values = [missing if value in _MISSING_VALUES else value
+                          for value in values]
+        return numpy.array(values, dtype)
 
 
 if __name__ == "__main__":
@@ -52,6 +52,9 @@ class PDBIO(object):
         >>> io.set_structure(s)
         >>> io.save("out.pdb")
     """
+    # Number of lines collected before they are written to the handle
+    _CHUNK_LINES = 10000
+
     def __init__(self, use_model_flag=0):
         """Creat the PDBIO object.
 
@@ -140,6 +143,155 @@ class PDBIO(object):
             structure = sb.structure
         self.structure = structure
 
+    def _write_model(self, fp, model, model_flag, select, atom_number,
+                     preserve_atom_numbering):
+        """Write a model to the handle in large chunks (PRIVATE).
+
+        The ATOM/HETATM records are formatted in bulk per residue, and
+        collected in a list of lines which is written to the handle
+        with a single call every _CHUNK_LINES lines.
+
+        Subclasses overriding _get_atom_line to customise the records
+        still have it called for each atom, at the cost of speed.
+
+        Returns the last atom number used, and if any atoms were written.
+        """
+        get_atom_line = self._get_atom_line
+        if getattr(get_atom_line, "__func__", None) is \
+                PDBIO.__dict__["_get_atom_line"]:
+            get_atom_line = None
+        lines = []
+        append = lines.append
+        accept_chain = select.accept_chain
+        accept_residue = select.accept_residue
+        accept_atom = select.accept_atom
+        element_cache = self._element_cache
+        model_residues_written = 0
+        if not preserve_atom_numbering:
+            atom_number = 1
+        if model_flag:
+            append("MODEL      %s\n" % model.serial_num)
+        for chain in model.get_list():
+            if not accept_chain(chain):
+                continue
+            chain_id = chain.get_id()
+            # necessary for TER
+            # do not write TER if no residues were written
+            # for this chain
+            chain_residues_written = 0
+            for residue in chain.get_unpacked_list():
+                if not accept_residue(residue):
+                    continue
+                hetfield, resseq, icode = residue.get_id()
+                resname = residue.get_resname()
+                segid = residue.get_segid()
+                atoms = [atom for atom in residue.get_unpacked_list()
+                         if accept_atom(atom)]
+                if not atoms:
+                    continue
+                chain_residues_written = 1
+                model_residues_written = 1
+                if hetfield != " ":
+                    record_type = "HETATM"
+                else:
+                    record_type = "ATOM  "
+                # The fields shared by all atoms of the residue
+                res_fields = "%3s %c%4i%c   " % (resname, chain_id, resseq,
+                                                 icode)
+                # Using the Atom attributes directly, as the getter
+                # method calls are a large part of the time taken.
+                for atom in atoms:
+                    if preserve_atom_numbering:
+                        atom_number = atom.serial_number
+                    if get_atom_line is not None:
+                        append(get_atom_line(atom, hetfield, segid,
+                                             atom_number, resname, resseq,
+                                             icode, chain_id))
+                        if not preserve_atom_numbering:
+                            atom_number += 1
+                        continue
+                    try:
+                        element = element_cache[atom.element]
+                    except KeyError:
+                        element = self._get_element(atom)
+                    try:
+                        occupancy_str = "%6.2f" % atom.occupancy
+                    except TypeError:
+                        occupancy_str = self._get_occupancy_str(atom)
+                    try:
+                        # Python floats format much faster than NumPy's
+                        x, y, z = atom.coord.tolist()
+                    except AttributeError:
+                        x, y, z = atom.coord
+                    append("%s%5i %-4s%c%s%8.3f%8.3f%8.3f%s%6.2f      "
+                           "%4s%2s  \n"
+                           % (record_type, atom_number, atom.fullname,
+                              atom.altloc, res_fields, x, y, z,
+                              occupancy_str, atom.bfactor, segid,
+                              element))
+                    if not preserve_atom_numbering:
+                        atom_number += 1
+                if len(lines) >= self._CHUNK_LINES:
+                    fp.write("".join(lines))
+                    del lines[:]
+            if chain_residues_written:
+                append("TER   %5i      %3s %c%4i%c                      "
+                       "                                \n"
+                       % (atom_number, resname, chain_id, resseq, icode))
+        if model_flag and model_residues_written:
+            append("ENDMDL\n")
+        fp.write("".join(lines))
+        return atom_number, model_residues_written
+
+    def _get_element(self, atom):
+        """Return the element field for an atom, using a cache (PRIVATE)."""
+        if atom.element:
+            element = atom.element.strip().upper()
+            if element.capitalize() not in atom_weights:
+                raise ValueError("Unrecognised element %r" % atom.element)
+            element = element.rjust(2)
+        else:
+            element = "  "
+        self._element_cache[atom.element] = element
+        return element
+
+    def _get_occupancy_str(self, atom):
+        """Return the occupancy field for an atom without one (PRIVATE)."""
+        occupancy = atom.get_occupancy()
+        if occupancy is None:
+            import warnings
+            from Bio import BiopythonWarning
+            warnings.warn("Missing occupancy in atom %s written as blank" %
+                          repr(atom.get_full_id()), BiopythonWarning)
+            return " " * 6
+        raise TypeError("Invalid occupancy %r in atom %r"
+                        % (occupancy, atom.get_full_id()))
+
+    def _write_models(self, file, models, model_flag, select, write_end,
+                      preserve_atom_numbering):
+        """Write an iterable of models to a file or handle (PRIVATE)."""
+        if isinstance(file, basestring):
+            fp = open(file, "w")
+            close_file = 1
+        else:
+            # filehandle, I hope :-)
+            fp = file
+            close_file = 0
+        self._element_cache = {}
+        atom_number = None
+        try:
+            for model in models:
+                if not select.accept_model(model):
+                    continue
+                atom_number = self._write_model(
+                    fp, model, model_flag, select, atom_number,
+                    preserve_atom_numbering)[0]
+            if write_end:
+                fp.write('END\n')
+        finally:
+            if close_file:
+                fp.close()
+
     def save(self, file, select=Select(), write_end=True, preserve_atom_numbering=False):
         """
         @param file: output file
@@ -161,65 +313,55 @@ class PDBIO(object):
 
         Typically select is a subclass of L{Select}.
         """
-        get_atom_line = self._get_atom_line
-        if isinstance(file, basestring):
-            fp = open(file, "w")
-            close_file = 1
-        else:
-            # filehandle, I hope :-)
-            fp = file
-            close_file = 0
         # multiple models?
         if len(self.structure) > 1 or self.use_model_flag:
             model_flag = 1
         else:
             model_flag = 0
-        for model in self.structure.get_list():
-            if not select.accept_model(model):
-                continue
-            # necessary for ENDMDL
-            # do not write ENDMDL if no residues were written
-            # for this model
-            model_residues_written = 0
-            if not preserve_atom_numbering:
-                atom_number = 1
-            if model_flag:
-                fp.write("MODEL      %s\n" % model.serial_num)
-            for chain in model.get_list():
-                if not select.accept_chain(chain):
-                    continue
-                chain_id = chain.get_id()
-                # necessary for TER
-                # do not write TER if no residues were written
-                # for this chain
-                chain_residues_written = 0
-                for residue in chain.get_unpacked_list():
-                    if not select.accept_residue(residue):
-                        continue
-                    hetfield, resseq, icode = residue.get_id()
-                    resname = residue.get_resname()
-                    segid = residue.get_segid()
-                    for atom in residue.get_unpacked_list():
-                        if select.accept_atom(atom):
-                            chain_residues_written = 1
-                            model_residues_written = 1
-                            if preserve_atom_numbering:
-                                atom_number = atom.get_serial_number()
-                            s = get_atom_line(atom, hetfield, segid, atom_number, resname,
-                                resseq, icode, chain_id)
-                            fp.write(s)
-                            if not preserve_atom_numbering:
-                                atom_number += 1
-                if chain_residues_written:
-                    fp.write("TER   %5i      %3s %c%4i%c                                                      \n"
-                             % (atom_number, resname, chain_id, resseq, icode))
-
-            if model_flag and model_residues_written:
-                fp.write("ENDMDL\n")
-        if write_end:
-            fp.write('END\n')
-        if close_file:
-            fp.close()
+        self._write_models(file, self.structure.get_list(), model_flag,
+                           select, write_end, preserve_atom_numbering)
+
+    def save_models(self, file, models, select=Select(), write_end=True,
+                    preserve_atom_numbering=False):
+        """Write models one at a time, e.g. from a generator.
+
+        This allows writing large ensembles without holding them in
+        memory, since only the current model and the next one are
+        kept. The output is the same as from the save method for a
+        structure containing the same models.
+
+        @param file: output file
+        @type file: string or filehandle
+
+        @param models: the models to write
+        @type models: iterable of L{Model}
+
+        @param select: selects which entities will be written,
+        see the save method.
+        @type select: object
+        """
+        models = iter(models)
+        # Look ahead to see if there are multiple models
+        first = []
+        for model in models:
+            first.append(model)
+            if len(first) == 2:
+                break
+        if len(first) > 1 or self.use_model_flag:
+            model_flag = 1
+        else:
+            model_flag = 0
+
+        def all_models():
+            for model in first:
+                yield model
+            # Don't keep a reference to the models already written
+            del first[:]
+            for model in models:
+                yield model
+
+        self._write_models(file, all_models(), model_flag, select,
+                           write_end, preserve_atom_numbering)
 
 if __name__ == "__main__":
 
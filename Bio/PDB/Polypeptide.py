@@ -53,11 +53,13 @@ from Bio._py3k import basestring
 
 import warnings
 
+import numpy
+
 from Bio.Alphabet import generic_protein
 from Bio.Data import SCOPData
 from Bio.Seq import Seq
 from Bio.PDB.PDBExceptions import PDBException
-from Bio.PDB.Vector import calc_dihedral, calc_angle
+from Bio.PDB.Vector import calc_dihedrals, calc_angles
 
 
 standard_aa_names = ["ALA", "CYS", "ASP", "GLU", "PHE", "GLY", "HIS", "ILE", "LYS",
@@ -187,6 +189,46 @@ def is_aa(residue, standard=False):
         return residue in SCOPData.protein_letters_3to1
 
 
+def _get_atom_coords(residues, name):
+    """Return an array with the coordinates of an atom in each residue (PRIVATE).
+
+    Residues which lack the atom get NaN coordinates.
+    """
+    coords = numpy.empty((len(residues), 3), 'd')
+    coords.fill(numpy.nan)
+    for i, res in enumerate(residues):
+        if res.has_id(name):
+            coords[i] = res[name].get_coord()
+    return coords
+
+
+def _calc_phi_psi(n, ca, c, first, last):
+    """Calculate phi/psi from arrays of backbone coordinates (PRIVATE).
+
+    The N, CA and C coordinates of consecutive residues are given as
+    Nx3 arrays (NaN for missing atoms). The boolean arrays first and
+    last mark the residues at the start and end of each polypeptide,
+    so several polypeptides can be handled in one go.
+
+    Returns an Nx2 array of phi and psi angles (NaN if undefined).
+    """
+    angles = numpy.empty((len(n), 2), 'd')
+    angles.fill(numpy.nan)
+    if len(n) > 1:
+        # Phi is C(i-1), N(i), CA(i), C(i)
+        angles[1:, 0] = calc_dihedrals(c[:-1], n[1:], ca[1:], c[1:])
+        # Psi is N(i), CA(i), C(i), N(i+1)
+        angles[:-1, 1] = calc_dihedrals(n[:-1], ca[:-1], c[:-1], n[1:])
+    # Psi and phi cannot be calculated if N, CA or C is missing
+    missing = numpy.isnan(n).any(axis=1) | numpy.isnan(ca).any(axis=1) | \
+        numpy.isnan(c).any(axis=1)
+    angles[missing] = numpy.nan
+    # No phi for the first residue, and no psi for the last residue
+    angles[first, 0] = numpy.nan
+    angles[last, 1] = numpy.nan
+    return angles
+
+
 class Polypeptide(list):
     """A polypeptide is simply a list of L{Residue} objects."""
     def get_ca_list(self):
@@ -201,44 +243,30 @@ class Polypeptide(list):
             ca_list.append(ca)
         return ca_list
 
+    def get_phi_psi_array(self):
+        """Return the phi/psi dihedral angles as an array.
+
+        The result is a (number of residues) x 2 array with the phi
+        and psi angle of each residue, in radians. Angles that cannot
+        be calculated (missing atoms, no phi for the first residue,
+        no psi for the last residue) are NaN.
+        """
+        first = numpy.zeros(len(self), bool)
+        first[:1] = True
+        last = numpy.zeros(len(self), bool)
+        last[-1:] = True
+        return _calc_phi_psi(_get_atom_coords(self, 'N'),
+                             _get_atom_coords(self, 'CA'),
+                             _get_atom_coords(self, 'C'), first, last)
+
     def get_phi_psi_list(self):
         """Return the list of phi/psi dihedral angles."""
         ppl = []
-        lng = len(self)
-        for i in range(0, lng):
-            res = self[i]
-            try:
-                n = res['N'].get_vector()
-                ca = res['CA'].get_vector()
-                c = res['C'].get_vector()
-            except Exception:
-                # Some atoms are missing
-                # Phi/Psi cannot be calculated for this residue
-                ppl.append((None, None))
-                res.xtra["PHI"] = None
-                res.xtra["PSI"] = None
-                continue
-            # Phi
-            if i > 0:
-                rp = self[i - 1]
-                try:
-                    cp = rp['C'].get_vector()
-                    phi = calc_dihedral(cp, n, ca, c)
-                except Exception:
-                    phi = None
-            else:
-                # No phi for residue 0!
+        for res, (phi, psi) in zip(self, self.get_phi_psi_array().tolist()):
+            if phi != phi:
+                # NaN, phi cannot be calculated for this residue
                 phi = None
-            # Psi
-            if i < (lng - 1):
-                rn = self[i + 1]
-                try:
-                    nn = rn['N'].get_vector()
-                    psi = calc_dihedral(n, ca, c, nn)
-                except Exception:
-                    psi = None
-            else:
-                # No psi for last residue!
+            if psi != psi:
                 psi = None
             ppl.append((phi, psi))
             # Add Phi/Psi to xtra dict of residue
@@ -246,32 +274,56 @@ class Polypeptide(list):
             res.xtra["PSI"] = psi
         return ppl
 
+    def _get_ca_coords(self):
+        """Return the C-alpha coordinates as an array (PRIVATE)."""
+        ca_list = self.get_ca_list()
+        return numpy.array([ca.get_coord() for ca in ca_list],
+                           'd').reshape((-1, 3))
+
+    def get_tau_array(self):
+        """Return the tau torsion angles as an array.
+
+        Tau is the dihedral angle of 4 consecutive C-alpha atoms. The
+        array has one entry per residue, where the angle of C-alpha
+        atoms i-2, i-1, i and i+1 is stored at index i. The first two
+        and the last entries are NaN.
+        """
+        ca = self._get_ca_coords()
+        tau = numpy.empty(len(ca), 'd')
+        tau.fill(numpy.nan)
+        if len(ca) > 3:
+            tau[2:-1] = calc_dihedrals(ca[:-3], ca[1:-2], ca[2:-1], ca[3:])
+        return tau
+
     def get_tau_list(self):
         """List of tau torsions angles for all 4 consecutive Calpha atoms."""
-        ca_list = self.get_ca_list()
-        tau_list = []
-        for i in range(0, len(ca_list) - 3):
-            atom_list = (ca_list[i], ca_list[i + 1], ca_list[i + 2], ca_list[i + 3])
-            v1, v2, v3, v4 = [a.get_vector() for a in atom_list]
-            tau = calc_dihedral(v1, v2, v3, v4)
-            tau_list.append(tau)
+        tau_list = self.get_tau_array()[2:-1].tolist()
+        for i, tau in enumerate(tau_list):
             # Put tau in xtra dict of residue
-            res = ca_list[i + 2].get_parent()
-            res.xtra["TAU"] = tau
+            self[i + 2].xtra["TAU"] = tau
         return tau_list
 
+    def get_theta_array(self):
+        """Return the theta angles as an array.
+
+        Theta is the angle of 3 consecutive C-alpha atoms. The array
+        has one entry per residue, where the angle of C-alpha atoms i-1,
+        i and i+1 is stored at index i. The first and last entries are
+        NaN.
+        """
+        ca = self._get_ca_coords()
+        theta = numpy.empty(len(ca), 'd')
+        theta.fill(numpy.nan)
+        if len(ca) > 2:
+            theta[1:-1] = calc_angles(ca[:-2], ca[1:-1], ca[2:])
+        return theta
+
     def get_theta_list(self):
         """List of theta angles for all 3 consecutive Calpha atoms."""
-        theta_list = []
-        ca_list = self.get_ca_list()
-        for i in range(0, len(ca_list) - 2):
-            atom_list = (ca_list[i], ca_list[i + 1], ca_list[i + 2])
-            v1, v2, v3 = [a.get_vector() for a in atom_list]
-            theta = calc_angle(v1, v2, v3)
-            theta_list.append(theta)
-            # Put tau in xtra dict of residue
-            res = ca_list[i + 1].get_parent()
-            res.xtra["THETA"] = theta
+        theta_list = self.get_theta_array()[1:-1].tolist()
+        for i, theta in enumerate(theta_list):
+            # Put theta in xtra dict of residue
+            self[i + 1].xtra["THETA"] = theta
         return theta_list
 
     def get_sequence(self):
@@ -453,6 +505,45 @@ class PPBuilder(_PPBuilder):
             return 0
 
 
+def calc_phi_psi(entity, builder=None):
+    """Calculate phi/psi angles of all polypeptides in all models.
+
+    Unlike the build_peptides methods, which only consider the first
+    model of a structure, this looks at every model. The angles of all
+    polypeptides are calculated together on NumPy arrays, which is
+    useful for Ramachandran statistics over many structures.
+
+    Returns a list of residues and an array with their phi and psi
+    angles (in radians, NaN if undefined) in the same order.
+
+    @param entity: polypeptides are searched for in this object
+    @type entity: L{Structure}, L{Model} or L{Chain}
+
+    @param builder: polypeptide builder to use (default L{PPBuilder})
+    @type builder: L{PPBuilder} or L{CaPPBuilder}
+    """
+    if builder is None:
+        builder = PPBuilder()
+    if entity.get_level() == "S":
+        entities = entity.get_list()
+    else:
+        entities = [entity]
+    residues = []
+    first = []
+    last = []
+    for model in entities:
+        for pp in builder.build_peptides(model):
+            residues.extend(pp)
+            first.extend([True] + [False] * (len(pp) - 1))
+            last.extend([False] * (len(pp) - 1) + [True])
+    angles = _calc_phi_psi(_get_atom_coords(residues, 'N'),
+                           _get_atom_coords(residues, 'CA'),
+                           _get_atom_coords(residues, 'C'),
+                           numpy.array(first, bool),
+                           numpy.array(last, bool))
+    return residues, angles
+
+
 if __name__ == "__main__":
     import sys
     from Bio.PDB.PDBParser import PDBParser
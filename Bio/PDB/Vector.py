@@ -206,6 +206,65 @@ def calc_dihedral(v1, v2, v3, v4):
     return angle
 
 
+def _norm_rows(a):
+    """Return the norms of the rows of an Nx3 array (PRIVATE)."""
+    return numpy.sqrt((a * a).sum(axis=-1))
+
+
+def _angle_rows(a, b):
+    """Return the angles between the rows of two Nx3 arrays (PRIVATE)."""
+    c = (a * b).sum(axis=-1) / (_norm_rows(a) * _norm_rows(b))
+    # Take care of roundoff errors
+    return numpy.arccos(numpy.clip(c, -1, 1))
+
+
+def calc_angles(p1, p2, p3):
+    """Calculate angles for arrays of 3 connected points.
+
+    This is the array version of calc_angle, which calculates all the
+    angles in one go. Undefined angles (e.g. for points with NaN
+    coordinates) are returned as NaN.
+
+    @param p1, p2, p3: the points that define the angles
+    @type p1, p2, p3: Nx3 arrays
+
+    @return: angles
+    @rtype: array of N floats
+    """
+    p2 = numpy.asarray(p2, 'd')
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        return _angle_rows(numpy.asarray(p1, 'd') - p2,
+                           numpy.asarray(p3, 'd') - p2)
+
+
+def calc_dihedrals(p1, p2, p3, p4):
+    """Calculate dihedral angles for arrays of 4 connected points.
+
+    This is the array version of calc_dihedral, which calculates all
+    the dihedral angles in one go. The angles are in ]-pi, pi].
+    Undefined angles (e.g. for points with NaN coordinates) are
+    returned as NaN.
+
+    @param p1, p2, p3, p4: the points that define the dihedral angles
+    @type p1, p2, p3, p4: Nx3 arrays
+
+    @return: dihedral angles
+    @rtype: array of N floats
+    """
+    p2 = numpy.asarray(p2, 'd')
+    p3 = numpy.asarray(p3, 'd')
+    ab = numpy.asarray(p1, 'd') - p2
+    cb = p3 - p2
+    db = numpy.asarray(p4, 'd') - p3
+    u = numpy.cross(ab, cb)
+    v = numpy.cross(db, cb)
+    w = numpy.cross(u, v)
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        angle = _angle_rows(u, v)
+        # Determine sign of angle, as in calc_dihedral
+        return numpy.where(_angle_rows(cb, w) > 0.001, -angle, angle)
+
+
 class Vector(object):
     """3D vector."""
 
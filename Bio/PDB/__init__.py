@@ -41,6 +41,7 @@ from .Superimposer import Superimposer
 # 3D vector class
 from .Vector import Vector, calc_angle, calc_dihedral, refmat, rotmat, rotaxis
 from .Vector import vector_to_axis, m2rotaxis, rotaxis2m
+from .Vector import calc_angles, calc_dihedrals
 
 # Alignment module
 from .StructureAlignment import StructureAlignment
@@ -203,11 +203,34 @@ def _extract_ids_and_descs(concat_str):
     return [pair for pair in map(add_descs, id_desc_pairs)]
 
 
+def _child_texts(elem):
+    """Returns a dictionary of the text of each child element (PRIVATE).
+
+    As with findtext, elements without any text give an empty string. This
+    is faster than calling findtext for each of the tags of interest.
+    """
+    return dict((child.tag, child.text or '') for child in elem)
+
+
+def _set_attrs(obj, texts, elem_map):
+    """Sets the attributes of an object from child element texts (PRIVATE)."""
+    for key, (attr_name, caster) in elem_map.items():
+        value = texts.get(key)
+        if value is not None:
+            # recast only if value is not intended to be str
+            if caster is not str:
+                value = caster(value)
+            setattr(obj, attr_name, value)
+
+
 class BlastXmlParser(object):
     """Parser for the BLAST XML format"""
 
     def __init__(self, handle):
         self.xml_iter = iter(ElementTree.iterparse(handle, events=('start', 'end')))
+        # parent of the <Iteration> elements, used to discard each query's
+        # element once parsed so memory use does not grow with the file
+        self._iterations_elem = None
         self._meta, self._fallback = self._parse_preamble()
 
     def __iter__(self):
@@ -249,8 +272,11 @@ class BlastXmlParser(object):
                 elem.clear()
                 continue
 
-            if event == 'start' and elem.tag == 'Iteration':
-                break
+            if event == 'start':
+                if elem.tag == 'Iteration':
+                    break
+                elif elem.tag == 'BlastOutput_iterations':
+                    self._iterations_elem = elem
 
         # we only want the version number, sans the program name or date
         if meta.get('version') is not None:
@@ -305,7 +331,7 @@ class BlastXmlParser(object):
                 else:
                     blast_query_id = ''
 
-                hit_list, key_list = [], []
+                hit_list, key_list = [], set()
                 for hit in self._parse_hit(qresult_elem.find('Iteration_hits'),
                         query_id):
                     if hit:
@@ -324,7 +350,7 @@ class BlastXmlParser(object):
                             for hsp in hit:
                                 hsp.hit_id = hit._blast_id
                         else:
-                            key_list.append(hit.id)
+                            key_list.add(hit.id)
 
                         hit_list.append(hit)
 
@@ -350,18 +376,14 @@ class BlastXmlParser(object):
                 stat_iter_elem = qresult_elem.find('Iteration_stat')
                 if stat_iter_elem is not None:
                     stat_elem = stat_iter_elem.find('Statistics')
+                    _set_attrs(qresult, _child_texts(stat_elem),
+                               _ELEM_QRESULT_OPT)
 
-                    for key, val_info in _ELEM_QRESULT_OPT.items():
-                        value = stat_elem.findtext(key)
-                        if value is not None:
-                            caster = val_info[1]
-                            # recast only if value is not intended to be str
-                            if value is not None and caster is not str:
-                                value = caster(value)
-                            setattr(qresult, val_info[0], value)
-
-                # delete element after we finish parsing it
+                # delete element after we finish parsing it, and remove it
+                # from its parent (which would otherwise keep all of them)
                 qresult_elem.clear()
+                if self._iterations_elem is not None:
+                    self._iterations_elem.clear()
                 yield qresult
 
     def _parse_hit(self, root_hit_elem, query_id):
@@ -420,15 +442,7 @@ class BlastXmlParser(object):
             hit._description_alt = [x[1] for x in id_descs[1:]]
             # blast_hit_id is only set if the hit ID is Blast-generated
             hit._blast_id = blast_hit_id
-
-            for key, val_info in _ELEM_HIT.items():
-                value = hit_elem.findtext(key)
-                if value is not None:
-                    caster = val_info[1]
-                    # recast only if value is not intended to be str
-                    if value is not None and caster is not str:
-                        value = caster(value)
-                    setattr(hit, val_info[0], value)
+            _set_attrs(hit, _child_texts(hit_elem), _ELEM_HIT)
 
             # delete element after we finish parsing it
             hit_elem.clear()
@@ -473,10 +487,12 @@ class BlastXmlParser(object):
             root_hsp_frag_elem = []
 
         for hsp_frag_elem in root_hsp_frag_elem:
+            # text of each child element, looked up below
+            texts = _child_texts(hsp_frag_elem)
             coords = {}  # temporary container for coordinates
             frag = HSPFragment(hit_id, query_id)
             for key, val_info in _ELEM_FRAG.items():
-                value = hsp_frag_elem.findtext(key)
+                value = texts.get(key)
                 caster = val_info[1]
 
                 # adjust 'from' and 'to' coordinates to 0-based ones
@@ -491,8 +507,7 @@ class BlastXmlParser(object):
                     setattr(frag, val_info[0], value)
 
             # set the similarity characters into aln_annotation dict
-            frag.aln_annotation['similarity'] = \
-                    hsp_frag_elem.findtext('Hsp_midline')
+            frag.aln_annotation['similarity'] = texts.get('Hsp_midline')
 
             # process coordinates
             # since 'x-from' could be bigger than 'x-to', we need to figure
@@ -519,13 +534,7 @@ class BlastXmlParser(object):
                 frag.alphabet = generic_protein
 
             hsp = HSP([frag])
-            for key, val_info in _ELEM_HSP.items():
-                value = hsp_frag_elem.findtext(key)
-                caster = val_info[1]
-                if value is not None:
-                    if caster is not str:
-                        value = caster(value)
-                    setattr(hsp, val_info[0], value)
+            _set_attrs(hsp, texts, _ELEM_HSP)
             # delete element after we finish parsing it
             hsp_frag_elem.clear()
             yield hsp
@@ -211,7 +211,8 @@ warnings.warn('Bio.SearchIO is an experimental submodule which may undergo '
         BiopythonExperimentalWarning)
 
 
-__all__ = ('read', 'parse', 'to_dict', 'index', 'index_db', 'write', 'convert')
+__all__ = ('read', 'parse', 'read_table', 'to_dict', 'index', 'index_db',
+           'parallel_parse', 'write', 'convert')
 
 
 # dictionary of supported formats for parse() and read()
@@ -251,6 +252,15 @@ _INDEXER_MAP = {
         'phmmer3-domtab': ('HmmerIO', 'Hmmer3DomtabHmmqueryIndexer'),
 }
 
+# dictionary of supported formats for read_table()
+_TABLE_MAP = {
+        'blast-tab': ('_table', 'read_table'),
+        'hmmer3-tab': ('_table', 'read_table'),
+        'hmmscan3-domtab': ('_table', 'read_table'),
+        'hmmsearch3-domtab': ('_table', 'read_table'),
+        'phmmer3-domtab': ('_table', 'read_table'),
+}
+
 # dictionary of supported formats for write()
 _WRITER_MAP = {
         'blast-tab': ('BlastIO', 'BlastTabWriter'),
@@ -369,6 +379,36 @@ def read(handle, format=None, **kwargs):
     return first
 
 
+def read_table(handle, format=None, **kwargs):
+    """Reads a tabular search output file into columns of NumPy arrays.
+
+     - handle - Handle to the file, or the filename as a string.
+     - format - Lower case string denoting one of the supported formats,
+       blast-tab, hmmer3-tab, hmmscan3-domtab, hmmsearch3-domtab or
+       phmmer3-domtab.
+     - kwargs - Format-specific keyword arguments (for blast-tab, the
+       fields and comments arguments as used by `parse`).
+
+    Rather than creating QueryResult, Hit, HSP and HSPFragment objects for
+    every row, `read_table` returns a SearchTable object holding each column
+    of the file as a NumPy array, grouped by query. This is much faster and
+    uses far less memory for large files. The tables can be filtered and the
+    best hits picked without creating any objects, and then turned into
+    QueryResult objects, e.g.
+
+        table = SearchIO.read_table('Blast/mirna.tab', 'blast-tab', comments=True)
+        for qresult in table.filter(max_evalue=1e-20).best_hits().qresults():
+            ...
+
+    See the Bio.SearchIO._table module for more details. This requires NumPy.
+
+    """
+    reader = get_processor(format, _TABLE_MAP)
+
+    with as_handle(handle, 'rU') as source_file:
+        return reader(source_file, format, **kwargs)
+
+
 def to_dict(qresults, key_function=lambda rec: rec.id):
     """Turns a QueryResult iterator or list into a dictionary.
 
@@ -571,6 +611,108 @@ def index_db(index_filename, filenames=None, format=None,
                                    key_function, repr)
 
 
+def parallel_parse(filename, format=None, processes=None, ordered=True,
+                   reduce_function=None, chunk_size=None, max_pending=None,
+                   **kwargs):
+    """Parses a search output file using several processes.
+
+     - filename        - string giving name of file to be parsed, which may
+                         be BGZF compressed.
+     - format          - Lower case string denoting one of the supported
+                         formats (those supported by `index`).
+     - processes       - Number of worker processes (defaults to the number
+                         of CPUs). With one process, the queries are parsed
+                         in this process.
+     - ordered         - If True (default) the results are returned in the
+                         order of the queries in the file, otherwise as soon
+                         as they are parsed.
+     - reduce_function - Optional function applied in the worker processes
+                         to each QueryResult, whose return value is returned
+                         instead of the QueryResult.
+     - chunk_size      - Minimum size in bytes of the chunks of queries
+                         handed to each worker process (default 4MB).
+     - max_pending     - Maximum number of chunks being parsed, or parsed but
+                         not yet returned (defaults to twice the number of
+                         processes).
+     - kwargs          - Format-specific keyword arguments.
+
+    The start of each query is found as for `index`, and chunks of whole
+    queries are parsed by a pool of worker processes using the
+    multiprocessing library. Without a reduce_function, this gives the same
+    QueryResult objects as `index` would:
+
+    >>> from Bio import SearchIO
+    >>> for qresult in SearchIO.parallel_parse('Blast/mirna.xml', 'blast-xml',
+    ...                                        processes=1):
+    ...     print("%s %i" % (qresult.id, len(qresult)))
+    ...
+    33211 100
+    33212 44
+    33213 95
+
+    As the results need to be pickled to return them from the worker
+    processes, only keeping what is needed with a reduce_function can save
+    a lot of time. This must be a function defined at the top level of a
+    module (not a lambda) so that it can be sent to the workers, e.g. to
+    keep only the best hit of each query:
+
+        def best_hit(qresult):
+            return qresult[:1]
+
+        for qresult in SearchIO.parallel_parse('Blast/mirna.xml', 'blast-xml',
+                                               reduce_function=best_hit):
+            ...
+
+    """
+    if not isinstance(filename, basestring):
+        raise TypeError("Need a filename (not a handle)")
+
+    from Bio._utils import pool_imap
+    from Bio.SearchIO import _index
+
+    proxy_class = get_processor(format, _INDEXER_MAP)
+    if chunk_size is None:
+        chunk_size = _index._PARALLEL_CHUNK_SIZE
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive, not %r" % chunk_size)
+    if processes is None:
+        import multiprocessing
+        processes = multiprocessing.cpu_count()
+    if max_pending is None:
+        max_pending = 2 * processes
+    if max_pending < 1:
+        raise ValueError("Maximum pending chunks must be positive, not %r"
+                         % max_pending)
+
+    indexer = proxy_class(filename, **kwargs)
+    try:
+        chunks = _index._query_chunks(indexer, chunk_size)
+        if processes < 2:
+            # a second handle, as the indexer reads the file as we go
+            reader = proxy_class(filename, **kwargs)
+            try:
+                for offsets in chunks:
+                    for result in _index._get_queries(reader, offsets,
+                                                      reduce_function):
+                        yield result
+            finally:
+                reader._handle.close()
+            return
+        tasks = ((proxy_class, filename, kwargs, offsets, reduce_function)
+                 for offsets in chunks)
+        results = pool_imap(_index._parse_queries, tasks, processes, ordered,
+                            max_pending)
+        try:
+            for chunk in results:
+                for result in chunk:
+                    yield result
+        finally:
+            # finish with the pool before closing the file it reads
+            results.close()
+    finally:
+        indexer._handle.close()
+
+
 def write(qresults, handle, format=None, **kwargs):
     """Writes QueryResult objects to a file in the given format.
 
@@ -30,3 +30,52 @@ class SearchIndexer(_IndexedSeqFileProxy):
 
     def get(self, offset):
         return self._parse(StringIO(_bytes_to_string(self.get_raw(offset))))
+
+
+# Default minimum size in bytes of the chunks of queries parsed by each
+# process in parallel_parse
+_PARALLEL_CHUNK_SIZE = 4 * 1024 * 1024
+
+# indexer kept open by each worker process, see _parse_queries
+_worker_indexer = (None, None)
+
+
+def _query_chunks(indexer, chunk_size):
+    """Group the query offsets from an indexer into chunks (PRIVATE).
+
+    Yields lists of the start offsets of consecutive queries, adding up to
+    at least chunk_size bytes (except the last chunk).
+    """
+    offsets = []
+    length = 0
+    for key, offset, query_length in indexer:
+        offsets.append(offset)
+        length += query_length
+        if length >= chunk_size:
+            yield offsets
+            offsets = []
+            length = 0
+    if offsets:
+        yield offsets
+
+
+def _parse_queries(task):
+    """Parse a chunk of queries, returning a list of results (PRIVATE).
+
+    The indexer is kept open between the chunks given to the same process.
+    """
+    global _worker_indexer
+    indexer_class, filename, kwargs, offsets, reduce_function = task
+    key = (indexer_class, filename, sorted(kwargs.items()))
+    if _worker_indexer[0] != key:
+        if _worker_indexer[1] is not None:
+            _worker_indexer[1]._handle.close()
+        _worker_indexer = (key, indexer_class(filename, **kwargs))
+    return _get_queries(_worker_indexer[1], offsets, reduce_function)
+
+
+def _get_queries(indexer, offsets, reduce_function=None):
+    """Parse the queries at the given offsets (PRIVATE)."""
+    if reduce_function is None:
+        return [indexer.get(offset) for offset in offsets]
+    return [reduce_function(indexer.get(offset)) for offset in offsets]
@@ -635,7 +635,8 @@ class HSPFragment(_BaseHSP):
     HSPFragment forms the core of any parsed search output file. Depending on
     the search output file format, it may contain the actual query and/or hit
     sequences that produces the search hits. These sequences are stored as
-    SeqRecord objects (see SeqRecord):
+    SeqRecord objects (see SeqRecord), which are only created when first
+    used if the sequences were given as strings:
 
     >>> from Bio import SearchIO
     >>> qresult = next(SearchIO.parse('Blast/mirna.xml', 'blast-xml'))
@@ -689,18 +690,21 @@ class HSPFragment(_BaseHSP):
         self._hit_id = hit_id
         self._query_id = query_id
 
-        for seq_type in ('query', 'hit'):
-            # query or hit attributes default attributes
-            setattr(self, '_%s_description' % seq_type, '<unknown description>')
-            setattr(self, '_%s_features' % seq_type, [])
-            # query or hit attributes whose default attribute is None
-            for attr in ('strand', 'frame', 'start', 'end'):
-                setattr(self, '%s_%s' % (seq_type, attr), None)
-            # self.query or self.hit
-            if eval(seq_type):
-                setattr(self, seq_type, eval(seq_type))
-            else:
-                setattr(self, seq_type, None)
+        # query and hit default attributes, set directly since the default
+        # values need no checking by the properties
+        self._query_description = '<unknown description>'
+        self._query_features = []
+        self._query_strand = self._query_frame = None
+        self._query_start = self._query_end = None
+        self._hit_description = '<unknown description>'
+        self._hit_features = []
+        self._hit_strand = self._hit_frame = None
+        self._hit_start = self._hit_end = None
+        self._query = self._hit = None
+        if query:
+            self.query = query
+        if hit:
+            self.hit = hit
 
     def __repr__(self):
         info = "hit_id=%r, query_id=%r" % (self.hit_id, self.query_id)
@@ -717,19 +721,25 @@ class HSPFragment(_BaseHSP):
         return self._str_hsp_header() + '\n' + self._str_aln()
 
     def __getitem__(self, idx):
-        if self.aln is not None:
+        if self._query is not None or self._hit is not None:
             obj = self.__class__(
                     hit_id=self.hit_id, query_id=self.query_id,
                     alphabet=self.alphabet)
             # transfer query and hit attributes
             # let SeqRecord handle feature slicing, then retrieve the sliced
             # features into the sliced HSPFragment
-            if self.query is not None:
-                obj.query = self.query[idx]
-                obj.query_features = obj.query.features
-            if self.hit is not None:
-                obj.hit = self.hit[idx]
-                obj.hit_features = obj.hit.features
+            for seq_type in ('query', 'hit'):
+                seq = getattr(self, '_%s' % seq_type)
+                if seq is None:
+                    continue
+                elif isinstance(seq, basestring) and \
+                        not getattr(self, '_%s_features' % seq_type):
+                    # not yet a SeqRecord, and no features to slice
+                    setattr(obj, seq_type, seq[idx])
+                else:
+                    seq = getattr(self, seq_type)[idx]
+                    setattr(obj, seq_type, seq)
+                    setattr(obj, '%s_features' % seq_type, seq.features)
             # description, strand, frame
             for attr in ('description', 'strand', 'frame'):
                 for seq_type in ('hit', 'query'):
@@ -800,6 +810,9 @@ class HSPFragment(_BaseHSP):
         :param seq_type: sequence type
         :type seq_type: string, choice of 'hit' or 'query'
 
+        Strings are returned as they are, and only turned into SeqRecord
+        objects by ``_get_seq`` when the sequence is first used.
+
         """
         assert seq_type in ('hit', 'query')
         if seq is None:
@@ -817,25 +830,34 @@ class HSPFragment(_BaseHSP):
                         "%r (%s); found: %r (%s)." % (len(opp_seq), opp_type,
                         len(seq), seq_type))
 
-        seq_id = getattr(self, '%s_id' % seq_type)
-        seq_desc = getattr(self, '%s_description' % seq_type)
-        seq_feats = getattr(self, '%s_features' % seq_type)
-        seq_name = 'aligned %s sequence' % seq_type
-
         if isinstance(seq, SeqRecord):
-            seq.id = seq_id
-            seq.description = seq_desc
-            seq.name = seq_name
-            seq.features = seq_feats
+            seq.id = getattr(self, '%s_id' % seq_type)
+            seq.description = getattr(self, '%s_description' % seq_type)
+            seq.name = 'aligned %s sequence' % seq_type
+            seq.features = getattr(self, '%s_features' % seq_type)
             seq.seq.alphabet = self.alphabet
-        elif isinstance(seq, basestring):
-            seq = SeqRecord(Seq(seq, self.alphabet), id=seq_id, name=seq_name,
-                    description=seq_desc, features=seq_feats)
 
         return seq
 
+    def _get_seq(self, seq_type):
+        """Returns the sequence as a SeqRecord, creating it if needed (PRIVATE).
+
+        :param seq_type: sequence type
+        :type seq_type: string, choice of 'hit' or 'query'
+
+        """
+        seq = getattr(self, '_%s' % seq_type)
+        if isinstance(seq, basestring):
+            seq = SeqRecord(Seq(seq, self.alphabet),
+                    id=getattr(self, '%s_id' % seq_type),
+                    name='aligned %s sequence' % seq_type,
+                    description=getattr(self, '%s_description' % seq_type),
+                    features=getattr(self, '%s_features' % seq_type))
+            setattr(self, '_%s' % seq_type, seq)
+        return seq
+
     def _hit_get(self):
-        return self._hit
+        return self._get_seq('hit')
 
     def _hit_set(self, value):
         self._hit = self._set_seq(value, 'hit')
@@ -844,7 +866,7 @@ class HSPFragment(_BaseHSP):
             doc="""Hit sequence as a SeqRecord object, defaults to None""")
 
     def _query_get(self):
-        return self._query
+        return self._get_seq('query')
 
     def _query_set(self, value):
         self._query = self._set_seq(value, 'query')
@@ -871,12 +893,13 @@ class HSPFragment(_BaseHSP):
 
     def _alphabet_set(self, value):
         self._alphabet = value
+        # sequences not yet turned into SeqRecords will use the new value
         try:
-            self.query.seq.alphabet = value
+            self._query.seq.alphabet = value
         except AttributeError:
             pass
         try:
-            self.hit.seq.alphabet = value
+            self._hit.seq.alphabet = value
         except AttributeError:
             pass
 
@@ -889,10 +912,10 @@ class HSPFragment(_BaseHSP):
         # alignment span can be its own attribute, or computed from
         # query / hit length
         if not hasattr(self, '_aln_span'):
-            if self.query is not None:
-                self._aln_span = len(self.query)
-            elif self.hit is not None:
-                self._aln_span = len(self.hit)
+            if self._query is not None:
+                self._aln_span = len(self._query)
+            elif self._hit is not None:
+                self._aln_span = len(self._hit)
 
         return self._aln_span
 
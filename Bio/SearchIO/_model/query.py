@@ -21,6 +21,14 @@ from ._base import _BaseSearchObject
 from .hit import Hit
 
 
+def _hit_id(hit):
+    """Returns the ID of a hit, the default hit key (PRIVATE).
+
+    Unlike a lambda, this allows QueryResult objects to be pickled.
+    """
+    return hit.id
+
+
 class QueryResult(_BaseSearchObject):
 
     """Class representing search results from a single query.
@@ -186,7 +194,7 @@ class QueryResult(_BaseSearchObject):
     _NON_STICKY_ATTRS = ('_items', '__alt_hit_ids', )
 
     def __init__(self, hits=(), id=None,
-            hit_key_function=lambda hit: hit.id):
+            hit_key_function=_hit_id):
         """Initializes a QueryResult object.
 
         :param id: query sequence ID
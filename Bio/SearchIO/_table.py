@@ -0,0 +1,524 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Columnar reader for tabular search outputs (requires NumPy).
+
+Parsing a large BLAST or HMMER table with Bio.SearchIO.parse creates a
+QueryResult, Hit, HSP and HSPFragment object for every row. When only a
+few numbers per row are needed (or only the best rows are wanted as
+objects), it is much faster to read the table into columns of NumPy
+arrays, one row per HSP, using the Bio.SearchIO.read_table function:
+
+>>> from Bio import SearchIO
+>>> table = SearchIO.read_table('Blast/mirna.tab', 'blast-tab', comments=True)
+>>> len(table)
+277
+>>> print(table.query_ids)
+['33211' '33212' '33213']
+>>> print(table.query_offsets)
+[  0 137 182 277]
+
+Each column is an array of integers, floats or strings, named after the
+columns in the file (for BLAST tables the short names used on the BLAST
+command line, e.g. 'evalue' or 'pident'):
+
+>>> print(table['sseqid'][:2])
+['gi|262205317|ref|NR_030195.1|' 'gi|301171311|ref|NR_035856.1|']
+>>> print(table['bitscore'][:2])
+[111. 109.]
+
+Filtering and picking the best hits per query are vectorized, giving new
+tables (here without the second query, which has no hits left), and
+QueryResult objects are only created when asked for:
+
+>>> best = table.filter(max_evalue=1e-20).best_hits()
+>>> print(best.query_ids)
+['33211' '33213']
+>>> for qresult in best.qresults():
+...     print("%s %s %s" % (qresult.id, qresult[0].id, qresult[0][0].evalue))
+...
+33211 gi|262205317|ref|NR_030195.1| 5e-23
+33213 gi|262206031|ref|NR_029826.1| 9e-26
+
+The supported formats are blast-tab, hmmer3-tab and the hmmer3 domain
+tables (hmmscan3-domtab, hmmsearch3-domtab and phmmer3-domtab). The
+column names of the HMMER tables follow the headers written by HMMER,
+see the _HMMER3_TAB_FIELDS and _HMMER3_DOMTAB_FIELDS lists.
+"""
+
+from __future__ import print_function
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.SearchIO.read_table.")
+
+from Bio._py3k import StringIO
+from Bio._py3k import basestring
+
+from Bio.SearchIO.BlastIO.blast_tab import BlastTabParser, _LONG_SHORT_MAP
+from Bio.SearchIO.BlastIO.blast_tab import _COLUMN_QRESULT, _COLUMN_HIT
+from Bio.SearchIO.BlastIO.blast_tab import _COLUMN_HSP, _COLUMN_FRAG
+from Bio.SearchIO.BlastIO.blast_tab import _DEFAULT_FIELDS
+from Bio.SearchIO.HmmerIO import Hmmer3TabParser
+from Bio.SearchIO.HmmerIO import Hmmer3DomtabHmmhitParser
+from Bio.SearchIO.HmmerIO import Hmmer3DomtabHmmqueryParser
+
+
+# column names and types of the hmmer3-tab format, in order
+_HMMER3_TAB_FIELDS = [
+    ('target_name', str), ('target_accession', str),
+    ('query_name', str), ('query_accession', str),
+    ('evalue', float), ('score', float), ('bias', float),
+    ('dom_evalue', float), ('dom_score', float), ('dom_bias', float),
+    ('exp', float), ('reg', int), ('clu', int), ('ov', int), ('env', int),
+    ('dom', int), ('rep', int), ('inc', int), ('description', str),
+]
+
+# column names and types of the hmmer3 domain table formats, in order
+_HMMER3_DOMTAB_FIELDS = [
+    ('target_name', str), ('target_accession', str), ('tlen', int),
+    ('query_name', str), ('query_accession', str), ('qlen', int),
+    ('evalue', float), ('score', float), ('bias', float),
+    ('dom_index', int), ('dom_count', int),
+    ('c_evalue', float), ('i_evalue', float),
+    ('dom_score', float), ('dom_bias', float),
+    ('hmm_from', int), ('hmm_to', int), ('ali_from', int), ('ali_to', int),
+    ('env_from', int), ('env_to', int), ('acc', float), ('description', str),
+]
+
+# per format: parser class, query and hit id columns (first one present is
+# used) and the columns used for the evalue, bitscore and identity filters
+_TABLE_FORMATS = {
+    'blast-tab': (BlastTabParser,
+                  ('qseqid', 'qacc', 'qaccver'),
+                  ('sseqid', 'sallseqid', 'sacc', 'saccver'),
+                  'evalue', 'bitscore', 'pident'),
+    'hmmer3-tab': (Hmmer3TabParser, ('query_name',), ('target_name',),
+                   'evalue', 'score', None),
+    'hmmscan3-domtab': (Hmmer3DomtabHmmhitParser,
+                        ('query_name',), ('target_name',),
+                        'i_evalue', 'dom_score', None),
+    'hmmsearch3-domtab': (Hmmer3DomtabHmmqueryParser,
+                          ('query_name',), ('target_name',),
+                          'i_evalue', 'dom_score', None),
+    'phmmer3-domtab': (Hmmer3DomtabHmmqueryParser,
+                       ('query_name',), ('target_name',),
+                       'i_evalue', 'dom_score', None),
+}
+
+# number of rows converted to arrays at a time
+_CHUNK_ROWS = 100000
+
+
+def _blast_field_type(field):
+    """Return the type (int, float or str) of a BLAST column (PRIVATE)."""
+    for mapping in (_COLUMN_QRESULT, _COLUMN_HIT, _COLUMN_HSP, _COLUMN_FRAG):
+        if field in mapping:
+            caster = mapping[field][1]
+            if caster in (int, float):
+                return caster
+    return str
+
+
+def _blast_fields(fields):
+    """Return the list of BLAST column names, expanding 'std' (PRIVATE)."""
+    if isinstance(fields, basestring):
+        fields = fields.strip().split(' ')
+    fields = list(fields)
+    if 'std' in fields:
+        idx = fields.index('std')
+        fields = fields[:idx] + _DEFAULT_FIELDS + fields[idx + 1:]
+    return fields
+
+
+def _first_column(names, columns):
+    """Return the first of the names which is a column (PRIVATE)."""
+    for name in names:
+        if name in columns:
+            return name
+    raise ValueError("Required query and/or hit ID field not found.")
+
+
+def _to_array(values, value_type):
+    """Convert a list of strings to an array of the given type (PRIVATE).
+
+    Columns which can't be converted (e.g. with 'N/A' values) are kept as
+    strings.
+    """
+    if value_type in (int, float):
+        dtype = numpy.int64 if value_type is int else numpy.float64
+        try:
+            return numpy.fromiter(map(value_type, values), dtype, len(values))
+        except ValueError:
+            pass
+    return numpy.array(values, dtype=str)
+
+
+def _format_value(value):
+    """Format a column value as written in a table (PRIVATE)."""
+    if isinstance(value, float):
+        # repr gives the shortest string parsed back to the same float
+        return repr(value)
+    return str(value)
+
+
+class SearchTable(object):
+    """Search results held in columns of NumPy arrays, one row per HSP.
+
+    Rows are grouped by query, the rows of query i being those from
+    query_offsets[i] to query_offsets[i + 1]. Use the read_table function
+    to create a SearchTable from a file.
+    """
+
+    def __init__(self, format, fields, columns, query_offsets, kwargs=None,
+                 query_comments=None):
+        """Initialize the class.
+
+        Arguments:
+         - format - the search output format (e.g. 'blast-tab').
+         - fields - list of the column names, in the file's order.
+         - columns - dictionary of the column names and arrays.
+         - query_offsets - array of the first row of each query, plus
+           the number of rows.
+         - kwargs - dictionary of arguments for the format's parser.
+         - query_comments - dictionary of the details from the comment
+           lines before each query (commented BLAST tables), keyed by
+           the query id.
+        """
+        self.format = format
+        self.fields = list(fields)
+        self.columns = columns
+        self.query_offsets = query_offsets
+        self._kwargs = kwargs or {}
+        self.query_comments = query_comments or {}
+        (self._parser, query_keys, hit_keys, self._evalue_key,
+         self._bitscore_key, self._identity_key) = _TABLE_FORMATS[format]
+        self._query_key = _first_column(query_keys, columns)
+        self._hit_key = _first_column(hit_keys, columns)
+
+    def __len__(self):
+        """Return the number of rows."""
+        return int(self.query_offsets[-1])
+
+    def __getitem__(self, name):
+        """Return the column array with the given name."""
+        return self.columns[name]
+
+    def __repr__(self):
+        """Return a short summary of the table."""
+        return "<%s %s table with %i rows for %i queries>" % (
+            self.__class__.__name__, self.format, len(self),
+            len(self.query_offsets) - 1)
+
+    @property
+    def query_ids(self):
+        """Array of the query identifiers."""
+        return self.columns[self._query_key][self.query_offsets[:-1]]
+
+    @property
+    def hit_ids(self):
+        """Array of the hit identifier of each row."""
+        return self.columns[self._hit_key]
+
+    def _score_column(self, key, name):
+        """Return the column used for filtering on a score (PRIVATE)."""
+        if key is None or key not in self.columns:
+            raise ValueError("No %s column in this %s table"
+                             % (name, self.format))
+        column = self.columns[key]
+        if column.dtype.kind not in "fi":
+            raise ValueError("The %s column is not numeric" % key)
+        return column
+
+    @property
+    def evalue(self):
+        """Array of the evalue of each row (the i-Evalue for domain tables)."""
+        return self._score_column(self._evalue_key, "evalue")
+
+    @property
+    def bitscore(self):
+        """Array of the bitscore of each row (domain score for domain tables)."""
+        return self._score_column(self._bitscore_key, "bitscore")
+
+    @property
+    def identity(self):
+        """Array of the percent identity of each row (BLAST tables only)."""
+        return self._score_column(self._identity_key, "identity")
+
+    def query_index(self):
+        """Return an array of the query number of each row."""
+        return numpy.repeat(numpy.arange(len(self.query_offsets) - 1),
+                            numpy.diff(self.query_offsets))
+
+    def take(self, rows):
+        """Return a new table with the given rows.
+
+        The rows can be given as an array of booleans (one per row), or an
+        array of row numbers in increasing order (so the rows stay grouped
+        by query). Queries without any rows are dropped.
+        """
+        rows = numpy.asarray(rows)
+        if rows.dtype == bool:
+            rows = numpy.flatnonzero(rows)
+        query_index = self.query_index()[rows]
+        starts = numpy.flatnonzero(query_index[1:] != query_index[:-1]) + 1
+        if len(rows):
+            offsets = numpy.concatenate(([0], starts, [len(rows)]))
+        else:
+            offsets = numpy.zeros(1)
+        columns = dict((name, column[rows])
+                       for name, column in self.columns.items())
+        return self.__class__(self.format, self.fields, columns,
+                              offsets.astype(numpy.int64), self._kwargs,
+                              self.query_comments)
+
+    def filter(self, max_evalue=None, min_bitscore=None, min_identity=None):
+        """Return a new table with only the rows passing the given cutoffs.
+
+        Arguments:
+         - max_evalue - keep rows with at most this evalue.
+         - min_bitscore - keep rows with at least this bitscore.
+         - min_identity - keep rows with at least this percent identity.
+        """
+        mask = numpy.ones(len(self), bool)
+        if max_evalue is not None:
+            mask &= self.evalue <= max_evalue
+        if min_bitscore is not None:
+            mask &= self.bitscore >= min_bitscore
+        if min_identity is not None:
+            mask &= self.identity >= min_identity
+        return self.take(mask)
+
+    def best_hits(self, n=1):
+        """Return a new table with the best scoring row of the top n hits.
+
+        For each query, the row (HSP) with the highest bitscore is found
+        for each hit, and the rows of the n hits with the highest scores
+        are kept (ties are broken by the evalue, then by the order in the
+        file). The rows are kept in the same order as in the file.
+        """
+        if n < 1:
+            raise ValueError("Number of hits must be positive, not %r" % n)
+        if not len(self):
+            return self.take(numpy.zeros(0, numpy.int64))
+        query_index = self.query_index()
+        bitscore = self.bitscore
+        try:
+            evalue = self.evalue
+        except ValueError:
+            # only break ties by the order in the file
+            evalue = numpy.zeros(len(self))
+        # best row for each (query, hit) pair
+        order = numpy.lexsort((evalue, -bitscore, self.hit_ids, query_index))
+        hit_ids = self.hit_ids[order]
+        queries = query_index[order]
+        first = numpy.ones(len(order), bool)
+        first[1:] = (hit_ids[1:] != hit_ids[:-1]) | \
+            (queries[1:] != queries[:-1])
+        best = order[first]
+        # rank those rows within each query
+        order = numpy.lexsort((best, evalue[best], -bitscore[best],
+                               query_index[best]))
+        best = best[order]
+        queries = query_index[best]
+        starts = numpy.flatnonzero(numpy.concatenate(
+            ([True], queries[1:] != queries[:-1])))
+        ranks = numpy.arange(len(best)) - numpy.repeat(
+            starts, numpy.diff(numpy.concatenate((starts, [len(best)]))))
+        return self.take(numpy.sort(best[ranks < n]))
+
+    def _lines(self, start, end):
+        """Return the rows from start to end as lines of text (PRIVATE)."""
+        values = [self.columns[name][start:end].tolist()
+                  for name in self.fields]
+        if self.format == 'blast-tab':
+            sep = '\t'
+        else:
+            sep = ' '
+        return ''.join(sep.join(_format_value(v) for v in row).rstrip() +
+                       '\n' for row in zip(*values))
+
+    def qresults(self):
+        """Iterate over the rows as QueryResult objects.
+
+        The objects are created by the usual Bio.SearchIO parser for the
+        format, one query at a time, so are the same as those from
+        Bio.SearchIO.parse (except that queries without any rows are
+        left out).
+        """
+        offsets = self.query_offsets.tolist()
+        for start, end in zip(offsets[:-1], offsets[1:]):
+            handle = StringIO(self._lines(start, end))
+            for qresult in self._parser(handle, **self._kwargs):
+                comments = self.query_comments.get(qresult.id, {})
+                for key, value in comments.items():
+                    setattr(qresult, key, value)
+                yield qresult
+
+
+def _parse_comment(line, comments):
+    """Add the details from a blast-tab comment line to a dict (PRIVATE).
+
+    This follows BlastTabParser._parse_comments.
+    """
+    line = line.strip()
+    if 'BLAST' in line and 'processed' not in line:
+        program_line = line[len(' #'):].split(' ')
+        comments['program'] = program_line[0].lower()
+        comments['version'] = program_line[1]
+    elif 'Query' in line:
+        query_line = line[len('# Query: '):].split(' ', 1)
+        comments['id'] = query_line[0]
+        if len(query_line) == 2:
+            comments['description'] = query_line[1]
+    elif 'Database' in line:
+        comments['target'] = line[len('# Database: '):]
+    elif 'RID' in line:
+        comments['rid'] = line[len('# RID: '):]
+    elif 'Fields' in line:
+        names = line[len('# Fields: '):].split(', ')
+        comments['fields'] = _blast_fields(
+            [_LONG_SHORT_MAP[name] for name in names])
+
+
+def _blast_tab_rows(handle, fields, query_comments=None):
+    """Iterate over the split rows of a blast-tab file (PRIVATE).
+
+    Yields the fields followed by the lists of column values of each row.
+    If a query_comments dictionary is given, the fields are taken from the
+    comment lines, and the details from the comments before each query's
+    rows are added to the dictionary (keyed by the query id).
+    """
+    if query_comments is None:
+        yield fields
+    comments = None
+    query_idx = None
+    for line in handle:
+        if line.startswith('#'):
+            if query_comments is not None:
+                if comments is None:
+                    comments = {}
+                _parse_comment(line, comments)
+            continue
+        line = line.strip()
+        if not line:
+            continue
+        if fields is None:
+            if comments is None or 'fields' not in comments:
+                raise ValueError("Fields comment line not found")
+            fields = comments['fields']
+            query_idx = fields.index(_first_column(
+                _TABLE_FORMATS['blast-tab'][1], fields))
+            yield fields
+        elif comments is not None and comments.get('fields', fields) != fields:
+            raise ValueError("All queries must have the same fields to be "
+                             "read as a table")
+        row = line.split('\t')
+        if len(row) != len(fields):
+            raise ValueError("Expected %i columns, found: %i"
+                             % (len(fields), len(row)))
+        if comments is not None:
+            query_comments[row[query_idx]] = comments
+            comments = None
+        yield row
+
+
+def _hmmer3_rows(handle, size):
+    """Iterate over the split rows of a hmmer3 table (PRIVATE).
+
+    The last (description) column may contain spaces, which are collapsed
+    as in the Bio.SearchIO parsers.
+    """
+    for line in handle:
+        if line.startswith('#'):
+            continue
+        row = line.split(None, size - 1)
+        if not row:
+            continue
+        if len(row) == size:
+            description = row[-1].rstrip()
+            if '  ' in description:
+                description = ' '.join(x for x in description.split(' ')
+                                       if x)
+            row[-1] = description
+        elif len(row) == size - 1:
+            row.append('')
+        else:
+            raise ValueError("Expected %i columns, found: %i"
+                             % (size, len(row)))
+        yield row
+
+
+def read_table(handle, format, **kwargs):
+    """Read a tabular search output into a SearchTable (PRIVATE).
+
+    This is called by Bio.SearchIO.read_table, which opens the handle.
+    """
+    if format == 'blast-tab':
+        if kwargs.get('comments', False):
+            # the fields come from the comment lines
+            fields = None
+            query_comments = {}
+        else:
+            fields = _blast_fields(kwargs.get('fields', _DEFAULT_FIELDS))
+            query_comments = None
+        rows = _blast_tab_rows(handle, fields, query_comments)
+        fields = next(rows, None)
+        if fields is None:
+            # commented file with no hits, use the default fields
+            fields = list(_DEFAULT_FIELDS)
+        types = [_blast_field_type(f) for f in fields]
+        # the table is turned back into rows of the given fields
+        parser_kwargs = {'fields': fields}
+    elif format in _TABLE_FORMATS:
+        if kwargs:
+            raise TypeError("Unexpected keyword arguments for %s: %s"
+                            % (format, ', '.join(sorted(kwargs))))
+        if format == 'hmmer3-tab':
+            field_types = _HMMER3_TAB_FIELDS
+        else:
+            field_types = _HMMER3_DOMTAB_FIELDS
+        fields = [f for f, t in field_types]
+        types = [t for f, t in field_types]
+        rows = _hmmer3_rows(handle, len(fields))
+        parser_kwargs = {}
+        query_comments = None
+    else:
+        raise ValueError("Unknown table format %r" % format)
+
+    # convert the rows to arrays a chunk at a time, by column
+    arrays = [[] for f in fields]
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == _CHUNK_ROWS:
+            for i, values in enumerate(zip(*chunk)):
+                arrays[i].append(_to_array(values, types[i]))
+            chunk = []
+    if chunk or not arrays[0]:
+        for i, values in enumerate(zip(*chunk) if chunk else arrays):
+            arrays[i].append(_to_array(list(values), types[i]))
+    columns = {}
+    for name, column in zip(fields, arrays):
+        if len(set(a.dtype.kind for a in column)) > 1:
+            # some chunks could not be converted to numbers
+            column = [a.astype(str) for a in column]
+        columns[name] = numpy.concatenate(column)
+
+    query_ids = columns[_first_column(_TABLE_FORMATS[format][1], columns)]
+    starts = numpy.flatnonzero(query_ids[1:] != query_ids[:-1]) + 1
+    if len(query_ids):
+        offsets = numpy.concatenate(([0], starts, [len(query_ids)]))
+    else:
+        offsets = numpy.zeros(1)
+    return SearchTable(format, fields, columns, offsets.astype(numpy.int64),
+                       parser_kwargs, query_comments)
+
+
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+    run_doctest()
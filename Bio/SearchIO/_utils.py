@@ -125,8 +125,10 @@ def fragcascade(attr, seq_type, doc=''):
 
     def setter(self, value):
         setattr(self, attr_name, value)
-        seq = getattr(self, seq_type)
-        if seq is not None:
+        # sequences still stored as strings pick up the value when they
+        # are turned into SeqRecord objects
+        seq = getattr(self, '_%s' % seq_type)
+        if seq is not None and not isinstance(seq, basestring):
             setattr(seq, attr, value)
 
     return property(fget=getter, fset=setter, doc=doc)
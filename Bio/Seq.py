@@ -19,10 +19,16 @@ from __future__ import print_function
 
 import string  # for maketrans only
 import array
+import binascii
+import bisect
+import re
 import sys
 import warnings
+import weakref
 
 from Bio._py3k import range
+from Bio._py3k import zip
+from Bio._py3k import map
 from Bio._py3k import basestring
 
 from Bio import BiopythonWarning
@@ -1551,6 +1557,531 @@ class UnknownSeq(Seq):
             return Seq("", s.alphabet)
 
 
+def _reverse_packed_codes(byte):
+    """Reverse the order of the four 2-bit codes in a byte (PRIVATE)."""
+    return (((byte & 3) << 6) | ((byte & 12) << 2) |
+            ((byte & 48) >> 2) | (byte >> 6))
+
+
+# Lookup tables used by the PackedSeq class, where A, C, G and T (or U)
+# are stored as 0, 1, 2 and 3, four to a byte with the first base in the
+# two most significant bits.  Complementing a base is then 3 - code, and
+# complementing a whole byte is 255 - byte.
+_PACKED_LETTERS = dict((letters, _maketrans(dict(zip(letters + "456789",
+                                                      "0123XXXXXX"))))
+                       for letters in ("ACGT", "ACGU"))
+_UNPACKED_BYTES = dict((letters, [a + b + c + d
+                                  for a in letters for b in letters
+                                  for c in letters for d in letters])
+                       for letters in _PACKED_LETTERS)
+_PACKED_COMPLEMENT = bytes(bytearray(255 - b for b in range(256)))
+_PACKED_REVERSE_COMPLEMENT = bytes(bytearray(_reverse_packed_codes(255 - b)
+                                             for b in range(256)))
+_UNPACKED_RUNS = {"ACGT": re.compile("[^ACGT]+"),
+                  "ACGU": re.compile("[^ACGU]+")}
+_LOWER_CASE_RUNS = re.compile("[a-z]+")
+_NON_DIGITS = re.compile("[^0-3]+")
+
+
+def _find_runs(regex, text, keep_text=True):
+    """Find the runs matching a regular expression in a string (PRIVATE).
+
+    Returns a tuple of two arrays (run starts and ends), plus a list of the
+    matching text if keep_text is True, where runs of a single repeated
+    letter (e.g. NNNNN) are recorded using just that letter.
+    """
+    starts = array.array("l")
+    ends = array.array("l")
+    texts = []
+    for match in regex.finditer(text):
+        starts.append(match.start())
+        ends.append(match.end())
+        if keep_text:
+            run = match.group()
+            if run.count(run[0]) == len(run):
+                run = run[0]
+            texts.append(run)
+    if keep_text:
+        return starts, ends, texts
+    return starts, ends
+
+
+def _clip_runs(runs, start, end):
+    """Return the runs overlapping start:end, relative to start (PRIVATE)."""
+    starts = runs[0]
+    ends = runs[1]
+    new_starts = array.array("l")
+    new_ends = array.array("l")
+    new_texts = []
+    for i in range(bisect.bisect_right(ends, start),
+                   bisect.bisect_left(starts, end)):
+        run_start = max(starts[i], start)
+        run_end = min(ends[i], end)
+        new_starts.append(run_start - start)
+        new_ends.append(run_end - start)
+        if len(runs) == 3:
+            text = runs[2][i]
+            if len(text) > 1:
+                text = text[run_start - starts[i]:run_end - starts[i]]
+            new_texts.append(text)
+    if len(runs) == 3:
+        return new_starts, new_ends, new_texts
+    return new_starts, new_ends
+
+
+def _reverse_runs(runs, length, table=None):
+    """Return the runs mirrored for the reverse strand (PRIVATE)."""
+    starts = array.array("l", (length - end for end in reversed(runs[1])))
+    ends = array.array("l", (length - start for start in reversed(runs[0])))
+    if len(runs) == 3:
+        return starts, ends, [text[::-1].translate(table)
+                              for text in reversed(runs[2])]
+    return starts, ends
+
+
+def _apply_runs(text, runs, function):
+    """Replace the runs in a string using the given function (PRIVATE).
+
+    The function is called with the run's index, start and end (relative
+    to the string), and should return the replacement text of that length.
+    """
+    pieces = []
+    pos = 0
+    for i, (start, end) in enumerate(zip(runs[0], runs[1])):
+        pieces.append(text[pos:start])
+        pieces.append(function(i, start, end))
+        pos = end
+    if not pieces:
+        return text
+    pieces.append(text[pos:])
+    return "".join(pieces)
+
+
+class PackedSeq(Seq):
+    """A read-only nucleotide sequence stored using two bits per base.
+
+    Holding large genomes in memory as ordinary Seq objects costs one byte
+    per base.  The PackedSeq stores the four unambiguous bases (A, C, G
+    and T, or U for RNA) using two bits each, with any runs of other
+    letters (such as N, ambiguity codes or gaps) and of lower case letters
+    (such as soft masking) recorded separately:
+
+    >>> from Bio.Seq import PackedSeq
+    >>> from Bio.Alphabet import generic_dna
+    >>> my_dna = PackedSeq("ACGTNNNNNNacgtRYACGTA", generic_dna)
+    >>> my_dna
+    PackedSeq('ACGTNNNNNNacgtRYACGTA', DNAAlphabet())
+    >>> len(my_dna)
+    21
+
+    It can be used just like a Seq object, and slicing, complement and
+    reverse complement all work on the packed form, returning another
+    PackedSeq object:
+
+    >>> my_dna[4:12]
+    PackedSeq('NNNNNNac', DNAAlphabet())
+    >>> my_dna.reverse_complement()
+    PackedSeq('TACGTRYacgtNNNNNNACGT', DNAAlphabet())
+    >>> my_dna.count("A"), my_dna.find("acgt")
+    (3, 10)
+    >>> my_dna[:12].translate()
+    Seq('TXXX', ExtendedIUPACProtein())
+
+    You can also pack an existing Seq (e.g. a SeqRecord's seq property as
+    parsed from a FASTA file), in which case its alphabet is used:
+
+    >>> from Bio.Seq import Seq
+    >>> from Bio.Alphabet import generic_rna
+    >>> PackedSeq(Seq("AUGGCCAUUGUA", generic_rna)).complement()
+    PackedSeq('UACCGGUAACAU', RNAAlphabet())
+
+    Other methods (like upper and transcribe) unpack the sequence, and
+    return an ordinary Seq object.
+    """
+    def __init__(self, data, alphabet=None):
+        """Create a new PackedSeq object.
+
+        Arguments:
+            - data - Sequence, required (string or Seq object)
+            - alphabet - Optional argument, an Alphabet object from
+              Bio.Alphabet, defaults to that of a Seq object given,
+              otherwise to generic DNA
+
+        Protein alphabets are not allowed.
+        """
+        if isinstance(data, Seq):
+            if alphabet is None:
+                alphabet = data.alphabet
+            data = str(data)
+        elif not isinstance(data, basestring):
+            raise TypeError("The sequence data given to a PackedSeq object "
+                            "should be a string or Seq object")
+        if alphabet is None:
+            alphabet = Alphabet.generic_dna
+        base = Alphabet._get_base_alphabet(alphabet)
+        if isinstance(base, Alphabet.ProteinAlphabet):
+            raise ValueError("Proteins cannot be packed as nucleotides!")
+        self.alphabet = alphabet
+        upper = data.upper()
+        if isinstance(base, Alphabet.RNAAlphabet):
+            self._letters = "ACGU"
+        elif isinstance(base, Alphabet.DNAAlphabet):
+            self._letters = "ACGT"
+        elif "U" in upper and "T" not in upper:
+            self._letters = "ACGU"
+        else:
+            self._letters = "ACGT"
+        self._length = len(data)
+        self._offset = 0
+        # Other digits are mapped to X, so this will only contain digits if
+        # all the letters could be packed:
+        digits = upper.translate(_PACKED_LETTERS[self._letters])
+        if digits.isdigit() or not digits:
+            self._runs = (array.array("l"), array.array("l"), [])
+        else:
+            self._runs = _find_runs(_UNPACKED_RUNS[self._letters], upper)
+            digits = _NON_DIGITS.sub(lambda m: "0" * len(m.group()), digits)
+        if data != upper:
+            self._lower = _find_runs(_LOWER_CASE_RUNS, data, False)
+        else:
+            self._lower = (array.array("l"), array.array("l"))
+        digits += "0" * (-len(digits) % 4)
+        if digits:
+            # Python parses (and formats) power of two bases in linear time,
+            # each hexadecimal digit here holding two bases:
+            self._packed = binascii.unhexlify("%0*x" % (len(digits) // 2,
+                                                        int(digits, 4)))
+        else:
+            self._packed = b""
+
+    def _new(self, packed, offset, length, runs, lower):
+        """Create a PackedSeq from already packed data (PRIVATE)."""
+        answer = PackedSeq.__new__(PackedSeq)
+        answer.alphabet = self.alphabet
+        answer._letters = self._letters
+        answer._packed = packed
+        answer._offset = offset
+        answer._length = length
+        answer._runs = runs
+        answer._lower = lower
+        return answer
+
+    def _unpack(self, start, end):
+        """Returns the string for the region start:end (PRIVATE)."""
+        offset = self._offset + start
+        last = (self._offset + end + 3) // 4
+        data = bytearray(self._packed[offset // 4:last])
+        text = "".join(map(_UNPACKED_BYTES[self._letters].__getitem__, data))
+        text = text[offset % 4:offset % 4 + end - start]
+        runs = _clip_runs(self._runs, start, end)
+        texts = runs[2]
+        text = _apply_runs(text, runs,
+                           lambda i, s, e: texts[i] * (e - s)
+                           if len(texts[i]) == 1 else texts[i])
+        return _apply_runs(text, _clip_runs(self._lower, start, end),
+                           lambda i, s, e: text[s:e].lower())
+
+    def __len__(self):
+        """Returns the length of the sequence, use len(my_seq)."""
+        return self._length
+
+    def __str__(self):
+        """Returns the full sequence as a python string, use str(my_seq)."""
+        return self._unpack(0, self._length)
+
+    def __repr__(self):
+        """Return (truncated) representation of the sequence for debugging."""
+        if len(self) > 60:
+            # Unpack only the parts shown, as in the Seq object's __repr__
+            return "{0}('{1}...{2}', {3!r})".format(self.__class__.__name__,
+                                                    self._unpack(0, 54),
+                                                    self._unpack(len(self) - 3,
+                                                                 len(self)),
+                                                    self.alphabet)
+        else:
+            return "{0}({1!r}, {2!r})".format(self.__class__.__name__,
+                                              str(self),
+                                              self.alphabet)
+
+    def __getitem__(self, index):
+        """Returns a subsequence of single letter, use my_seq[index].
+
+        Slices with a step of one are returned as a new PackedSeq object,
+        sharing no data with the original, while other steps return an
+        ordinary Seq object:
+
+        >>> from Bio.Seq import PackedSeq
+        >>> my_dna = PackedSeq("ACGTTTGNNAC")
+        >>> my_dna[2:-2]
+        PackedSeq('GTTTGNN', DNAAlphabet())
+        >>> my_dna[-3]
+        'N'
+        >>> my_dna[::2]
+        Seq('AGTGNC', DNAAlphabet())
+        """
+        if isinstance(index, int):
+            if index < 0:
+                index += self._length
+            if not 0 <= index < self._length:
+                raise IndexError("sequence index out of range")
+            return self._unpack(index, index + 1)
+        start, end, step = index.indices(self._length)
+        if step != 1:
+            return Seq(str(self)[index], self.alphabet)
+        end = max(start, end)
+        offset = self._offset + start
+        last = (self._offset + end + 3) // 4
+        return self._new(self._packed[offset // 4:last],
+                         offset % 4, end - start,
+                         _clip_runs(self._runs, start, end),
+                         _clip_runs(self._lower, start, end))
+
+    def _get_complement_table(self):
+        """Returns the complement table and letters to use (PRIVATE).
+
+        As in the Seq object, unless the alphabet says if this is DNA or RNA
+        the sequence itself must be checked for T and U.
+        """
+        base = Alphabet._get_base_alphabet(self.alphabet)
+        if isinstance(base, Alphabet.DNAAlphabet):
+            return _dna_complement_table, "ACGT"
+        elif isinstance(base, Alphabet.RNAAlphabet):
+            return _rna_complement_table, "ACGU"
+        data = str(self).upper()
+        if "U" in data and "T" in data:
+            # TODO - Handle this cleanly?
+            raise ValueError("Mixed RNA/DNA found")
+        elif "U" in data:
+            return _rna_complement_table, "ACGU"
+        return _dna_complement_table, "ACGT"
+
+    def complement(self):
+        """Returns the complement sequence. New PackedSeq object.
+
+        >>> from Bio.Seq import PackedSeq
+        >>> PackedSeq("CCCCCgatA-GD").complement()
+        PackedSeq('GGGGGctaT-CH', DNAAlphabet())
+        """
+        table, letters = self._get_complement_table()
+        starts, ends, texts = self._runs
+        answer = self._new(self._packed.translate(_PACKED_COMPLEMENT),
+                           self._offset, self._length,
+                           (starts, ends, [text.translate(table)
+                                           for text in texts]),
+                           self._lower)
+        answer._letters = letters
+        return answer
+
+    def reverse_complement(self):
+        """Returns the reverse complement sequence. New PackedSeq object.
+
+        >>> from Bio.Seq import PackedSeq
+        >>> PackedSeq("CCCCCgatA-G").reverse_complement()
+        PackedSeq('C-TatcGGGGG', DNAAlphabet())
+        """
+        table, letters = self._get_complement_table()
+        packed = self._packed[::-1].translate(_PACKED_REVERSE_COMPLEMENT)
+        answer = self._new(packed,
+                           4 * len(packed) - self._offset - self._length,
+                           self._length,
+                           _reverse_runs(self._runs, self._length, table),
+                           _reverse_runs(self._lower, self._length))
+        answer._letters = letters
+        return answer
+
+
+class SeqView(Seq):
+    """A read-only sequence sharing the data of a (large) string or buffer.
+
+    Slicing an ordinary Seq object copies the selected letters into a new
+    string.  When tiling windows over a chromosome this means allocating
+    lots of temporary strings, which a SeqView avoids.  It wraps a string,
+    or an object supporting the buffer protocol (such as bytes, bytearray
+    or a memory mapped file), and records the start and end of the region
+    used:
+
+    >>> from Bio.Seq import SeqView
+    >>> from Bio.Alphabet import generic_dna
+    >>> data = bytearray(b"GATCCTCCATATACAACGGTATCTCCACCTCAGGTTTAGATCTC")
+    >>> my_dna = SeqView(data, generic_dna)
+    >>> my_dna
+    SeqView('GATCCTCCATATACAACGGTATCTCCACCTCAGGTTTAGATCTC', DNAAlphabet())
+
+    Slices (with a step of one) return another SeqView using the same data,
+    and the count, find and rfind methods search it in place:
+
+    >>> window = my_dna[10:20]
+    >>> window
+    SeqView('ATACAACGGT', DNAAlphabet())
+    >>> window.count("A"), window.find("CGG"), window.rfind("A", 0, 5)
+    (4, 6, 4)
+
+    The letters are only copied into a new python string when materialized,
+    for example via str(window), or by methods like translate or complement
+    which return an ordinary Seq object:
+
+    >>> window.complement()
+    Seq('TATGTTGCCA', DNAAlphabet())
+
+    Note that changing a mutable buffer (like the bytearray here) will also
+    change the SeqView objects using it.
+    """
+    def __init__(self, data, alphabet=Alphabet.generic_alphabet,
+                 start=0, end=None):
+        """Create a new SeqView object.
+
+        Arguments:
+            - data - Sequence, required (a string, or an object supporting
+              the buffer protocol holding ASCII letters)
+            - alphabet - Optional argument, an Alphabet object from
+              Bio.Alphabet
+            - start - Optional argument, start of the region used
+            - end - Optional argument, end of the region used (defaults
+              to the end of the data)
+        """
+        if not isinstance(data, basestring):
+            try:
+                memoryview(data)
+            except TypeError:
+                raise TypeError("The sequence data given to a SeqView object "
+                                "should be a string or support the buffer "
+                                "protocol (e.g. bytes, bytearray or mmap)")
+        self._buffer = data
+        self._start, self._end, step = slice(start, end).indices(len(data))
+        self._end = max(self._start, self._end)
+        self.alphabet = alphabet
+
+    def _text(self, start, end):
+        """Returns the data from start to end as a python string (PRIVATE).
+
+        The start and end are relative to the underlying buffer.
+        """
+        data = self._buffer[start:end]
+        if isinstance(data, bytearray):
+            data = bytes(data)
+        if not isinstance(data, str):
+            # Bytes under Python 3
+            data = data.decode("ascii")
+        return data
+
+    def _encode(self, sub_str):
+        """Returns the search string in the same type as the data (PRIVATE)."""
+        if isinstance(self._buffer, basestring) or isinstance(sub_str, bytes):
+            return sub_str
+        return sub_str.encode("ascii")
+
+    def __len__(self):
+        """Returns the length of the sequence, use len(my_seq)."""
+        return self._end - self._start
+
+    def __str__(self):
+        """Returns the full sequence as a python string, use str(my_seq)."""
+        return self._text(self._start, self._end)
+
+    def __repr__(self):
+        """Return (truncated) representation of the sequence for debugging."""
+        if len(self) > 60:
+            # Copy only the parts shown, as in the Seq object's __repr__
+            return "{0}('{1}...{2}', {3!r})".format(
+                self.__class__.__name__,
+                self._text(self._start, self._start + 54),
+                self._text(self._end - 3, self._end),
+                self.alphabet)
+        else:
+            return "{0}({1!r}, {2!r})".format(self.__class__.__name__,
+                                              str(self),
+                                              self.alphabet)
+
+    def __getitem__(self, index):
+        """Returns a subsequence of single letter, use my_seq[index].
+
+        Slices with a step of one are returned as a new SeqView object
+        sharing the same data, while other steps return an ordinary Seq
+        object:
+
+        >>> from Bio.Seq import SeqView
+        >>> my_dna = SeqView(b"ACGTTTGNNAC")
+        >>> my_dna[2:-2]
+        SeqView('GTTTGNN', Alphabet())
+        >>> my_dna[-3]
+        'N'
+        >>> my_dna[::2]
+        Seq('AGTGNC', Alphabet())
+        """
+        if isinstance(index, int):
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError("sequence index out of range")
+            index += self._start
+            return self._text(index, index + 1)
+        start, end, step = index.indices(len(self))
+        if step != 1:
+            return Seq(str(self)[index], self.alphabet)
+        return SeqView(self._buffer, self.alphabet,
+                       self._start + start, self._start + max(start, end))
+
+    def _search(self, method, sub, start, end):
+        """Run a string search method on the underlying data (PRIVATE).
+
+        Returns the result of the method, using start and end relative to
+        this sequence, or None if not possible without copying the data.
+        """
+        sub_str = self._get_seq_str_and_check_alphabet(sub)
+        if not sub_str or not hasattr(self._buffer, method):
+            # An empty string has special rules about the start and end
+            return None
+        start, end, step = slice(start, end).indices(len(self))
+        return getattr(self._buffer, method)(self._encode(sub_str),
+                                             self._start + start,
+                                             self._start + end)
+
+    def count(self, sub, start=0, end=sys.maxsize):
+        """Non-overlapping count method, like that of a python string.
+
+        This behaves like the Seq object's method of the same name, but
+        where possible counts using the underlying data directly.
+        """
+        answer = self._search("count", sub, start, end)
+        if answer is None:
+            return Seq.count(self, sub, start, end)
+        return answer
+
+    def find(self, sub, start=0, end=sys.maxsize):
+        """Find method, like that of a python string.
+
+        This behaves like the Seq object's method of the same name, but
+        where possible searches the underlying data directly.
+        """
+        answer = self._search("find", sub, start, end)
+        if answer is None:
+            return Seq.find(self, sub, start, end)
+        elif answer == -1:
+            return -1
+        return answer - self._start
+
+    def rfind(self, sub, start=0, end=sys.maxsize):
+        """Find from right method, like that of a python string.
+
+        This behaves like the Seq object's method of the same name, but
+        where possible searches the underlying data directly.
+        """
+        answer = self._search("rfind", sub, start, end)
+        if answer is None:
+            return Seq.rfind(self, sub, start, end)
+        elif answer == -1:
+            return -1
+        return answer - self._start
+
+    def __contains__(self, char):
+        """Implements the 'in' keyword, searching the underlying data."""
+        return self.find(char) != -1
+
+    def complement(self):
+        """Returns the complement sequence. New Seq object."""
+        return Seq(str(self), self.alphabet).complement()
+
+
 class MutableSeq(object):
     """An editable sequence object (with an alphabet).
 
@@ -2001,6 +2532,69 @@ def back_transcribe(rna):
         return rna.replace('U', 'T').replace('u', 't')
 
 
+# Private markers used in the codon lookups for (possible) stop codons,
+# replaced by the requested symbols once a whole sequence is translated.
+_STOP_MARKER = "\x00"
+_POS_STOP_MARKER = "\x01"
+
+
+class _CodonLookup(dict):
+    """Precompiled codon to amino acid mapping for a CodonTable (PRIVATE).
+
+    Keys are tuples of three upper case letters (as produced by zipping
+    an iterator over the sequence with itself), values are single
+    character strings: the amino acid, or one of the private stop and
+    possible stop markers.  Entries are computed on first use following
+    the same rules as the codon by codon translation, so each ambiguous
+    codon only needs to be expanded once per table.  Invalid codons are
+    not cached and raise a KeyError.
+    """
+
+    def __init__(self, table, gap=None):
+        dict.__init__(self)
+        self.table = table
+        self.gap = gap
+        if table.nucleotide_alphabet.letters is not None:
+            self.valid_letters = set(
+                table.nucleotide_alphabet.letters.upper())
+        else:
+            # Assume the worst case, ambiguous DNA or RNA:
+            self.valid_letters = set(IUPAC.ambiguous_dna.letters.upper() +
+                                     IUPAC.ambiguous_rna.letters.upper())
+
+    def __missing__(self, key):
+        codon = "".join(key)
+        try:
+            amino_acid = self.table.forward_table[codon]
+        except (KeyError, CodonTable.TranslationError):
+            if codon in self.table.stop_codons:
+                amino_acid = _STOP_MARKER
+            elif self.valid_letters.issuperset(key):
+                amino_acid = _POS_STOP_MARKER
+            elif self.gap is not None and codon == self.gap * 3:
+                amino_acid = self.gap
+            else:
+                raise KeyError(codon)
+        self[key] = amino_acid
+        return amino_acid
+
+
+_codon_lookups = weakref.WeakKeyDictionary()
+
+
+def _get_codon_lookup(table, gap=None):
+    """Return the cached _CodonLookup for this table and gap (PRIVATE)."""
+    try:
+        lookups = _codon_lookups[table]
+    except KeyError:
+        lookups = _codon_lookups[table] = {}
+    try:
+        return lookups[gap]
+    except KeyError:
+        lookup = lookups[gap] = _CodonLookup(table, gap)
+        return lookup
+
+
 def _translate_str(sequence, table, stop_symbol="*", to_stop=False,
                    cds=False, pos_stop="X", gap=None):
     """Helper function to translate a nucleotide string (PRIVATE).
@@ -2101,6 +2695,27 @@ def _translate_str(sequence, table, stop_symbol="*", to_stop=False,
             raise ValueError("Gap character should be a single character "
                              "string.")
 
+    # Translate all the codons in one go using the precompiled lookup,
+    # falling back on the codon by codon loop below only to report
+    # invalid codons (unless translation stopped before reaching them).
+    lookup = _get_codon_lookup(table, gap)
+    codons = iter(sequence)
+    try:
+        protein = "".join(map(lookup.__getitem__,
+                              zip(codons, codons, codons)))
+    except KeyError:
+        pass
+    else:
+        if _STOP_MARKER in protein:
+            if cds:
+                raise CodonTable.TranslationError(
+                    "Extra in frame stop codon found.")
+            if to_stop:
+                protein = protein[:protein.index(_STOP_MARKER)]
+            protein = protein.replace(_STOP_MARKER, stop_symbol)
+        protein = protein.replace(_POS_STOP_MARKER, pos_stop)
+        return "".join(amino_acids) + protein
+
     for i in range(0, n - n % 3, 3):
         codon = sequence[i:i + 3]
         try:
@@ -42,6 +42,7 @@ classes:
 
     - FeatureLocation - Specify the start and end location of a feature.
     - CompoundLocation - Collection of FeatureLocation objects (for joins etc).
+    - FeatureIndex - Index of features by location, for overlap queries.
 
     - ExactPosition - Specify the position as being exact.
     - WithinPosition - Specify a position occurring within some range.
@@ -54,12 +55,34 @@ classes:
 
 from __future__ import print_function
 
+import bisect
 from collections import OrderedDict
 
 from Bio._py3k import _is_int_or_long
 
 from Bio.Seq import MutableSeq, reverse_complement
 
+# Recently used ExactPosition objects, which are immutable so can be shared
+# (e.g. by a gene and its CDS, or by the features of a sliced record)
+_exact_positions = {}
+_EXACT_POSITIONS_SIZE = 4096
+
+
+def _getstate(self):
+    """Return the attributes of an object with __slots__, to pickle (PRIVATE)."""
+    state = dict(getattr(self, "__dict__", ()))
+    for cls in type(self).__mro__:
+        for name in cls.__dict__.get("__slots__", ()):
+            if name != "__dict__" and hasattr(self, name):
+                state[name] = getattr(self, name)
+    return state
+
+
+def _setstate(self, state):
+    """Restore the attributes of an object using __slots__ (PRIVATE)."""
+    for name, value in state.items():
+        object.__setattr__(self, name, value)
+
 
 class SeqFeature(object):
     """Represent a Sequence Feature on an object.
@@ -90,6 +113,12 @@ class SeqFeature(object):
           values. As of Biopython 1.69 this is an ordered dictionary.
     """
 
+    # Other attributes can still be added, but most features need no __dict__
+    __slots__ = ("location", "type", "id", "qualifiers", "__dict__")
+
+    __getstate__ = _getstate
+    __setstate__ = _setstate
+
     def __init__(self, location=None, type='', location_operator='',
                  strand=None, id="<unknown id>",
                  qualifiers=None, sub_features=None,
@@ -588,6 +617,11 @@ class FeatureLocation(object):
     would use a BeforePosition object for the start.
     """
 
+    __slots__ = ("_start", "_end", "_strand", "ref", "ref_db")
+
+    __getstate__ = _getstate
+    __setstate__ = _setstate
+
     def __init__(self, start, end, strand=None, ref=None, ref_db=None):
         """Specify the start, end, strand etc of a sequence feature.
 
@@ -948,6 +982,11 @@ class FeatureLocation(object):
 class CompoundLocation(object):
     """For handling joins etc where a feature location has several parts."""
 
+    __slots__ = ("operator", "parts")
+
+    __getstate__ = _getstate
+    __setstate__ = _setstate
+
     def __init__(self, parts, operator="join"):
         """Create a compound location with several parts.
 
@@ -1316,9 +1355,221 @@ class CompoundLocation(object):
         return f_seq
 
 
+def _entry_key(entry):
+    """Sort key for the FeatureIndex entries, ignoring the strand (PRIVATE)."""
+    return entry[:3]
+
+
+class FeatureIndex(object):
+    """Index of a list of features by location, for fast overlap queries.
+
+    This groups the features by the length of their locations (in powers
+    of two), each group sorted by start position, so that finding the
+    features which overlap a region only looks at features starting
+    shortly before or within it, rather than every feature.
+
+    >>> features = [SeqFeature(FeatureLocation(0, 100, 1), id="gene"),
+    ...             SeqFeature(FeatureLocation(10, 20, 1), id="cds1"),
+    ...             SeqFeature(FeatureLocation(50, 70, -1), id="cds2"),
+    ...             SeqFeature(FeatureLocation(80, 90) + FeatureLocation(110, 120),
+    ...                        id="cds3")]
+    >>> index = FeatureIndex(features)
+    >>> [f.id for f in index.overlap(60, 100)]
+    ['gene', 'cds2', 'cds3']
+    >>> [f.id for f in index.overlap(60, 100, strand=-1)]
+    ['cds2']
+    >>> [f.id for f in index.contained(5, 80)]
+    ['cds1', 'cds2']
+    >>> [f.id for f in index.containing(15, 16)]
+    ['gene', 'cds1']
+    >>> [f.id for f in index.nearest(105)]
+    ['cds3']
+
+    The parts of a compound location are indexed separately, so a feature
+    does not overlap a region which falls within one of its introns:
+
+    >>> [f.id for f in index.overlap(95, 105)]
+    ['gene']
+
+    Features without a location, or referencing other sequences, are left
+    out. The index does not follow later changes to the features, so must
+    be rebuilt if they are modified (see also the feature_index property
+    of the SeqRecord object, which does this automatically when features
+    are added, removed or replaced).
+    """
+
+    def __init__(self, features):
+        """Index the features (a list of SeqFeature objects)."""
+        self.features = features = list(features)
+        self._remote = []
+        parts = []
+        spans = []
+        for i, feature in enumerate(features):
+            location = feature.location
+            if location is None:
+                continue
+            if feature.ref or feature.ref_db:
+                self._remote.append(i)
+                continue
+            start = location.nofuzzy_start
+            end = location.nofuzzy_end
+            if start is None or end is None:
+                continue
+            spans.append((start, end, i, location.strand))
+            for part in location.parts:
+                if part.ref or part.ref_db:
+                    continue
+                start = part.nofuzzy_start
+                end = part.nofuzzy_end
+                if start is not None and end is not None:
+                    parts.append((start, end, i, part.strand))
+        self._spans = self._group(spans)
+        self._parts = self._group(parts)
+        parts.sort(key=_entry_key)
+        self._starts = [entry[0] for entry in parts]
+        self._by_start = parts
+        # For finding the nearest feature, an empty part counts as one base
+        self._by_end = sorted(parts,
+                              key=lambda entry: max(entry[1], entry[0] + 1))
+        self._ends = [max(entry[1], entry[0] + 1) for entry in self._by_end]
+
+    def _group(self, entries):
+        """Group (start, end, index, strand) tuples by length (PRIVATE).
+
+        Returns a list of tuples of the shortest and longest possible length
+        in each group, the sorted start positions, and the entries.
+        """
+        groups = {}
+        for entry in entries:
+            length = max(entry[1] - entry[0], 0)
+            groups.setdefault(length.bit_length(), []).append(entry)
+        answer = []
+        for bits in sorted(groups):
+            group = sorted(groups[bits], key=_entry_key)
+            answer.append(((1 << bits) >> 1, (1 << bits) - 1,
+                           [entry[0] for entry in group], group))
+        return answer
+
+    def __len__(self):
+        """Return the number of features indexed."""
+        return len(self.features)
+
+    def _select(self, indices):
+        """Return the features for a set of indices, in list order (PRIVATE)."""
+        features = self.features
+        return [features[i] for i in sorted(indices)]
+
+    def _overlap_indices(self, start, end, strand=None):
+        """Return the indices of the features overlapping a region (PRIVATE)."""
+        found = set()
+        for shortest, longest, starts, group in self._parts:
+            for j in range(bisect.bisect_left(starts, start - longest),
+                           bisect.bisect_left(starts, max(end, start + 1))):
+                s, e, i, s_strand = group[j]
+                if (e > start or s >= start) and \
+                        (strand is None or strand == s_strand):
+                    found.add(i)
+        return found
+
+    def _contained_indices(self, start, end, strand=None):
+        """Return the indices of the features within a region (PRIVATE)."""
+        found = set()
+        for shortest, longest, starts, group in self._spans:
+            if shortest > end - start:
+                break
+            for j in range(bisect.bisect_left(starts, start),
+                           bisect.bisect_right(starts, end - shortest)):
+                s, e, i, s_strand = group[j]
+                if e <= end and (strand is None or strand == s_strand):
+                    found.add(i)
+        return found
+
+    def overlap(self, start, end, strand=None):
+        """Return the features overlapping a region, in their list order.
+
+        Arguments:
+            - start, end - the region, as in Python slice notation
+            - strand - optional, only consider features (or parts of
+              compound features) on this strand (e.g. 1 or -1)
+
+        For a single position use overlap(position, position + 1).
+        """
+        return self._select(self._overlap_indices(start, end, strand))
+
+    def contained(self, start, end, strand=None):
+        """Return the features lying entirely within a region, in list order.
+
+        These are the features kept when slicing a SeqRecord from start
+        to end.
+        """
+        return self._select(self._contained_indices(start, end, strand))
+
+    def containing(self, start, end, strand=None):
+        """Return the features with a part covering the whole region, in list order."""
+        found = set()
+        for shortest, longest, starts, group in self._parts:
+            if longest < end - start:
+                continue
+            for j in range(bisect.bisect_left(starts, end - longest),
+                           bisect.bisect_right(starts, start)):
+                s, e, i, s_strand = group[j]
+                if e >= end and (strand is None or strand == s_strand):
+                    found.add(i)
+        return self._select(found)
+
+    def nearest(self, position, strand=None):
+        """Return the features nearest to a position, in list order.
+
+        Features overlapping the position are the nearest; otherwise this
+        gives the feature(s) with a part ending closest before it, or
+        starting closest after it (several in the case of ties).
+        """
+        found = self._overlap_indices(position, position + 1, strand)
+        if found:
+            return self._select(found)
+        distances = []
+        j = bisect.bisect_right(self._ends, position)
+        while j > 0:
+            j -= 1
+            s, e, i, s_strand = self._by_end[j]
+            if strand is None or strand == s_strand:
+                distances.append((position - self._ends[j] + 1, -1))
+                break
+        j = bisect.bisect_right(self._starts, position)
+        while j < len(self._by_start):
+            s, e, i, s_strand = self._by_start[j]
+            if strand is None or strand == s_strand:
+                distances.append((s - position, 1))
+                break
+            j += 1
+        if not distances:
+            return []
+        best = min(distance for distance, direction in distances)
+        for distance, direction in distances:
+            if distance != best:
+                continue
+            if direction < 0:
+                end = position - distance + 1
+                lo = bisect.bisect_left(self._ends, end)
+                hi = bisect.bisect_right(self._ends, end)
+                entries = self._by_end[lo:hi]
+            else:
+                start = position + distance
+                lo = bisect.bisect_left(self._starts, start)
+                hi = bisect.bisect_right(self._starts, start)
+                entries = self._by_start[lo:hi]
+            found.update(i for s, e, i, s_strand in entries
+                         if strand is None or strand == s_strand)
+        return self._select(found)
+
+
 class AbstractPosition(object):
     """Abstract base class representing a position."""
 
+    # Subclasses with extra attributes (e.g. WithinPosition) have a __dict__,
+    # as int subclasses cannot have non-empty __slots__
+    __slots__ = ()
+
     def __repr__(self):
         """String representation of the location for debugging."""
         return "%s(...)" % (self.__class__.__name__)
@@ -1357,11 +1608,24 @@ class ExactPosition(int, AbstractPosition):
     15
 
     """
+    __slots__ = ()
+
     def __new__(cls, position, extension=0):
         if extension != 0:
             raise AttributeError("Non-zero extension %s for exact position."
                                  % extension)
-        return int.__new__(cls, position)
+        if cls is not ExactPosition:
+            return int.__new__(cls, position)
+        try:
+            return _exact_positions[position]
+        except KeyError:
+            if len(_exact_positions) >= _EXACT_POSITIONS_SIZE:
+                _exact_positions.clear()
+            obj = _exact_positions[position] = int.__new__(cls, position)
+            return obj
+        except TypeError:
+            # Unhashable, let int complain if this is invalid
+            return int.__new__(cls, position)
 
     def __repr__(self):
         """String representation of the ExactPosition location for debugging."""
@@ -1392,7 +1656,8 @@ class UncertainPosition(ExactPosition):
     This is used in UniProt, e.g. ?222 for uncertain position 222, or in the
     XML format explicitly marked as uncertain. Does not apply to GenBank/EMBL.
     """
-    pass
+
+    __slots__ = ()
 
 
 class UnknownPosition(AbstractPosition):
@@ -1401,6 +1666,8 @@ class UnknownPosition(AbstractPosition):
     This is used in UniProt, e.g. ? or in the XML as unknown.
     """
 
+    __slots__ = ()
+
     def __repr__(self):
         """String representation of the UnknownPosition location for debugging."""
         return "%s()" % self.__class__.__name__
@@ -1518,6 +1785,10 @@ class WithinPosition(int, AbstractPosition):
         obj._right = right
         return obj
 
+    def __getnewargs__(self):
+        """Return the arguments needed by __new__, e.g. for pickling."""
+        return (int(self), self._left, self._right)
+
     def __repr__(self):
         """String representation of the WithinPosition location for debugging."""
         return "%s(%i, left=%i, right=%i)" \
@@ -1620,6 +1891,10 @@ class BetweenPosition(int, AbstractPosition):
         obj._right = right
         return obj
 
+    def __getnewargs__(self):
+        """Return the arguments needed by __new__, e.g. for pickling."""
+        return (int(self), self._left, self._right)
+
     def __repr__(self):
         """String representation of the WithinPosition location for debugging."""
         return "%s(%i, left=%i, right=%i)" \
@@ -1683,6 +1958,8 @@ class BeforePosition(int, AbstractPosition):
     like integers.
     """
     # Subclasses int so can't use __init__
+    __slots__ = ()
+
     def __new__(cls, position, extension=0):
         if extension != 0:
             raise AttributeError("Non-zero extension %s for exact position."
@@ -1753,6 +2030,8 @@ class AfterPosition(int, AbstractPosition):
     like integers.
     """
     # Subclasses int so can't use __init__
+    __slots__ = ()
+
     def __new__(cls, position, extension=0):
         if extension != 0:
             raise AttributeError("Non-zero extension %s for exact position."
@@ -1858,6 +2137,10 @@ class OneOfPosition(int, AbstractPosition):
         positions = [int(pos) for pos in self.position_choices]
         return max(positions) - min(positions)
 
+    def __getnewargs__(self):
+        """Return the arguments needed by __new__, e.g. for pickling."""
+        return (int(self), self.position_choices)
+
     def __repr__(self):
         """String representation of the OneOfPosition location for debugging."""
         return "%s(%i, choices=%r)" % (self.__class__.__name__,
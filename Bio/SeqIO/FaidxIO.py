@@ -0,0 +1,368 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+"""Random access to FASTA files using a samtools faidx style index.
+
+The SeqIO.index function gives dictionary like access to the records in a
+FASTA file, but each lookup parses the whole record.  When you only want a
+small region of a large sequence (say 100bp from a human chromosome), it is
+much faster to use a samtools faidx style index (a ``.fai`` file), which
+records for each sequence its length, the byte offset of its first base and
+the line length used.  This allows seeking directly to the bytes holding
+any region.
+
+Each line of a ``.fai`` file has five tab separated columns:
+
+    - NAME - the sequence identifier (the first word of the title line)
+    - LENGTH - the number of bases in the sequence
+    - OFFSET - the byte offset of the sequence's first base in the file
+    - LINEBASES - the number of bases on each line
+    - LINEWIDTH - the number of bytes in each line, including the newline
+
+This requires all the sequence lines of a record (except the last) are the
+same length, as written by SeqIO.  The index can be built with the
+``write_fai`` function (giving the same file as ``samtools faidx``), and
+used with the ``FastaIndex`` class:
+
+>>> from Bio.SeqIO.FaidxIO import FastaIndex
+>>> with FastaIndex("GenBank/NC_005816.ffn") as fasta:
+...     print(len(fasta))
+...     print(fasta.get_length("ref|NC_005816.1|:2925-3119"))
+...     print(fasta.fetch("ref|NC_005816.1|:2925-3119", 60, 80))
+10
+195
+ATACTGCTTGAAAAACTGGA
+
+Here there was no ``.fai`` file, so the index was built in memory (which
+means reading the whole FASTA file).
+
+BGZF compressed FASTA files (as produced with ``bgzip``) are also supported,
+in which case the ``.fai`` file uses offsets in the uncompressed data, and
+the matching samtools/htslib ``.gzi`` index of the BGZF blocks is used (or
+built in memory) to seek to the region wanted.
+"""
+
+from __future__ import print_function
+
+import bisect
+import mmap
+import os
+import struct
+
+from Bio import bgzf
+from Bio.Alphabet import single_letter_alphabet
+from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
+
+
+def _is_bgzf(filename):
+    """Check the file starts with the BGZF magic bytes (PRIVATE)."""
+    with open(filename, "rb") as handle:
+        return handle.read(4) == bgzf._bgzf_magic
+
+
+def _fai_entries(handle):
+    """Iterate over the faidx index entries of a binary FASTA handle (PRIVATE).
+
+    Yields tuples of (name, length, offset, line bases, line width), where
+    the offsets are relative to the start of the (uncompressed) data.
+    """
+    names = set()
+    entry = None
+    offset = 0
+    for line in handle:
+        offset += len(line)
+        if line[:1] == b">":
+            if entry is not None:
+                yield _fai_entry(*entry)
+            name = line[1:].split(None, 1)
+            name = name[0].decode("ascii") if name else ""
+            if name in names:
+                raise ValueError("Duplicate sequence name %r" % name)
+            names.add(name)
+            # name, offset, lines (as lengths with and without newline)
+            entry = (name, offset, [])
+        elif entry is None:
+            if line.strip():
+                raise ValueError("FASTA file should start with '>'")
+        else:
+            entry[2].append((len(line.rstrip(b"\r\n")), len(line)))
+    if entry is not None:
+        yield _fai_entry(*entry)
+
+
+def _fai_entry(name, offset, lines):
+    """Return the index entry tuple for one FASTA record (PRIVATE)."""
+    # Ignore any trailing blank lines
+    while lines and not lines[-1][0]:
+        lines.pop()
+    if not lines:
+        return name, 0, offset, 0, 0
+    line_bases, line_width = lines[0]
+    for bases, width in lines[1:-1]:
+        if bases != line_bases or width != line_width:
+            raise ValueError("Different line length in sequence %r" % name)
+    if lines[-1][0] > line_bases:
+        raise ValueError("Different line length in sequence %r" % name)
+    length = sum(bases for bases, width in lines)
+    return name, length, offset, line_bases, line_width
+
+
+def _gzi_entries(handle):
+    """Return the BGZF block offsets from a binary handle to a .gzi (PRIVATE).
+
+    Returns two lists, the compressed and uncompressed offsets of each
+    block start (including the first block at zero).
+    """
+    count, = struct.unpack("<Q", handle.read(8))
+    values = struct.unpack("<%iQ" % (2 * count), handle.read(16 * count))
+    return [0] + list(values[0::2]), [0] + list(values[1::2])
+
+
+def _bgzf_block_offsets(filename):
+    """Return the BGZF block offsets by scanning the file (PRIVATE).
+
+    Returns two lists, the compressed and uncompressed offsets of each
+    block start.
+    """
+    raw_offsets = []
+    data_offsets = []
+    with open(filename, "rb") as handle:
+        for raw_start, raw_len, data_start, data_len in \
+                bgzf.BgzfBlocks(handle):
+            if data_len:
+                raw_offsets.append(raw_start)
+                data_offsets.append(data_start)
+    if not raw_offsets:
+        raw_offsets, data_offsets = [0], [0]
+    return raw_offsets, data_offsets
+
+
+def write_fai(filename, fai_filename=None, gzi_filename=None):
+    """Write a samtools faidx style index for a FASTA file.
+
+    Arguments:
+        - filename - the FASTA file, optionally BGZF compressed
+        - fai_filename - where to write the index, by default the FASTA
+          filename with ``.fai`` appended
+        - gzi_filename - for BGZF compressed files, where to write the
+          block index, by default the FASTA filename with ``.gzi`` appended
+
+    Returns the number of sequences indexed.  A ValueError is raised if
+    the line lengths within a sequence are inconsistent (other than on the
+    last line), or if a sequence name is repeated.
+    """
+    if fai_filename is None:
+        fai_filename = filename + ".fai"
+    if _is_bgzf(filename):
+        if gzi_filename is None:
+            gzi_filename = filename + ".gzi"
+        raw_offsets, data_offsets = _bgzf_block_offsets(filename)
+        with open(gzi_filename, "wb") as handle:
+            # The first block (at zero) is not recorded
+            handle.write(struct.pack("<Q", len(raw_offsets) - 1))
+            for raw_offset, data_offset in zip(raw_offsets[1:],
+                                               data_offsets[1:]):
+                handle.write(struct.pack("<QQ", raw_offset, data_offset))
+        handle = bgzf.BgzfReader(filename, "rb")
+    else:
+        handle = open(filename, "rb")
+    try:
+        # Check the whole file before writing anything
+        entries = list(_fai_entries(handle))
+    finally:
+        handle.close()
+    with open(fai_filename, "w") as out_handle:
+        for entry in entries:
+            out_handle.write("%s\t%i\t%i\t%i\t%i\n" % entry)
+    return len(entries)
+
+
+class FastaIndex(object):
+    """Random access to the sequences in an indexed FASTA file.
+
+    This is a read only dictionary like object, mapping sequence names to
+    SeqRecord objects (like the SeqIO.index function), but also offering
+    fast access to regions of each sequence via the fetch method, which
+    reads just the lines needed (using a memory map for uncompressed
+    files).
+    """
+
+    def __init__(self, filename, alphabet=single_letter_alphabet,
+                 fai_filename=None, gzi_filename=None):
+        """Open the FASTA file and load (or build) the index.
+
+        Arguments:
+            - filename - the FASTA file, optionally BGZF compressed
+            - alphabet - the alphabet to use for the Seq objects returned
+            - fai_filename - the faidx index, by default the FASTA filename
+              with ``.fai`` appended.  If this does not exist, the index
+              is built in memory (see the write_fai function to save it)
+            - gzi_filename - for BGZF compressed files, the block index, by
+              default the FASTA filename with ``.gzi`` appended.  If this
+              does not exist the block offsets are found by scanning the
+              file.
+        """
+        self.alphabet = alphabet
+        if fai_filename is None:
+            fai_filename = filename + ".fai"
+        self._bgzf = _is_bgzf(filename)
+        self._mmap = None
+        if self._bgzf:
+            if gzi_filename is None:
+                gzi_filename = filename + ".gzi"
+            if os.path.isfile(gzi_filename):
+                with open(gzi_filename, "rb") as handle:
+                    self._raw_offsets, self._data_offsets = \
+                        _gzi_entries(handle)
+            else:
+                self._raw_offsets, self._data_offsets = \
+                    _bgzf_block_offsets(filename)
+            self._handle = bgzf.BgzfReader(filename, "rb")
+        else:
+            self._handle = open(filename, "rb")
+            try:
+                self._mmap = mmap.mmap(self._handle.fileno(), 0,
+                                       access=mmap.ACCESS_READ)
+            except (ValueError, EnvironmentError):
+                # e.g. an empty file
+                self._mmap = None
+        self._index = {}
+        self._names = []
+        if os.path.isfile(fai_filename):
+            with open(fai_filename) as handle:
+                entries = [self._parse_fai_line(line)
+                           for line in handle if line.strip()]
+        else:
+            entries = list(_fai_entries(self._handle))
+        for entry in entries:
+            self._names.append(entry[0])
+            self._index[entry[0]] = entry[1:]
+
+    @staticmethod
+    def _parse_fai_line(line):
+        """Parse a line of a .fai file into an index entry (PRIVATE)."""
+        parts = line.rstrip("\r\n").split("\t")
+        if len(parts) < 5:
+            raise ValueError("Expected five tab separated columns in .fai "
+                             "file, not: %r" % line)
+        return (parts[0],) + tuple(int(value) for value in parts[1:5])
+
+    def _read(self, start, end):
+        """Read bytes start to end of the (uncompressed) file (PRIVATE)."""
+        if self._mmap is not None:
+            return self._mmap[start:end]
+        if self._bgzf:
+            i = bisect.bisect_right(self._data_offsets, start) - 1
+            self._handle.seek(bgzf.make_virtual_offset(
+                self._raw_offsets[i], start - self._data_offsets[i]))
+        else:
+            self._handle.seek(start)
+        return self._handle.read(end - start)
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, self._handle.name)
+
+    def __len__(self):
+        """Return the number of sequences in the index."""
+        return len(self._names)
+
+    def __iter__(self):
+        """Iterate over the sequence names (in the file order)."""
+        return iter(self._names)
+
+    def keys(self):
+        """Return a list of the sequence names (in the file order)."""
+        return list(self._names)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def get_length(self, name):
+        """Return the length of the named sequence."""
+        return self._index[name][0]
+
+    def get_raw(self, name):
+        """Return the region of the file holding the named sequence (bytes).
+
+        This excludes the title line, and any trailing blank lines.
+        """
+        length, offset, line_bases, line_width = self._index[name]
+        if not length:
+            return b""
+        lines, extra = divmod(length, line_bases)
+        end = offset + lines * line_width + extra
+        if extra:
+            # Include the final newline (if present)
+            end += line_width - line_bases
+        return self._read(offset, end)
+
+    def fetch(self, name, start=0, end=None):
+        """Return a region of the named sequence as a Seq object.
+
+        The start and end are interpreted like a Python slice, so counting
+        from zero, and excluding the end.  This reads only the lines holding
+        the region.
+        """
+        length, offset, line_bases, line_width = self._index[name]
+        start, end, step = slice(start, end).indices(length)
+        if end <= start:
+            return Seq("", self.alphabet)
+        lines, extra = divmod(start, line_bases)
+        first = offset + lines * line_width + extra
+        lines, extra = divmod(end, line_bases)
+        last = offset + lines * line_width + extra
+        data = self._read(first, last)
+        if line_width != line_bases:
+            data = data.replace(b"\n", b"").replace(b"\r", b"")
+        if not isinstance(data, str):
+            # Bytes under Python 3
+            data = data.decode("ascii")
+        return Seq(data, self.alphabet)
+
+    def _get_title(self, name):
+        """Find the title line preceding the named sequence (PRIVATE)."""
+        offset = self._index[name][1]
+        start = offset
+        data = b""
+        while start > 0:
+            start = max(0, start - 1024)
+            data = self._read(start, offset)
+            # Find the start of the title line before the final newline
+            i = data.rstrip(b"\r\n").rfind(b"\n")
+            if i != -1:
+                data = data[i + 1:]
+                break
+        data = data.rstrip(b"\r\n")
+        if not data.startswith(b">"):
+            raise ValueError("Could not find the title line for sequence %r, "
+                             "is the .fai file up to date?" % name)
+        return data[1:].decode("ascii")
+
+    def __getitem__(self, name):
+        """Return the named sequence as a SeqRecord.
+
+        As with SeqIO.parse, the record's description is the full title
+        line, and the id and name are its first word.
+        """
+        title = self._get_title(name)
+        return SeqRecord(self.fetch(name), id=name, name=name,
+                         description=title)
+
+    def close(self):
+        """Close the underlying file."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+    run_doctest(verbose=0)
@@ -34,6 +34,7 @@ http://www.ebi.ac.uk/imgt/hla/docs/manual.html
 from __future__ import print_function
 
 import warnings
+
 from Bio import BiopythonWarning
 
 from Bio.Seq import UnknownSeq
@@ -41,9 +42,13 @@ from Bio.GenBank.Scanner import GenBankScanner, EmblScanner, _ImgtScanner
 from Bio import Alphabet
 from Bio.SeqIO.Interfaces import SequentialSequenceWriter
 from Bio import SeqFeature
+from Bio import bgzf
 
 from Bio._py3k import _is_int_or_long
 from Bio._py3k import basestring
+from Bio._py3k import _bytes_to_string
+from Bio._py3k import StringIO
+from Bio._utils import pool_imap
 
 
 # NOTE
@@ -54,7 +59,7 @@ from Bio._py3k import basestring
 # However, all the writing code is in this file.
 
 
-def GenBankIterator(handle):
+def GenBankIterator(handle, feature_types=None, lazy_features=False):
     """Breaks up a Genbank file into SeqRecord objects.
 
     Every section from the LOCUS line to the terminating // becomes
@@ -63,6 +68,11 @@ def GenBankIterator(handle):
     Note that for genomes or chromosomes, there is typically only
     one record.
 
+    Optional arguments feature_types (a list of the feature types to keep,
+    e.g. ["CDS", "gene"]) and lazy_features (parse the feature table only
+    when the features are used) can speed up parsing when not all of the
+    features are needed, see the parse_records method of the scanner.
+
     This gets called internally by Bio.SeqIO for the GenBank file format:
 
     >>> from Bio import SeqIO
@@ -91,10 +101,12 @@ def GenBankIterator(handle):
 
     """
     # This calls a generator function:
-    return GenBankScanner(debug=0).parse_records(handle)
+    scanner = GenBankScanner(debug=0)
+    return scanner.parse_records(handle, feature_types=feature_types,
+                                 lazy_features=lazy_features)
 
 
-def EmblIterator(handle):
+def EmblIterator(handle, feature_types=None, lazy_features=False):
     """Breaks up an EMBL file into SeqRecord objects.
 
     Every section from the LOCUS line to the terminating // becomes
@@ -103,6 +115,9 @@ def EmblIterator(handle):
     Note that for genomes or chromosomes, there is typically only
     one record.
 
+    As with the GenBankIterator, the optional feature_types and
+    lazy_features arguments can be used to skip or defer parsing features.
+
     This gets called internally by Bio.SeqIO for the EMBL file format:
 
     >>> from Bio import SeqIO
@@ -137,7 +152,9 @@ def EmblIterator(handle):
 
     """
     # This calls a generator function:
-    return EmblScanner(debug=0).parse_records(handle)
+    scanner = EmblScanner(debug=0)
+    return scanner.parse_records(handle, feature_types=feature_types,
+                                 lazy_features=lazy_features)
 
 
 def ImgtIterator(handle):
@@ -174,6 +191,143 @@ def EmblCdsFeatureIterator(handle, alphabet=Alphabet.generic_protein):
     return EmblScanner(debug=0).parse_cds_features(handle, alphabet)
 
 
+# Scanners used by parallel_parse, by format name
+_parallel_scanners = {"genbank": GenBankScanner,
+                      "gb": GenBankScanner,
+                      "embl": EmblScanner,
+                      "imgt": _ImgtScanner}
+
+# Default minimum size in bytes of the chunks parsed by each process
+_PARALLEL_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def _record_chunks(handle, chunk_size):
+    """Split a binary handle into chunks of whole records (PRIVATE).
+
+    Yields the start (a virtual offset for BGZF files) and length in bytes
+    of each chunk, which are at least chunk_size bytes long (except the
+    last) and end with a // line.
+    """
+    start = handle.tell()
+    length = 0
+    while True:
+        line = handle.readline()
+        if not line:
+            break
+        length += len(line)
+        if length >= chunk_size and line.rstrip() == b"//":
+            yield start, length
+            start = handle.tell()
+            length = 0
+    if length:
+        yield start, length
+
+
+def _parse_chunk(task):
+    """Parse a chunk of records, returning a list of SeqRecords (PRIVATE)."""
+    filename, is_bgzf, start, length, format, feature_types = task
+    if is_bgzf:
+        handle = bgzf.BgzfReader(filename, "rb")
+    else:
+        handle = open(filename, "rb")
+    try:
+        handle.seek(start)
+        data = handle.read(length)
+    finally:
+        handle.close()
+    scanner = _parallel_scanners[format](debug=0)
+    return list(scanner.parse_records(StringIO(_bytes_to_string(data)),
+                                      feature_types=feature_types))
+
+
+def parallel_parse(filename, format="genbank", processes=None, ordered=True,
+                   chunk_size=_PARALLEL_CHUNK_SIZE, max_pending=None,
+                   feature_types=None):
+    """Parse a GenBank, EMBL or IMGT file using several processes.
+
+    Arguments:
+     - filename - the file to parse, which may be BGZF compressed.
+     - format - "genbank" (or "gb"), "embl" or "imgt".
+     - processes - number of worker processes (defaults to the number
+       of CPUs). With one process, the records are parsed in this process.
+     - ordered - if True (default) the records are returned in the order
+       they are in the file, otherwise as soon as they are parsed.
+     - chunk_size - minimum size in bytes of the chunks of records
+       handed to each worker process.
+     - max_pending - maximum number of chunks being parsed, or parsed but
+       not yet returned (defaults to twice the number of processes). This
+       bounds the memory used when the records are used more slowly than
+       they are parsed.
+     - feature_types - optional list of the feature types to keep (see
+       the GenBankIterator function).
+
+    The file is split into chunks of whole records at the // lines (using
+    virtual offsets for BGZF files), which are read and parsed by a pool
+    of worker processes using the multiprocessing library. This returns a
+    SeqRecord iterator, giving the same records as Bio.SeqIO.parse:
+
+    >>> from Bio.SeqIO.InsdcIO import parallel_parse
+    >>> for record in parallel_parse("GenBank/cor6_6.gb", processes=1,
+    ...                              chunk_size=1000):
+    ...     print(record.id)
+    ...
+    X55053.1
+    X62281.1
+    M81224.1
+    AJ237582.1
+    L31939.1
+    AF297471.1
+
+    Note the records are pickled to send them back from the worker
+    processes, which can take longer than parsing them, so for typical
+    files this is slower than Bio.SeqIO.parse (and for a single record,
+    e.g. one bacterial genome, there is nothing to be done in parallel).
+    Check it is faster for your data (e.g. keeping only a few of the
+    feature_types) before using it.
+    """
+    try:
+        format = format.lower()
+        _parallel_scanners[format]
+    except (AttributeError, KeyError):
+        raise ValueError("Unknown format %r, expected 'genbank', 'embl' "
+                         "or 'imgt'" % format)
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive, not %r" % chunk_size)
+    if processes is None:
+        import multiprocessing
+        processes = multiprocessing.cpu_count()
+    if max_pending is None:
+        max_pending = 2 * processes
+    if max_pending < 1:
+        raise ValueError("Maximum pending chunks must be positive, not %r"
+                         % max_pending)
+    with open(filename, "rb") as handle:
+        is_bgzf = handle.read(4) == bgzf._bgzf_magic
+    if is_bgzf:
+        handle = bgzf.BgzfReader(filename, "rb")
+    else:
+        handle = open(filename, "rb")
+    try:
+        tasks = ((filename, is_bgzf, start, length, format, feature_types)
+                 for start, length in _record_chunks(handle, chunk_size))
+        if processes < 2:
+            for task in tasks:
+                for record in _parse_chunk(task):
+                    yield record
+            return
+        results = pool_imap(_parse_chunk, tasks, processes, ordered,
+                            max_pending)
+        try:
+            for records in results:
+                for record in records:
+                    yield record
+        finally:
+            # finish with the pool before closing the file it reads
+            results.close()
+    finally:
+        handle.close()
+
+
 def _insdc_feature_position_string(pos, offset=0):
     """Build a GenBank/EMBL position string (PRIVATE).
 
@@ -7,7 +7,6 @@
 # as part of this package.
 """Represent a Sequence Record, a sequence with annotation."""
 
-
 from Bio._py3k import basestring
 
 # NEEDS TO BE SYNCH WITH THE REST OF BIOPYTHON AND BIOPERL
@@ -232,6 +231,16 @@ class SeqRecord(object):
             raise TypeError("features argument should be a list (of SeqFeature objects)")
         self.features = features
 
+    def __getstate__(self):
+        """Return the attributes to pickle, leaving out the feature index.
+
+        The index is rebuilt when needed, so need not be stored (and this
+        keeps the pickles readable by older versions of Biopython).
+        """
+        state = self.__dict__.copy()
+        state.pop("_feature_index", None)
+        return state
+
     # TODO - Just make this a read only property?
     def _set_per_letter_annotations(self, value):
         if not isinstance(value, dict):
@@ -319,6 +328,44 @@ class SeqRecord(object):
                    fset=_set_seq,
                    doc="The sequence itself, as a Seq or MutableSeq object.")
 
+    def _get_feature_index(self):
+        from Bio.SeqFeature import FeatureIndex
+        features = self.features
+        # Rather than looking at every feature's location, check this is
+        # the list indexed and it holds the same features (comparing the
+        # lists only compares the identity of the features, which is fast)
+        cache = getattr(self, "_feature_index", None)
+        if cache is None or cache[0] is not features \
+                or cache[1].features != features:
+            cache = (features, FeatureIndex(features))
+            self._feature_index = cache
+        return cache[1]
+
+    feature_index = property(
+        fget=_get_feature_index,
+        doc="""Index of the features by location (read only).
+
+        This FeatureIndex object (see Bio.SeqFeature) finds the features
+        overlapping, within or nearest to a region without checking every
+        feature:
+
+        >>> from Bio import SeqIO
+        >>> record = SeqIO.read("GenBank/NC_005816.gb", "genbank")
+        >>> for f in record.feature_index.overlap(1000, 1100):
+        ...     print("%s %s" % (f.type, f.qualifiers.get("locus_tag")))
+        source None
+        repeat_region None
+        gene ['YP_pPCP01']
+        CDS ['YP_pPCP01']
+
+        The index is built when first used, and rebuilt automatically if
+        features are added, removed or replaced, or the list of features
+        is replaced. It is not rebuilt if a feature in the list is given a
+        new location (or its location is modified in place), so in that
+        case assign a new list, e.g. record.features = record.features[:]
+        It is also used when slicing the record.
+        """)
+
     def __getitem__(self, index):
         """Returns a sub-sequence or an individual letter.
 
@@ -462,17 +509,15 @@ class SeqRecord(object):
             if step == 1:
                 # Select relevant features, add them with shifted locations
                 # assert str(self.seq)[index] == str(self.seq)[start:stop]
-                for f in self.features:
-                    if f.ref or f.ref_db:
-                        # TODO - Implement this (with lots of tests)?
-                        import warnings
-                        warnings.warn("When slicing SeqRecord objects, any "
-                                      "SeqFeature referencing other sequences (e.g. "
-                                      "from segmented GenBank records) are ignored.")
-                        continue
-                    if start <= f.location.nofuzzy_start \
-                            and f.location.nofuzzy_end <= stop:
-                        answer.features.append(f._shift(-start))
+                feature_index = self.feature_index
+                for i in feature_index._remote:
+                    # TODO - Implement this (with lots of tests)?
+                    import warnings
+                    warnings.warn("When slicing SeqRecord objects, any "
+                                  "SeqFeature referencing other sequences (e.g. "
+                                  "from segmented GenBank records) are ignored.")
+                for f in feature_index.contained(start, stop):
+                    answer.features.append(f._shift(-start))
 
             # Slice all the values to match the sliced sequence
             # (this should also work with strides, even negative strides):
@@ -568,6 +613,63 @@ class SeqRecord(object):
         """
         return char in self.seq
 
+    def windows(self, size, step=None):
+        """Iterate over windows along the record, as new SeqRecord objects.
+
+        Arguments:
+            - size - integer, length of each window
+            - step - optional integer, distance between the starts of
+              successive windows (defaults to the size, giving windows
+              which tile the record without overlapping)
+
+        Each window is the same as slicing the record, i.e. record[start:end]
+        but without checking all the features every time, and only windows
+        of the full size are returned. For example,
+
+        >>> from Bio import SeqIO
+        >>> record = SeqIO.read("GenBank/NC_005816.gb", "genbank")
+        >>> len(record), len(record.features)
+        (9609, 41)
+        >>> for window in record.windows(2000, 2500):
+        ...     print("%i %i %s" % (len(window), len(window.features),
+        ...                         window.seq[:10]))
+        2000 13 TGTAACGAAC
+        2000 6 TCGACGGGAC
+        2000 7 CACCAGTGCT
+        2000 7 ATTGATAAGA
+
+        If the sequence is a SeqView, the windows share its data, so that
+        streaming over a large sequence only needs memory for the current
+        window's annotation.
+        """
+        if size < 1:
+            raise ValueError("Window size should be at least one.")
+        if step is None:
+            step = size
+        elif step < 1:
+            raise ValueError("Window step should be at least one.")
+        feature_index = self.feature_index
+        for i in feature_index._remote:
+            # See __getitem__
+            import warnings
+            warnings.warn("When slicing SeqRecord objects, any "
+                          "SeqFeature referencing other sequences (e.g. "
+                          "from segmented GenBank records) are ignored.")
+        from BioSQL.BioSeq import DBSeqRecord
+        if isinstance(self, DBSeqRecord):
+            cls = SeqRecord
+        else:
+            cls = self.__class__
+        for start in range(0, len(self) - size + 1, step):
+            end = start + size
+            answer = cls(self.seq[start:end], id=self.id, name=self.name,
+                         description=self.description)
+            answer.features.extend(f._shift(-start) for f in
+                                   feature_index.contained(start, end))
+            for key, value in self.letter_annotations.items():
+                answer._per_letter_annotations[key] = value[start:end]
+            yield answer
+
     def __str__(self):
         """A human readable summary of the record and its annotation (string).
 
@@ -0,0 +1,128 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+"""Search nucleotide sequences for many IUPAC patterns at once.
+
+This uses the bit-parallel shift-and algorithm, where the partial matches
+of all the patterns are tracked as the bits of a single integer, updated
+for each letter of the sequence. This finds all the matches of all the
+patterns (overlapping or not, and optionally on both strands) in a single
+pass, taking the same time however many patterns are searched for (up to
+the point where the integer no longer fits in a few machine words).
+
+Ambiguous letters in the patterns (like N for any base, or R for A or G)
+match any of the corresponding unambiguous bases in the sequence, while
+ambiguous letters in the sequence never match (as with the nt_search
+function in Bio.SeqUtils):
+
+>>> from Bio.SeqUtils.NucleotideSearch import NucleotideSearch
+>>> searcher = NucleotideSearch({"EcoRI": "GAATTC", "HincII": "GTYRAC"})
+>>> for match in searcher.search("TTGAATTCAGTCGACNGTTAAC"):
+...     print(match)
+(2, 8, 1, 'EcoRI')
+(2, 8, -1, 'EcoRI')
+(9, 15, 1, 'HincII')
+(9, 15, -1, 'HincII')
+(16, 22, 1, 'HincII')
+(16, 22, -1, 'HincII')
+
+Each match is given as a tuple of the start and end (as in Python slice
+notation on the forward strand), the strand (1 or -1) and the name of the
+pattern. Palindromic sites like these are found on both strands.
+"""
+
+from __future__ import print_function
+
+from Bio.Data.IUPACData import ambiguous_dna_values
+from Bio.Seq import reverse_complement
+
+# Letters from the sequence are processed in chunks of this size
+_CHUNK_SIZE = 100000
+
+
+class NucleotideSearch(object):
+    """Find all the matches to a set of IUPAC nucleotide patterns."""
+
+    def __init__(self, patterns, both_strands=True):
+        """Compile the patterns for searching.
+
+        Arguments:
+            - patterns - a dictionary of pattern names and IUPAC nucleotide
+              patterns (strings or Seq objects), or a list of patterns
+              (in which case the patterns are used as their names)
+            - both_strands - boolean, also search for the reverse
+              complement of each pattern (default True)
+        """
+        if not isinstance(patterns, dict):
+            patterns = dict((str(pattern), pattern) for pattern in patterns)
+        if not patterns:
+            raise ValueError("At least one pattern is required")
+        # Each pattern (and reverse complement) is given a block of bits
+        masks = [0] * 256
+        self._initial = 0
+        self._accept = 0
+        self._patterns = []
+        bit = 0
+        for name in sorted(patterns):
+            pattern = str(patterns[name]).upper().replace("U", "T")
+            if not pattern:
+                raise ValueError("Pattern %r is empty" % name)
+            strands = [(1, pattern)]
+            if both_strands:
+                strands.append((-1, reverse_complement(pattern)))
+            for strand, letters in strands:
+                for i, letter in enumerate(letters):
+                    try:
+                        values = ambiguous_dna_values[letter]
+                    except KeyError:
+                        raise ValueError("Pattern %r has invalid letter %r"
+                                         % (name, letter))
+                    for value in values:
+                        for code in (value, value.lower()):
+                            masks[ord(code)] |= 1 << (bit + i)
+                        if value == "T":
+                            # Also match RNA
+                            for code in "Uu":
+                                masks[ord(code)] |= 1 << (bit + i)
+                self._initial |= 1 << bit
+                bit += len(letters)
+                self._accept |= 1 << (bit - 1)
+                self._patterns.append((bit - 1, len(letters), strand, name))
+        self._masks = masks
+
+    def search(self, seq):
+        """Iterate over the matches in a sequence (string or Seq object).
+
+        Yields tuples of the start, end, strand and pattern name, ordered by
+        the end of the match.  The sequence is processed in chunks, so the
+        memory used does not depend on its length.
+        """
+        masks = self._masks
+        initial = self._initial
+        accept = self._accept
+        state = 0
+        for offset in range(0, len(seq), _CHUNK_SIZE):
+            chunk = str(seq[offset:offset + _CHUNK_SIZE])
+            for i, code in enumerate(bytearray(chunk.encode("ascii"))):
+                state = ((state << 1) | initial) & masks[code]
+                if state & accept:
+                    end = offset + i + 1
+                    for bit, length, strand, name in self._patterns:
+                        if (state >> bit) & 1:
+                            yield end - length, end, strand, name
+
+    def search_records(self, records):
+        """Iterate over the matches in some SeqRecord objects.
+
+        Takes any iterable of SeqRecord objects (e.g. from Bio.SeqIO), and
+        yields tuples of the record identifier, start, end, strand and
+        pattern name.
+        """
+        for record in records:
+            for match in self.search(record.seq):
+                yield (record.id,) + match
+
+
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+    run_doctest(verbose=0)
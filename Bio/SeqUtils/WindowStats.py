@@ -0,0 +1,271 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+"""Base composition statistics over sliding windows (requires NumPy).
+
+The WindowStats class counts the bases in a sequence once, as running
+totals (prefix sums), after which the base counts of any window are just
+a subtraction. This means the GC content, GC skew, cumulative GC skew,
+local composition complexity (LCC) and entropy can be computed for any
+window size and step in time proportional to the sequence length:
+
+>>> from Bio.SeqUtils.WindowStats import WindowStats
+>>> stats = WindowStats("ATGCGCGGTTAACCAGTTAA")
+>>> print(stats.starts(10, 5))
+[ 0  5 10]
+>>> print(stats.gc(10, 5))
+[60. 50. 30.]
+>>> print(stats.gc_skew(10, 5))
+[ 0.33333333 -0.2        -0.33333333]
+>>> print(stats.cumulative_gc_skew(10, 5))
+[ 0.33333333  0.13333333 -0.2       ]
+
+Only full length windows are used, starting every step bases (the step
+defaults to the window size, giving non-overlapping windows). The values
+match those from the GC and GC_skew functions in Bio.SeqUtils, and the
+lcc_simp function in Bio.SeqUtils.lcc, applied to each window.
+
+The running totals take twenty bytes per base, so for chromosome length
+sequences use the iter_window_counts function instead, which works
+through the sequence (or any iterable of sequence chunks, such as lines
+from a file) a chunk at a time, and the functions gc_content, gc_skew,
+cumulative_gc_skew, lcc and entropy, which take the window counts:
+
+>>> from Bio.SeqUtils.WindowStats import iter_window_counts, gc_content
+>>> chunks = ["ATGCGCG", "GTTAACCAGT", "TAA"]
+>>> for starts, counts in iter_window_counts(chunks, 10, 5):
+...     print("%s %s" % (starts, gc_content(counts)))
+[0 5] [60. 50.]
+[10] [30.]
+
+"""
+
+from __future__ import print_function
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.SeqUtils.WindowStats.")
+
+from Bio._py3k import basestring
+
+# Maps each byte to its column (U counted as T, lower case as upper case)
+_CODES = numpy.empty(256, numpy.uint8)
+_CODES[:] = 5
+for _i, _letter in enumerate("ACGTS"):
+    _CODES[ord(_letter)] = _i
+    _CODES[ord(_letter.lower())] = _i
+_CODES[ord("U")] = _CODES[ord("u")] = 3
+del _i, _letter
+
+# Sequence strings are processed in chunks of this size
+_CHUNK_SIZE = 1000000
+
+
+def _encode(seq):
+    """Return the column codes for a sequence string or object (PRIVATE)."""
+    data = str(seq)
+    if not isinstance(data, bytes):
+        data = data.encode("ascii")
+    return _CODES[numpy.frombuffer(data, numpy.uint8)]
+
+
+def _prefix_sums(codes):
+    """Return the running totals of the counted letters (PRIVATE).
+
+    Row i holds the counts of A, C, G, T and S in codes[:i].
+    """
+    prefix = numpy.zeros((len(codes) + 1, 5), numpy.int32)
+    for column in range(5):
+        numpy.cumsum(codes == column, out=prefix[1:, column])
+    return prefix
+
+
+def _window_counts(prefix, starts, window):
+    """Return the counts for the windows at the given starts (PRIVATE)."""
+    counts = numpy.empty((len(starts), 6), numpy.int32)
+    counts[:, :5] = prefix[starts + window] - prefix[starts]
+    counts[:, 5] = window - counts[:, :5].sum(axis=1)
+    return counts
+
+
+def _check_window(window, step):
+    """Check the window size and step, returning the step (PRIVATE)."""
+    if step is None:
+        step = window
+    if window < 1:
+        raise ValueError("Window size must be positive, not %r" % window)
+    if step < 1:
+        raise ValueError("Step must be positive, not %r" % step)
+    return step
+
+
+def _chunks(seq):
+    """Split a sequence into chunks, or iterate over given chunks (PRIVATE)."""
+    if isinstance(seq, basestring) or hasattr(seq, "alphabet"):
+        for start in range(0, len(seq), _CHUNK_SIZE):
+            yield seq[start:start + _CHUNK_SIZE]
+    else:
+        for chunk in seq:
+            yield chunk
+
+
+def iter_window_counts(seq, window, step=None):
+    """Iterate over the base counts of sliding windows, a chunk at a time.
+
+    Arguments:
+        - seq - a sequence (string or Seq object), or an iterable of
+          sequence chunks (e.g. the lines of a FASTA file, without the
+          title line or newlines), which may be of any length
+        - window - window size, integer
+        - step - distance between the window starts, integer (defaults
+          to the window size)
+
+    Yields pairs of NumPy arrays, the start of each window, and the counts
+    of A, C, G, T, S and any other letters in each window (one row per
+    window). Only the current chunk (plus any part of a window carried
+    over from the previous chunk) is held in memory.
+    """
+    step = _check_window(window, step)
+    buffer = numpy.zeros(0, numpy.uint8)
+    # Position of buffer[0] in the sequence
+    offset = 0
+    # Position of the next window start
+    next_start = 0
+    for chunk in _chunks(seq):
+        codes = _encode(chunk)
+        if len(buffer):
+            codes = numpy.concatenate((buffer, codes))
+        first = next_start - offset
+        if first + window <= len(codes):
+            starts = numpy.arange(first, len(codes) - window + 1, step)
+            yield starts + offset, _window_counts(_prefix_sums(codes),
+                                                  starts, window)
+            next_start = offset + starts[-1] + step
+        keep = next_start - offset
+        if keep < len(codes):
+            buffer = codes[keep:]
+            offset = next_start
+        else:
+            buffer = buffer[:0]
+            offset += len(codes)
+
+
+def gc_content(counts):
+    """Return the G+C percentage of each window, from the window counts.
+
+    As in the GC function in Bio.SeqUtils, S (G or C) is counted, and
+    the total is the window size (including any ambiguous letters).
+    """
+    counts = numpy.asarray(counts)
+    total = counts.sum(axis=1)
+    gc = counts[:, 1] + counts[:, 2] + counts[:, 4]
+    return 100.0 * gc / numpy.maximum(total, 1)
+
+
+def gc_skew(counts):
+    """Return the GC skew (G-C)/(G+C) of each window, from the window counts.
+
+    As in the GC_skew function in Bio.SeqUtils, windows without any G or C
+    have a skew of zero.
+    """
+    counts = numpy.asarray(counts)
+    g = counts[:, 2].astype(float)
+    c = counts[:, 1]
+    return (g - c) / numpy.maximum(g + c, 1)
+
+
+def cumulative_gc_skew(counts, initial=0.0):
+    """Return the running total of the GC skew, from the window counts.
+
+    The initial value can be used to carry the total over from the previous
+    chunk when working through a sequence with iter_window_counts.
+    """
+    return initial + numpy.cumsum(gc_skew(counts))
+
+
+def _plogp(counts, totals):
+    """Return the sum of p*log2(p) for p=counts/totals by row (PRIVATE)."""
+    p = counts / numpy.maximum(totals, 1).astype(float)[:, numpy.newaxis]
+    logp = numpy.log2(numpy.where(p > 0, p, 1))
+    return (p * logp).sum(axis=1)
+
+
+def lcc(counts):
+    """Return the local composition complexity of each window, from counts.
+
+    This matches the lcc_simp function in Bio.SeqUtils.lcc, using the
+    frequencies of A, C, G and T relative to the window size.
+    """
+    counts = numpy.asarray(counts)
+    totals = counts.sum(axis=1)
+    if len(totals) and totals.min() == totals.max():
+        # All windows are the same size, so look up each p*log2(p) term
+        # (like the lcc_mult function does)
+        terms = _plogp(numpy.arange(totals[0] + 1)[:, numpy.newaxis],
+                       numpy.repeat(totals[0], totals[0] + 1))
+        return -terms[counts[:, :4]].sum(axis=1)
+    return -_plogp(counts[:, :4], totals)
+
+
+def entropy(counts):
+    """Return the Shannon entropy (in bits) of each window, from counts.
+
+    This uses the frequencies of A, C, G and T relative to their total
+    (ignoring any ambiguous letters), so ranges from 0 to 2.
+    """
+    counts = numpy.asarray(counts)
+    acgt = counts[:, :4]
+    return -_plogp(acgt, acgt.sum(axis=1))
+
+
+class WindowStats(object):
+    """Base composition statistics over sliding windows along a sequence."""
+
+    def __init__(self, seq):
+        """Count the bases in the sequence (string or Seq object)."""
+        self._prefix = _prefix_sums(_encode(seq))
+
+    def __len__(self):
+        """Return the length of the sequence."""
+        return len(self._prefix) - 1
+
+    def starts(self, window, step=None):
+        """Return the start of each full length window, as a NumPy array."""
+        step = _check_window(window, step)
+        return numpy.arange(0, len(self) - window + 1, step)
+
+    def counts(self, window, step=None):
+        """Return the counts of A, C, G, T, S and other letters in each window.
+
+        The result is a NumPy array with one row per window, and one column
+        per letter.
+        """
+        return _window_counts(self._prefix, self.starts(window, step), window)
+
+    def gc(self, window, step=None):
+        """Return the G+C percentage of each window (see gc_content)."""
+        return gc_content(self.counts(window, step))
+
+    def gc_skew(self, window, step=None):
+        """Return the GC skew of each window (see gc_skew)."""
+        return gc_skew(self.counts(window, step))
+
+    def cumulative_gc_skew(self, window, step=None):
+        """Return the running total of the GC skew of the windows."""
+        return cumulative_gc_skew(self.counts(window, step))
+
+    def lcc(self, window, step=None):
+        """Return the local composition complexity of each window (see lcc)."""
+        return lcc(self.counts(window, step))
+
+    def entropy(self, window, step=None):
+        """Return the Shannon entropy of each window (see entropy)."""
+        return entropy(self.counts(window, step))
+
+
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+    run_doctest(verbose=0)
@@ -182,6 +182,18 @@ def nt_search(seq, subseq):
 
     use ambiguous values (like N = A or T or C or G, R = A or G etc.)
     searches only on forward strand
+
+    Returns a list of the regular expression used, followed by the start
+    of each (possibly overlapping) match:
+
+    >>> from Bio.SeqUtils import nt_search
+    >>> nt_search("AAATGCCTGTCAACCTGA", "TGN")
+    ['TG[GATC]', 3, 7, 15]
+    >>> nt_search("AAAAA", "AA")
+    ['AA', 0, 1, 2, 3]
+
+    To search for several patterns at once, optionally on both strands,
+    see Bio.SeqUtils.NucleotideSearch instead.
     """
     pattern = ''
     for nt in subseq:
@@ -191,17 +203,10 @@ def nt_search(seq, subseq):
         else:
             pattern += '[%s]' % value
 
-    pos = -1
+    # A zero width lookahead finds overlapping matches in a single pass
     result = [pattern]
-    l = len(seq)
-    while True:
-        pos += 1
-        s = seq[pos:]
-        m = re.search(pattern, s)
-        if not m:
-            break
-        pos += int(m.start(0))
-        result.append(pos)
+    result.extend(m.start() for m in re.finditer("(?=%s)" % pattern,
+                                                 str(seq)))
     return result
 
 # }}}
@@ -459,6 +464,86 @@ def molecular_weight(seq, seq_type=None, double_stranded=False, circular=False,
     return weight
 
 
+def translate_frames(seq, genetic_code=1, stop_symbol="*"):
+    """Translate all six reading frames of a nucleotide sequence.
+
+    Returns a dictionary of protein strings keyed by frame, 1, 2 and 3 for
+    the forward strand (starting at the first, second and third base) and
+    -1, -2 and -3 for the reverse complement strand.  Any partial codon at
+    the end of a frame is ignored.
+
+    >>> from Bio.SeqUtils import translate_frames
+    >>> frames = translate_frames("AUGGCCAUUGUAAUGGGCCGCUGA")
+    >>> for frame in sorted(frames):
+    ...     print("%i %s" % (frame, frames[frame]))
+    -3 SGPLQWP
+    -2 QRPITMA
+    -1 SAAHYNGH
+    1 MAIVMGR*
+    2 WPL*WAA
+    3 GHCNGPL
+
+    Each frame is translated in a single call, so this is also suitable for
+    whole genomes (see also the find_orfs function).
+    """
+    from Bio.Seq import reverse_complement, translate
+    seq = str(seq)
+    anti = reverse_complement(seq)
+    length = len(seq)
+    frames = {}
+    for i in range(0, 3):
+        fragment_length = 3 * ((length - i) // 3)
+        frames[i + 1] = translate(seq[i:i + fragment_length], genetic_code,
+                                  stop_symbol)
+        frames[-(i + 1)] = translate(anti[i:i + fragment_length],
+                                     genetic_code, stop_symbol)
+    return frames
+
+
+def find_orfs(seq, min_length=100, genetic_code=1):
+    """Find open reading frames in all six frames of a nucleotide sequence.
+
+    An open reading frame here is a stretch of at least min_length amino
+    acids uninterrupted by a stop codon (i.e. translated from stop to stop,
+    not requiring a start codon).  Returns a list of (start, end, strand,
+    protein) tuples sorted by start, where start and end are Python style
+    coordinates on the forward strand covering the translated codons (the
+    terminating stop codon is excluded), strand is +1 or -1, and protein
+    is the translation as a string.
+
+    >>> from Bio.SeqUtils import find_orfs
+    >>> for orf in find_orfs("AUGGCCAUUGUAAUGGGCCGCUGA", min_length=7):
+    ...     print(orf)
+    (0, 21, 1, 'MAIVMGR')
+    (0, 24, -1, 'SAAHYNGH')
+    (1, 22, -1, 'SGPLQWP')
+    (2, 23, -1, 'QRPITMA')
+    (2, 23, 1, 'GHCNGPL')
+
+    For RNA input the strand is still +1 or -1 relative to the given
+    sequence, and mixed case input is fine.
+    """
+    if min_length < 1:
+        raise ValueError("Minimum ORF length should be at least one.")
+    seq = str(seq)
+    length = len(seq)
+    # Protein fragments between stop codons, at least min_length long:
+    pattern = re.compile("[^*]{%i,}" % min_length)
+    orfs = []
+    for frame, protein in translate_frames(seq, genetic_code).items():
+        offset = abs(frame) - 1
+        for match in pattern.finditer(protein):
+            start = offset + 3 * match.start()
+            end = offset + 3 * match.end()
+            if frame > 0:
+                orfs.append((start, end, 1, match.group()))
+            else:
+                orfs.append((length - end, length - start, -1,
+                             match.group()))
+    orfs.sort()
+    return orfs
+
+
 def six_frame_translations(seq, genetic_code=1):
     """Formatted string showing the 6 frame translations and GC content.
 
@@ -484,15 +569,13 @@ def six_frame_translations(seq, genetic_code=1):
     <BLANKLINE>
 
     """  # noqa for pep8 W291 trailing whitespace
-    from Bio.Seq import reverse_complement, translate
+    from Bio.Seq import reverse_complement
     anti = reverse_complement(seq)
     comp = anti[::-1]
     length = len(seq)
-    frames = {}
-    for i in range(0, 3):
-        fragment_length = 3 * ((length - i) // 3)
-        frames[i + 1] = translate(seq[i:i + fragment_length], genetic_code)
-        frames[-(i + 1)] = translate(anti[i:i + fragment_length], genetic_code)[::-1]
+    frames = translate_frames(seq, genetic_code)
+    for i in range(1, 4):
+        frames[-i] = frames[-i][::-1]
 
     # create header
     if length > 20:
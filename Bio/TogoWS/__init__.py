@@ -36,7 +36,7 @@ import time
 from Bio._py3k import _binary_to_string_handle, _as_bytes
 
 # Importing these functions with leading underscore as not intended for reuse
-from Bio._py3k import urlopen as _urlopen
+from Bio.WebCache import urlopen as _urlopen
 from Bio._py3k import quote as _quote
 
 
@@ -319,26 +319,30 @@ def _open(url, post=None):
     Open a handle to TogoWS, will raise an IOError if it encounters an error.
 
     In the absence of clear guidelines, this function enforces a limit of
-    "up to three queries per second" to avoid abusing the TogoWS servers.
+    "up to three queries per second" to avoid abusing the TogoWS servers,
+    except for requests answered from the Bio.WebCache response cache.
     """
-    delay = 0.333333333  # one third of a second
-    current = time.time()
-    wait = _open.previous + delay - current
-    if wait > 0:
-        time.sleep(wait)
-        _open.previous = current + wait
-    else:
-        _open.previous = current
-
     # print(url)
     if post:
-        handle = _urlopen(url, _as_bytes(post))
+        handle = _urlopen(url, _as_bytes(post), throttle=_wait)
     else:
-        handle = _urlopen(url)
+        handle = _urlopen(url, throttle=_wait)
 
     # We now trust TogoWS to have set an HTTP error code, that
     # suffices for my current unit tests. Previously we would
     # examine the start of the data returned back.
     return _binary_to_string_handle(handle)
 
-_open.previous = 0
+
+def _wait():
+    """Wait as needed before sending a query to TogoWS (PRIVATE)."""
+    delay = 0.333333333  # one third of a second
+    current = time.time()
+    wait = _wait.previous + delay - current
+    if wait > 0:
+        time.sleep(wait)
+        _wait.previous = current + wait
+    else:
+        _wait.previous = current
+
+_wait.previous = 0
@@ -0,0 +1,339 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""On-disk cache of the responses of online services, shared by Biopython.
+
+Pipelines often fetch the same records from the NCBI, ExPASy, KEGG or
+TogoWS again and again, each time counting against the request limits of
+these services. Setting a response cache keeps the successful responses in
+an SQLite database, so that repeating a request (even in another run of
+your program) is answered from disk:
+
+>>> import os, tempfile
+>>> from Bio import WebCache
+>>> filename = os.path.join(tempfile.mkdtemp(), "responses.sqlite")
+>>> cache = WebCache.set_cache(filename, ttl=7 * 24 * 3600)
+
+Once set, the cache is used by the Bio.Entrez functions (and the
+EntrezClient class), Bio.ExPASy, Bio.KEGG.REST and Bio.TogoWS. Requests
+answered from the cache do not wait for the rate limits of the services.
+The cache can also be used directly:
+
+>>> handle = WebCache.urlopen("http://www.example.org/?db=x&id=1")  # doctest: +SKIP
+
+How well it works is seen from the statistics:
+
+>>> stats = cache.stats()
+>>> print("%(hits)i hits, %(misses)i misses" % stats)
+0 hits, 0 misses
+>>> print("%(entries)i responses, %(size)i bytes" % stats)
+0 responses, 0 bytes
+
+Use set_cache(None) to stop using the cache:
+
+>>> WebCache.set_cache(None)
+>>> cache.close()
+
+Responses are found by the request method, the URL and the parameters
+(in any order, ignoring the email, tool and api_key parameters which only
+identify who asked). Only successful responses are stored, and requests
+creating or using an Entrez history (EPost, searches with usehistory, or
+requests giving a WebEnv) are always sent to the NCBI, as the WebEnv
+expires. Note that with a cache set, responses are read completely before
+being returned.
+
+Several processes can share the same cache file.
+"""
+
+from __future__ import print_function
+
+import hashlib
+import os
+import threading
+import time
+from io import BytesIO
+
+try:
+    from urllib.parse import parse_qsl, urlsplit, urlunsplit
+except ImportError:
+    # Python 2
+    from urlparse import parse_qsl, urlsplit, urlunsplit
+
+from Bio._py3k import urlopen as _urlopen
+from Bio._py3k import urlencode as _urlencode
+
+try:
+    import sqlite3 as _sqlite
+except ImportError:
+    # Not present on Jython, but should be included in Python 2.5
+    # or later (unless compiled from source without its dependencies)
+    _sqlite = None
+
+
+# Parameters identifying the user rather than the request
+_IGNORED_PARAMETERS = ("email", "tool", "api_key")
+
+# The cache used by urlopen, see set_cache
+_cache = None
+
+
+def _normalize_parameters(text):
+    """Sort form encoded parameters, dropping those we ignore (PRIVATE).
+
+    Returns the text unchanged if it does not look like form encoded data.
+    """
+    try:
+        pairs = parse_qsl(text, keep_blank_values=True, strict_parsing=True)
+    except ValueError:
+        return text
+    pairs = sorted((key, value) for key, value in pairs
+                   if key not in _IGNORED_PARAMETERS)
+    return _urlencode(pairs)
+
+
+def _request_key(url, data=None):
+    """Return the key identifying a request, a hex digest (PRIVATE)."""
+    scheme, netloc, path, query, fragment = urlsplit(url)
+    if query:
+        query = _normalize_parameters(query)
+    url = urlunsplit((scheme.lower(), netloc.lower(), path, query, ""))
+    if data is None:
+        request = "GET " + url
+    else:
+        if not isinstance(data, str):
+            data = data.decode("latin-1")
+        request = "POST %s\n%s" % (url, _normalize_parameters(data))
+    return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+
+def _handle(url, data):
+    """Return a handle to the response body (PRIVATE)."""
+    handle = BytesIO(data)
+    handle.url = url
+    return handle
+
+
+class ResponseCache(object):
+    """Cache of responses to web requests, kept in an SQLite database.
+
+    Arguments:
+     - filename - The SQLite database file, created if need be.
+     - ttl - Time to live of the responses in seconds, by default they
+       never expire.
+     - max_size - Maximum total size of the responses in bytes, beyond which
+       the least recently used responses are removed. By default there is
+       no limit.
+     - timeout - Seconds to wait for other processes using the database.
+
+    The attributes hits and misses count the lookups in this process.
+    """
+
+    def __init__(self, filename, ttl=None, max_size=None, timeout=60):
+        """Initialize the class."""
+        if not _sqlite:
+            # Hack for Jython (of if Python is compiled without it)
+            from Bio import MissingPythonDependencyError
+            raise MissingPythonDependencyError("Requires sqlite3, which is "
+                                               "included Python 2.5+")
+        self.filename = os.path.abspath(os.path.expanduser(filename))
+        self.ttl = ttl
+        self.max_size = max_size
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._con = None
+        self._pid = None
+        with self._lock:
+            con = self._connect()
+            with con:
+                con.execute("CREATE TABLE IF NOT EXISTS responses "
+                            "(key TEXT PRIMARY KEY, url TEXT, data BLOB, "
+                            "size INTEGER, created REAL, accessed REAL);")
+                con.execute("CREATE INDEX IF NOT EXISTS responses_accessed "
+                            "ON responses(accessed);")
+
+    def __repr__(self):
+        """Return a string representation of the cache."""
+        return "%s(%r, ttl=%r, max_size=%r)" % (self.__class__.__name__,
+                                                self.filename, self.ttl,
+                                                self.max_size)
+
+    def _connect(self):
+        """Return the connection to the database of this process (PRIVATE).
+
+        A connection is not used again after a fork, as the child process
+        must open its own.
+        """
+        if self._con is None or self._pid != os.getpid():
+            con = _sqlite.connect(self.filename, timeout=self.timeout,
+                                  check_same_thread=False)
+            # Let readers carry on while another process writes
+            con.execute("PRAGMA journal_mode=WAL;")
+            self._con = con
+            self._pid = os.getpid()
+        return self._con
+
+    def get(self, url, data=None):
+        """Return the cached response to a request as bytes, or None.
+
+        Arguments:
+         - url - The URL requested.
+         - data - Optional POST data (bytes) of the request.
+
+        """
+        key = _request_key(url, data)
+        now = time.time()
+        with self._lock:
+            con = self._connect()
+            with con:
+                row = con.execute("SELECT data, created FROM responses "
+                                  "WHERE key=?;", (key,)).fetchone()
+                if row is not None and self.ttl is not None and \
+                        row[1] + self.ttl < now:
+                    con.execute("DELETE FROM responses WHERE key=?;", (key,))
+                    row = None
+                if row is None:
+                    self.misses += 1
+                    return None
+                con.execute("UPDATE responses SET accessed=? WHERE key=?;",
+                            (now, key))
+            self.hits += 1
+        return bytes(row[0])
+
+    def put(self, url, body, data=None):
+        """Store the response (bytes) to a request.
+
+        Arguments:
+         - url - The URL requested.
+         - body - The body of the response (bytes).
+         - data - Optional POST data (bytes) of the request.
+
+        """
+        key = _request_key(url, data)
+        now = time.time()
+        with self._lock:
+            con = self._connect()
+            with con:
+                con.execute("INSERT OR REPLACE INTO responses "
+                            "(key, url, data, size, created, accessed) "
+                            "VALUES (?, ?, ?, ?, ?, ?);",
+                            (key, url, _sqlite.Binary(body), len(body),
+                             now, now))
+                if self.max_size is not None:
+                    self._evict(con)
+
+    def _evict(self, con):
+        """Remove the least recently used responses over the size (PRIVATE)."""
+        total = con.execute("SELECT SUM(size) FROM responses;").fetchone()[0]
+        if total <= self.max_size:
+            return
+        keys = []
+        for key, size in con.execute("SELECT key, size FROM responses "
+                                     "ORDER BY accessed;"):
+            keys.append((key,))
+            total -= size
+            if total <= self.max_size:
+                break
+        con.executemany("DELETE FROM responses WHERE key=?;", keys)
+
+    def purge(self):
+        """Remove the expired responses from the database."""
+        if self.ttl is None:
+            return
+        with self._lock:
+            con = self._connect()
+            with con:
+                con.execute("DELETE FROM responses WHERE created<?;",
+                            (time.time() - self.ttl,))
+
+    def clear(self):
+        """Remove all the responses from the database."""
+        with self._lock:
+            con = self._connect()
+            with con:
+                con.execute("DELETE FROM responses;")
+
+    def stats(self):
+        """Return a dictionary of the hits, misses, entries and total size."""
+        with self._lock:
+            entries, size = self._connect().execute(
+                "SELECT COUNT(*), SUM(size) FROM responses;").fetchone()
+        return {"hits": self.hits, "misses": self.misses,
+                "entries": entries, "size": size or 0}
+
+    def close(self):
+        """Close the connection to the database."""
+        with self._lock:
+            if self._con is not None and self._pid == os.getpid():
+                self._con.close()
+            self._con = None
+
+
+def set_cache(cache, ttl=None, max_size=None):
+    """Set the response cache used by Biopython's online modules.
+
+    Arguments:
+     - cache - A ResponseCache object, or the filename of the SQLite
+       database to use, or None to stop caching.
+     - ttl - Time to live of the responses in seconds (when giving a
+       filename).
+     - max_size - Maximum total size of the responses in bytes (when giving
+       a filename).
+
+    Returns the ResponseCache object (or None).
+    """
+    global _cache
+    if cache is not None and not isinstance(cache, ResponseCache):
+        cache = ResponseCache(cache, ttl, max_size)
+    elif ttl is not None or max_size is not None:
+        raise ValueError("Give the ttl and max_size to the ResponseCache")
+    _cache = cache
+    return cache
+
+
+def get_cache():
+    """Return the response cache in use, or None."""
+    return _cache
+
+
+def urlopen(url, data=None, throttle=None, use_cache=True):
+    """Open a URL, answering from the response cache if possible.
+
+    Arguments:
+     - url - The URL to open.
+     - data - Optional POST data (bytes).
+     - throttle - Optional function called before sending the request
+       (but not when answering from the cache), e.g. to wait as required
+       by the rate limit of the service.
+     - use_cache - Set to False for requests which change the state of
+       the server, and so must always be sent.
+
+    Without a response cache this simply returns the handle from the
+    urlopen function of the Python standard library.
+    """
+    cache = _cache if use_cache else None
+    if cache is not None:
+        body = cache.get(url, data)
+        if body is not None:
+            return _handle(url, body)
+    if throttle is not None:
+        throttle()
+    if data is None:
+        handle = _urlopen(url)
+    else:
+        handle = _urlopen(url, data)
+    if cache is None:
+        return handle
+    try:
+        body = handle.read()
+    finally:
+        handle.close()
+    cache.put(url, body, data)
+    return _handle(getattr(handle, "url", url), body)
+
+
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+    run_doctest()
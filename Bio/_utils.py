@@ -95,6 +95,81 @@ def find_test_dir(start_dir=None):
                      os.path.abspath(start_dir))
 
 
+def _pool_call(function_and_task):
+    """Call a function with a task, in a worker process of pool_imap (PRIVATE).
+
+    Exceptions which would fail when unpickled in the main process (which
+    stops the pool from handling any more results) are replaced.
+    """
+    function, task = function_and_task
+    try:
+        return function(task)
+    except Exception as err:
+        import pickle
+        try:
+            pickle.loads(pickle.dumps(err))
+        except Exception:
+            raise RuntimeError("%s in worker process: %s"
+                               % (err.__class__.__name__, err))
+        raise
+
+
+def pool_imap(function, tasks, processes, ordered=True, max_pending=None):
+    """Apply a function to each task using a pool of worker processes.
+
+    Arguments:
+    function -- Function defined at the top level of a module (so that it
+                can be sent to the workers), called with each task.
+    tasks -- Iterable of the tasks, read as they are handed out.
+    processes -- Number of worker processes.
+    ordered -- If True (default) the results are returned in the order of
+               the tasks, otherwise as soon as they are ready.
+    max_pending -- Maximum number of tasks handed out but whose results
+                   have not been returned yet (defaults to twice the number
+                   of processes), which bounds the memory used when the
+                   results are used more slowly than they are made.
+
+    This is a generator giving the return value of the function for each
+    task. An exception raised by the function (or a return value which
+    cannot be pickled) is raised here. Whether the generator is exhausted,
+    raises an exception or is closed early, the tasks already handed out
+    are finished before the pool is shut down.
+    """
+    import multiprocessing
+    import threading
+
+    if max_pending is None:
+        max_pending = 2 * processes
+    slots = threading.Semaphore(max_pending)
+    stopped = threading.Event()
+
+    def hand_out():
+        # Called from the pool's thread handing out the tasks, which waits
+        # here until a result has been taken by the caller.
+        for task in tasks:
+            slots.acquire()
+            if stopped.is_set():
+                return
+            yield function, task
+
+    pool = multiprocessing.Pool(processes)
+    try:
+        if ordered:
+            results = pool.imap(_pool_call, hand_out())
+        else:
+            results = pool.imap_unordered(_pool_call, hand_out())
+        for result in results:
+            slots.release()
+            yield result
+    finally:
+        # Let the thread handing out the tasks stop, rather than using
+        # terminate which can hang while the workers are busy
+        stopped.set()
+        slots.release()
+        pool.close()
+        pool.join()
+
+
 def run_doctest(target_dir=None, *args, **kwargs):
     """Runs doctest for the importing module."""
     import doctest
@@ -396,8 +396,11 @@ def BgzfBlocks(handle):
     data_start = 0
     while True:
         start_offset = handle.tell()
-        # This may raise StopIteration which is perfect here
-        block_length, data = _load_bgzf_block(handle)
+        try:
+            block_length, data = _load_bgzf_block(handle)
+        except StopIteration:
+            # End of file (inside a generator this must be a return)
+            return
         data_len = len(data)
         yield start_offset, block_length, data_start, data_len
         data_start += data_len
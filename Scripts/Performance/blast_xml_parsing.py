@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""Compare the speed and memory use of the BLAST XML parsers.
+
+Usage: python blast_xml_parsing.py [BLAST XML file] [copies]
+
+This parses the file (by default the miRNA BLASTN output used in the unit
+tests) with Bio.Blast.NCBIXML and with Bio.SearchIO (format blast-xml),
+reporting the time taken and the peak memory used while iterating over the
+results (using tracemalloc, Python 3.4 or later). To mimic a large output,
+the queries are copied a number of times into a temporary file first; use
+a copies value of one to parse a multi-GB file as it is.
+"""
+from __future__ import print_function
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+from Bio import BiopythonExperimentalWarning
+from Bio.Blast import NCBIXML
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", BiopythonExperimentalWarning)
+    from Bio import SearchIO
+
+if len(sys.argv) > 1:
+    filename = sys.argv[1]
+else:
+    filename = os.path.join(os.path.dirname(__file__), "..", "..",
+                            "Tests", "Blast", "mirna.xml")
+copies = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+if copies > 1:
+    with open(filename) as handle:
+        data = handle.read()
+    start = data.index("<BlastOutput_iterations>") + \
+        len("<BlastOutput_iterations>")
+    end = data.index("</BlastOutput_iterations>")
+    handle, filename = tempfile.mkstemp(suffix=".xml")
+    os.close(handle)
+    with open(filename, "w") as handle:
+        handle.write(data[:start])
+        for i in range(copies):
+            handle.write(data[start:end])
+        handle.write(data[end:])
+    remove = True
+else:
+    remove = False
+
+
+def ncbixml(filename):
+    """Count the queries and HSPs using Bio.Blast.NCBIXML."""
+    queries = hsps = 0
+    with open(filename) as handle:
+        for record in NCBIXML.parse(handle):
+            queries += 1
+            hsps += sum(len(alignment.hsps)
+                        for alignment in record.alignments)
+    return queries, hsps
+
+
+def searchio(filename):
+    """Count the queries and HSPs using Bio.SearchIO."""
+    queries = hsps = 0
+    for qresult in SearchIO.parse(filename, "blast-xml"):
+        queries += 1
+        hsps += sum(len(hit) for hit in qresult)
+    return queries, hsps
+
+
+print("Parsing %s (%0.1f MB)" % (filename,
+                                 os.path.getsize(filename) / 1024.0 ** 2))
+try:
+    for name, function in [("Bio.Blast.NCBIXML", ncbixml),
+                           ("Bio.SearchIO", searchio)]:
+        start_time = time.time()
+        queries, hsps = function(filename)
+        taken = time.time() - start_time
+        tracemalloc.start()
+        function(filename)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print("%s: %i queries, %i HSPs in %0.2fs (%0.0f HSPs/s), "
+              "peak memory %0.1f MB" % (name, queries, hsps, taken,
+                                        hsps / taken, peak / 1024.0 ** 2))
+finally:
+    if remove:
+        os.remove(filename)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""Measure the speed and memory use of the SearchIO object model.
+
+Usage: python searchio_memory.py [copies]
+
+This parses the BLAST XML and HMMER3 text outputs used in the unit tests
+(after copying their queries a number of times into a temporary file, to
+mimic large outputs), keeping all the QueryResult objects in memory. It
+reports the time taken and the memory used per HSP (using tracemalloc,
+Python 3.4 or later), and then the time taken to use the aligned sequences
+of every HSP, which are only turned into SeqRecord objects when needed.
+"""
+from __future__ import print_function
+
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+from Bio import BiopythonExperimentalWarning
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", BiopythonExperimentalWarning)
+    from Bio import SearchIO
+
+copies = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+tests = os.path.join(os.path.dirname(__file__), "..", "..", "Tests")
+
+# file name, format, and the text before the first and after the last query
+FILES = [(os.path.join(tests, "Blast", "mirna.xml"), "blast-xml",
+          "<BlastOutput_iterations>", "</BlastOutput_iterations>"),
+         (os.path.join(tests, "Hmmer", "text_30_hmmscan_010.out"),
+          "hmmer3-text", None, None)]
+
+
+def copy_queries(filename, start_mark, end_mark):
+    """Write a temporary file with the queries copied, returns its name."""
+    with open(filename) as handle:
+        data = handle.read()
+    if start_mark is None:
+        # HMMER3 text, queries start at the first Query: line
+        start = data.index("Query:")
+        end = len(data)
+    else:
+        start = data.index(start_mark) + len(start_mark)
+        end = data.index(end_mark)
+    handle, filename = tempfile.mkstemp()
+    os.close(handle)
+    with open(filename, "w") as handle:
+        handle.write(data[:start])
+        for i in range(copies):
+            handle.write(data[start:end])
+        handle.write(data[end:])
+    return filename
+
+
+for filename, fmt, start_mark, end_mark in FILES:
+    filename = copy_queries(filename, start_mark, end_mark)
+    try:
+        start_time = time.time()
+        qresults = list(SearchIO.parse(filename, fmt))
+        taken = time.time() - start_time
+        hsps = sum(len(hit) for qresult in qresults for hit in qresult)
+        del qresults
+        gc.collect()
+        tracemalloc.start()
+        qresults = list(SearchIO.parse(filename, fmt))
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print("%s: %i queries, %i HSPs in %0.2fs, %0.1f MB, "
+              "%0.0f bytes per HSP" % (fmt, len(qresults), hsps, taken,
+                                       used / 1024.0 ** 2, used / float(hsps)))
+        start_time = time.time()
+        for qresult in qresults:
+            for hit in qresult:
+                for hsp in hit:
+                    hsp.query_all, hsp.hit_all
+        print("%s: sequences of all HSPs used in %0.2fs"
+              % (fmt, time.time() - start_time))
+    finally:
+        os.remove(filename)
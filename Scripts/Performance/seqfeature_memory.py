@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+"""Measure the memory used by the features of an annotated genome.
+
+Usage: python seqfeature_memory.py [GenBank or EMBL file] [copies]
+
+This parses the file (by default the Arabidopsis chloroplast genome used in
+the unit tests) and reports the memory taken by the SeqFeature, location
+and position objects, using tracemalloc (Python 3.4 or later). To mimic a
+large genome, the features are copied (shifted along the sequence) a number
+of times, sharing their qualifiers with the original features.
+"""
+from __future__ import print_function
+
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+from Bio import SeqIO
+from Bio.SeqFeature import SeqFeature
+
+if len(sys.argv) > 1:
+    filename = sys.argv[1]
+else:
+    filename = os.path.join(os.path.dirname(__file__), "..", "..",
+                            "Tests", "GenBank", "NC_000932.gb")
+copies = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+fmt = "embl" if filename.endswith((".embl", ".em")) else "genbank"
+
+start_time = time.time()
+records = list(SeqIO.parse(filename, fmt))
+print("Parsed %i records in %0.2fs" % (len(records), time.time() - start_time))
+features = [f for record in records for f in record.features]
+
+gc.collect()
+tracemalloc.start()
+before = tracemalloc.get_traced_memory()[0]
+copied = []
+for i in range(copies):
+    offset = i * 1000000
+    copied.extend(SeqFeature(f.location._shift(offset), type=f.type,
+                             id=f.id, qualifiers=f.qualifiers)
+                  for f in features)
+gc.collect()
+used = tracemalloc.get_traced_memory()[0] - before
+tracemalloc.stop()
+
+print("%i features (%i copies of %i), %0.1f MB, %0.1f bytes per feature"
+      % (len(copied), copies, len(features), used / 1024.0 ** 2,
+         used / float(len(copied))))
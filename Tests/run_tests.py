@@ -122,6 +122,7 @@ DOCTEST_MODULES = [
     "Bio.Seq",
     "Bio.SeqIO",
     "Bio.SeqIO.AceIO",
+    "Bio.SeqIO.FaidxIO",
     "Bio.SeqIO.FastaIO",
     "Bio.SeqIO.IgIO",
     "Bio.SeqIO.InsdcIO",
@@ -135,11 +136,13 @@ DOCTEST_MODULES = [
     "Bio.SeqUtils",
     "Bio.SeqUtils.CheckSum",
     "Bio.SeqUtils.MeltingTemp",
+    "Bio.SeqUtils.NucleotideSearch",
     "Bio.Sequencing.Applications._Novoalign",
     "Bio.Sequencing.Applications._bwa",
     "Bio.Sequencing.Applications._samtools",
     "Bio.SwissProt",
     "Bio.UniProt.GOA",
+    "Bio.WebCache",
     "Bio.Wise",
     "Bio.Wise.psw",
 ]
@@ -147,10 +150,15 @@ DOCTEST_MODULES = [
 if is_numpy():
     DOCTEST_MODULES.extend([
         "Bio.Affy.CelFile",
+        "Bio.Align._array",
         "Bio.MaxEntropy",
+        "Bio.PDB.BatchSuperimposer",
+        "Bio.PDB.MMCIF2Dict",
         "Bio.PDB.Polypeptide",
         "Bio.PDB.Selection",
+        "Bio.SearchIO._table",
         "Bio.SeqIO.PdbIO",
+        "Bio.SeqUtils.WindowStats",
         "Bio.Statistics.lowess",
         "Bio.SVDSuperimposer",
     ])
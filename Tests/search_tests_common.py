@@ -15,6 +15,7 @@ except ImportError:
     sqlite3 = None
 
 from Bio._py3k import _as_bytes
+from Bio._py3k import basestring
 from Bio.SeqRecord import SeqRecord
 
 from Bio import BiopythonExperimentalWarning
@@ -98,6 +99,15 @@ class CheckIndex(unittest.TestCase):
                 self.assertNotEqual(id(qres), id(dbidx_qres))
                 self.assertTrue(compare_search_obj(qres, dbidx_qres))
 
+        # parsing the indexed queries one at a time should agree too
+        parallel = list(SearchIO.parallel_parse(filename, format, processes=1,
+                                                chunk_size=1, **kwargs))
+        self.assertEqual(len(parsed), len(parallel),
+                         "Should be %i records in %s, parallel_parse gave %i"
+                         % (len(parsed), filename, len(parallel)))
+        for qres, par_qres in zip(parsed, parallel):
+            self.assertTrue(compare_search_obj(qres, par_qres))
+
         indexed.close()
         if sqlite3 is not None:
             db_indexed.close()
@@ -153,9 +163,12 @@ def compare_attrs(obj_a, obj_b, attrs):
         # comparing using compare_record is too slow
         if attr in ('_hit', '_query') and (val_a is not None and val_b is
                 not None):
-            # compare seq directly if it's a contiguous hsp
-            if isinstance(val_a, SeqRecord) and isinstance(val_b, SeqRecord):
-                assert str(val_a.seq) == str(val_b.seq), \
+            # compare seq directly if it's a contiguous hsp, whose sequences
+            # may still be strings if they have not been used yet
+            if isinstance(val_a, (SeqRecord, basestring)) and \
+                    isinstance(val_b, (SeqRecord, basestring)):
+                assert str(getattr(val_a, 'seq', val_a)) == \
+                        str(getattr(val_b, 'seq', val_b)), \
                         "%s: %r vs %r" % (attr, val_a, val_b)
             elif isinstance(val_a, list) and isinstance(val_b, list):
                 for seq_a, seq_b in zip(val_a, val_b):
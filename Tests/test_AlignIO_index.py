@@ -0,0 +1,181 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Unit tests for Bio.AlignIO.index() and index_db() with Stockholm files."""
+
+try:
+    import sqlite3
+except ImportError:
+    # skip the index_db tests if sqlite is not available
+    sqlite3 = None
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from Bio import AlignIO
+from Bio import bgzf
+from Bio.Alphabet import generic_protein
+from Bio.AlignIO.StockholmIO import StockholmIterator
+
+
+FAMILIES = "Stockholm/families.sth"
+
+
+class StockholmParsing(unittest.TestCase):
+    """Check the parser details the index relies on."""
+
+    def test_interlaced(self):
+        """Check the blocks of an interlaced alignment are joined."""
+        with open(FAMILIES) as handle:
+            alignment = next(StockholmIterator(handle))
+        self.assertEqual(4, len(alignment))
+        self.assertEqual(43, alignment.get_alignment_length())
+        record = alignment[3]
+        self.assertEqual("O31698/88-139", record.id)
+        self.assertEqual("EVMLTDIPRLHINDPIMK--GFGMVINN------GFVCVENDE",
+                         str(record.seq))
+        self.assertEqual("CCCCCCCHHHHHHHHHHH..HEEEEEEE....EEEEEEEEEEH",
+                         record.letter_annotations["secondary_structure"])
+        self.assertEqual("Bacillus subtilis", record.annotations["organism"])
+
+    def test_file_annotations(self):
+        """Check the #=GF lines are recorded in the alignment annotations."""
+        alignments = list(AlignIO.parse(FAMILIES, "stockholm"))
+        self.assertEqual(3, len(alignments))
+        annotations = alignments[0].annotations
+        self.assertEqual("CBS", annotations["identifier"])
+        self.assertEqual("PF00571.24", annotations["accession"])
+        self.assertEqual("CBS domain", annotations["description"])
+        self.assertEqual("Bateman A", annotations["GF:AU"])
+        self.assertEqual("CBS domains are small intracellular modules "
+                         "mostly found\nin 2 or four copies within a "
+                         "protein.", annotations["GF:CC"])
+        self.assertEqual({"identifier": "no_accession", "GF:SQ": "2"},
+                         alignments[2].annotations)
+
+    def test_no_letter_annotations(self):
+        """Check the #=GR lines can be ignored."""
+        with open(FAMILIES) as handle:
+            alignments = list(StockholmIterator(handle,
+                                                letter_annotations=False))
+        expected = list(AlignIO.parse(FAMILIES, "stockholm"))
+        self.assertEqual(len(expected), len(alignments))
+        for old, new in zip(expected, alignments):
+            self.assertEqual([str(r.seq) for r in old],
+                             [str(r.seq) for r in new])
+            for record in new:
+                self.assertEqual({}, record.letter_annotations)
+        self.assertTrue(expected[0][0].letter_annotations)
+
+
+class StockholmIndex(unittest.TestCase):
+
+    def check_index(self, families):
+        """Compare each indexed alignment with those from parsing."""
+        alignments = list(AlignIO.parse(FAMILIES, "stockholm"))
+        self.assertEqual(3, len(families))
+        self.assertEqual(["PF00571.24", "PF01783.17", "no_accession"],
+                         sorted(families))
+        for alignment in alignments:
+            key = alignment.annotations.get("accession",
+                                            alignment.annotations["identifier"])
+            self.assertTrue(key in families)
+            indexed = families[key]
+            self.assertEqual(alignment.annotations, indexed.annotations)
+            self.assertEqual([(r.id, str(r.seq)) for r in alignment],
+                             [(r.id, str(r.seq)) for r in indexed])
+        self.assertFalse("PF00571" in families)
+        self.assertRaises(KeyError, families.__getitem__, "PF00571")
+        raw = families.get_raw("PF01783.17")
+        self.assertTrue(raw.startswith(b"# STOCKHOLM 1.0\n#=GF ID   "
+                                       b"Ribosomal_L32p\n"))
+        self.assertTrue(raw.endswith(b"\n//\n"))
+        self.assertEqual(1, raw.count(b"# STOCKHOLM 1.0"))
+        self.assertEqual(3, raw.count(b"\nRL32_"))
+
+    def test_index(self):
+        """Index a Stockholm file."""
+        families = AlignIO.index(FAMILIES, "stockholm")
+        try:
+            self.check_index(families)
+        finally:
+            families.close()
+
+    def test_key_function(self):
+        """Index a Stockholm file without the accession versions."""
+        families = AlignIO.index(FAMILIES, "stockholm", generic_protein,
+                                 key_function=lambda acc: acc.split(".")[0])
+        try:
+            self.assertEqual(["PF00571", "PF01783", "no_accession"],
+                             sorted(families))
+            alignment = families["PF01783"]
+            self.assertEqual(generic_protein, alignment._alphabet)
+            self.assertEqual(3, len(alignment))
+        finally:
+            families.close()
+
+    def test_letter_annotations(self):
+        """Index a Stockholm file ignoring the #=GR lines."""
+        families = AlignIO.index(FAMILIES, "stockholm",
+                                 letter_annotations=False)
+        try:
+            for record in families["PF00571.24"]:
+                self.assertEqual({}, record.letter_annotations)
+        finally:
+            families.close()
+
+    def test_bgzf(self):
+        """Index a BGZF compressed Stockholm file."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(temp_dir, "families.sth.bgz")
+            with open(FAMILIES, "rb") as handle:
+                with bgzf.BgzfWriter(filename, "wb") as output:
+                    output.write(handle.read())
+            families = AlignIO.index(filename, "stockholm")
+            try:
+                self.check_index(families)
+            finally:
+                families.close()
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_no_key(self):
+        """Check an error is raised for alignments without #=GF AC or ID."""
+        self.assertRaises(ValueError, AlignIO.index,
+                          "Stockholm/simple.sth", "stockholm")
+
+    def test_bad_format(self):
+        """Check unsupported formats are rejected."""
+        self.assertRaises(ValueError, AlignIO.index,
+                          "Clustalw/opuntia.aln", "clustal")
+        self.assertRaises(ValueError, AlignIO.index, FAMILIES, "Stockholm")
+        with open(FAMILIES) as handle:
+            self.assertRaises(TypeError, AlignIO.index, handle, "stockholm")
+
+    @unittest.skipIf(sqlite3 is None, "sqlite3 not available")
+    def test_index_db(self):
+        """Index a Stockholm file with SQLite, and reload the index."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            index_filename = os.path.join(temp_dir, "families.idx")
+            families = AlignIO.index_db(index_filename, FAMILIES, "stockholm")
+            try:
+                self.check_index(families)
+            finally:
+                families.close()
+            families = AlignIO.index_db(index_filename)
+            try:
+                self.check_index(families)
+            finally:
+                families.close()
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
@@ -14,6 +14,7 @@ from Bio.Seq import Seq
 from Bio.SeqRecord import SeqRecord
 from Bio import AlignIO
 from Bio.SubsMat.FreqTable import FreqTable, FREQ
+from Bio.Align import AlignInfo
 from Bio.Align.AlignInfo import SummaryInfo
 import math
 
@@ -143,6 +144,37 @@ X  0.0 0.0 0.0 0.0 0.0 0.0 0.0 0.0 0.0 0.0 0.0 0.0 0.0 0.0 0.0 0.0 0.0
                                                1.290, 1.290, 0.80, 0.610, 0.390, 0.470, 0.040], places=2)
         self.assertAlmostEqual(ic, 7.546, places=3)
 
+    def check_column_by_column(self, alignment):
+        """Check the summaries match those done without the array."""
+        def summaries():
+            s = SummaryInfo(alignment)
+            ic = s.information_content(chars_to_ignore=['-'], pseudo_count=1)
+            return [str(s.dumb_consensus()), str(s.gap_consensus(0.5)),
+                    str(s.dumb_consensus(0.1, require_multiple=1)),
+                    [(p[0], p[1]) for p in s.pos_specific_score_matrix().pssm],
+                    s.replacement_dictionary(), ic, s.ic_vector]
+        expected = summaries()
+        numpy = AlignInfo.numpy
+        try:
+            AlignInfo.numpy = None
+            self.assertEqual(expected, summaries())
+        finally:
+            AlignInfo.numpy = numpy
+
+    @unittest.skipIf(AlignInfo.numpy is None, "NumPy not installed")
+    def test_column_by_column(self):
+        """Check using the alignment array gives identical results."""
+        alpha = Gapped(unambiguous_dna, "-")
+        alignment = AlignIO.read("Clustalw/opuntia.aln", "clustal",
+                                 alphabet=alpha)
+        self.check_column_by_column(alignment)
+        for i, record in enumerate(alignment):
+            record.annotations['weight'] = 0.1 + 0.3 * i
+        self.check_column_by_column(alignment)
+        alignment = AlignIO.read("Clustalw/hedgehog.aln", "clustal",
+                                 alphabet=Gapped(generic_protein, "-"))
+        self.check_column_by_column(alignment)
+
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
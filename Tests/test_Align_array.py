@@ -0,0 +1,135 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Tests for the array view of alignments (MultipleSeqAlignment.as_array)."""
+
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use MultipleSeqAlignment.as_array.")
+
+from Bio import AlignIO
+from Bio.Alphabet import generic_dna
+from Bio.Align import MultipleSeqAlignment
+from Bio.Seq import Seq, MutableSeq
+from Bio.SeqRecord import SeqRecord
+
+
+class AlignmentArrayTests(unittest.TestCase):
+
+    def setUp(self):
+        self.align = AlignIO.read("Clustalw/opuntia.aln", "clustal")
+
+    def test_columns(self):
+        """Check the columns match those of the alignment."""
+        array = self.align.as_array()
+        self.assertEqual((7, 156), array.data.shape)
+        self.assertEqual(7, len(array))
+        self.assertEqual(156, array.get_alignment_length())
+        expected = ["".join(str(rec.seq[i]) for rec in self.align)
+                    for i in range(156)]
+        self.assertEqual(expected, [array[:, i] for i in range(156)])
+        self.assertEqual(expected, [self.align[:, i] for i in range(156)])
+        self.assertEqual(expected[-1][2:5], self.align[2:5, -1])
+        self.assertEqual(str(self.align[3].seq), array[3])
+        self.assertEqual(str(self.align[3].seq[5:9]), array[3, 5:9])
+        self.assertEqual(self.align[3, 58], array[3, 58])
+        self.assertRaises(IndexError, array.__getitem__, (0, 156))
+        self.assertRaises(TypeError, array.__getitem__, (0, 1, 2))
+
+    def test_cache(self):
+        """Check the array is only built again when the rows change."""
+        array = self.align.as_array()
+        self.assertTrue(array is self.align.as_array())
+        self.assertFalse(array.data.flags.writeable)
+        self.align.sort()
+        self.assertFalse(array is self.align.as_array())
+        array = self.align.as_array()
+        self.assertEqual([rec.id for rec in self.align],
+                         [rec.id for rec in array.records])
+        self.align[0].seq = Seq("A" * 156)
+        self.assertEqual("A" + array[1:, 0], self.align[:, 0])
+        array = self.align.as_array()
+        self.align.append(SeqRecord(Seq("C" * 156), id="extra"))
+        self.assertEqual(8, len(self.align.as_array()))
+        self.assertEqual("C", self.align[:, 0][-1])
+        # sequences which can be edited in place are not cached
+        self.align[0].seq = MutableSeq("G" * 156)
+        array = self.align.as_array()
+        self.assertFalse(array is self.align.as_array())
+        self.align[0].seq[0] = "T"
+        self.assertEqual("T", self.align[:, 0][0])
+
+    def test_counts(self):
+        """Check the gap fractions and letter counts of each column."""
+        array = self.align.as_array()
+        letters, counts = array.column_counts()
+        self.assertEqual("-ACGT", letters)
+        self.assertEqual((5, 156), counts.shape)
+        for i in range(156):
+            column = self.align[:, i]
+            self.assertEqual([column.count(letter) for letter in letters],
+                             counts[:, i].tolist())
+        self.assertTrue(numpy.allclose(counts[0] / 7.0, array.gap_fraction()))
+        self.assertEqual(0, array.gap_fraction(".").sum())
+        letters, counts = array.column_counts("TX")
+        self.assertEqual("TX", letters)
+        self.assertEqual([3, 0], counts[:, 58].tolist())
+
+    def test_chunks(self):
+        """Check the letters are counted in chunks of rows."""
+        from Bio.Align import _array
+        array = self.align.as_array()
+        expected = array.column_counts()
+        old = _array._CHUNK_ROWS
+        try:
+            _array._CHUNK_ROWS = 2
+            letters, counts = array.column_counts()
+        finally:
+            _array._CHUNK_ROWS = old
+        self.assertEqual(expected[0], letters)
+        self.assertTrue(numpy.array_equal(expected[1], counts))
+
+    def test_subset(self):
+        """Check selecting rows and columns by slices, lists and masks."""
+        array = self.align.as_array()
+        mask = array.gap_fraction() == 0
+        trimmed = array[:, mask]
+        self.assertEqual((7, mask.sum()), trimmed.data.shape)
+        self.assertEqual(0, trimmed.gap_fraction().sum())
+        align = trimmed.to_alignment()
+        self.assertEqual(len(self.align), len(align))
+        for old, new in zip(self.align, align):
+            self.assertEqual(old.id, new.id)
+            self.assertEqual(old.description, new.description)
+            self.assertEqual("".join(letter for letter, keep
+                                     in zip(str(old.seq), mask) if keep),
+                             str(new.seq))
+        self.assertEqual(self.align._alphabet, align._alphabet)
+        rows = array[[0, 2, 4], 10:20]
+        self.assertEqual([self.align[i].id for i in (0, 2, 4)],
+                         [rec.id for rec in rows.records])
+        self.assertEqual([str(self.align[i].seq[10:20]) for i in (0, 2, 4)],
+                         [rows[i] for i in range(3)])
+        rows = array[numpy.array([True, False] * 3 + [True])]
+        self.assertEqual(4, len(rows))
+        self.assertEqual(156, rows.get_alignment_length())
+        self.assertEqual(str(self.align[6].seq), rows[3])
+
+    def test_empty(self):
+        """Check an alignment without any rows."""
+        array = MultipleSeqAlignment([], generic_dna).as_array()
+        self.assertEqual((0, 0), array.data.shape)
+        self.assertEqual("", array.letters())
+        self.assertEqual(0, len(array.gap_fraction()))
+        self.assertEqual(0, len(array.to_alignment()))
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
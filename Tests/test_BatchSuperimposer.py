@@ -0,0 +1,173 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Tests for the vectorized QCP code in Bio.PDB.BatchSuperimposer."""
+
+import os
+import tempfile
+import unittest
+
+try:
+    from numpy import array, dot, around, array_equal, allclose, zeros
+    from numpy import linalg, random, sqrt
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.PDB.BatchSuperimposer.")
+
+from Bio.PDB.BatchSuperimposer import BatchQCPSuperimposer, rmsd_matrix
+
+
+class BatchQCPSuperimposerTest(unittest.TestCase):
+
+    def setUp(self):
+        # Same coordinates as in test_QCPSuperimposer.py
+        self.x = array([[51.65, -1.90, 50.07],
+                        [50.40, -1.23, 50.65],
+                        [50.68, -0.04, 51.54],
+                        [50.22, -0.02, 52.85]])
+
+        self.y = array([[51.30, -2.99, 46.54],
+                        [51.09, -1.88, 47.58],
+                        [52.36, -1.20, 48.03],
+                        [52.71, -1.18, 49.38]])
+
+    def check_transformed(self, sup):
+        """Check the transformed coordinates are at the RMSD found."""
+        transformed = sup.get_transformed()
+        rot, tran = sup.get_rotran()
+        for coords, model_rot, model_tran, model, rms in zip(
+                sup.coords, rot, tran, transformed, sup.get_rms()):
+            self.assertTrue(allclose(model, dot(coords, model_rot) +
+                                     model_tran))
+            diff = model - sup.reference_coords
+            self.assertAlmostEqual(rms, sqrt((diff * diff).sum() / sup.n))
+
+    def test_run(self):
+        sup = BatchQCPSuperimposer()
+        sup.set(self.x, array([self.y, self.x, self.y + 1.0]))
+        sup.run()
+        rms = sup.get_rms()
+        self.assertEqual(3, len(rms))
+        self.assertEqual(float('%.3f' % rms[0]), 0.003)
+        self.assertEqual(float('%.3f' % rms[1]), 0.0)
+        self.assertEqual(float('%.3f' % rms[2]), 0.003)
+        rot, tran = sup.get_rotran()
+        self.assertEqual((3, 3, 3), rot.shape)
+        self.assertEqual((3, 3), tran.shape)
+        self.assertTrue(allclose(rot[0], rot[2]))
+        self.assertTrue(
+            array_equal(around(rot[1], decimals=3), [[1, 0, 0],
+                                                     [0, 1, 0],
+                                                     [0, 0, 1]]))
+        self.assertTrue(allclose(sup.get_transformed()[1], self.x))
+        self.check_transformed(sup)
+
+    def test_random(self):
+        state = random.RandomState(1)
+        reference = state.uniform(-20.0, 20.0, (12, 3))
+        coords = state.uniform(-20.0, 20.0, (20, 12, 3))
+        # add rotated and translated copies of the reference, with noise
+        for i in range(5):
+            rot = linalg.qr(state.normal(size=(3, 3)))[0]
+            coords[i] = (dot(reference, rot) + state.normal(size=3) * 10 +
+                         state.normal(scale=0.1, size=(12, 3)))
+        sup = BatchQCPSuperimposer()
+        sup.set(reference, coords)
+        sup.run(chunk_size=7)
+        self.assertTrue((sup.get_rms()[:5] < 0.5).all())
+        self.check_transformed(sup)
+
+    def test_rms_only(self):
+        sup = BatchQCPSuperimposer()
+        sup.set(self.x, array([self.y, self.x]))
+        sup.run(rotation=False)
+        self.assertEqual(float('%.3f' % sup.get_rms()[0]), 0.003)
+        self.assertIsNone(sup.rot)
+        self.assertRaises(ValueError, sup.get_rotran)
+
+    def test_get_init_rms(self):
+        sup = BatchQCPSuperimposer()
+        sup.set(self.x, array([self.x, self.x + 1.0]))
+        self.assertTrue(allclose(sup.get_init_rms(), [0.0, 3 ** 0.5]))
+
+    def test_mismatch(self):
+        sup = BatchQCPSuperimposer()
+        self.assertRaises(ValueError, sup.set, self.x, array([self.x[:3]]))
+        self.assertRaises(ValueError, sup.set, self.x, self.x)
+        self.assertRaises(ValueError, sup.run)
+
+
+class RMSDMatrixTest(unittest.TestCase):
+
+    def setUp(self):
+        x = array([[-2.803, -15.373, 24.556],
+                   [0.893, -16.062, 25.147],
+                   [1.368, -12.371, 25.885],
+                   [-1.651, -12.153, 28.177],
+                   [-0.440, -15.218, 30.068],
+                   [2.551, -13.273, 31.372],
+                   [0.105, -11.330, 33.567]])
+        y = array([[-14.739, -18.673, 15.040],
+                   [-12.473, -15.810, 16.074],
+                   [-14.802, -13.307, 14.408],
+                   [-17.782, -14.852, 16.171],
+                   [-16.124, -14.617, 19.584],
+                   [-15.029, -11.037, 18.902],
+                   [-18.577, -10.001, 17.996]])
+        self.coords = array([x, y, x + 2.0, y[::-1], x[::-1]])
+
+    def check_matrix(self, matrix):
+        coords = self.coords
+        n = len(coords)
+        self.assertEqual(n * (n - 1) // 2, len(matrix))
+        index = 0
+        for i in range(n):
+            for j in range(i + 1, n):
+                sup = BatchQCPSuperimposer()
+                sup.set(coords[i], coords[j:j + 1])
+                sup.run(rotation=False)
+                self.assertAlmostEqual(sup.get_rms()[0], matrix[index])
+                index += 1
+        # From the QCPSuperimposer tests
+        self.assertEqual(float('%.3f' % matrix[0]), 0.719)
+        self.assertAlmostEqual(matrix[1], 0.0, places=5)
+
+    def test_matrix(self):
+        self.check_matrix(rmsd_matrix(self.coords))
+
+    def test_chunks(self):
+        self.check_matrix(rmsd_matrix(self.coords, chunk_size=2))
+
+    def test_processes(self):
+        self.check_matrix(rmsd_matrix(self.coords, chunk_size=2, processes=2))
+
+    def test_memmap(self):
+        handle, filename = tempfile.mkstemp(suffix=".dat")
+        os.close(handle)
+        try:
+            matrix = rmsd_matrix(self.coords, chunk_size=3, filename=filename)
+            self.check_matrix(matrix)
+            del matrix
+            self.assertEqual(8 * 10, os.path.getsize(filename))
+        finally:
+            os.remove(filename)
+
+    def test_empty(self):
+        self.assertEqual(0, len(rmsd_matrix(zeros((1, 4, 3)))))
+
+    def test_empty_memmap(self):
+        handle, filename = tempfile.mkstemp(suffix=".dat")
+        os.close(handle)
+        try:
+            matrix = rmsd_matrix(zeros((1, 4, 3)), filename=filename)
+            self.assertEqual(0, len(matrix))
+            del matrix
+        finally:
+            os.remove(filename)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
@@ -0,0 +1,250 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Tests for Bio.Entrez.Client using a local stand-in for the NCBI server."""
+
+import threading
+import time
+import unittest
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import urlparse, parse_qs
+except ImportError:
+    # Python 2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import urlparse, parse_qs
+
+from Bio._py3k import HTTPError
+from Bio.Entrez.Client import EntrezClient, TokenBucket
+
+
+EPOST = """<?xml version="1.0"?>
+<!DOCTYPE ePostResult PUBLIC "-//NLM//DTD ePostResult, 11 May 2002//EN" \
+"http://www.ncbi.nlm.nih.gov/entrez/query/DTD/ePost_020511.dtd">
+<ePostResult>
+	<QueryKey>%i</QueryKey>
+	<WebEnv>%s</WebEnv>
+</ePostResult>
+"""
+
+
+class EUtilsHandler(BaseHTTPRequestHandler):
+    """Minimal E-utilities, keeping the posted identifiers in memory.
+
+    EFetch and ESummary give the identifiers of the requested part of the
+    history, one per line.
+    """
+
+    protocol_version = "HTTP/1.1"  # i.e. keep the connections open
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        parts = urlparse(self.path)
+        self.reply(parts.path, parse_qs(parts.query))
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        body = self.rfile.read(length).decode("ascii")
+        self.reply(urlparse(self.path).path, parse_qs(body))
+
+    def reply(self, path, params):
+        server = self.server
+        cgi = path.rsplit("/", 1)[-1]
+        params = dict((key, values[0]) for key, values in params.items())
+        with server.lock:
+            server.requests.append((self.command, cgi, params,
+                                    self.client_address))
+            status = server.statuses.pop(0) if server.statuses else 200
+            server.active += 1
+            server.max_active = max(server.active, server.max_active)
+        try:
+            time.sleep(server.delay)
+            if status != 200:
+                body = "Server error"
+            elif cgi == "epost.fcgi":
+                with server.lock:
+                    webenv = params.get("WebEnv",
+                                        "WebEnv%i" % len(server.history))
+                    history = server.history.setdefault(webenv, [])
+                    history.append(params["id"].split(","))
+                    body = EPOST % (len(history), webenv)
+            elif "WebEnv" in params:
+                ids = server.history[params["WebEnv"]][
+                    int(params["query_key"]) - 1]
+                start = int(params["retstart"])
+                end = start + int(params["retmax"])
+                body = "".join(i + "\n" for i in ids[start:end])
+            else:
+                body = "%s %s\n" % (cgi, params.get("term"))
+            body = body.encode("ascii")
+            self.send_response(status)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+
+class EUtilsServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class EntrezClientTests(unittest.TestCase):
+
+    def setUp(self):
+        server = EUtilsServer(("127.0.0.1", 0), EUtilsHandler)
+        server.lock = threading.Lock()
+        server.requests = []
+        server.statuses = []  # HTTP status codes of the next replies
+        server.history = {}
+        server.delay = 0
+        server.active = server.max_active = 0
+        self.server = server
+        self.thread = threading.Thread(target=server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.client = EntrezClient(email="biopython-dev@biopython.org",
+                                   rate=1000, backoff=0,
+                                   base_url="http://127.0.0.1:%i/eutils"
+                                   % server.server_address[1])
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_parameters(self):
+        """Check the tool, email and API key are sent."""
+        client = EntrezClient(email="A.N.Other@example.com", tool="test",
+                              api_key="KEY", base_url=self.client.base_url)
+        self.assertEqual(10, client._bucket.rate)
+        handle = client.esearch(db="nucleotide", term="orchid")
+        self.assertEqual("esearch.fcgi orchid\n", handle.read())
+        self.assertTrue(handle.url.startswith(client.base_url +
+                                              "esearch.fcgi?"))
+        client.close()
+        command, cgi, params, address = self.server.requests[0]
+        self.assertEqual(("GET", "esearch.fcgi"), (command, cgi))
+        self.assertEqual({"db": "nucleotide", "term": "orchid",
+                          "tool": "test", "email": "A.N.Other@example.com",
+                          "api_key": "KEY"}, params)
+        self.assertEqual(3, EntrezClient(base_url=client.base_url)._bucket.rate)
+
+    def test_persistent(self):
+        """Check the requests share one connection."""
+        for i in range(5):
+            self.assertEqual("einfo.fcgi None\n", self.client.einfo().read())
+        self.assertEqual(5, len(self.server.requests))
+        self.assertEqual(1, len(set(request[3]
+                                    for request in self.server.requests)))
+
+    def test_post(self):
+        """Check long lists of identifiers are sent by POST."""
+        self.client.efetch(db="nucleotide", id=list(range(10)))
+        self.client.efetch(db="nucleotide", id=list(range(250)))
+        self.assertEqual(["GET", "POST"],
+                         [request[0] for request in self.server.requests])
+        self.assertEqual(",".join(str(i) for i in range(250)),
+                         self.server.requests[1][2]["id"])
+
+    def test_retry(self):
+        """Check requests are retried after server errors."""
+        self.server.statuses = [503, 500]
+        self.assertEqual("einfo.fcgi None\n", self.client.einfo().read())
+        self.assertEqual(3, len(self.server.requests))
+        # not for errors in the request
+        self.server.statuses = [400]
+        try:
+            self.client.einfo()
+        except HTTPError as err:
+            self.assertEqual(400, err.code)
+        else:
+            self.fail("Expected HTTPError")
+        self.assertEqual(4, len(self.server.requests))
+        # nor once out of retries
+        self.client.retries = 1
+        self.server.statuses = [500, 502, 200]
+        self.assertRaises(HTTPError, self.client.einfo)
+        self.assertEqual(6, len(self.server.requests))
+
+    def test_rate(self):
+        """Check the requests are spaced out."""
+        self.client._bucket = TokenBucket(20)
+        start = time.time()
+        for i in range(5):
+            self.client.einfo()
+        self.assertTrue(time.time() - start >= 0.19)
+
+    def test_batches(self):
+        """Fetch records in batches after posting their identifiers."""
+        ids = ["id%i" % i for i in range(25)]
+        self.server.delay = 0.05
+        handles = self.client.efetch_batches(db="nucleotide", id=ids,
+                                             batch_size=4, post_size=10,
+                                             rettype="fasta")
+        text = "".join(handle.read() for handle in handles)
+        self.assertEqual(ids, text.split())
+        requests = self.server.requests
+        self.assertEqual(["epost.fcgi"] * 3 + ["efetch.fcgi"] * 8,
+                         [request[1] for request in requests])
+        self.assertFalse("WebEnv" in requests[0][2])
+        self.assertEqual(["WebEnv0"] * 10,
+                         [request[2]["WebEnv"] for request in requests[1:]])
+        self.assertEqual(["1", "1", "1", "2", "2", "2", "3", "3"],
+                         sorted(request[2]["query_key"]
+                                for request in requests[3:]))
+        self.assertTrue(all(request[2]["rettype"] == "fasta"
+                            for request in requests[3:]))
+        self.assertTrue(self.server.max_active > 1)
+
+    def test_batches_history(self):
+        """Fetch summaries in batches from an earlier search."""
+        ids = [str(i) for i in range(10)]
+        self.server.history["WebEnvX"] = [ids]
+        self.client.max_connections = 1
+        handles = self.client.esummary_batches(db="pubmed", webenv="WebEnvX",
+                                               query_key="1", count=10,
+                                               batch_size=3)
+        self.assertEqual([ids[0:3], ids[3:6], ids[6:9], ids[9:]],
+                         [handle.read().split() for handle in handles])
+        self.assertEqual([("0", "3"), ("3", "3"), ("6", "3"), ("9", "1")],
+                         [(request[2]["retstart"], request[2]["retmax"])
+                          for request in self.server.requests])
+        self.assertRaises(ValueError, list,
+                          self.client.efetch_batches(db="pubmed",
+                                                     webenv="WebEnvX"))
+
+
+class TokenBucketTests(unittest.TestCase):
+
+    def test_waits(self):
+        """Check the waits for tokens."""
+        now = [0.0]
+        waits = []
+        bucket = TokenBucket(4, clock=lambda: now[0], sleep=waits.append)
+        for i in range(5):
+            bucket.acquire()
+        self.assertEqual([0.25, 0.5, 0.75, 1.0], waits)
+        # after a while the bucket fills again, up to its capacity
+        now[0] = 10.0
+        del waits[:]
+        bucket = TokenBucket(4, capacity=2, clock=lambda: now[0],
+                             sleep=waits.append)
+        now[0] = 20.0
+        for i in range(3):
+            bucket.acquire()
+        self.assertEqual([0.25], waits)
+        self.assertRaises(ValueError, TokenBucket, 0)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
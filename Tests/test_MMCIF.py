@@ -29,6 +29,8 @@ from Bio.PDB.PDBExceptions import PDBConstructionException, PDBConstructionWarni
 
 from Bio.PDB import PPBuilder, CaPPBuilder
 from Bio.PDB.MMCIFParser import MMCIFParser, FastMMCIFParser
+from Bio.PDB.MMCIF2Dict import MMCIF2Dict
+from Bio._py3k import StringIO
 
 
 class ParseReal(unittest.TestCase):
@@ -251,6 +253,81 @@ class ParseReal(unittest.TestCase):
         self.assertAlmostEqual(
             res_1["CA"].get_occupancy(),
             0.17, 2, "Residue 1 serine occupancy correcy")
+class MMCIF2DictTests(unittest.TestCase):
+    """Testing the mmCIF tokenizer and dictionary."""
+
+    cif = """data_TEST
+#
+_entry.id   TEST
+_struct.title
+;A multi-line
+ title
+;
+_cell.length_a   10.5
+_cell.length_b   '?'
+#
+loop_
+_atom_site.group_PDB
+_atom_site.id
+_atom_site.label_atom_id
+_atom_site.Cartn_x
+_atom_site.occupancy
+ATOM 1 "O5'" 1.5 1.00
+ATOM 2 C5' -2.25 ?
+HETATM 3 'a b' 3.0 . # comment
+#
+loop_
+_other.value
+'it's' "x" no#comment
+"""
+
+    def test_tokenizer(self):
+        """Test quoting, comments and text fields."""
+        mmcif_dict = MMCIF2Dict(StringIO(self.cif))
+        self.assertEqual(mmcif_dict["data_"], "TEST")
+        self.assertEqual(mmcif_dict["_entry.id"], "TEST")
+        self.assertEqual(mmcif_dict["_struct.title"], "A multi-linetitle")
+        self.assertEqual(mmcif_dict["_cell.length_a"], "10.5")
+        self.assertEqual(mmcif_dict["_cell.length_b"], "?")
+        self.assertEqual(mmcif_dict["_atom_site.label_atom_id"],
+                         ["O5'", "C5'", "a b"])
+        self.assertEqual(mmcif_dict["_atom_site.occupancy"],
+                         ["1.00", "?", "."])
+        self.assertEqual(mmcif_dict["_other.value"],
+                         ["it's", "x", "no#comment"])
+
+    def test_categories(self):
+        """Test only parsing some categories."""
+        mmcif_dict = MMCIF2Dict(StringIO(self.cif),
+                                categories=["_atom_site", "cell"])
+        self.assertEqual(sorted(mmcif_dict),
+                         ["_atom_site.Cartn_x", "_atom_site.group_PDB",
+                          "_atom_site.id", "_atom_site.label_atom_id",
+                          "_atom_site.occupancy", "_cell.length_a",
+                          "_cell.length_b", "data_"])
+        full_dict = MMCIF2Dict("PDB/4ZHL.cif")
+        mmcif_dict = MMCIF2Dict("PDB/4ZHL.cif", categories=["_atom_site"])
+        for key in mmcif_dict:
+            self.assertEqual(full_dict[key], mmcif_dict[key])
+        self.assertEqual(len(full_dict["_atom_site.id"]),
+                         len(mmcif_dict["_atom_site.id"]))
+
+    def test_get_array(self):
+        """Test reading columns as NumPy arrays."""
+        mmcif_dict = MMCIF2Dict(StringIO(self.cif), categories=["atom_site"])
+        x = mmcif_dict.get_array("_atom_site.Cartn_x")
+        self.assertEqual(x.dtype, numpy.float64)
+        self.assertEqual(list(x), [1.5, -2.25, 3.0])
+        self.assertEqual(list(mmcif_dict.get_array("_atom_site.id", int)),
+                         [1, 2, 3])
+        occupancy = mmcif_dict.get_array("_atom_site.occupancy")
+        self.assertEqual(occupancy[0], 1.0)
+        self.assertTrue(numpy.isnan(occupancy[1:]).all())
+        occupancy = mmcif_dict.get_array("_atom_site.occupancy", "f4", 0.5)
+        self.assertEqual(list(occupancy), [1.0, 0.5, 0.5])
+        self.assertRaises(ValueError, mmcif_dict.get_array,
+                          "_atom_site.occupancy", int)
+
 
 if __name__ == '__main__':
     runner = unittest.TextTestRunner(verbosity=2)
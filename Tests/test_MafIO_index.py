@@ -17,6 +17,7 @@ import tempfile
 import shutil
 
 from Bio.AlignIO.MafIO import MafIndex
+from Bio import bgzf
 from Bio import SeqIO
 from Bio.Seq import Seq
 from Bio.SeqRecord import SeqRecord
@@ -159,6 +160,27 @@ if sqlite3:
                               "MAF/length_coords_mismatch.maf",
                               "mm9.chr10")
 
+        def test_good_bgzf(self):
+            bgzf_file = self.tmpdir + "/ucsc_mm9_chr10.maf.bgz"
+            with open("MAF/ucsc_mm9_chr10.maf", "rb") as handle:
+                data = handle.read()
+            with bgzf.BgzfWriter(bgzf_file, "wb") as handle:
+                # small blocks, so alignments span BGZF blocks
+                for i in range(0, len(data), 5000):
+                    handle.write(data[i:i + 5000])
+                    handle.flush()
+            idx = MafIndex(self.tmpfile, bgzf_file, "mm9.chr10")
+            self.assertEqual(len(idx), 48)
+            plain_idx = MafIndex("MAF/ucsc_mm9_chr10.mafindex",
+                                 "MAF/ucsc_mm9_chr10.maf", "mm9.chr10")
+            starts, ends = (3009319, 3021421), (3012566, 3021536)
+            results = list(idx.search(starts, ends))
+            self.assertEqual(len(results), 8)
+            for alignment, expected in zip(results,
+                                           plain_idx.search(starts, ends)):
+                self.assertEqual([str(r.seq) for r in alignment],
+                                 [str(r.seq) for r in expected])
+
     class TestGetRecord(unittest.TestCase):
         """Make sure we can seek and fetch records properly"""
 
@@ -332,6 +354,50 @@ if sqlite3:
                                   15875298, 78072287, 14757144, 3012076,
                                   16160203, 16379004, 15860456]))
 
+        def test_cache(self):
+            # cached records are copied, sharing only the Seq objects
+            first = self.idx._get_record(34)
+            second = self.idx._get_record(34)
+            self.assertFalse(first is second)
+            self.assertTrue(first[0].seq is second[0].seq)
+            idx = MafIndex("MAF/ucsc_mm9_chr10.mafindex",
+                           "MAF/ucsc_mm9_chr10.maf", "mm9.chr10", max_cache=1)
+            first = idx._get_record(34)
+            self.assertTrue(first[0].seq is idx._get_record(34)[0].seq)
+            idx._get_record(99228)
+            self.assertFalse(first[0].seq is idx._get_record(34)[0].seq)
+            idx = MafIndex("MAF/ucsc_mm9_chr10.mafindex",
+                           "MAF/ucsc_mm9_chr10.maf", "mm9.chr10", max_cache=0)
+            self.assertFalse(idx._get_record(34)[0].seq is
+                             idx._get_record(34)[0].seq)
+
+        def test_cache_modified(self):
+            """Modifying search results does not change later searches"""
+            result = list(self.idx.search([3014742], [3015028]))
+            expected = [(record.id, record.annotations["start"])
+                        for record in result[0]]
+            result[0][0].id = "MUTATED"
+            result[0][0].annotations["start"] = -1
+            result[0]._annotations["score"] = "MUTATED"
+            result = list(self.idx.search([3014742], [3015028]))
+            self.assertEqual(expected, [(record.id, record.annotations["start"])
+                                        for record in result[0]])
+            self.assertNotEqual("MUTATED", result[0]._annotations["score"])
+
+        def test_merged_regions(self):
+            """Overlapping and unsorted segments are searched once"""
+            self.assertEqual([(1, 5), (6, 7), (8, 12)],
+                             MafIndex._merge_regions((8, 1, 2, 6, 10),
+                                                     (10, 4, 5, 7, 12)))
+            expected = [x.annotations["start"] for y in
+                        self.idx.search((3014742, 3018161),
+                                        (3015028, 3018644)) for x in y]
+            results = [x.annotations["start"] for y in
+                       self.idx.search((3018161, 3014742, 3014800, 3018200),
+                                       (3018644, 3015028, 3014900, 3018300))
+                       for x in y]
+            self.assertEqual(expected, results)
+
         def test_correct_retrieval_3(self):
             search = self.idx.search((3012076, 3012076 + 300), (3012076 + 100, 3012076 + 400))
             results = [x for x in search]
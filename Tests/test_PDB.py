@@ -36,8 +36,11 @@ from Bio.Seq import Seq
 from Bio.Alphabet import generic_protein
 from Bio.PDB import PDBParser, PPBuilder, CaPPBuilder, PDBIO, Select
 from Bio.PDB import HSExposureCA, HSExposureCB, ExposureCN
+from Bio.PDB.HSExposure import calc_all_models
 from Bio.PDB.PDBExceptions import PDBConstructionException, PDBConstructionWarning
 from Bio.PDB import rotmat, Vector, refmat, calc_angle, calc_dihedral, rotaxis, m2rotaxis
+from Bio.PDB import calc_angles, calc_dihedrals
+from Bio.PDB.Polypeptide import calc_phi_psi
 from Bio.PDB import Residue, Atom
 from Bio.PDB import make_dssp_dict
 from Bio.PDB import DSSP
@@ -755,6 +758,55 @@ class WriteTest(unittest.TestCase):
         finally:
             os.remove(filename)
 
+    def test_pdbio_save_models(self):
+        """Write models from a generator using PDBIO"""
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", PDBConstructionWarning)
+            structure = self.parser.get_structure("X", "PDB/a_structure.pdb")
+        io = PDBIO()
+        io.set_structure(structure)
+        expected = StringIO()
+        io.save(expected)
+        self.assertIn("ENDMDL", expected.getvalue())
+        handle = StringIO()
+        io = PDBIO()
+        io.save_models(handle, (model for model in structure))
+        self.assertEqual(expected.getvalue(), handle.getvalue())
+        # A single model is written without MODEL records, as by save
+        io.set_structure(self.structure)
+        expected = StringIO()
+        io.save(expected)
+        self.assertNotIn("MODEL", expected.getvalue())
+        handle = StringIO()
+        io.save_models(handle, iter(self.structure))
+        self.assertEqual(expected.getvalue(), handle.getvalue())
+
+    def test_pdbio_custom_atom_line(self):
+        """Write ATOM records from a subclass overriding _get_atom_line"""
+        class CustomPDBIO(PDBIO):
+            def _get_atom_line(self, atom, *args):
+                line = PDBIO._get_atom_line(self, atom, *args)
+                if atom.get_id() == "CA":
+                    line = line[:72] + "CA  " + line[76:]
+                return line
+
+        io = PDBIO()
+        io.set_structure(self.structure)
+        expected = StringIO()
+        io.save(expected)
+        io = CustomPDBIO()
+        io.set_structure(self.structure)
+        handle = StringIO()
+        io.save(handle)
+        lines = handle.getvalue().splitlines()
+        self.assertEqual(len(expected.getvalue().splitlines()), len(lines))
+        for old, new in zip(expected.getvalue().splitlines(), lines):
+            if new[12:16] == " CA ":
+                self.assertEqual("CA  ", new[72:76])
+                self.assertEqual(old[:72] + old[76:], new[:72] + new[76:])
+            else:
+                self.assertEqual(old, new)
+
     def test_pdbio_write_residue(self):
         """Write a single residue using PDBIO"""
         io = PDBIO()
@@ -851,6 +903,7 @@ class Exposure(unittest.TestCase):
         with warnings.catch_warnings():
             warnings.simplefilter("ignore", PDBConstructionWarning)
             structure = PDBParser(PERMISSIVE=True).get_structure('X', pdb_filename)
+        self.structure = structure
         self.model = structure[1]
         # Look at first chain only
         a_residues = list(self.model["A"].child_list)
@@ -926,6 +979,20 @@ class Exposure(unittest.TestCase):
         self.assertEqual(1, len(residues[-1].xtra))
         self.assertEqual(38, residues[-1].xtra["EXP_CN"])
 
+    def test_calc_all_models(self):
+        """Exposure for all models of a structure."""
+        results = calc_all_models(self.structure, ExposureCN, self.radius)
+        self.assertEqual(2, len(results))
+        self.assertEqual([m for m, cn in results], list(self.structure))
+        model, cn = results[1]
+        self.assertEqual(25, cn[("A", self.a_residues[1].get_id())])
+        self.assertEqual(38, cn[("A", self.a_residues[-1].get_id())])
+        results = calc_all_models(self.structure, HSExposureCB, self.radius)
+        model, hse = results[1]
+        self.assertEqual((5, 20, 0.0),
+                         hse[("A", self.a_residues[1].get_id())])
+        self.assertEqual(22, self.a_residues[3].xtra["EXP_HSE_B_U"])
+
 
 class Atom_Element(unittest.TestCase):
     """induces Atom Element from Atom Name"""
@@ -1205,6 +1272,89 @@ class TransformTests(unittest.TestCase):
                         "Want %r and %r to be almost equal" % (axis.get_array(), caxis.get_array()))
 
 
+class AngleTests(unittest.TestCase):
+    """Test the array based angle calculations."""
+
+    def setUp(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", PDBConstructionWarning)
+            parser = PDBParser(PERMISSIVE=True)
+            self.structure = parser.get_structure("example", "PDB/1A8O.pdb")
+
+    def test_calc_angles(self):
+        """Test calc_angles and calc_dihedrals against the Vector versions"""
+        points = numpy.array([[0, 0, 1], [0, 0, 0], [0, 1, 0], [1, 1, 0],
+                              [1, 2, 3], [-1, 0.5, 2], [3, 2, 1]], "d")
+        for i in range(len(points) - 3):
+            v1, v2, v3, v4 = [Vector(p) for p in points[i:i + 4]]
+            self.assertAlmostEqual(calc_angle(v1, v2, v3),
+                                   calc_angles(points[i:i + 1],
+                                               points[i + 1:i + 2],
+                                               points[i + 2:i + 3])[0])
+        angles = calc_dihedrals(points[:-3], points[1:-2], points[2:-1],
+                                points[3:])
+        self.assertEqual(4, len(angles))
+        for i, angle in enumerate(angles):
+            v1, v2, v3, v4 = [Vector(p) for p in points[i:i + 4]]
+            self.assertAlmostEqual(calc_dihedral(v1, v2, v3, v4), angle)
+        self.assertEqual(1.5707963267948966, angles[0])
+        # Undefined angles are NaN
+        points[0, 0] = numpy.nan
+        self.assertTrue(numpy.isnan(calc_dihedrals(points[:1], points[1:2],
+                                                   points[2:3], points[3:4])[0]))
+
+    def test_polypeptide_arrays(self):
+        """Test the Polypeptide angle arrays"""
+        pp = PPBuilder().build_peptides(self.structure[0])[0]
+        phi_psi = pp.get_phi_psi_array()
+        self.assertEqual((len(pp), 2), phi_psi.shape)
+        self.assertTrue(numpy.isnan(phi_psi[0, 0]))
+        self.assertTrue(numpy.isnan(phi_psi[-1, 1]))
+        self.assertAlmostEqual(-0.46297171497725553, phi_psi[0, 1])
+        self.assertAlmostEqual(-1.0873937604007962, phi_psi[1, 0])
+        self.assertAlmostEqual(2.133770783263711, phi_psi[1, 1])
+        phi_psi_list = pp.get_phi_psi_list()
+        self.assertEqual(len(pp), len(phi_psi_list))
+        self.assertEqual(None, phi_psi_list[0][0])
+        self.assertEqual(None, phi_psi_list[-1][1])
+        self.assertAlmostEqual(-1.079209857767184, phi_psi_list[-1][0])
+        self.assertAlmostEqual(-2.405223274365188, pp[2].xtra["PHI"])
+        tau = pp.get_tau_array()
+        self.assertEqual(len(pp), len(tau))
+        self.assertTrue(numpy.isnan(tau[:2]).all())
+        self.assertTrue(numpy.isnan(tau[-1]))
+        self.assertAlmostEqual(2.9095242142980595, tau[2])
+        tau_list = pp.get_tau_list()
+        self.assertEqual(len(pp) - 3, len(tau_list))
+        self.assertAlmostEqual(-1.8663779687487847, tau_list[1])
+        self.assertAlmostEqual(-1.8663779687487847, pp[3].xtra["TAU"])
+        theta = pp.get_theta_array()
+        self.assertEqual(len(pp), len(theta))
+        self.assertTrue(numpy.isnan(theta[0]))
+        self.assertAlmostEqual(1.9833911131936928, theta[1])
+        theta_list = pp.get_theta_list()
+        self.assertEqual(len(pp) - 2, len(theta_list))
+        self.assertAlmostEqual(2.2076864621237595, theta_list[1])
+
+    def test_calc_phi_psi(self):
+        """Test calc_phi_psi over all polypeptides"""
+        residues, angles = calc_phi_psi(self.structure)
+        self.assertEqual((len(residues), 2), angles.shape)
+        expected = []
+        for pp in PPBuilder().build_peptides(self.structure[0]):
+            expected.extend(pp.get_phi_psi_list())
+        self.assertEqual(len(expected), len(residues))
+        for (phi, psi), (phi2, psi2) in zip(expected, angles):
+            if phi is None:
+                self.assertTrue(numpy.isnan(phi2))
+            else:
+                self.assertAlmostEqual(phi, phi2)
+            if psi is None:
+                self.assertTrue(numpy.isnan(psi2))
+            else:
+                self.assertAlmostEqual(psi, psi2)
+
+
 class CopyTests(unittest.TestCase):
 
     def setUp(self):
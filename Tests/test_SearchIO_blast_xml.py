@@ -3182,6 +3182,17 @@ class BlastXmlSpecialCases(unittest.TestCase):
         self.assertEqual('gnl|BL_ORD_ID|17', hit2.id)
         self.assertEqual('gi|347972582|ref|XM_309352.4| Anopheles gambiae str. PEST AGAP011294-PA (DEFI_ANOGA) mRNA, complete cds', hit2.description)
 
+    def test_parsed_elements_discarded(self):
+        """Test each query's XML element is discarded once parsed."""
+        from Bio.SearchIO.BlastIO.blast_xml import BlastXmlParser
+        with open(get_file('mirna.xml'), 'rb') as handle:
+            parser = BlastXmlParser(handle)
+            counter = 0
+            for qresult in parser:
+                counter += 1
+                self.assertEqual(0, len(parser._iterations_elem))
+        self.assertEqual(3, counter)
+
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
@@ -5,9 +5,42 @@
 
 """Tests for SearchIO blast-xml indexing."""
 
+import multiprocessing
 import unittest
+import warnings
+from multiprocessing.pool import MaybeEncodingError
 
-from search_tests_common import CheckRaw, CheckIndex
+from Bio import BiopythonExperimentalWarning
+
+with warnings.catch_warnings():
+    warnings.simplefilter('ignore', BiopythonExperimentalWarning)
+    from Bio import SearchIO
+
+from search_tests_common import CheckRaw, CheckIndex, compare_search_obj
+
+
+def best_hit(qresult):
+    """Keep only the best hit of a query, for the parallel_parse tests."""
+    return qresult[:1]
+
+
+class QueryError(Exception):
+    """Exception which cannot be unpickled, for the parallel_parse tests."""
+
+    def __init__(self, qresult_id, message):
+        Exception.__init__(self, message)
+
+
+def raise_value_error(qresult):
+    raise ValueError("Bad query %s" % qresult.id)
+
+
+def raise_query_error(qresult):
+    raise QueryError(qresult.id, "Bad query")
+
+
+def unpicklable(qresult):
+    return lambda: qresult
 
 
 class BlastXmlRawCases(CheckRaw):
@@ -762,6 +795,91 @@ class BlastXmlIndexCases(CheckIndex):
         self.check_index(filename, self.fmt)
 
 
+class BlastXmlParallelCases(unittest.TestCase):
+
+    """Check parsing BLAST XML with several processes."""
+
+    def test_ordered(self):
+        """Test blast-xml parallel_parse, results in order"""
+        for filename in ['Blast/mirna.xml', 'Blast/wnts.xml.bgz']:
+            # the BGZF file has the same content as the plain one
+            parsed = list(SearchIO.parse(filename.replace('.bgz', ''),
+                                         'blast-xml'))
+            qresults = list(SearchIO.parallel_parse(filename, 'blast-xml',
+                                                    processes=2,
+                                                    chunk_size=1))
+            self.assertEqual(len(parsed), len(qresults))
+            for qresult, par_qresult in zip(parsed, qresults):
+                self.assertTrue(compare_search_obj(qresult, par_qresult))
+
+    def test_unordered(self):
+        """Test blast-xml parallel_parse, results as they are parsed"""
+        parsed = dict((qresult.id, qresult) for qresult in
+                      SearchIO.parse('Blast/wnts.xml', 'blast-xml'))
+        qresults = list(SearchIO.parallel_parse('Blast/wnts.xml', 'blast-xml',
+                                                processes=2, ordered=False,
+                                                chunk_size=2000,
+                                                max_pending=1))
+        self.assertEqual(sorted(parsed), sorted(q.id for q in qresults))
+        for qresult in qresults:
+            self.assertTrue(compare_search_obj(parsed[qresult.id], qresult))
+
+    def test_reduce_function(self):
+        """Test blast-xml parallel_parse, with a reduce function"""
+        parsed = list(SearchIO.parse('Blast/mirna.xml', 'blast-xml'))
+        for processes in (1, 2):
+            qresults = list(SearchIO.parallel_parse(
+                'Blast/mirna.xml', 'blast-xml', processes=processes,
+                reduce_function=best_hit))
+            self.assertEqual([q.id for q in parsed], [q.id for q in qresults])
+            for qresult, best in zip(parsed, qresults):
+                self.assertEqual(1, len(best))
+                self.assertTrue(compare_search_obj(qresult[0], best[0]))
+
+    def test_abandon(self):
+        """Test blast-xml parallel_parse, stopping part way through"""
+        for i in range(8):
+            for ordered in (True, False):
+                qresults = SearchIO.parallel_parse('Blast/wnts.xml',
+                                                   'blast-xml', processes=2,
+                                                   ordered=ordered,
+                                                   chunk_size=1,
+                                                   max_pending=2)
+                self.assertTrue(next(qresults).id)
+                qresults.close()
+                self.assertEqual([], multiprocessing.active_children())
+
+    def test_worker_errors(self):
+        """Test blast-xml parallel_parse, errors in the worker processes"""
+        for ordered in (True, False):
+            for function, exception in [(raise_value_error, ValueError),
+                                        (raise_query_error, RuntimeError),
+                                        (unpicklable, MaybeEncodingError)]:
+                self.assertRaises(exception, list,
+                                  SearchIO.parallel_parse(
+                                      'Blast/wnts.xml', 'blast-xml',
+                                      processes=2, ordered=ordered,
+                                      chunk_size=1,
+                                      reduce_function=function))
+                self.assertEqual([], multiprocessing.active_children())
+
+    def test_errors(self):
+        """Test blast-xml parallel_parse, bad arguments"""
+        with open('Blast/mirna.xml') as handle:
+            self.assertRaises(TypeError, list,
+                              SearchIO.parallel_parse(handle, 'blast-xml'))
+        self.assertRaises(ValueError, list,
+                          SearchIO.parallel_parse('Blast/mirna.xml',
+                                                  'blast-text'))
+        self.assertRaises(ValueError, list,
+                          SearchIO.parallel_parse('Blast/mirna.xml',
+                                                  'blast-xml', chunk_size=0))
+        self.assertRaises(ValueError, list,
+                          SearchIO.parallel_parse('Blast/mirna.xml',
+                                                  'blast-xml', processes=2,
+                                                  max_pending=0))
+
+
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
@@ -1352,6 +1352,28 @@ class HSPFragmentCases(unittest.TestCase):
         self.assertTrue(isinstance(self.fragment.aln, MultipleSeqAlignment))
         self.assertEqual(single_letter_alphabet, self.fragment.aln._alphabet)
 
+    def test_seq_lazy(self):
+        """Test HSPFragment sequences are SeqRecord objects only once used"""
+        fragment = HSPFragment('hit_id', 'query_id', 'ATGCTAGCTACA',
+                'ATG--AGCTAGG')
+        self.assertEqual('ATGCTAGCTACA', fragment._hit)
+        self.assertEqual(12, len(fragment))
+        # changes before the sequences are used should still be applied
+        fragment.hit_description = 'yeah'
+        fragment.query_features.append('feature')
+        fragment.alphabet = generic_dna
+        self.assertEqual('ATG--AGCTAGG', fragment._query)
+        self.assertTrue(isinstance(fragment.hit, SeqRecord))
+        self.assertEqual('hit_id', fragment.hit.id)
+        self.assertEqual('yeah', fragment.hit.description)
+        self.assertTrue(fragment.hit.seq.alphabet is generic_dna)
+        self.assertTrue(fragment.hit is fragment.hit)
+        self.assertEqual(['feature'], fragment.query.features)
+        self.assertEqual('query_id', fragment.aln[0].id)
+        # and changes afterwards should go to the SeqRecord objects
+        fragment.query_description = 'mir'
+        self.assertEqual('mir', fragment.query.description)
+
     def test_alphabet_no_seq(self):
         """Test HSPFragment alphabet property, query and hit sequences not present"""
         self.assertTrue(self.fragment.alphabet is single_letter_alphabet)
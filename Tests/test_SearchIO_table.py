@@ -0,0 +1,201 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Tests for reading tabular search outputs as columns (SearchIO.read_table)."""
+
+import os
+import unittest
+import warnings
+
+try:
+    import numpy
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.SearchIO.read_table.")
+
+from Bio import BiopythonExperimentalWarning
+from Bio._py3k import StringIO
+
+with warnings.catch_warnings():
+    warnings.simplefilter('ignore', BiopythonExperimentalWarning)
+    from Bio import SearchIO
+
+from search_tests_common import compare_search_obj
+
+
+# file name, format and keyword arguments
+FILES = [('Blast/mirna.tab', 'blast-tab', {'comments': True})]
+FILES.extend(('Blast/tab_%s.txt' % name, 'blast-tab', {'comments': True})
+             for name in ['2226_tblastn_005', '2226_tblastn_006',
+                          '2226_tblastn_007', '2226_tblastn_008',
+                          '2226_tblastn_010', '2226_tblastn_011',
+                          '2226_tblastn_012', '2228_tblastn_001',
+                          '2228_tblastx_001'])
+FILES.extend([
+    ('Blast/tab_2226_tblastn_001.txt', 'blast-tab', {}),
+    ('Blast/tab_2226_tblastn_003.txt', 'blast-tab', {}),
+    ('Blast/tab_2226_tblastn_004.txt', 'blast-tab', {}),
+    ('Blast/tab_2226_tblastn_009.txt', 'blast-tab',
+     {'fields': ('qseqid', 'sseqid')}),
+    ('Blast/tab_2226_tblastn_013.txt', 'blast-tab',
+     {'fields': 'qseq std sseq'}),
+])
+FILES.extend(('Hmmer/%s' % name, 'hmmer3-tab', {})
+             for name in sorted(os.listdir('Hmmer'))
+             if name.startswith('tab_'))
+FILES.extend(('Hmmer/%s' % name, name.split('_')[2] + '3-domtab', {})
+             for name in sorted(os.listdir('Hmmer'))
+             if name.startswith('domtab_'))
+
+
+def _parse(filename, format, **kwargs):
+    """Return the QueryResults with hits parsed in the usual way."""
+    return [qresult for qresult in SearchIO.parse(filename, format, **kwargs)
+            if len(qresult)]
+
+
+class SearchTableTests(unittest.TestCase):
+
+    def compare(self, expected, qresults):
+        self.assertEqual([q.id for q in expected], [q.id for q in qresults])
+        for old, new in zip(expected, qresults):
+            self.assertEqual(len(old), len(new))
+            for old_hit, new_hit in zip(old, new):
+                self.assertTrue(compare_search_obj(old_hit, new_hit))
+
+    def test_qresults(self):
+        """Check the tables give the same objects as parsing."""
+        for filename, format, kwargs in FILES:
+            expected = _parse(filename, format, **kwargs)
+            table = SearchIO.read_table(filename, format, **kwargs)
+            self.assertEqual(len(expected), len(table.query_offsets) - 1)
+            self.assertEqual([q.id for q in expected],
+                             table.query_ids.tolist())
+            self.assertEqual(sum(len(h) for q in expected for h in q),
+                             len(table))
+            self.compare(expected, list(table.qresults()))
+
+    def test_chunks(self):
+        """Check the rows are converted in chunks."""
+        from Bio.SearchIO import _table
+        old = _table._CHUNK_ROWS
+        try:
+            _table._CHUNK_ROWS = 7
+            table = SearchIO.read_table('Blast/mirna.tab', 'blast-tab',
+                                        comments=True)
+        finally:
+            _table._CHUNK_ROWS = old
+        expected = SearchIO.read_table('Blast/mirna.tab', 'blast-tab',
+                                       comments=True)
+        for name in expected.fields:
+            self.assertTrue(numpy.array_equal(expected[name], table[name]))
+        self.assertEqual(numpy.float64, table['evalue'].dtype)
+        self.assertEqual(numpy.int64, table['qstart'].dtype)
+
+    def test_filter(self):
+        """Check filtering rows against the objects."""
+        for filename, format, kwargs in FILES:
+            table = SearchIO.read_table(filename, format, **kwargs)
+            if 'evalue' not in table.fields and format == 'blast-tab':
+                self.assertRaises(ValueError, table.filter, max_evalue=1)
+                continue
+            cutoff = numpy.median(table.evalue) if len(table) else 1
+            expected = []
+            for qresult in _parse(filename, format, **kwargs):
+                # the hmmer3-tab evalue is the full sequence evalue
+                if format == 'hmmer3-tab':
+                    qresult = qresult.hit_filter(lambda h: h.evalue <= cutoff)
+                else:
+                    qresult = qresult.hsp_filter(lambda h: h.evalue <= cutoff)
+                if len(qresult):
+                    expected.append(qresult)
+            self.compare(expected,
+                         list(table.filter(max_evalue=cutoff).qresults()))
+        table = SearchIO.read_table('Blast/mirna.tab', 'blast-tab',
+                                    comments=True)
+        rows = table.filter(max_evalue=1e-10, min_bitscore=80,
+                            min_identity=98)
+        self.assertTrue((rows.evalue <= 1e-10).all())
+        self.assertTrue((rows.bitscore >= 80).all())
+        self.assertTrue((rows['pident'] >= 98).all())
+        mask = (table.evalue <= 1e-10) & (table.bitscore >= 80) & \
+            (table.identity >= 98)
+        self.assertEqual(mask.sum(), len(rows))
+        table = SearchIO.read_table('Hmmer/tab_30_hmmscan_001.out',
+                                    'hmmer3-tab')
+        self.assertRaises(ValueError, table.filter, min_identity=90)
+
+    def test_best_hits(self):
+        """Check picking the best hits against the objects."""
+        for filename, format, kwargs in FILES:
+            table = SearchIO.read_table(filename, format, **kwargs)
+            if 'bitscore' not in table.fields and format == 'blast-tab':
+                self.assertRaises(ValueError, table.best_hits)
+                continue
+            for n in (1, 2, 5):
+                best = table.best_hits(n)
+                qresults = list(best.qresults())
+                expected = _parse(filename, format, **kwargs)
+                self.assertEqual([q.id for q in expected],
+                                 [q.id for q in qresults])
+                for old, new in zip(expected, qresults):
+                    if format == 'hmmer3-tab':
+                        # uses the full sequence scores
+                        old = [[h] for h in old]
+                        new = [[h] for h in new]
+                    scores = sorted(min((-hsp.bitscore,
+                                         getattr(hsp, 'evalue', 0))
+                                        for hsp in hit) for hit in old)
+                    self.assertEqual(min(n, len(old)), len(new))
+                    self.assertEqual(sum(len(h) for h in new), len(new))
+                    self.assertEqual(scores[:n], sorted(
+                        (-hit[0].bitscore, getattr(hit[0], 'evalue', 0))
+                        for hit in new))
+        self.assertRaises(ValueError, table.best_hits, 0)
+
+    def test_take(self):
+        """Check selecting rows by number or by mask."""
+        table = SearchIO.read_table('Blast/mirna.tab', 'blast-tab',
+                                    comments=True)
+        rows = table.take([0, 1, 140, 276])
+        self.assertEqual(['33211', '33212', '33213'], rows.query_ids.tolist())
+        self.assertEqual([0, 2, 3, 4], rows.query_offsets.tolist())
+        self.assertEqual(table['sseqid'][140], rows['sseqid'][2])
+        qresults = list(rows.qresults())
+        self.assertEqual([2, 1, 1],
+                         [sum(len(hit) for hit in q) for q in qresults])
+        empty = table.take(numpy.zeros(len(table), bool))
+        self.assertEqual(0, len(empty))
+        self.assertEqual([], list(empty.qresults()))
+        self.assertEqual(0, len(empty.best_hits()))
+
+    def test_empty(self):
+        """Check reading tables without any rows."""
+        for text, format, kwargs in [('', 'blast-tab', {}),
+                                     ('# comment\n', 'hmmer3-tab', {}),
+                                     ('', 'blast-tab', {'comments': True})]:
+            table = SearchIO.read_table(StringIO(text), format, **kwargs)
+            self.assertEqual(0, len(table))
+            self.assertEqual([], table.query_ids.tolist())
+            self.assertEqual([], list(table.qresults()))
+
+    def test_errors(self):
+        """Check unsupported formats and bad rows are rejected."""
+        self.assertRaises(ValueError, SearchIO.read_table,
+                          'Blast/mirna.xml', 'blast-xml')
+        self.assertRaises(ValueError, SearchIO.read_table,
+                          'Blast/mirna.tab', 'BLAST-TAB')
+        self.assertRaises(ValueError, SearchIO.read_table,
+                          StringIO('a\tb\tc\n'), 'blast-tab')
+        self.assertRaises(ValueError, SearchIO.read_table,
+                          StringIO('a\tb\n'), 'blast-tab', fields='evalue')
+        self.assertRaises(TypeError, SearchIO.read_table,
+                          'Hmmer/tab_30_hmmscan_001.out', 'hmmer3-tab',
+                          comments=True)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
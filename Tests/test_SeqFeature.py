@@ -5,9 +5,15 @@
 
 """Tests Bio.SeqFeature.
 """
+import copy
+import pickle
+import random
 import unittest
 from os import path
 from Bio import SeqIO
+from Bio.SeqFeature import SeqFeature, FeatureLocation, FeatureIndex
+from Bio.SeqFeature import ExactPosition, BeforePosition
+from Bio.SeqFeature import WithinPosition, UnknownPosition
 
 
 class TestReference(unittest.TestCase):
@@ -26,3 +32,136 @@ class TestReference(unittest.TestCase):
         self.assertNotEqual(rec1.annotations['references'][0], rec2.annotations['references'][1])
         self.assertEqual(rec1.annotations['references'][1], rec1.annotations['references'][1])
         self.assertEqual(rec1.annotations['references'][1], rec2.annotations['references'][1])
+
+
+class TestSlots(unittest.TestCase):
+    """Tests for the compact (__slots__) feature and location objects"""
+
+    def setUp(self):
+        location = FeatureLocation(BeforePosition(5), 10, strand=1) + \
+            FeatureLocation(WithinPosition(20, left=20, right=23), 30,
+                            strand=1, ref="X", ref_db="db")
+        self.feature = SeqFeature(location, type="CDS", id="test",
+                                  qualifiers={"note": ["example"]})
+
+    def check_copy(self, new):
+        old = self.feature
+        self.assertEqual(str(old), str(new))
+        self.assertEqual(repr(old.location), repr(new.location))
+        self.assertEqual(old.location.parts[1].ref_db,
+                         new.location.parts[1].ref_db)
+        self.assertEqual(1, new.strand)
+
+    def test_no_dict(self):
+        location = FeatureLocation(5, 10)
+        self.assertFalse(hasattr(location, "__dict__"))
+        self.assertFalse(hasattr(location.start, "__dict__"))
+        self.assertFalse(hasattr(self.feature.location, "__dict__"))
+        self.assertRaises(AttributeError, setattr, location, "extra", 1)
+
+    def test_extra_attributes(self):
+        self.feature.extra = 1
+        self.check_copy(pickle.loads(pickle.dumps(self.feature)))
+        self.assertEqual(1, copy.copy(self.feature).extra)
+
+    def test_pickle(self):
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            self.check_copy(pickle.loads(pickle.dumps(self.feature, protocol)))
+
+    def test_copy(self):
+        self.check_copy(copy.copy(self.feature))
+        new = copy.deepcopy(self.feature)
+        self.check_copy(new)
+        self.assertFalse(new.location is self.feature.location)
+
+    def test_shared_positions(self):
+        self.assertTrue(ExactPosition(1234) is ExactPosition(1234))
+        self.assertTrue(FeatureLocation(5, 10).end is ExactPosition(10))
+        self.assertEqual(10, ExactPosition(10.0))
+        self.assertRaises(ValueError, ExactPosition, "X")
+        self.assertRaises(TypeError, ExactPosition, None)
+        self.assertRaises(TypeError, ExactPosition, [])
+        self.assertEqual("UnknownPosition()", repr(UnknownPosition()))
+
+
+class TestFeatureIndex(unittest.TestCase):
+    """Tests for the SeqFeature.FeatureIndex class"""
+
+    def setUp(self):
+        random.seed(37)
+        self.features = []
+        for i in range(300):
+            start = random.randint(0, 1000)
+            length = random.choice([0, 1, 5, 20, 100, 1000])
+            strand = random.choice([1, -1, None])
+            location = FeatureLocation(start, start + random.randint(0, length),
+                                       strand)
+            if random.random() < 0.2:
+                start = location.end + random.randint(0, 50)
+                location += FeatureLocation(start, start + random.randint(1, 50),
+                                            strand)
+            self.features.append(SeqFeature(location, id="f%i" % i))
+        self.features.append(SeqFeature(None, id="none"))
+        self.features.append(SeqFeature(FeatureLocation(5, 10), ref="X",
+                                        id="remote"))
+        self.index = FeatureIndex(self.features)
+
+    def check(self, method, expected):
+        features = [f for f in self.features
+                    if f.location is not None and not f.ref]
+        for strand in [None, 1, -1]:
+            for _ in range(200):
+                start = random.randint(-10, 1200)
+                end = start + random.choice([0, 1, 2, 10, 50, 500])
+                self.assertEqual([f.id for f in features
+                                  if expected(f, start, end, strand)],
+                                 [f.id for f in method(start, end, strand)])
+
+    def test_overlap(self):
+        def overlaps(f, start, end, strand):
+            return any(p.start < max(end, start + 1) and
+                       (p.end > start or p.start >= start) and
+                       strand in (None, p.strand)
+                       for p in f.location.parts)
+        self.check(self.index.overlap, overlaps)
+
+    def test_contained(self):
+        def contained(f, start, end, strand):
+            return start <= f.location.start and f.location.end <= end and \
+                strand in (None, f.location.strand)
+        self.check(self.index.contained, contained)
+
+    def test_containing(self):
+        def containing(f, start, end, strand):
+            return any(p.start <= start and end <= p.end and
+                       strand in (None, p.strand)
+                       for p in f.location.parts)
+        self.check(self.index.containing, containing)
+
+    def test_nearest(self):
+        def distance(part, position):
+            if position < part.start:
+                return part.start - position
+            elif position >= max(part.end, part.start + 1):
+                return position - max(part.end, part.start + 1) + 1
+            return 0
+        for strand in [None, 1, -1]:
+            for position in range(-10, 1200, 7):
+                parts = [(distance(p, position), f.id)
+                         for f in self.features
+                         if f.location is not None and not f.ref
+                         for p in f.location.parts
+                         if strand in (None, p.strand)]
+                best = min(parts)[0]
+                expected = [f.id for f in self.features
+                            if any(d == best and i == f.id for d, i in parts)]
+                self.assertEqual(expected,
+                                 [f.id for f in self.index.nearest(position,
+                                                                   strand)])
+        self.assertEqual([], FeatureIndex([]).nearest(10))
+
+    def test_excluded(self):
+        self.assertEqual(len(self.features), len(self.index))
+        ids = [f.id for f in self.index.overlap(-10, 2000)]
+        self.assertFalse("none" in ids)
+        self.assertFalse("remote" in ids)
@@ -0,0 +1,124 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Tests for the samtools faidx style index in Bio.SeqIO.FaidxIO."""
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from Bio import SeqIO
+from Bio import bgzf
+from Bio.Alphabet import generic_dna
+from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
+from Bio.SeqIO.FaidxIO import FastaIndex, write_fai
+
+
+class FaidxTests(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp(prefix="biopython_faidx_")
+        random.seed(17)
+        self.records = []
+        for i, length in enumerate([0, 1, 59, 60, 61, 120, 1000, 70000]):
+            seq = "".join(random.choice("ACGTNacgt") for _ in range(length))
+            self.records.append(SeqRecord(Seq(seq, generic_dna),
+                                          id="seq%i" % i,
+                                          description="example %i" % i))
+        self.fasta = os.path.join(self.temp_dir, "example.fasta")
+        SeqIO.write(self.records, self.fasta, "fasta")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def check_index(self, fasta):
+        self.assertEqual(len(self.records), len(fasta))
+        self.assertEqual([r.id for r in self.records], list(fasta))
+        for record in self.records:
+            data = str(record.seq)
+            self.assertTrue(record.id in fasta)
+            self.assertEqual(len(data), fasta.get_length(record.id))
+            self.assertEqual(data, str(fasta.fetch(record.id)))
+            for start, end in [(0, 1), (0, 60), (59, 61), (5, -5), (-3, None),
+                               (50, 10), (len(data) - 1, len(data) + 5)]:
+                self.assertEqual(data[start:end],
+                                 str(fasta.fetch(record.id, start, end)))
+            for _ in range(20):
+                start = random.randint(0, len(data))
+                end = random.randint(start, len(data))
+                self.assertEqual(data[start:end],
+                                 str(fasta.fetch(record.id, start, end)))
+            new = fasta[record.id]
+            self.assertEqual(record.id, new.id)
+            self.assertEqual(record.id + " " + record.description,
+                             new.description)
+            self.assertEqual(data, str(new.seq))
+        self.assertFalse("missing" in fasta)
+        self.assertRaises(KeyError, fasta.fetch, "missing")
+
+    def test_in_memory(self):
+        with FastaIndex(self.fasta) as fasta:
+            self.check_index(fasta)
+        self.assertFalse(os.path.isfile(self.fasta + ".fai"))
+
+    def test_write_fai(self):
+        self.assertEqual(len(self.records), write_fai(self.fasta))
+        with open(self.fasta + ".fai") as handle:
+            lines = handle.read().splitlines()
+        self.assertEqual(len(self.records), len(lines))
+        self.assertEqual("seq0\t0\t16\t0\t0", lines[0])
+        self.assertEqual("seq1\t1\t32\t1\t2", lines[1])
+        self.assertEqual("seq3\t60\t126\t60\t61", lines[3])
+        with FastaIndex(self.fasta) as fasta:
+            self.check_index(fasta)
+
+    def test_dos(self):
+        filename = os.path.join(self.temp_dir, "dos.fasta")
+        with open(self.fasta, "rb") as handle:
+            data = handle.read()
+        with open(filename, "wb") as handle:
+            handle.write(data.replace(b"\n", b"\r\n"))
+        write_fai(filename)
+        with open(filename + ".fai") as handle:
+            self.assertEqual("seq3\t60\t132\t60\t62",
+                             handle.read().splitlines()[3])
+        with FastaIndex(filename) as fasta:
+            self.check_index(fasta)
+
+    def test_bgzf(self):
+        filename = os.path.join(self.temp_dir, "example.fasta.gz")
+        handle = bgzf.BgzfWriter(filename, "wb")
+        with open(self.fasta, "rb") as in_handle:
+            handle.write(in_handle.read())
+        handle.close()
+        # Without a .fai or .gzi file:
+        with FastaIndex(filename) as fasta:
+            self.check_index(fasta)
+        write_fai(filename)
+        self.assertTrue(os.path.isfile(filename + ".gzi"))
+        # Same offsets as for the uncompressed file:
+        write_fai(self.fasta)
+        with open(self.fasta + ".fai") as handle:
+            with open(filename + ".fai") as handle2:
+                self.assertEqual(handle.read(), handle2.read())
+        with FastaIndex(filename) as fasta:
+            self.assertTrue(len(fasta._raw_offsets) > 1)
+            self.check_index(fasta)
+
+    def test_bad_files(self):
+        filename = os.path.join(self.temp_dir, "bad.fasta")
+        with open(filename, "w") as handle:
+            handle.write(">alpha\nACGT\nACG\nACGT\n")
+        self.assertRaises(ValueError, write_fai, filename)
+        with open(filename, "w") as handle:
+            handle.write(">alpha\nACGT\n>alpha\nACGT\n")
+        self.assertRaises(ValueError, FastaIndex, filename)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
@@ -3,12 +3,17 @@
 # license.  Please see the LICENSE file that should have been included
 # as part of this package.
 
+import multiprocessing
+import os
+import pickle
+import tempfile
 import unittest
 from Bio._py3k import StringIO
 
 from Bio import SeqIO
 from Bio.Alphabet import generic_dna
 from Bio.Seq import Seq
+from Bio.SeqIO.InsdcIO import GenBankIterator, EmblIterator, parallel_parse
 from Bio.SeqFeature import SeqFeature, FeatureLocation
 from Bio.SeqRecord import SeqRecord
 
@@ -97,6 +102,135 @@ class TestEmblRewrite(unittest.TestCase):
         self.check_rewrite("EMBL/AE017046.embl")
 
 
+class TestFeatureParsing(unittest.TestCase):
+    """Check lazy and filtered feature parsing."""
+
+    files = [(GenBankIterator, "GenBank/NC_005816.gb"),
+             (GenBankIterator, "GenBank/cor6_6.gb"),
+             (GenBankIterator, "GenBank/origin_line.gb"),
+             (EmblIterator, "EMBL/AE017046.embl"),
+             (EmblIterator, "EMBL/epo_prt_selection.embl")]
+
+    def parse(self, iterator, filename, **kwargs):
+        with open(filename) as handle:
+            return list(iterator(handle, **kwargs))
+
+    def test_lazy(self):
+        """Check lazy feature parsing gives the same records."""
+        for iterator, filename in self.files:
+            expected = self.parse(iterator, filename)
+            records = self.parse(iterator, filename, lazy_features=True)
+            self.assertEqual(len(expected), len(records))
+            for old, new in zip(expected, records):
+                self.assertTrue(compare_record(old, new))
+                self.assertEqual(old.annotations, new.annotations)
+
+    def test_feature_types(self):
+        """Check only the requested feature types are parsed."""
+        for iterator, filename in self.files:
+            expected = self.parse(iterator, filename)
+            for lazy in (False, True):
+                records = self.parse(iterator, filename, lazy_features=lazy,
+                                     feature_types=["CDS", "source"])
+                for old, new in zip(expected, records):
+                    wanted = [f for f in old.features
+                              if f.type in ("CDS", "source")]
+                    self.assertEqual([repr(f) for f in wanted],
+                                     [repr(f) for f in new.features])
+                    self.assertEqual(old.annotations, new.annotations)
+
+    def test_lazy_record(self):
+        """Check lazy records can be sliced, pickled and modified."""
+        expected = self.parse(GenBankIterator, "GenBank/NC_005816.gb")[0]
+        record = self.parse(GenBankIterator, "GenBank/NC_005816.gb",
+                            lazy_features=True)[0]
+        self.assertTrue(compare_record(expected[100:5000], record[100:5000]))
+        record = self.parse(GenBankIterator, "GenBank/NC_005816.gb",
+                            lazy_features=True)[0]
+        self.assertTrue(compare_record(expected,
+                                       pickle.loads(pickle.dumps(record))))
+        record.features = []
+        self.assertEqual([], record.features)
+        self.assertEqual(0, len(record[100:5000].features))
+
+
+class TestParallelParse(unittest.TestCase):
+    """Check parsing in parallel gives the same records."""
+
+    files = [("GenBank/cor6_6.gb", "genbank"),
+             ("GenBank/cor6_6.gb.bgz", "genbank"),
+             ("GenBank/NC_000932.gb.bgz", "gb"),
+             ("EMBL/epo_prt_selection.embl", "embl")]
+
+    def check(self, filename, format, **kwargs):
+        if filename.endswith(".bgz"):
+            expected = list(SeqIO.parse(filename[:-4], format))
+        else:
+            expected = list(SeqIO.parse(filename, format))
+        records = list(parallel_parse(filename, format, **kwargs))
+        if not kwargs.get("ordered", True):
+            records.sort(key=lambda r: [r.id for r in expected].index(r.id))
+        self.assertEqual(len(expected), len(records))
+        for old, new in zip(expected, records):
+            self.assertTrue(compare_record(old, new))
+
+    def test_single_process(self):
+        """Check parsing chunks in this process."""
+        for filename, format in self.files:
+            self.check(filename, format, processes=1, chunk_size=1)
+            self.check(filename, format, processes=1)
+
+    def test_processes(self):
+        """Check parsing chunks in a process pool."""
+        for filename, format in self.files:
+            self.check(filename, format, processes=2, chunk_size=1)
+            self.check(filename, format, processes=2, chunk_size=1,
+                       ordered=False, max_pending=1)
+            self.check(filename, format, processes=2, chunk_size=10000,
+                       max_pending=3)
+
+    def test_feature_types(self):
+        """Check parsing only some feature types in parallel."""
+        for record in parallel_parse("GenBank/cor6_6.gb", processes=2,
+                                     chunk_size=1, feature_types=["CDS"]):
+            self.assertEqual(["CDS"], [f.type for f in record.features])
+
+    def test_abandon(self):
+        """Check stopping part way through shuts down the workers."""
+        for i in range(8):
+            for ordered in (True, False):
+                records = parallel_parse("GenBank/cor6_6.gb", processes=2,
+                                         chunk_size=1, ordered=ordered,
+                                         max_pending=2)
+                self.assertTrue(next(records).id)
+                records.close()
+                self.assertEqual([], multiprocessing.active_children())
+
+    def test_errors(self):
+        """Check invalid arguments and bad records."""
+        self.assertRaises(ValueError, list,
+                          parallel_parse("GenBank/cor6_6.gb", "fasta"))
+        self.assertRaises(ValueError, list,
+                          parallel_parse("GenBank/cor6_6.gb", chunk_size=0))
+        with open("GenBank/cor6_6.gb") as handle:
+            data = handle.read()
+        # Truncate the last record
+        data = data[:data.rindex("ORIGIN")]
+        handle, filename = tempfile.mkstemp(suffix=".gb")
+        os.close(handle)
+        try:
+            with open(filename, "w") as handle:
+                handle.write(data)
+            for ordered in (True, False):
+                self.assertRaises(ValueError, list,
+                                  parallel_parse(filename, processes=2,
+                                                 chunk_size=1,
+                                                 ordered=ordered))
+                self.assertEqual([], multiprocessing.active_children())
+        finally:
+            os.remove(filename)
+
+
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
@@ -8,11 +8,13 @@
 Initially this takes matched tests of GenBank and FASTA files from the NCBI
 and confirms they are consistent using our different parsers.
 """
+import base64
+import pickle
 import unittest
 
 from Bio import SeqIO
 from Bio.Alphabet import generic_dna, generic_protein
-from Bio.Seq import Seq, MutableSeq
+from Bio.Seq import Seq, MutableSeq, SeqView
 from Bio.SeqRecord import SeqRecord
 from Bio.SeqFeature import SeqFeature, FeatureLocation, ExactPosition
 from Bio.SeqFeature import WithinPosition, BeforePosition, AfterPosition, OneOfPosition
@@ -206,6 +208,108 @@ Seq('ABCDEFGHIJKLMNOPQRSTUVWZYX', ProteinAlphabet())"""
         self.assertEqual(len(rec[5:2]), 0)
         self.assertEqual(len(rec[5:2][2:-2]), 0)
 
+    def test_windows(self):
+        """Windows match slicing"""
+        rec = self.record
+        for size, step in [(1, 1), (5, 3), (10, 10), (12, 1), (26, 5)]:
+            windows = list(rec.windows(size, step))
+            starts = range(0, len(rec) - size + 1, step)
+            self.assertEqual(len(windows), len(starts))
+            for start, window in zip(starts, windows):
+                sub = rec[start:start + size]
+                self.assertEqual(str(sub.seq), str(window.seq))
+                self.assertEqual(sub.id, window.id)
+                self.assertEqual(sub.letter_annotations,
+                                 window.letter_annotations)
+                self.assertEqual([str(f.location) for f in sub.features],
+                                 [str(f.location) for f in window.features])
+        self.assertEqual([], list(rec.windows(27)))
+        self.assertEqual(3, len(list(rec.windows(10, 8))))
+        self.assertRaises(ValueError, list, rec.windows(0))
+        self.assertRaises(ValueError, list, rec.windows(5, 0))
+
+    def test_windows_view(self):
+        """Windows over a SeqView share its data"""
+        data = bytearray(b"ACGTN" * 20)
+        rec = SeqRecord(SeqView(data, generic_dna), id="view")
+        windows = list(rec.windows(20, 15))
+        self.assertEqual(6, len(windows))
+        for window in windows:
+            self.assertTrue(isinstance(window.seq, SeqView))
+            self.assertTrue(window.seq._buffer is data)
+            self.assertEqual(4, window.seq.count("N"))
+
+    def test_feature_index(self):
+        """Feature index follows changes to the features"""
+        rec = self.record[:]
+        index = rec.feature_index
+        self.assertTrue(index is rec.feature_index)
+        self.assertEqual(len(rec.features), len(index))
+        self.assertEqual(0, len(rec[0:5].features))
+        rec.features.append(SeqFeature(FeatureLocation(1, 3), type="new"))
+        self.assertFalse(index is rec.feature_index)
+        self.assertEqual(["new"], [f.type for f in rec[0:5].features])
+        rec.features[-1].location = FeatureLocation(10, 12)
+        # a new location is only seen once the list is replaced
+        rec.features = rec.features[:]
+        self.assertEqual(0, len(rec[0:5].features))
+        self.assertEqual(["new"], [f.type for f in rec[9:13].features])
+        rec.features = rec.features[:-1]
+        self.assertEqual(0, len(rec[9:13].features))
+        # slicing reuses the index, until a feature is replaced
+        index = rec.feature_index
+        rec[0:5]
+        self.assertTrue(index is rec.feature_index)
+        rec.features[0] = SeqFeature(FeatureLocation(1, 3), type="replaced")
+        self.assertFalse(index is rec.feature_index)
+        self.assertEqual(["replaced"], [f.type for f in rec[0:5].features])
+
+    def test_features_list(self):
+        """Lists of features are kept, not copied"""
+        features = []
+        rec = SeqRecord(Seq("ACGT" * 5), features=features)
+        self.assertEqual(0, len(rec[0:10].features))
+        features.append(SeqFeature(FeatureLocation(2, 5), type="gene"))
+        self.assertTrue(rec.features is features)
+        self.assertEqual(["gene"], [f.type for f in rec[0:10].features])
+        other = [SeqFeature(FeatureLocation(12, 15), type="CDS")]
+        rec.features = other
+        other.append(SeqFeature(FeatureLocation(4, 8), type="exon"))
+        self.assertTrue(rec.features is other)
+        self.assertEqual(["exon"], [f.type for f in rec[0:10].features])
+
+    def test_pickle(self):
+        """Pickle records, including those of older versions"""
+        rec = self.record[:]
+        self.assertEqual(1, len(rec[0:10].features))
+        new = pickle.loads(pickle.dumps(rec, 2))
+        self.assertFalse(hasattr(new, "_feature_index"))
+        self.assertEqual(str(rec.seq), str(new.seq))
+        self.assertEqual(1, len(new[0:10].features))
+        # SeqRecord from Biopython 1.69 with one feature
+        old = base64.b64decode(
+            "gAJjQmlvLlNlcVJlY29yZApTZXFSZWNvcmQKcQApgXEBfXECKFgEAAAAX3NlcXED"
+            "Y0Jpby5TZXEKU2VxCnEEKYFxBX1xBihYBQAAAF9kYXRhcQdYCAAAAEFDR1RBQ0dU"
+            "cQhYCAAAAGFscGhhYmV0cQljQmlvLkFscGhhYmV0CkFscGhhYmV0CnEKKYFxC3Vi"
+            "WAIAAABpZHEMWAMAAABvbGRxDVgEAAAAbmFtZXEOWA4AAAA8dW5rbm93biBuYW1l"
+            "PnEPWAsAAABkZXNjcmlwdGlvbnEQWBUAAAA8dW5rbm93biBkZXNjcmlwdGlvbj5x"
+            "EVgHAAAAZGJ4cmVmc3ESXXETWAsAAABhbm5vdGF0aW9uc3EUfXEVWBcAAABfcGVy"
+            "X2xldHRlcl9hbm5vdGF0aW9uc3EWY0Jpby5TZXFSZWNvcmQKX1Jlc3RyaWN0ZWRE"
+            "aWN0CnEXKYFxGH1xGVgHAAAAX2xlbmd0aHEaSwhzYlgIAAAAZmVhdHVyZXNxG11x"
+            "HGNCaW8uU2VxRmVhdHVyZQpTZXFGZWF0dXJlCnEdKYFxHn1xHyhYCAAAAGxvY2F0"
+            "aW9ucSBjQmlvLlNlcUZlYXR1cmUKRmVhdHVyZUxvY2F0aW9uCnEhKYFxIn1xIyhY"
+            "BgAAAF9zdGFydHEkY0Jpby5TZXFGZWF0dXJlCkV4YWN0UG9zaXRpb24KcSVLAoVx"
+            "JoFxJ1gEAAAAX2VuZHEoaCVLBYVxKYFxKlgHAAAAX3N0cmFuZHErTlgDAAAAcmVm"
+            "cSxOWAYAAAByZWZfZGJxLU51YlgEAAAAdHlwZXEuWAQAAABnZW5lcS9oDFgMAAAA"
+            "PHVua25vd24gaWQ+cTBYCgAAAHF1YWxpZmllcnNxMWNjb2xsZWN0aW9ucwpPcmRl"
+            "cmVkRGljdApxMilScTN1YmF1Yi4=")
+        rec = pickle.loads(old)
+        self.assertEqual("ACGTACGT", str(rec.seq))
+        self.assertEqual(["gene"], [f.type for f in rec.features])
+        sliced = rec[1:7]
+        self.assertEqual(1, sliced.features[0].location.start)
+        self.assertEqual(4, sliced.features[0].location.end)
+
     def test_add_simple(self):
         """Simple addition"""
         rec = self.record + self.record
@@ -4,6 +4,7 @@
 # as part of this package.
 
 import os
+import random
 import unittest
 
 from Bio import SeqIO
@@ -11,6 +12,8 @@ from Bio.Alphabet import single_letter_alphabet
 from Bio.Seq import Seq, MutableSeq
 from Bio.SeqRecord import SeqRecord
 from Bio.SeqUtils import GC, seq1, seq3, GC_skew
+from Bio.SeqUtils import translate_frames, find_orfs, nt_search
+from Bio.SeqUtils.NucleotideSearch import NucleotideSearch
 from Bio.SeqUtils.lcc import lcc_simp, lcc_mult
 from Bio.SeqUtils.CheckSum import crc32, crc64, gcg, seguid
 from Bio.SeqUtils.CodonUsage import CodonAdaptationIndex
@@ -152,6 +155,73 @@ class SeqUtilsTests(unittest.TestCase):
         self.assertEqual(seq1(seq3(s1)), s1)
         self.assertEqual(seq3(seq1(s3)).upper(), s3.upper())
 
+    def test_translate_frames(self):
+        record = SeqIO.read("GenBank/NC_005816.fna", "fasta")
+        seq = record.seq
+        frames = translate_frames(seq, 11)
+        self.assertEqual(sorted(frames), [-3, -2, -1, 1, 2, 3])
+        anti = seq.reverse_complement()
+        for i in range(3):
+            end = i + 3 * ((len(seq) - i) // 3)
+            self.assertEqual(frames[i + 1], str(seq[i:end].translate(11)))
+            self.assertEqual(frames[-i - 1], str(anti[i:end].translate(11)))
+
+    def test_find_orfs(self):
+        record = SeqIO.read("GenBank/NC_005816.fna", "fasta")
+        seq = record.seq
+        orfs = find_orfs(seq, min_length=100, genetic_code=11)
+        self.assertTrue(orfs)
+        self.assertEqual(orfs, sorted(orfs))
+        for start, end, strand, protein in orfs:
+            self.assertTrue(len(protein) >= 100)
+            self.assertEqual(end - start, 3 * len(protein))
+            fragment = seq[start:end]
+            if strand == -1:
+                fragment = fragment.reverse_complement()
+            self.assertEqual(str(fragment.translate(11)), protein)
+        self.assertTrue(len(find_orfs(seq, 50, 11)) > len(orfs))
+        self.assertRaises(ValueError, find_orfs, seq, 0)
+
+    def test_nt_search(self):
+        self.assertEqual(nt_search("ACGTTTACGNACG", "ACG"), ["ACG", 0, 6, 10])
+        self.assertEqual(nt_search("GGGGG", "GNG"), ["G[GATC]G", 0, 1, 2])
+
+    def test_nucleotide_search(self):
+        random.seed(7)
+        patterns = {"a": "ACGN", "b": "RRYY", "c": "TTT", "d": "GAATTC"}
+        searcher = NucleotideSearch(patterns)
+        forward = NucleotideSearch(patterns.values(), both_strands=False)
+        for _ in range(20):
+            seq = "".join(random.choice("ACGTN") for _ in range(500))
+            expected = []
+            for name, pattern in patterns.items():
+                reverse = str(Seq(pattern).reverse_complement())
+                for strand, query in [(1, pattern), (-1, reverse)]:
+                    for start in nt_search(seq, query)[1:]:
+                        expected.append((start + len(query), name, -strand,
+                                         start))
+            expected = [(start, end, -strand, name)
+                        for end, name, strand, start in sorted(expected)]
+            self.assertEqual(expected, list(searcher.search(seq)))
+            self.assertEqual(expected, list(searcher.search(Seq(seq.lower()))))
+            self.assertEqual([(start, end, 1, patterns[name])
+                              for start, end, strand, name in expected
+                              if strand == 1],
+                             list(forward.search(seq)))
+
+    def test_nucleotide_search_records(self):
+        records = SeqIO.parse("GenBank/NC_005816.ffn", "fasta")
+        searcher = NucleotideSearch({"EcoRI": "GAATTC"})
+        matches = list(searcher.search_records(records))
+        self.assertTrue(matches)
+        for record in SeqIO.parse("GenBank/NC_005816.ffn", "fasta"):
+            starts = nt_search(str(record.seq), "GAATTC")[1:]
+            self.assertEqual([(record.id, start, start + 6, strand, "EcoRI")
+                              for start in starts for strand in (1, -1)],
+                             [m for m in matches if m[0] == record.id])
+        self.assertRaises(ValueError, NucleotideSearch, ["ACG?"])
+        self.assertRaises(ValueError, NucleotideSearch, [])
+
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
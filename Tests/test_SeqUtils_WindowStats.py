@@ -0,0 +1,96 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Tests for the sliding window statistics in Bio.SeqUtils.WindowStats."""
+
+import math
+import random
+import unittest
+
+try:
+    from numpy import allclose, array_equal, concatenate
+except ImportError:
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.SeqUtils.WindowStats.")
+
+from Bio.Alphabet import generic_dna
+from Bio.Seq import Seq
+from Bio.SeqUtils import GC, GC_skew
+from Bio.SeqUtils.lcc import lcc_simp
+from Bio.SeqUtils.WindowStats import WindowStats, iter_window_counts
+from Bio.SeqUtils.WindowStats import gc_content, gc_skew, lcc, entropy
+
+
+def _entropy(seq):
+    counts = [seq.upper().count(letter) for letter in "ACGT"]
+    total = float(sum(counts))
+    return -sum(c / total * math.log(c / total, 2) for c in counts if c)
+
+
+class WindowStatsTests(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(36)
+        self.seq = "".join(random.choice("AACGTTTNSacgt")
+                           for _ in range(2000))
+
+    def test_against_existing(self):
+        stats = WindowStats(Seq(self.seq, generic_dna))
+        self.assertEqual(len(self.seq), len(stats))
+        for window, step in [(1, 1), (7, 3), (100, 100), (250, 60)]:
+            starts = list(range(0, len(self.seq) - window + 1, step))
+            windows = [self.seq[i:i + window] for i in starts]
+            self.assertEqual(starts, list(stats.starts(window, step)))
+            self.assertTrue(allclose([GC(w) for w in windows],
+                                     stats.gc(window, step)))
+            expected = [GC_skew(w, window)[0] for w in windows]
+            self.assertTrue(allclose(expected, stats.gc_skew(window, step)))
+            total = 0.0
+            for i, value in enumerate(stats.cumulative_gc_skew(window, step)):
+                total += expected[i]
+                self.assertAlmostEqual(total, value)
+            upper = [w.upper() for w in windows]
+            self.assertTrue(allclose([lcc_simp(w) for w in upper],
+                                     stats.lcc(window, step)))
+            self.assertTrue(allclose([_entropy(w) for w in windows],
+                                     stats.entropy(window, step)))
+        self.assertEqual(0, len(stats.gc(len(self.seq) + 1)))
+        self.assertRaises(ValueError, stats.counts, 0)
+        self.assertRaises(ValueError, stats.counts, 10, 0)
+
+    def test_counts(self):
+        stats = WindowStats("ACGTSNacgtuX")
+        self.assertEqual([[2, 2, 2, 3, 1, 2]],
+                         stats.counts(12).tolist())
+        self.assertEqual([[1, 1, 1, 1, 0, 0], [1, 1, 1, 0, 0, 1]],
+                         stats.counts(4, 5).tolist())
+
+    def test_streaming(self):
+        stats = WindowStats(self.seq)
+        for window, step in [(1, 1), (7, 3), (100, 100), (50, 120)]:
+            expected = stats.counts(window, step)
+            for size in [1, 13, 50, 99, 1000, 5000]:
+                chunks = [self.seq[i:i + size]
+                          for i in range(0, len(self.seq), size)]
+                results = list(iter_window_counts(chunks, window, step))
+                starts = concatenate([s for s, c in results])
+                counts = concatenate([c for s, c in results])
+                self.assertTrue(array_equal(stats.starts(window, step),
+                                            starts))
+                self.assertTrue(array_equal(expected, counts))
+            starts, counts = next(iter_window_counts(self.seq, window, step))
+            self.assertTrue(array_equal(expected, counts))
+            self.assertTrue(allclose(stats.gc(window, step),
+                                     gc_content(counts)))
+            self.assertTrue(allclose(stats.gc_skew(window, step),
+                                     gc_skew(counts)))
+            self.assertTrue(allclose(stats.lcc(window, step), lcc(counts)))
+            self.assertTrue(allclose(stats.entropy(window, step),
+                                     entropy(counts)))
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
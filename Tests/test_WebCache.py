@@ -0,0 +1,245 @@
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Tests for the Bio.WebCache response cache, using a local web server."""
+
+try:
+    import sqlite3
+    del sqlite3
+except ImportError:
+    # skip the tests if sqlite is not available
+    from Bio import MissingPythonDependencyError
+    raise MissingPythonDependencyError("Requires sqlite3, which is "
+                                       "included Python 2.5+")
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    # Python 2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+from Bio import WebCache
+from Bio._py3k import HTTPError
+from Bio.Entrez.Client import EntrezClient
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Reply with the request, or with an error for paths with "error"."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.reply(None)
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        self.reply(self.rfile.read(length).decode("ascii"))
+
+    def reply(self, data):
+        self.server.requests.append((self.command, self.path, data))
+        status = 404 if "error" in self.path else 200
+        body = ("%s %s %s" % (self.command, self.path, data)).encode("ascii")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class EchoServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class WebCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.temp_dir, "responses.sqlite")
+        self.cache = WebCache.ResponseCache(self.filename)
+
+    def tearDown(self):
+        WebCache.set_cache(None)
+        self.cache.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_keys(self):
+        """Check equivalent requests give the same response."""
+        cache = self.cache
+        cache.put("http://Example.org/f?id=1&db=x&email=me", b"one")
+        cache.put("http://example.org/f", b"two", b"db=x&id=1")
+        cache.put("http://example.org/f", b"three", b">seq\nACGT\n")
+        self.assertEqual(b"one", cache.get("http://example.org/f?db=x&id=1"))
+        self.assertEqual(b"one",
+                         cache.get("http://example.org/f?tool=t&id=1&db=x"))
+        self.assertEqual(b"two", cache.get("http://example.org/f", b"id=1&db=x"))
+        self.assertEqual(b"three",
+                         cache.get("http://example.org/f", b">seq\nACGT\n"))
+        self.assertEqual(None, cache.get("http://example.org/f?db=y&id=1"))
+        self.assertEqual(None, cache.get("http://example.org/f"))
+        self.assertEqual({"hits": 4, "misses": 2, "entries": 3, "size": 11},
+                         cache.stats())
+
+    def test_ttl(self):
+        """Check responses expire."""
+        cache = self.cache
+        cache.put("http://example.org/f?id=1", b"one")
+        cache.ttl = 3600
+        self.assertEqual(b"one", cache.get("http://example.org/f?id=1"))
+        cache.put("http://example.org/f?id=2", b"two")
+        cache.ttl = 0
+        time.sleep(0.01)
+        self.assertEqual(None, cache.get("http://example.org/f?id=1"))
+        self.assertEqual(1, cache.stats()["entries"])
+        cache.purge()
+        self.assertEqual(0, cache.stats()["entries"])
+
+    def test_lru(self):
+        """Check the least recently used responses are removed."""
+        cache = self.cache
+        cache.max_size = 10
+        for name in ("one", "two", "six"):
+            cache.put("http://example.org/" + name, name.encode("ascii"))
+            time.sleep(0.01)
+        cache.get("http://example.org/one")
+        cache.put("http://example.org/seven", b"seven")
+        self.assertEqual(b"one", cache.get("http://example.org/one"))
+        self.assertEqual(None, cache.get("http://example.org/two"))
+        self.assertEqual(None, cache.get("http://example.org/six"))
+        self.assertEqual(b"seven", cache.get("http://example.org/seven"))
+        self.assertEqual(8, cache.stats()["size"])
+        cache.clear()
+        self.assertEqual(0, cache.stats()["entries"])
+
+    def test_shared(self):
+        """Check the responses are seen by another cache on the same file."""
+        self.cache.put("http://example.org/f?id=1", b"one")
+        other = WebCache.set_cache(self.filename, ttl=60)
+        try:
+            self.assertEqual(60, other.ttl)
+            self.assertEqual(b"one", other.get("http://example.org/f?id=1"))
+            self.assertTrue(WebCache.get_cache() is other)
+        finally:
+            other.close()
+        self.assertRaises(ValueError, WebCache.set_cache, self.cache, 60)
+        WebCache.set_cache(None)
+        self.assertEqual(None, WebCache.get_cache())
+
+
+class UrlopenTests(unittest.TestCase):
+
+    def setUp(self):
+        server = EchoServer(("127.0.0.1", 0), EchoHandler)
+        server.requests = []
+        self.server = server
+        self.thread = threading.Thread(target=server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.url = "http://127.0.0.1:%i/" % server.server_address[1]
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = WebCache.set_cache(os.path.join(self.temp_dir,
+                                                     "responses.sqlite"))
+
+    def tearDown(self):
+        WebCache.set_cache(None)
+        self.cache.close()
+        shutil.rmtree(self.temp_dir)
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_urlopen(self):
+        """Check repeated requests are answered from the cache."""
+        throttled = []
+        url = self.url + "find?id=1&db=x"
+        for i in range(3):
+            handle = WebCache.urlopen(url, throttle=lambda: throttled.append(1))
+            self.assertEqual(b"GET /find?id=1&db=x None", handle.read())
+            self.assertEqual(url, handle.url)
+        for i in range(2):
+            handle = WebCache.urlopen(url, b"id=1")
+            self.assertEqual(b"POST /find?id=1&db=x id=1", handle.read())
+        self.assertEqual(2, len(self.server.requests))
+        self.assertEqual([1], throttled)
+        handle = WebCache.urlopen(url, use_cache=False)
+        self.assertEqual(b"GET /find?id=1&db=x None", handle.read())
+        self.assertEqual(3, len(self.server.requests))
+        stats = self.cache.stats()
+        self.assertEqual((3, 2, 2), (stats["hits"], stats["misses"],
+                                     stats["entries"]))
+
+    def test_errors(self):
+        """Check unsuccessful responses are not stored."""
+        for i in range(2):
+            self.assertRaises(HTTPError, WebCache.urlopen, self.url + "error")
+        self.assertEqual(2, len(self.server.requests))
+        self.assertEqual(0, self.cache.stats()["entries"])
+
+    def cgis(self):
+        """Return the names of the E-utilities requested."""
+        return [request[1].split("?")[0].rsplit("/", 1)[1]
+                for request in self.server.requests]
+
+    def test_entrez_client(self):
+        """Check the EntrezClient uses the cache, except for the history."""
+        client = EntrezClient(email="biopython-dev@biopython.org", rate=1000,
+                              base_url=self.url + "eutils")
+        try:
+            for i in range(2):
+                handle = client.efetch(db="nucleotide", id="1")
+                self.assertTrue(handle.read().startswith("GET /eutils/efetch"))
+                handle = client.epost(db="nucleotide", id="1")
+                self.assertTrue(handle.read().startswith("POST /eutils/epost"))
+                client.esearch(db="nucleotide", term="orchid", usehistory="y")
+                client.esummary(db="nucleotide", webenv="WebEnv0",
+                                query_key="1")
+        finally:
+            client.close()
+        self.assertEqual(["efetch.fcgi"] +
+                         ["epost.fcgi", "esearch.fcgi", "esummary.fcgi"] * 2,
+                         self.cgis())
+        self.assertEqual(1, self.cache.stats()["entries"])
+
+    def test_entrez_batches(self):
+        """Check fetching identifiers in batches again uses the cache."""
+        ids = [str(i) for i in range(250)]
+        client = EntrezClient(email="biopython-dev@biopython.org", rate=1000,
+                              base_url=self.url + "eutils")
+        try:
+            first = [handle.read() for handle in
+                     client.efetch_batches(db="nucleotide", id=ids,
+                                           batch_size=220, rettype="fasta")]
+            self.assertEqual(["efetch.fcgi"] * 2, self.cgis())
+            # the longer list of identifiers is sent by POST
+            self.assertEqual(["GET", "POST"],
+                             sorted(request[0]
+                                    for request in self.server.requests))
+            self.assertTrue(first[0].startswith("POST /eutils/efetch.fcgi"))
+            self.assertTrue("id=" + "%2C".join(ids[:220]) in first[0])
+            self.assertTrue("id=" + "%2C".join(ids[220:]) in first[1])
+            again = [handle.read() for handle in
+                     client.efetch_batches(db="nucleotide", id=ids,
+                                           batch_size=220, rettype="fasta")]
+        finally:
+            client.close()
+        self.assertEqual(first, again)
+        self.assertEqual(2, len(self.server.requests))
+        stats = self.cache.stats()
+        self.assertEqual((2, 2, 2), (stats["hits"], stats["misses"],
+                                     stats["entries"]))
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
@@ -824,6 +824,142 @@ class TestUnknownSeq(unittest.TestCase):
         self.assertEqual("", seq.ungap("-"))
 
 
+class TestPackedSeq(unittest.TestCase):
+    def setUp(self):
+        self.data = "ACGTTGCANNNNNNNNNNacgtnnRYKMacgtACGTTT-GCAuA"
+        self.seq = Seq.PackedSeq(self.data[:-3], Alphabet.generic_dna)
+
+    def test_round_trip(self):
+        for data in ("", "A", "ACG", "ACGT", "ACGTA", "nnnnNN", self.data):
+            self.assertEqual(data, str(Seq.PackedSeq(data)))
+            self.assertEqual(len(data), len(Seq.PackedSeq(data)))
+
+    def test_compact(self):
+        data = "ACGT" * 1000 + "N" * 1000 + "acgt" * 1000
+        seq = Seq.PackedSeq(data)
+        self.assertEqual(data, str(seq))
+        self.assertEqual(len(seq._packed), len(data) // 4)
+
+    def test_protein(self):
+        self.assertRaises(ValueError, Seq.PackedSeq, "ACGT", IUPAC.protein)
+
+    def test_getitem(self):
+        data = self.data[:-3]
+        for i in range(-len(data), len(data)):
+            self.assertEqual(data[i], self.seq[i])
+        self.assertRaises(IndexError, self.seq.__getitem__, len(data))
+        for start in range(-5, len(data) + 2):
+            for end in range(-5, len(data) + 2):
+                sub = self.seq[start:end]
+                self.assertTrue(isinstance(sub, Seq.PackedSeq))
+                self.assertEqual(data[start:end], str(sub))
+                self.assertEqual(data[start:end][1:-1], str(sub[1:-1]))
+        self.assertEqual(data[::3], str(self.seq[::3]))
+        self.assertEqual(data[::-1], str(self.seq[::-1]))
+
+    def test_complement(self):
+        seq = Seq.Seq(self.data[:-3], Alphabet.generic_dna)
+        for start in range(0, len(seq), 3):
+            for end in range(start, len(seq) + 1, 2):
+                self.assertEqual(str(seq[start:end].complement()),
+                                 str(self.seq[start:end].complement()))
+                self.assertEqual(str(seq[start:end].reverse_complement()),
+                                 str(self.seq[start:end].reverse_complement()))
+                self.assertEqual(
+                    str(seq[start:end]),
+                    str(self.seq[start:end].reverse_complement()
+                        .reverse_complement()))
+
+    def test_complement_rna(self):
+        data = "ACGUNNacgun"
+        self.assertEqual("UNNACGUNNACGU",
+                         str(Seq.PackedSeq("ACGUNNACGUNNA",
+                                           Alphabet.generic_rna)
+                             .reverse_complement()))
+        self.assertEqual(str(Seq.Seq(data).reverse_complement()),
+                         str(Seq.PackedSeq(data,
+                                           Alphabet.generic_nucleotide)
+                             .reverse_complement()))
+        self.assertRaises(ValueError,
+                          Seq.PackedSeq(self.data,
+                                        Alphabet.generic_nucleotide).complement)
+
+    def test_string_methods(self):
+        data = self.data[:-3]
+        self.assertEqual(data.count("A"), self.seq.count("A"))
+        self.assertEqual(data.count("N", 3, 20), self.seq.count("N", 3, 20))
+        self.assertEqual(data.find("acgt"), self.seq.find("acgt"))
+        self.assertEqual(data.find("acgt", 20), self.seq.find("acgt", 20))
+        self.assertEqual(Seq.Seq(data), self.seq)
+
+    def test_translate(self):
+        seq = Seq.Seq(self.data[:36], Alphabet.generic_dna)
+        packed = Seq.PackedSeq(seq)
+        self.assertEqual(str(seq.translate()), str(packed.translate()))
+        self.assertEqual(str(seq.reverse_complement().translate()),
+                         str(packed.reverse_complement().translate()))
+
+
+class TestSeqView(unittest.TestCase):
+    def setUp(self):
+        self.data = "ACGTTGCANNNNNNNNNNacgtnnRYKMacgtACGTTT-GCA"
+
+    def test_buffers(self):
+        for data in (self.data, self.data.encode("ascii"),
+                     bytearray(self.data.encode("ascii"))):
+            seq = Seq.SeqView(data, Alphabet.generic_dna)
+            self.assertEqual(self.data, str(seq))
+            self.assertEqual(len(self.data), len(seq))
+            self.assertEqual(Seq.Seq(self.data), seq)
+        self.assertRaises(TypeError, Seq.SeqView, 1234)
+
+    def test_getitem(self):
+        seq = Seq.SeqView(bytearray(self.data.encode("ascii")))
+        for i in range(-len(self.data), len(self.data)):
+            self.assertEqual(self.data[i], seq[i])
+        self.assertRaises(IndexError, seq.__getitem__, len(self.data))
+        for start in range(-3, len(self.data) + 2, 2):
+            for end in range(-3, len(self.data) + 2, 3):
+                sub = seq[start:end]
+                self.assertTrue(isinstance(sub, Seq.SeqView))
+                self.assertTrue(sub._buffer is seq._buffer)
+                self.assertEqual(self.data[start:end], str(sub))
+                self.assertEqual(self.data[start:end][1:-1], str(sub[1:-1]))
+        self.assertEqual(self.data[::3], str(seq[::3]))
+
+    def test_search(self):
+        seq = Seq.SeqView(self.data.encode("ascii"), start=5, end=-5)
+        data = self.data[5:-5]
+        for sub in ("A", "N", "NN", "acgt", "", "X", Seq.Seq("GT")):
+            sub_str = str(sub)
+            for start, end in ((0, len(data)), (3, 20), (-10, -2), (8, 3)):
+                self.assertEqual(data.count(sub_str, start, end),
+                                 seq.count(sub, start, end))
+                self.assertEqual(data.find(sub_str, start, end),
+                                 seq.find(sub, start, end))
+                self.assertEqual(data.rfind(sub_str, start, end),
+                                 seq.rfind(sub, start, end))
+            self.assertEqual(sub_str in data, sub in seq)
+
+    def test_mmap(self):
+        import mmap
+        import tempfile
+        handle = tempfile.TemporaryFile()
+        try:
+            handle.write(self.data.encode("ascii"))
+            handle.flush()
+            buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            seq = Seq.SeqView(buffer, Alphabet.generic_dna)[8:20]
+            self.assertEqual(self.data[8:20], str(seq))
+            self.assertEqual(self.data[8:20].count("N"), seq.count("N"))
+            self.assertEqual(self.data[8:20].find("acgt"), seq.find("acgt"))
+            self.assertEqual(str(Seq.Seq(self.data[8:20]).reverse_complement()),
+                             str(seq.reverse_complement()))
+            buffer.close()
+        finally:
+            handle.close()
+
+
 class TestAmbiguousComplements(unittest.TestCase):
     def test_ambiguous_values(self):
         """Test that other tests do not introduce characters to our values"""